@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+统一命令入口
+每个子命令对应一个已有的入口（publish.py、发布服务客户端、生成流水线等），只导入选中的那一个，
+list、status 等查询命令不会导入 Selenium、大模型 SDK 等依赖，几乎立即返回：
+
+    python cli.py list tag:python unpublished
+    python cli.py status
+    python cli.py publish --article posts/a.md --platform csdn
+    python cli.py generate --article-limit 2
+    python cli.py topics
+
+子命令后面的参数原样交给对应的入口，`python cli.py <子命令> --help` 查看各自的参数。
+各子命令的导入耗时上限见 tests/test_import_time.py。
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class Command(NamedTuple):
+    """子命令：入口模块（或相对项目根目录的脚本路径）、固定放在用户参数前面的参数、说明"""
+    target: str
+    args: tuple
+    help: str
+
+
+COMMANDS: Dict[str, Command] = {
+    'list': Command('src.publisher.article_index', (), '列出文章目录中的文章，可按条件筛选'),
+    'status': Command('src.service.client', ('status',), '发布服务状态'),
+    'jobs': Command('src.service.client', ('jobs',), '发布服务中的任务'),
+    'submit': Command('src.service.client', ('submit',), '把文章提交给发布服务并跟踪进度'),
+    'stop': Command('src.service.client', ('stop',), '处理完当前批次后停止发布服务'),
+    'publish': Command('publish', (), '发布文章（参数同 publish.py，不带参数时进入交互模式）'),
+    'serve': Command('publish', ('--serve',), '启动发布服务'),
+    'watch': Command('publish', ('--watch',), '监听文章目录，新增或修改的文章自动发布'),
+    'generate': Command('generate.auto_content_pipeline', (), '抓取新闻并生成文章'),
+    'topics': Command('kimi/main.py', ('--list',), '列出已探索的主题和已生成的教程大纲'),
+    'kimi': Command('kimi/main.py', (), '教程系列生成（参数同 kimi/main.py）'),
+    'daily': Command('csdn-blog-auto-publish/auto_generate_daily.py', (), '每日技术博客生成'),
+}
+
+
+def load(name: str):
+    """
+    导入子命令的入口，返回其 main 函数
+
+    脚本路径形式的入口（kimi/main.py 等）按脚本方式加载：所在目录加入 sys.path，
+    工作目录切换到所在目录（这些脚本按相对路径读写数据）。
+    """
+    target = COMMANDS[name].target
+    if not target.endswith('.py'):
+        return importlib.import_module(target).main
+
+    path = os.path.join(PROJECT_ROOT, target)
+    directory = os.path.dirname(path)
+    sys.path.insert(0, directory)
+    os.chdir(directory)
+    module_name = '_'.join(target[:-3].replace('-', '_').split('/'))
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module.main
+
+
+def usage() -> str:
+    width = max(len(name) for name in COMMANDS)
+    lines = ['用法：python cli.py <子命令> [参数...]', '', '子命令：']
+    lines += [f"  {name:<{width}}  {command.help}" for name, command in COMMANDS.items()]
+    lines += ['', '`python cli.py <子命令> --help` 查看子命令的参数']
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        print(usage())
+        return 0
+    name, rest = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"✗ 未知的子命令：{name}\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    sys.path.insert(0, PROJECT_ROOT)
+    entry = load(name)
+    # 入口按自己的方式解析 sys.argv（publish.py 等的 main 不接收参数）
+    sys.argv = [f"cli.py {name}", *COMMANDS[name].args, *rest]
+    result = entry()
+    return result if isinstance(result, int) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
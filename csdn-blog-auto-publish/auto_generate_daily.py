@@ -13,6 +13,11 @@ import sys
 import json
 from pathlib import Path
 from datetime import datetime
+
+# 项目根目录（性能剖析模块）
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.profiler import profiling
 from zhipu_news_search import ZhipuNewsSearcher
 from zhipu_content_generator import ZhipuContentGenerator
 
@@ -181,8 +186,19 @@ def main():
         help="posts目录文章数量限制（默认16篇）"
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="性能剖析：对本次运行采样，结果写到项目根目录的 data/profiles/（也可设置环境变量 POSTS_COPILOT_PROFILE=1）"
+    )
     
+    args = parser.parse_args()
+    with profiling('daily', enabled=args.profile):
+        return run(args)
+
+
+def run(args):
+    """按命令行参数执行"""
     # 初始化路径
     posts_dir = Path("posts")
     todo_dir = Path("todo")
@@ -21,14 +21,25 @@ publish_csdn.py
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError
 import pyperclip
 import argparse
+import hashlib
+import json
 import sys
 import time
+import unicodedata
+from datetime import datetime
 from pathlib import Path
 import re  # 导入 re (原始脚本中已在函数内导入，这里统一到顶部)
 import frontmatter # 新增：用于解析 YAML Front Matter
 
 
 EDITOR_URL = "https://editor.csdn.net/md/?not_checkout=1&spm=1000.2115.3001.5352"
+# 博客主页文章列表接口，用于发布前检查是否已经发布过
+ARTICLE_LIST_API = "https://blog.csdn.net/community/home-api/v1/get-business-list"
+
+# 已发布记录：本脚本发布过的文章（标题、正文指纹）和从 CSDN 获取的最近文章标题
+PUBLISHED_FILE = Path('published.json')
+# CSDN 文章标题缓存有效期（秒）
+PUBLISHED_TTL = 3600
 
 
 def read_markdown(path: Path) -> str:
@@ -36,6 +47,76 @@ def read_markdown(path: Path) -> str:
         raise FileNotFoundError(f"Markdown file not found: {path}")
     return path.read_text(encoding="utf-8")
 
+def normalize_title(title: str) -> str:
+    """规范化标题用于比较：全角转半角、忽略大小写，去掉空白和标点"""
+    title = unicodedata.normalize('NFKC', title or '').casefold()
+    return re.sub(r'[\W_]+', '', title)
+
+
+def content_hash(text: str) -> str:
+    """正文指纹（忽略空白差异）"""
+    return hashlib.sha256(re.sub(r'\s+', ' ', text or '').strip().encode('utf-8')).hexdigest()
+
+
+def load_published() -> dict:
+    if PUBLISHED_FILE.exists():
+        try:
+            return json.loads(PUBLISHED_FILE.read_text(encoding='utf-8'))
+        except Exception as e:
+            print(f"读取 {PUBLISHED_FILE} 失败: {e}")
+    return {'articles': [], 'remote': {'fetched_at': 0, 'titles': []}}
+
+
+def save_published(published: dict):
+    PUBLISHED_FILE.write_text(json.dumps(published, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def fetch_published_titles(p, storage_file: Path) -> list:
+    """使用 storage.json 中的登录 Cookie 直接请求文章列表接口（不启动浏览器）"""
+    state = json.loads(storage_file.read_text(encoding='utf-8'))
+    username = next((c['value'] for c in state.get('cookies', []) if c.get('name') == 'UserName'), None)
+    if not username:
+        raise ValueError("storage.json 中没有 UserName Cookie")
+    request = p.request.new_context(storage_state=str(storage_file))
+    try:
+        response = request.get(ARTICLE_LIST_API, params={
+            'page': 1, 'size': 50, 'businessType': 'blog', 'username': username,
+        }, timeout=10000)
+        if not response.ok:
+            raise RuntimeError(f"HTTP {response.status}")
+        return [item['title'] for item in (response.json().get('data') or {}).get('list') or []]
+    finally:
+        request.dispose()
+
+
+def refresh_published_titles(p, published: dict, storage_file: Path):
+    """CSDN 文章标题缓存过期时重新获取；失败时继续使用旧数据和本地记录"""
+    remote = published.setdefault('remote', {'fetched_at': 0, 'titles': []})
+    if not storage_file.exists() or time.time() - remote.get('fetched_at', 0) <= PUBLISHED_TTL:
+        return
+    try:
+        remote['titles'] = fetch_published_titles(p, storage_file)
+        remote['fetched_at'] = time.time()
+        save_published(published)
+        print(f"已获取 CSDN 最近发布的 {len(remote['titles'])} 篇文章标题")
+    except Exception as e:
+        print(f"获取 CSDN 已发布文章列表失败，仅使用本地记录: {e}")
+
+
+def find_duplicate(published: dict, title: str, digest: str):
+    """返回判定为重复的原因，未发布过时返回 None"""
+    key = normalize_title(title)
+    for article in published.get('articles', []):
+        if article.get('hash') == digest:
+            return f"正文与 {article['published_at']} 发布的《{article['title']}》相同"
+    for article in published.get('articles', []):
+        if key and article.get('title_key') == key:
+            return f"标题已于 {article['published_at']} 发布过"
+    if key and key in {normalize_title(t) for t in published.get('remote', {}).get('titles', [])}:
+        return "CSDN 上已有同名文章"
+    return None
+
+
 def fill_title(page, title: str) -> bool:
     """尝试多个可能的标题选择器，返回是否成功填充"""
     title_selectors = [
@@ -519,6 +600,8 @@ def main():
     parser.add_argument("--headless", default="false", choices=["true", "false"], help="是否无头模式，默认 false（显示浏览器以便登录）")
     parser.add_argument("--login-timeout", type=int, default=120, help="等待登录时间（秒），默认 120 秒")
     parser.add_argument("--skip-publish", action='store_true', help="只填充标题与正文但不触发发布（调试用）")
+    parser.add_argument("--force", action='store_true', help="跳过重复发布检查，已发布过的文章也重新发布")
+    parser.add_argument("--min-interval", type=int, default=30, help="两次发布之间的最短间隔（秒），默认 30 秒；填充下一篇的时间也计入间隔")
     # 移除了 --title 和 --file 参数，因为脚本现在是处理 'posts' 目录
     args = parser.parse_args()
 
@@ -538,6 +621,30 @@ def main():
     storage_file = Path('storage.json')
 
     with sync_playwright() as p:
+        # 启动浏览器之前先排除已经发布过的文章（本地记录 + CSDN 文章列表）
+        published = load_published()
+        fingerprints = {}
+        pending = []
+        for fp in files_to_process:
+            try:
+                digest = content_hash(frontmatter.loads(read_markdown(fp)).content)
+            except Exception as e:
+                print(f"读取 {fp} 失败: {e}, 跳过")
+                continue
+            fingerprints[fp] = digest
+            pending.append(fp)
+        if not args.force:
+            refresh_published_titles(p, published, storage_file)
+            for fp in list(pending):
+                reason = find_duplicate(published, fp.stem, fingerprints[fp])
+                if reason:
+                    print(f"跳过已发布的文章 {fp}: {reason}（使用 --force 重新发布）")
+                    pending.remove(fp)
+        files_to_process = pending
+        if not files_to_process:
+            print("没有需要发布的新文章，退出")
+            return
+
         browser = p.chromium.launch(headless=headless)
 
         # 如果 storage 存在则加载以复用登录状态
@@ -567,6 +674,9 @@ def main():
             except PlaywrightTimeoutError:
                 print("等待编辑器元素超时，尝试继续（可能需要你手动登录或手动打开编辑器）")
         
+        # 上一次触发发布的时间，用于控制发布间隔
+        last_publish_at = None
+
         # 循环处理 files_to_process
         for idx, fp in enumerate(files_to_process, start=1):
             print(f"\n===== 处理 {idx}/{len(files_to_process)}: {fp} =====")
@@ -606,17 +716,37 @@ def main():
                 print("--skip-publish 启用，已填充但未触发发布。")
                 continue
 
+            # 距离上次发布不足最短间隔时只等待剩余时间，避免触发平台防护
+            # （打开编辑器、填充正文的时间已经计入间隔，不再每篇固定等待 30 秒）
+            if last_publish_at is not None:
+                remaining = args.min_interval - (time.monotonic() - last_publish_at)
+                if remaining > 0:
+                    print(f"距离上次发布不足 {args.min_interval} 秒，等待 {remaining:.0f} 秒...")
+                    time.sleep(remaining)
+
             # 6. 点击发布 (传入最终的 use_tags)
             use_tags = ["人工智能"]
             published = click_publish_buttons(page, tags=use_tags)
+            last_publish_at = time.monotonic()
             if published:
+                # 等待发布请求完成再跳转到下一篇（代替原来的固定等待）
+                try:
+                    page.wait_for_load_state('networkidle', timeout=15000)
+                except PlaywrightTimeoutError:
+                    pass
                 print(f"已触发发布请求: {fp}")
+                published.setdefault('articles', []).append({
+                    'title': use_title,
+                    'title_key': normalize_title(use_title),
+                    'hash': fingerprints[fp],
+                    'file': str(fp),
+                    'published_at': datetime.now().isoformat(timespec='seconds'),
+                })
+                published.setdefault('remote', {}).setdefault('titles', []).insert(0, use_title)
+                save_published(published)
             else:
                 print(f"{fp} 的发布步骤未完全成功，请手动检查页面。")
 
-            # 每次发布后给短暂等待，避免触发平台防护，得至少 30 秒
-            time.sleep(30)
-
     # with sync_playwright 上下文退出时 Playwright 会负责清理，
     # 避免在 with 之外再次调用 browser.close() 导致 "Event loop is closed" 错误。
 
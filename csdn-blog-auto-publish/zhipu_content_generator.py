@@ -10,7 +10,6 @@ import json
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
-from zhipuai import ZhipuAI
 
 
 class ZhipuContentGenerator:
@@ -27,6 +26,7 @@ class ZhipuContentGenerator:
         if not self.api_key:
             raise ValueError("请提供智谱AI API Key，或设置环境变量 ZHIPUAI_API_KEY")
         
+        from zhipuai import ZhipuAI  # 导入较慢，创建客户端时才导入
         self.client = ZhipuAI(api_key=self.api_key)
         
     def generate_titles(self, keyword: Optional[str] = None, count: int = 10) -> List[str]:
@@ -10,7 +10,6 @@ import json
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional
-from zhipuai import ZhipuAI
 
 
 class ZhipuNewsSearcher:
@@ -46,6 +45,7 @@ class ZhipuNewsSearcher:
         if not self.api_key:
             raise ValueError("请提供智谱AI API Key，或设置环境变量 ZHIPUAI_API_KEY")
         
+        from zhipuai import ZhipuAI  # 导入较慢，创建客户端时才导入
         self.client = ZhipuAI(api_key=self.api_key)
     
     def search_tech_news(
@@ -11,6 +11,7 @@ import sys
 import json
 import time
 import argparse
+import importlib
 import yaml
 from pathlib import Path
 from datetime import datetime
@@ -19,19 +20,21 @@ from typing import List, Dict, Optional
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from generate.qbitai_crawler import QbitAICrawler
-from generate.aibase_crawler import AIBaseCrawler
-from generate.reference_searcher import ReferenceSearcher
-from generate.enhanced_content_generator import EnhancedContentGenerator
+from src.core.metrics import export_metrics, get_metrics, instrument_llm_client
+from src.core.profiler import profiling
+
+CRAWL_SECONDS = get_metrics().histogram('crawl_seconds', '新闻抓取耗时（秒）', ('source',))
+CRAWL_ITEMS = get_metrics().counter('crawl_items_total', '抓取到的新闻数', ('source',))
+GENERATED_TOTAL = get_metrics().counter('generated_articles_total', '文章生成数', ('result',))
 
 
 class AutoContentPipeline:
     """自动化内容生成流水线"""
     
-    # 新闻源映射
+    # 新闻源映射（爬虫依赖 requests / BeautifulSoup，创建时才导入）
     CRAWLER_MAP = {
-        'qbitai': QbitAICrawler,
-        'aibase': AIBaseCrawler
+        'qbitai': 'generate.qbitai_crawler:QbitAICrawler',
+        'aibase': 'generate.aibase_crawler:AIBaseCrawler'
     }
     
     def __init__(
@@ -67,10 +70,16 @@ class AutoContentPipeline:
         # 初始化爬虫列表
         self.crawlers = self._init_crawlers()
         
-        # 初始化其他组件
+        # 初始化其他组件（依赖智谱AI SDK，用到时才导入）
+        from generate.reference_searcher import ReferenceSearcher
+        from generate.enhanced_content_generator import EnhancedContentGenerator
         self.searcher = ReferenceSearcher(api_key=self.api_key)
         self.generator = EnhancedContentGenerator(api_key=self.api_key)
         
+        # 记录大模型调用的耗时和 token 用量
+        instrument_llm_client(self.searcher.client, 'searcher')
+        instrument_llm_client(self.generator.client, 'generator')
+        
         # 统计信息
         self.stats = {
             'crawled_news': 0,
@@ -130,8 +139,10 @@ class AutoContentPipeline:
         """
         crawlers = []
         for source in self.news_sources:
-            crawler_class = self.CRAWLER_MAP.get(source)
-            if crawler_class:
+            crawler_path = self.CRAWLER_MAP.get(source)
+            if crawler_path:
+                module_name, class_name = crawler_path.split(':')
+                crawler_class = getattr(importlib.import_module(module_name), class_name)
                 crawlers.append({
                     'name': source,
                     'instance': crawler_class()
@@ -183,7 +194,9 @@ class AutoContentPipeline:
                 crawler = crawler_info['instance']
                 
                 print(f"\n📰 正在抓取 {source_name.upper()} 新闻源...")
-                news_list = crawler.fetch_top_news(limit=news_limit)
+                with CRAWL_SECONDS.time(source=source_name):
+                    news_list = crawler.fetch_top_news(limit=news_limit)
+                CRAWL_ITEMS.inc(len(news_list), source=source_name)
                 
                 # 为每条新闻添加来源标记
                 for news in news_list:
@@ -257,6 +270,7 @@ class AutoContentPipeline:
                     if 'error' in references:
                         print(f"⚠️ 跳过（搜索失败）: {news['title'][:50]}...")
                         self.stats['failed_articles'] += 1
+                        GENERATED_TOTAL.inc(result='skipped')
                         continue
                     
                     article = self.generator.generate_article_from_news(
@@ -274,6 +288,7 @@ class AutoContentPipeline:
                     })
                     
                     self.stats['generated_articles'] += 1
+                    GENERATED_TOTAL.inc(result='succeeded')
                     
                     # API请求限流
                     if idx < len(selected_news):
@@ -283,6 +298,7 @@ class AutoContentPipeline:
                 except Exception as e:
                     print(f"❌ 文章生成失败: {e}")
                     self.stats['failed_articles'] += 1
+                    GENERATED_TOTAL.inc(result='failed')
             
             if save_intermediate:
                 self._save_json(generated_articles, "03_generated_articles.json")
@@ -383,6 +399,12 @@ class AutoContentPipeline:
         else:
             report += "   （无）\n"
         
+        # 抓取、大模型调用的耗时和 token 用量
+        metrics_summary = get_metrics().summary()
+        if metrics_summary:
+            report += "\n📉 运行指标\n"
+            report += ''.join(f"   {line}\n" for line in metrics_summary.splitlines())
+        
         report += f"""
 {'='*80}
 ✅ 报告生成完成
@@ -448,8 +470,19 @@ def main():
         help='新闻源，逗号分隔（如: aibase,qbitai）。不指定则从配置文件读取'
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='性能剖析：对本次运行采样，结果写到 data/profiles/（也可设置环境变量 POSTS_COPILOT_PROFILE=1）'
+    )
     
+    args = parser.parse_args()
+    with profiling('generate', enabled=args.profile):
+        run(args)
+
+
+def run(args):
+    """按命令行参数运行流水线"""
     try:
         # 创建流水线
         pipeline = AutoContentPipeline(
@@ -476,6 +509,9 @@ def main():
         print(f"输出目录: {args.output_dir}")
         print("="*80 + "\n")
         
+        # 累加到 data/metrics/ 下的状态文件和 Prometheus 文本文件
+        export_metrics()
+        
     except Exception as e:
         print(f"\n❌ 执行失败: {e}")
         import traceback
@@ -11,7 +11,6 @@ import re
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Dict, Any
-from zhipuai import ZhipuAI
 
 
 class EnhancedContentGenerator:
@@ -69,6 +68,7 @@ class EnhancedContentGenerator:
         if not self.api_key:
             raise ValueError("请提供智谱AI API Key，或设置环境变量 ZHIPUAI_API_KEY")
         
+        from zhipuai import ZhipuAI  # 导入较慢，创建客户端时才导入
         self.client = ZhipuAI(api_key=self.api_key)
     
     def generate_article_from_news(
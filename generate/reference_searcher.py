@@ -11,7 +11,6 @@ import json
 import time
 from typing import List, Dict, Optional
 from datetime import datetime
-from zhipuai import ZhipuAI
 
 
 class ReferenceSearcher:
@@ -28,6 +27,7 @@ class ReferenceSearcher:
         if not self.api_key:
             raise ValueError("请提供智谱AI API Key，或设置环境变量 ZHIPUAI_API_KEY")
         
+        from zhipuai import ZhipuAI  # 导入较慢，创建客户端时才导入
         self.client = ZhipuAI(api_key=self.api_key)
     
     def search_topic_references(
@@ -7,8 +7,6 @@
 import os
 import json
 import yaml
-import httpx
-import openai
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -18,6 +16,10 @@ class FormulaChatClient:
     """Formula API 客户端（支持联网搜索）"""
     
     def __init__(self, base_url: str, api_key: str):
+        # openai / httpx 导入较慢，创建客户端时才导入
+        import httpx
+        import openai
+
         self.base_url = base_url
         self.api_key = api_key
         self.openai = openai.Client(base_url=base_url, api_key=api_key)
@@ -10,6 +10,10 @@ import argparse
 from pathlib import Path
 from typing import Optional
 
+# 项目根目录（性能剖析模块）
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.profiler import profiling
 from topic_explorer import TopicExplorer
 from curriculum_generator import CurriculumGenerator
 from article_generator import ArticleGenerator
@@ -33,9 +37,17 @@ class ContentGenerationPipeline:
         print("📦 初始化模块...")
         self.topic_explorer = TopicExplorer(config_path)
         self.curriculum_generator = CurriculumGenerator(config_path)
-        self.article_generator = ArticleGenerator(config_path)
+        # 文章生成器初始化时要联网加载搜索工具，生成文章时才创建（列出主题、查看大纲不需要）
+        self.config_path = config_path
+        self._article_generator = None
         print("✓ 所有模块已就绪\n")
     
+    @property
+    def article_generator(self) -> ArticleGenerator:
+        if self._article_generator is None:
+            self._article_generator = ArticleGenerator(self.config_path)
+        return self._article_generator
+    
     def _check_environment(self):
         """检查环境配置"""
         api_key = os.getenv("MOONSHOT_API_KEY")
@@ -253,7 +265,8 @@ class ContentGenerationPipeline:
     
     def close(self):
         """关闭所有客户端"""
-        self.article_generator.close()
+        if self._article_generator is not None:
+            self._article_generator.close()
 
 
 def main():
@@ -318,9 +331,16 @@ def main():
                        help='跳过大纲生成（已生成过）')
     parser.add_argument('--config', type=str, metavar='PATH',
                        help='配置文件路径')
+    parser.add_argument('--profile', action='store_true',
+                       help='性能剖析：对本次运行采样，结果写到 data/profiles/（也可设置环境变量 POSTS_COPILOT_PROFILE=1）')
     
     args = parser.parse_args()
-    
+    with profiling('kimi', enabled=args.profile):
+        run(args)
+
+
+def run(args):
+    """按命令行参数执行"""
     try:
         pipeline = ContentGenerationPipeline(config_path=args.config)
         
@@ -7,7 +7,6 @@ Topic 探索器模块
 import os
 import json
 import yaml
-import openai
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -27,7 +26,8 @@ class TopicExplorer:
         if not api_key:
             raise ValueError("MOONSHOT_API_KEY 环境变量未设置")
         
-        self.client = openai.Client(base_url=base_url, api_key=api_key)
+        self._client_args = {'base_url': base_url, 'api_key': api_key}
+        self._client = None
         self.model = self.config['article_generation']['model']
         
         # 加载现有主题库
@@ -35,6 +35,14 @@ class TopicExplorer:
         self.topics_db_path.parent.mkdir(parents=True, exist_ok=True)
         self.topics_db = self._load_topics_db()
     
+    @property
+    def client(self):
+        """OpenAI 兼容客户端（openai 导入较慢，第一次调用接口时才创建）"""
+        if self._client is None:
+            import openai
+            self._client = openai.Client(**self._client_args)
+        return self._client
+    
     def _load_config(self, config_path: Optional[str] = None):
         """加载配置文件"""
         if config_path is None:
@@ -12,7 +12,11 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
+# 项目根目录（性能剖析模块）
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 # 导入各模块
+from src.core.profiler import profiling
 from topic_explorer import TopicExplorer
 from curriculum_generator import CurriculumGenerator
 from article_generator import ArticleGenerator
@@ -285,9 +289,16 @@ def main():
     parser.add_argument('--status', action='store_true', help='显示系统状态')
     parser.add_argument('-c', '--config', type=str, help='配置文件路径')
     parser.add_argument('-q', '--quiet', action='store_true', help='静默模式')
+    parser.add_argument('--profile', action='store_true',
+                        help='性能剖析：对本次运行采样，结果写到 data/profiles/（也可设置环境变量 POSTS_COPILOT_PROFILE=1）')
     
     args = parser.parse_args()
-    
+    with profiling('tutorial', enabled=args.profile):
+        run(args)
+
+
+def run(args):
+    """按命令行参数执行"""
     try:
         # 创建系统实例
         system = TutorialAutoGenerator(config_path=args.config)
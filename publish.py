@@ -3,20 +3,33 @@
 支持交互式发布文章到各个平台
 """
 
+import argparse
 import os
 import sys
 import traceback
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # 添加项目根目录到 Python 路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.core.logger import setup_logger, get_logger
-from src.core.session_manager import SessionManager
-from src.utils.file_utils import list_files, write_to_file, read_head
+from src.core.metrics import export_metrics, print_summary, start_http_server
+from src.core.profiler import profiling
+from src.core.scheduler import PublishScheduler, RateLimiter
+from src.publisher.article_index import ArticleIndex, parse_query
+from src.publisher.capabilities import check_article, log_report
+from src.publisher.drafts import DraftStore, STATUS_FAILED, STATUS_PUBLISHED
+from src.publisher.duplicates import DuplicateChecker
+from src.service.client import ServiceClient, print_event, print_jobs
+from src.utils.file_utils import write_to_file, read_head
 from src.utils.yaml_file_utils import read_common
 
+# Selenium、发布服务、目录监听在用到时才导入，--help、提交到发布服务等不连接浏览器的用法启动更快
+if TYPE_CHECKING:
+    from src.core.session_manager import SessionManager
+
 # 初始化日志
 logger = setup_logger('publish_script')
 
@@ -78,7 +91,7 @@ def get_publisher(platform: str):
         return None
 
 
-def publish_to_platform(platform: str, article_path: str, session_manager: SessionManager) -> bool:
+def publish_to_platform(platform: str, article_path: str, session_manager: 'SessionManager', job=None) -> bool:
     """
     发布到指定平台
     
@@ -86,6 +99,7 @@ def publish_to_platform(platform: str, article_path: str, session_manager: Sessi
         platform: 平台名称
         article_path: 文章路径
         session_manager: 会话管理器
+        job: 调度任务（发布成功时在其中记录文章链接）
     
     Returns:
         bool: 是否成功
@@ -105,13 +119,30 @@ def publish_to_platform(platform: str, article_path: str, session_manager: Sessi
         # 设置驱动（复用会话管理器）
         publisher.session_manager = session_manager
         publisher.driver = session_manager.driver
+        # 调度执行时需要登录不阻塞整个批次，任务暂放到登录完成
+        publisher.defer_login = job is not None and (publisher.common_config.get('login_queue') or {}).get('enabled', True)
+        
+        # 执行发布（失败时在同一编辑器标签页中从失败的步骤重试）
+        attempts = publisher.common_config.get('publish_attempts', 2)
+        success = publisher.publish_with_resume(article_path, attempts=attempts)
         
-        # 执行发布
-        success = publisher.publish(article_path)
+        if not success and publisher.login_required:
+            logger.warning(f"⚠ {platform.upper()} 需要登录，先发布其他平台，登录后自动继续")
+            job.wait_for = publisher.login_probe()
+            return False
         
         if success:
-            logger.info(f"✓ {platform.upper()} 发布成功！")
+            url = publisher.publish_result.get('url', '')
+            logger.info(f"✓ {platform.upper()} 发布成功！{url}")
             save_last_published_file(os.path.basename(article_path))
+            if job is not None:
+                job.url = url
+            # 停在编辑器等待人工发布（未开启自动发布）时不写入发布记录，人工发布前仍可重新发布
+            checker = get_duplicate_checker()
+            if checker and publisher.publish_result.get('confirmed'):
+                checker.record(platform, article_path, url=url)
+            elif checker:
+                logger.info(f"⚠ {platform.upper()} 尚未确认最终发布，不写入发布记录")
         else:
             logger.error(f"✗ {platform.upper()} 发布失败")
         
@@ -123,35 +154,356 @@ def publish_to_platform(platform: str, article_path: str, session_manager: Sessi
         return False
 
 
-def publish_to_all_platforms(article_path: str, session_manager: SessionManager):
+_rate_limiter = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """获取全局限流器（配置来自 common.yaml 的 rate_limits）"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(read_common().get('rate_limits'))
+    return _rate_limiter
+
+
+_duplicate_checker = None
+
+
+def new_scheduler() -> PublishScheduler:
+    """创建发布调度器（限流来自 rate_limits，暂放任务的等待来自 login_queue）"""
+    config = read_common().get('login_queue') or {}
+    return PublishScheduler(get_rate_limiter(), park_timeout=config.get('timeout', 1800),
+                            park_poll=config.get('poll', 10))
+
+
+def get_duplicate_checker():
+    """获取全局重复发布检测器（common.yaml 中 duplicate_check.enabled 为 false 时返回 None）"""
+    global _duplicate_checker
+    config = read_common().get('duplicate_check') or {}
+    if not config.get('enabled', True):
+        return None
+    if _duplicate_checker is None:
+        _duplicate_checker = DuplicateChecker(ttl=config.get('ttl', 3600))
+    return _duplicate_checker
+
+
+def preflight(platform: str, article_path: str) -> bool:
     """
-    发布到所有已启用的平台
+    发布前按平台能力矩阵离线检查文章（common.yaml 中 preflight.enabled 为 false 时跳过）
     
     Args:
+        platform: 平台名称
         article_path: 文章路径
+    
+    Returns:
+        bool: 是否通过（可自动修正的问题不影响通过）
+    """
+    common_config = read_common()
+    config = common_config.get('preflight') or {}
+    if not config.get('enabled', True):
+        return True
+    try:
+        report = check_article(platform, article_path, defaults=common_config,
+                               auto_fix=config.get('auto_fix', True))
+    except Exception as e:
+        logger.warning(f"⚠ {platform.upper()} 预检 {os.path.basename(article_path)} 时出错，跳过预检：{e}")
+        return True
+    log_report(report)
+    return report.ok
+
+
+def get_enabled_platforms() -> list:
+    """获取已启用的平台列表"""
+    enabled_platforms = read_common().get('enable', {})
+    return [platform for platform in ALL_PLATFORMS if enabled_platforms.get(platform, False)]
+
+
+def publish_batch(article_paths: list, platforms: list, session_manager: 'SessionManager', force: bool = False):
+    """
+    批量发布：按平台限流调度，某个平台冷却时先发布其他平台或其他文章
+    
+    已经在平台上发布过的文章（见 DuplicateChecker）在调度前跳过，
+    预检未通过的任务（见 capabilities.check_article）在调度前拒绝。
+    
+    Args:
+        article_paths: 文章路径列表
+        platforms: 平台列表
+        session_manager: 会话管理器
+        force: 是否跳过重复发布检测
+    
+    Returns:
+        list: 有平台发布失败或因每日上限跳过的文章路径（监听模式稍后重试）
+    """
+    checker = None if force else get_duplicate_checker()
+    scheduler = new_scheduler()
+    duplicates, rejected = [], []
+    for article_path in article_paths:
+        for platform in platforms:
+            reason = checker.check(platform, article_path) if checker else None
+            if reason:
+                logger.warning(f"⚠ {platform.upper()} 已发布过 {os.path.basename(article_path)}，跳过：{reason}")
+                duplicates.append((platform, article_path))
+                continue
+            if not preflight(platform, article_path):
+                rejected.append((platform, article_path))
+                continue
+            scheduler.add(platform, article_path)
+    if duplicates:
+        logger.info("如需重新发布，请使用 --force 参数")
+    
+    summary = scheduler.run(lambda job: publish_to_platform(job.platform, job.article_path, session_manager, job))
+    
+    logger.info(f"\n{'='*60}")
+    logger.info(f"发布完成！成功：{len(summary['succeeded'])}，失败：{len(summary['failed'])}，"
+                f"跳过（达到每日上限）：{len(summary['skipped'])}，跳过（已发布）：{len(duplicates)}，"
+                f"拒绝（预检未通过）：{len(rejected)}")
+    for job in summary['succeeded']:
+        logger.info(f"  {job.platform.upper()} {os.path.basename(job.article_path)}：{job.url or '（未获取到链接）'}")
+    logger.info(f"{'='*60}\n")
+    
+    unfinished = {job.article_path for job in summary['failed'] + summary['skipped']}
+    return [path for path in article_paths if path in unfinished]
+
+
+def watch_articles(platforms: list, session_manager: 'SessionManager', force: bool = False):
+    """
+    监听模式：文章目录和生成器输出目录中新增或修改的文章写入完成后，自动按批量模式发布
+    
+    目录、防抖时间等见 common.yaml 的 watch 段（相对目录按 publish.py 所在目录解析）；
+    已发布过的文章仍由重复发布检测跳过，发布失败的文章稍后重试。
+    
+    Args:
+        platforms: 平台列表
         session_manager: 会话管理器
+        force: 是否跳过重复发布检测
     """
     common_config = read_common()
-    enabled_platforms = common_config.get('enable', {})
+    config = common_config.get('watch') or {}
+    dirs = [common_config.get('content_dir')]
+    base_dir = Path(__file__).resolve().parent
+    dirs += [str(base_dir / d) for d in config.get('dirs', ['posts', 'kimi/data/articles'])]
+    from src.publisher.watcher import ContentWatcher
+
+    watcher = ContentWatcher(dirs, debounce=config.get('debounce', 5), poll_interval=config.get('poll_interval', 2),
+                             retry_interval=config.get('retry_interval', 300))
+    logger.info(f"监听模式：新文章将发布到 {', '.join(platforms)}，按 Ctrl+C 退出")
+    watcher.run(lambda changes: publish_batch([path for path, _ in changes], platforms, session_manager, force=force))
+
+
+def service_url() -> str:
+    """发布服务地址（common.yaml 的 service 段）"""
+    config = read_common().get('service') or {}
+    return f"http://{config.get('host', '127.0.0.1')}:{config.get('port', 8765)}"
+
+
+def ensure_browser(session_manager: 'SessionManager') -> 'SessionManager':
+    """确认浏览器连接仍然可用，断开时（如 Chrome 重启过）重新连接"""
+    try:
+        session_manager.driver.current_url
+    except Exception as e:
+        logger.warning(f"⚠ 浏览器连接已断开，重新连接：{e}")
+        session_manager.create_driver(use_existing=True)
+    return session_manager
+
+
+def check_job(platform: str, article_path: str, force: bool = False):
+    """
+    发布服务调度前的检查：重复发布检测和预检
+    
+    Returns:
+        str: 拒绝原因，None 表示通过
+    """
+    checker = None if force else get_duplicate_checker()
+    reason = checker.check(platform, article_path) if checker else None
+    if reason:
+        return f"已发布过：{reason}"
+    if not preflight(platform, article_path):
+        return "预检未通过"
+    return None
+
+
+def serve(session_manager: 'SessionManager'):
+    """
+    发布服务模式：保持浏览器连接，通过本地 HTTP 接口接收任务（见 src/service/server.py）
+    
+    Args:
+        session_manager: 会话管理器（已连接 Chrome）
+    """
+    from src.service.server import PublishService
+
+    config = read_common().get('service') or {}
+    service = PublishService(
+        execute=lambda job: publish_to_platform(job.platform, job.article_path, ensure_browser(session_manager), job),
+        check=check_job,
+        scheduler_factory=new_scheduler,
+        default_platforms=get_enabled_platforms,
+    )
+    service.serve(config.get('host', '127.0.0.1'), config.get('port', 8765))
+    logger.info("发布服务运行中，按 Ctrl+C 退出；提交任务：python publish.py --article a.md 或 "
+                "python -m src.service.client submit a.md")
+    service.wait()
+
+
+def submit_to_service(client: ServiceClient, article_paths: list, platforms: list = None, force: bool = False) -> bool:
+    """
+    把批量发布任务提交给运行中的发布服务，并输出进度直到全部结束
+    
+    Returns:
+        bool: 是否全部成功
+    """
+    since = client.events(timeout=0)['next']
+    jobs = client.submit(article_paths, platforms, force)
+    logger.info(f"✓ 已提交到发布服务（{client.url}）：{len(jobs)} 个任务")
+    jobs = client.follow([job['id'] for job in jobs], print_event, since=since)
+    print_jobs(jobs)
+    return all(job['status'] == 'succeeded' for job in jobs)
+
+
+def save_drafts(article_paths: list, platforms: list, session_manager: 'SessionManager', force: bool = False):
+    """
+    两阶段发布第一阶段：在各平台填写标题和正文并保存草稿，记录到 data/drafts.json
     
-    success_count = 0
-    fail_count = 0
+    保存草稿不占用发布频率限额，无需人工值守；审阅后运行 publish_drafts 完成发布。
     
-    for platform in ALL_PLATFORMS:
-        if enabled_platforms.get(platform, False):
-            logger.info(f"\n准备发布到：{platform}")
-            if publish_to_platform(platform, article_path, session_manager):
-                success_count += 1
+    Args:
+        article_paths: 文章路径列表
+        platforms: 平台列表
+        session_manager: 会话管理器
+        force: 是否跳过重复发布检测
+    """
+    checker = None if force else get_duplicate_checker()
+    store = DraftStore()
+    saved, failed = [], []
+    for article_path in article_paths:
+        for platform in platforms:
+            reason = checker.check(platform, article_path) if checker else None
+            if reason:
+                logger.warning(f"⚠ {platform.upper()} 已发布过 {os.path.basename(article_path)}，跳过：{reason}")
+                continue
+            if not preflight(platform, article_path):
+                failed.append((platform, article_path))
+                continue
+            
+            publisher = get_publisher(platform)
+            if not publisher:
+                continue
+            if not publisher.supports_drafts():
+                logger.warning(f"⚠ {platform.upper()} 不支持保存草稿，跳过")
+                continue
+            
+            logger.info(f"\n{'='*60}")
+            logger.info(f"保存草稿：{platform.upper()} {os.path.basename(article_path)}")
+            logger.info(f"{'='*60}\n")
+            publisher.session_manager = session_manager
+            publisher.driver = session_manager.driver
+            publisher.draft_mode = True
+            try:
+                ok = publisher.publish_with_resume(article_path, attempts=publisher.common_config.get('publish_attempts', 2))
+            except Exception as e:
+                logger.error(f"✗ {platform.upper()} 保存草稿时发生错误：{e}", exc_info=True)
+                ok = False
+            
+            if ok and publisher.draft_result:
+                title = publisher.parse_article_metadata(article_path).get('title', '')
+                store.record(platform, article_path, publisher.draft_result['id'], publisher.draft_result['url'],
+                             title=title)
+                saved.append((platform, article_path))
             else:
-                fail_count += 1
-        else:
-            logger.debug(f"平台 {platform} 未启用，跳过")
+                logger.error(f"✗ {platform.upper()} 保存草稿失败")
+                failed.append((platform, article_path))
     
     logger.info(f"\n{'='*60}")
-    logger.info(f"发布完成！成功：{success_count}，失败：{fail_count}")
+    logger.info(f"草稿保存完成！成功：{len(saved)}，失败：{len(failed)}")
+    logger.info("审阅草稿后运行 python publish.py --publish-drafts 发布全部草稿")
     logger.info(f"{'='*60}\n")
 
 
+def publish_draft_to_platform(draft: dict, session_manager: 'SessionManager', job=None) -> bool:
+    """
+    发布一个已保存的草稿
+    
+    Args:
+        draft: DraftStore 中的草稿记录
+        session_manager: 会话管理器
+        job: 调度任务（发布成功时在其中记录文章链接）
+    
+    Returns:
+        bool: 是否成功
+    """
+    platform, article_path = draft['platform'], draft['article']
+    logger.info(f"发布草稿：{platform.upper()} {os.path.basename(article_path)}（草稿ID {draft['draft_id']}）")
+    
+    store = DraftStore()
+    try:
+        publisher = get_publisher(platform)
+        if not publisher:
+            return False
+        publisher.session_manager = session_manager
+        publisher.driver = session_manager.driver
+        success = publisher.publish_draft(draft)
+    except Exception as e:
+        logger.error(f"✗ {platform.upper()} 发布草稿时发生错误：{e}", exc_info=True)
+        store.mark(platform, article_path, STATUS_FAILED, error=str(e))
+        return False
+    
+    if not success:
+        logger.error(f"✗ {platform.upper()} 发布草稿失败")
+        store.mark(platform, article_path, STATUS_FAILED, error=publisher.last_step_error)
+        return False
+    
+    url = publisher.publish_result.get('url', '')
+    logger.info(f"✓ {platform.upper()} 草稿发布成功！{url}")
+    store.mark(platform, article_path, STATUS_PUBLISHED, url=url, error='')
+    if job is not None:
+        job.url = url
+    checker = get_duplicate_checker()
+    if checker:
+        checker.record(platform, article_path, url=url)
+    return True
+
+
+def publish_drafts(session_manager: 'SessionManager', platforms: list = None, article_paths: list = None):
+    """
+    两阶段发布第二阶段：按草稿记录发布所有待发布的草稿（按平台限流调度）
+    
+    Args:
+        session_manager: 会话管理器
+        platforms: 只发布这些平台的草稿，None 表示全部
+        article_paths: 只发布这些文章的草稿，None 表示全部
+    """
+    drafts = DraftStore().pending(platforms=platforms, articles=article_paths)
+    if not drafts:
+        logger.info("没有待发布的草稿")
+        return
+    
+    scheduler = new_scheduler()
+    for draft in drafts:
+        scheduler.add(draft['platform'], draft['article'])
+    by_key = {(draft['platform'], draft['article']): draft for draft in drafts}
+    
+    summary = scheduler.run(
+        lambda job: publish_draft_to_platform(by_key[(job.platform, job.article_path)], session_manager, job)
+    )
+    
+    logger.info(f"\n{'='*60}")
+    logger.info(f"草稿发布完成！成功：{len(summary['succeeded'])}，失败：{len(summary['failed'])}，"
+                f"跳过（达到每日上限）：{len(summary['skipped'])}")
+    for job in summary['succeeded']:
+        logger.info(f"  {job.platform.upper()} {os.path.basename(job.article_path)}：{job.url or '（未获取到链接）'}")
+    logger.info(f"{'='*60}\n")
+
+
+def publish_to_all_platforms(article_path: str, session_manager: 'SessionManager', force: bool = False):
+    """
+    发布到所有已启用的平台
+    
+    Args:
+        article_path: 文章路径
+        session_manager: 会话管理器
+        force: 是否跳过重复发布检测
+    """
+    publish_batch([article_path], get_enabled_platforms(), session_manager, force=force)
+
+
 def save_last_published_file(filename: str):
     """保存最后发布的文件名"""
     LAST_PUBLISHED_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -166,58 +518,96 @@ def get_last_published_file() -> str:
     return "无"
 
 
+_article_index = None
+
+# 选择文章时每页显示的文章数
+ARTICLES_PER_PAGE = 30
+
+
+def get_article_index():
+    """获取文章目录的索引（增量更新后返回；content_dir 不存在时返回 None）"""
+    global _article_index
+    content_dir = read_common().get('content_dir')
+    if not content_dir or not os.path.exists(content_dir):
+        logger.error(f"文章目录不存在：{content_dir}")
+        return None
+    if _article_index is None or _article_index.content_dir != os.path.abspath(content_dir):
+        _article_index = ArticleIndex(content_dir)
+    _article_index.refresh()
+    return _article_index
+
+
+def query_articles(query: str) -> list:
+    """
+    按筛选条件从文章索引中查找文章（语法见 article_index.parse_query）
+    
+    Args:
+        query: 筛选条件，如 "tag:python unpublished platform:csdn"
+    
+    Returns:
+        list: 文章路径（新的在前）
+    """
+    index = get_article_index()
+    if index is None:
+        return []
+    return [entry['path'] for entry in index.query(**parse_query(query))]
+
+
 def select_article() -> str:
     """
     选择要发布的文章
     
+    输入序号选择文章，输入其他内容按标题、标签、日期和发布状态筛选（见 article_index.parse_query），
+    直接回车清除筛选条件。
+    
     Returns:
         str: 文章路径
     """
-    common_config = read_common()
-    content_dir = common_config.get('content_dir')
-    
-    if not content_dir or not os.path.exists(content_dir):
-        logger.error(f"文章目录不存在：{content_dir}")
-        return None
-    
-    file_list = list_files(content_dir, ".md")
-    
-    if not file_list:
-        logger.error(f"目录中没有找到 Markdown 文件：{content_dir}")
+    index = get_article_index()
+    if index is None:
         return None
     
-    print("\n" + "="*60)
-    print("请选择要发布的文章：")
-    print("="*60)
-    
-    for index, file_path in enumerate(file_list):
-        filename = os.path.basename(file_path)
-        # 标记上次发布的文章
-        marker = " 👈 上次发布" if filename == get_last_published_file() else ""
-        print(f"{index}. {filename}{marker}")
-    
-    print("="*60)
-    
-    try:
-        choice = input("\n请输入文章序号：").strip()
-        index = int(choice)
+    query = ''
+    while True:
+        entries = index.query(**parse_query(query))
+        if not entries and not query:
+            logger.error(f"目录中没有找到 Markdown 文件：{index.content_dir}")
+            return None
         
-        if 0 <= index < len(file_list):
-            selected_file = file_list[index]
+        print("\n" + "="*60)
+        print(f"请选择要发布的文章{f'（筛选：{query}）' if query else ''}：")
+        print("="*60)
+        
+        last_published = get_last_published_file()
+        for index_no, entry in enumerate(entries[:ARTICLES_PER_PAGE]):
+            # 标记上次发布的文章和已发布的平台
+            marker = " 👈 上次发布" if entry['name'] == last_published else ""
+            published = f" [已发布：{', '.join(entry['published'])}]" if entry['published'] else ""
+            print(f"{index_no}. {entry['date']}  {entry['title'] or entry['name']}{published}{marker}")
+        if len(entries) > ARTICLES_PER_PAGE:
+            print(f"... 共 {len(entries)} 篇，输入关键字、tag:标签、since:日期、unpublished 等缩小范围")
+        
+        print("="*60)
+        
+        try:
+            choice = input("\n请输入文章序号或筛选条件：").strip()
+        except KeyboardInterrupt:
+            logger.info("\n用户取消操作")
+            return None
+        
+        if not choice.isdigit():
+            query = choice
+            continue
+        
+        index_no = int(choice)
+        if 0 <= index_no < min(len(entries), ARTICLES_PER_PAGE):
+            selected_file = entries[index_no]['path']
             selected_filename = os.path.basename(selected_file)
-            print(f"✓ 已选择：[{index}] {selected_filename}")
-            logger.info(f"已选择文章：[{index}] {selected_filename}")
+            print(f"✓ 已选择：[{index_no}] {selected_filename}")
+            logger.info(f"已选择文章：[{index_no}] {selected_filename}")
             logger.info(f"文章路径：{selected_file}")
             return selected_file
-        else:
-            logger.error("无效的序号")
-            return None
-            
-    except ValueError:
-        logger.error("请输入有效的数字")
-        return None
-    except KeyboardInterrupt:
-        logger.info("\n用户取消操作")
+        logger.error("无效的序号")
         return None
 
 
@@ -301,8 +691,37 @@ def select_platform(current_article: str = None) -> str:
         return 'quit'
 
 
+def parse_args():
+    """解析命令行参数（不带参数时进入交互模式）"""
+    parser = argparse.ArgumentParser(description='博客自动发布工具')
+    parser.add_argument('--article', nargs='+', help='要发布的文章路径，可以指定多篇（批量模式）')
+    parser.add_argument('--query', help='从文章目录中按条件选择文章（批量模式），'
+                                        '如 "tag:python since:2024-01-01 unpublished platform:csdn"')
+    parser.add_argument('--platform', nargs='+', help='发布到的平台，默认为所有已启用的平台')
+    parser.add_argument('--force', action='store_true', help='跳过重复发布检测，已发布过的文章也重新发布')
+    parser.add_argument('--draft', action='store_true', help='两阶段发布第一阶段：只保存草稿（需配合 --article）')
+    parser.add_argument('--publish-drafts', action='store_true',
+                        help='两阶段发布第二阶段：发布 data/drafts.json 中所有待发布的草稿')
+    parser.add_argument('--serve', action='store_true',
+                        help='发布服务模式：保持浏览器连接，通过本地 HTTP 接口接收任务')
+    parser.add_argument('--no-service', action='store_true',
+                        help='批量模式下不使用运行中的发布服务，直接在本进程中发布')
+    parser.add_argument('--watch', action='store_true',
+                        help='监听模式：文章目录中新增或修改的文章自动发布（目录见 common.yaml 的 watch 段）')
+    parser.add_argument('--profile', action='store_true',
+                        help='性能剖析：对本次运行采样，结果写到 data/profiles/（也可设置环境变量 POSTS_COPILOT_PROFILE=1）')
+    return parser.parse_args()
+
+
 def main():
     """主函数"""
+    args = parse_args()
+    with profiling('publish', enabled=args.profile):
+        run(args)
+
+
+def run(args):
+    """按命令行参数执行发布"""
     logger.info("="*60)
     logger.info("博客自动发布工具 v2.0")
     logger.info("="*60)
@@ -311,7 +730,33 @@ def main():
         # 读取配置
         common_config = read_common()
         
+        # 按条件从文章目录中选择文章
+        if args.query:
+            matched = query_articles(args.query)
+            if not matched:
+                logger.error(f"没有符合条件的文章：{args.query}")
+                return
+            logger.info(f"符合条件的文章：{len(matched)} 篇")
+            args.article = list(args.article or []) + matched
+        
+        # 发布服务在运行时，批量发布交给服务执行（不需要再连接 Chrome）
+        if args.article and not (args.serve or args.draft or args.publish_drafts or args.watch or args.no_service):
+            client = ServiceClient(service_url())
+            if client.available():
+                submit_to_service(client, args.article, args.platform, force=args.force)
+                return
+        
+        # 执行发布的进程在运行期间提供 /metrics 接口（metrics.port 为 0 时不启动；
+        # 提交给发布服务的客户端不启动，端口由服务占用）
+        metrics_port = (common_config.get('metrics') or {}).get('port') or 0
+        if metrics_port:
+            try:
+                start_http_server(int(metrics_port))
+            except OSError as e:
+                logger.warning(f"⚠ 指标接口启动失败（端口 {metrics_port} 可能已被其他发布进程占用）：{e}")
+        
         # 创建会话管理器
+        from src.core.session_manager import SessionManager
         session_manager = SessionManager('common', common_config)
         
         try:
@@ -352,6 +797,33 @@ def main():
         
         logger.info("✓ 浏览器驱动初始化完成")
         
+        # 两阶段发布
+        if args.publish_drafts:
+            publish_drafts(session_manager, platforms=args.platform, article_paths=args.article)
+            return
+        if args.draft:
+            if not args.article:
+                logger.error("保存草稿需要通过 --article 指定文章")
+                return
+            save_drafts(args.article, args.platform or get_enabled_platforms(), session_manager, force=args.force)
+            return
+        
+        # 发布服务模式：持续运行，通过 HTTP 接口接收任务
+        if args.serve:
+            serve(session_manager)
+            return
+        
+        # 监听模式：持续运行，新增或修改的文章自动发布
+        if args.watch:
+            platforms = args.platform or (common_config.get('watch') or {}).get('platforms') or get_enabled_platforms()
+            watch_articles(platforms, session_manager, force=args.force)
+            return
+        
+        # 批量模式：按平台限流调度后退出
+        if args.article:
+            publish_batch(args.article, args.platform or get_enabled_platforms(), session_manager, force=args.force)
+            return
+        
         # 主循环
         should_exit = False
         current_article_path = None  # 记录当前选择的文章
@@ -382,12 +854,12 @@ def main():
                 elif platform == 'all':
                     # 发布到所有平台
                     logger.info(f"准备将文章发布到所有平台：{os.path.basename(current_article_path)}")
-                    publish_to_all_platforms(current_article_path, session_manager)
+                    publish_to_all_platforms(current_article_path, session_manager, force=args.force)
                     # 发布完成后继续循环，可以选择继续发布或退出
                 else:
                     # 发布到指定平台
                     logger.info(f"准备将文章发布到 {platform.upper()}：{os.path.basename(current_article_path)}")
-                    publish_to_platform(platform, current_article_path, session_manager)
+                    publish_batch([current_article_path], [platform], session_manager, force=args.force)
                     # 发布完成后继续循环，可以选择继续发布或退出
         
     except KeyboardInterrupt:
@@ -398,6 +870,9 @@ def main():
         # 清理资源
         if 'session_manager' in locals():
             session_manager.close()
+        # 打印本次运行的指标，并累加到 data/metrics/ 下的状态文件和 Prometheus 文本文件
+        print_summary()
+        export_metrics()
         logger.info("程序退出")
 
 
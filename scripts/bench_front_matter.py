@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Front matter 解析基准测试
+
+生成合成文章目录（默认 1 万篇，包含 CRLF、BOM、正文分隔线、无 front matter 等情况），
+比较原来的解析方式（元数据和正文各读一次文件、两个不同的正则）与 src/utils/front_matter.py：
+
+    python scripts/bench_front_matter.py
+    python scripts/bench_front_matter.py --posts 2000 --dir /tmp/corpus --keep
+"""
+
+import argparse
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import front_matter
+from src.utils.front_matter import read_article
+
+# 一次发布中读取同一篇文章的次数：重复检测、预检、发布器解析元数据、读取正文
+READS_PER_PUBLISH = 4
+
+_PARAGRAPH = "这是一段用于基准测试的正文，包含 **加粗**、`代码` 和 [链接](https://example.com)。\n"
+
+
+def make_post(i: int, rng: random.Random) -> str:
+    """生成一篇合成文章"""
+    body = ''.join(
+        f"## 第 {n} 节\n\n" + _PARAGRAPH * rng.randint(2, 8) + ("\n---\n\n" if rng.random() < 0.3 else "\n")
+        for n in range(rng.randint(3, 12))
+    )
+    kind = i % 10
+    if kind == 0:
+        # 没有 front matter，正文中有分隔线
+        return "# 无元数据的文章\n\n---\n\n" + body
+    header = (f"title: 合成文章 {i}\n"
+              f"date: 2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}\n"
+              f"tags: [Python, 标签{i % 50}, 自动化]\n"
+              f"description: 第 {i} 篇合成文章的摘要\n")
+    text = f"---\n{header}---\n\n{body}"
+    if kind == 1:
+        text = text.replace('\n', '\r\n')
+    elif kind == 2:
+        text = '\ufeff' + text
+    return text
+
+
+def build_corpus(directory: Path, posts: int, seed: int = 42):
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(posts):
+        (directory / f"post_{i:05d}.md").write_text(make_post(i, rng), encoding='utf-8', newline='')
+
+
+def legacy_read(path: str):
+    """原来的方式：parse_front_matter 与 read_file 各读一次文件"""
+    with open(path, 'r', encoding='UTF-8') as f:
+        content = f.read().replace("<!-- truncate -->", "")
+    match = re.compile(r'^---\n(.+?)\n---', re.DOTALL).search(content)
+    metadata = yaml.safe_load(match.group(1)) if match else []
+
+    with open(path, 'r', encoding='UTF-8') as f:
+        content = f.read()
+    body = re.sub(r'^---[\s\S]*?---', '', content, flags=re.MULTILINE).replace("<!-- truncate -->", "")
+    return metadata, body
+
+
+def run(label: str, func, paths, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        for _ in range(repeat):
+            func(path)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.2f}s  {elapsed / len(paths) * 1e6:8.1f}µs/篇")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Front matter 解析基准测试')
+    parser.add_argument('--posts', type=int, default=10000, help='合成文章数')
+    parser.add_argument('--dir', help='合成文章目录，默认使用临时目录')
+    parser.add_argument('--keep', action='store_true', help='保留合成文章目录')
+    args = parser.parse_args()
+
+    directory = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix='fm_corpus_'))
+    try:
+        build_corpus(directory, args.posts)
+        paths = sorted(str(path) for path in directory.glob('*.md'))
+        print(f"合成文章：{len(paths)} 篇（{directory}）")
+
+        mismatched = 0
+        for path in paths:
+            legacy_metadata, legacy_body = legacy_read(path)
+            front_matter._cache.clear()
+            metadata, body = read_article(path)
+            if (legacy_metadata or {}) != metadata or legacy_body.replace('\r\n', '\n').strip() != body.strip():
+                mismatched += 1
+        print(f"与原来的解析结果不同：{mismatched} 篇（CRLF、BOM、正文分隔线等边界情况，忽略首尾空白）")
+
+        print("\n单次读取：")
+        legacy = run('原来的方式', legacy_read, paths)
+        front_matter._cache.clear()
+        new = run('front_matter.read_article', read_article, paths)
+        print(f"  提速 {legacy / new:.1f}x")
+
+        print(f"\n一次发布读取 {READS_PER_PUBLISH} 次：")
+        legacy = run('原来的方式', legacy_read, paths, repeat=READS_PER_PUBLISH)
+        front_matter._cache.clear()
+        new = run('front_matter.read_article', read_article, paths, repeat=READS_PER_PUBLISH)
+        print(f"  提速 {legacy / new:.1f}x")
+    finally:
+        if not args.keep and not args.dir:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
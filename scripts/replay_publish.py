@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+发布流程录制 / 回放工具
+
+录制（连接调试模式的 Chrome，在真实站点上执行一次发布）：
+    python scripts/replay_publish.py --record --platform csdn --article posts/demo.md
+
+回放（本地服务器 + 无头 Chrome，离线运行并与耗时基线比较）：
+    python scripts/replay_publish.py --platform csdn --article posts/demo.md
+    python scripts/replay_publish.py --platform csdn --article posts/demo.md --update-baseline
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from publish import get_publisher
+from src.core.logger import setup_logger
+from src.replay import FlowRecorder, compare_timings, load_baseline, run_replay, save_baseline
+from src.utils.yaml_file_utils import read_common
+
+logger = setup_logger('replay_publish')
+
+# 录制数据默认目录
+FIXTURES_DIR = project_root / 'tests' / 'fixtures' / 'replay'
+
+
+def record(platform: str, article_path: str, fixture_dir: Path) -> bool:
+    """在真实站点上执行发布并录制"""
+    publisher = get_publisher(platform)
+    if not publisher:
+        return False
+
+    # 录制依赖性能日志（network_log 默认关闭）
+    publisher.session_manager.config = dict(publisher.session_manager.config, network_log=True)
+    publisher.setup_driver(use_existing=True)
+    recorder = FlowRecorder(publisher.driver, fixture_dir)
+    publisher.step_hooks.append(recorder)
+
+    success = publisher.publish(article_path)
+    recorder.save(publisher.site_url, platform)
+    save_baseline(fixture_dir, publisher.step_timings)
+    return success
+
+
+def replay(platform: str, article_path: str, fixture_dir: Path,
+           update_baseline: bool = False, tolerance: float = 0.5) -> bool:
+    """离线回放并与基线比较"""
+    publisher = get_publisher(platform)
+    if not publisher:
+        return False
+
+    timings = run_replay(publisher, fixture_dir, article_path, read_common())
+    for timing in timings:
+        logger.info(f"  {timing['step']:<28} {timing['seconds']:>7.2f}秒  {'✓' if timing['ok'] else '✗'}")
+
+    if update_baseline:
+        save_baseline(fixture_dir, timings)
+        return True
+
+    problems = compare_timings(timings, load_baseline(fixture_dir), tolerance=tolerance)
+    for problem in problems:
+        logger.error(f"✗ {problem}")
+    if not problems:
+        logger.info("✓ 回放通过，步骤耗时在基线范围内")
+    return not problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='发布流程录制 / 回放工具')
+    parser.add_argument('--platform', required=True, help='平台名称，如 csdn、juejin')
+    parser.add_argument('--article', required=True, help='文章路径')
+    parser.add_argument('--record', action='store_true', help='在真实站点上录制')
+    parser.add_argument('--fixtures', default=str(FIXTURES_DIR), help='录制数据根目录')
+    parser.add_argument('--update-baseline', action='store_true', help='用本次回放结果更新耗时基线')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='耗时相对容差（默认 0.5）')
+    args = parser.parse_args()
+
+    fixture_dir = Path(args.fixtures) / args.platform
+
+    if args.record:
+        ok = record(args.platform, args.article, fixture_dir)
+    else:
+        ok = replay(args.platform, args.article, fixture_dir, args.update_baseline, args.tolerance)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
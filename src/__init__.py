@@ -3,10 +3,27 @@ Blog Auto-Publishing Tools
 博客自动发布工具
 """
 
+import importlib
+
 __version__ = "2.0.0"
 __author__ = "Your Name"
 
-from src.core import setup_logger, get_logger, SessionManager
-from src.publisher import BasePublisher
+# 导出的名称 -> 所在模块；首次访问时才导入（SessionManager、BasePublisher 依赖 Selenium，
+# 不能让 `import src.xxx` 的每条命令都付出导入 Selenium 的时间）
+_EXPORTS = {
+    'setup_logger': 'src.core.logger',
+    'get_logger': 'src.core.logger',
+    'SessionManager': 'src.core.session_manager',
+    'BasePublisher': 'src.publisher.base_publisher',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ['setup_logger', 'get_logger', 'SessionManager', 'BasePublisher']
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
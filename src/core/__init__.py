@@ -2,7 +2,22 @@
 Core modules for blog auto-publishing tools
 """
 
+import importlib
+
 from .logger import setup_logger, get_logger
-from .session_manager import SessionManager
+
+# 依赖 Selenium 的名称在首次访问时才导入
+_LAZY_EXPORTS = {
+    'SessionManager': '.session_manager',
+}
 
 __all__ = ['setup_logger', 'get_logger', 'SessionManager']
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
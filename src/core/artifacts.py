@@ -0,0 +1,205 @@
+"""
+故障现场采集模块
+发布步骤失败时保存截图、页面DOM、控制台日志和最近的网络请求，供事后排查
+"""
+
+import json
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .logger import get_logger
+from .network_log import get_network_log
+
+logger = get_logger(__name__)
+
+# 故障现场保存目录
+FAILURES_DIR = Path(__file__).parent.parent.parent / 'data' / 'failures'
+
+
+def new_run_id(platform: str) -> str:
+    """
+    生成一次发布的运行ID（每次发布调用一个，同一秒内的多次发布也不重复）
+
+    Args:
+        platform: 平台名称
+
+    Returns:
+        str: 形如 20251019-153012-123456-csdn 的运行ID
+    """
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{platform}"
+
+
+class FailureArtifacts:
+    """
+    故障现场存储（环形缓冲区）
+
+    目录结构::
+
+        data/failures/
+            index.json                      索引：运行ID、步骤、时间、错误、大小
+            <run_id>/<序号>_<step>/        序号在同一运行ID内递增，淘汰旧记录后也不复用
+                screenshot.png
+                dom.html
+                console.json
+                network.json
+                meta.json
+
+    超过条数或总大小上限时，从最旧的记录开始删除。
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_entries: int = 50, max_mb: float = 200):
+        """
+        初始化存储
+
+        Args:
+            root: 保存目录，默认 data/failures
+            max_entries: 最多保留的故障记录数
+            max_mb: 最多占用的磁盘空间（MB）
+        """
+        self.root = Path(root or FAILURES_DIR)
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.index_file = self.root / 'index.json'
+        self._lock = threading.Lock()
+
+    def list(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        列出已保存的故障记录（按时间顺序）
+
+        Args:
+            run_id: 只列出指定运行ID的记录
+
+        Returns:
+            List[Dict]: 故障记录
+        """
+        entries = self._load_index()
+        if run_id:
+            entries = [entry for entry in entries if entry['run_id'] == run_id]
+        return entries
+
+    def _load_index(self) -> List[Dict[str, Any]]:
+        if not self.index_file.exists():
+            return []
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠ 读取故障索引失败：{e}")
+            return []
+
+    def _save_index(self, entries: List[Dict[str, Any]]):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        tmp_file.replace(self.index_file)
+
+    def capture(self, driver, run_id: str, step: str, error: str = '',
+                extra: Optional[Dict[str, Any]] = None) -> Optional[Path]:
+        """
+        采集当前浏览器现场
+
+        各项采集互相独立，某一项失败（如页面已崩溃无法截图）不影响其他项。
+
+        Args:
+            driver: WebDriver实例
+            run_id: 运行ID
+            step: 失败的步骤名
+            error: 错误信息
+            extra: 额外写入 meta.json 的信息（如步骤耗时记录）
+
+        Returns:
+            Path: 故障记录目录，采集失败时返回 None
+        """
+        with self._lock:
+            entries = self._load_index()
+            sequence = max((entry.get('sequence', 0) for entry in entries if entry['run_id'] == run_id), default=0) + 1
+            target = self.root / run_id / f"{sequence:02d}_{step}"
+            while target.exists():
+                sequence += 1
+                target = self.root / run_id / f"{sequence:02d}_{step}"
+            target.mkdir(parents=True)
+
+            meta = {
+                'run_id': run_id,
+                'step': step,
+                'error': error,
+                'captured_at': datetime.now().isoformat(timespec='seconds'),
+                'url': _safe(lambda: driver.current_url, ''),
+                'title': _safe(lambda: driver.title, ''),
+            }
+            meta.update(extra or {})
+
+            _safe(lambda: driver.save_screenshot(str(target / 'screenshot.png')))
+            page_source = _safe(lambda: driver.page_source)
+            if page_source:
+                (target / 'dom.html').write_text(page_source, encoding='utf-8')
+            _write_json(target / 'console.json', _safe(lambda: driver.get_log('browser'), []))
+            _write_json(target / 'network.json', _safe(lambda: get_network_log(driver).recent(100), []))
+            _write_json(target / 'meta.json', meta)
+
+            size = sum(path.stat().st_size for path in target.iterdir() if path.is_file())
+            entries.append({
+                'run_id': run_id,
+                'sequence': sequence,
+                'step': step,
+                'error': error[:200],
+                'captured_at': meta['captured_at'],
+                'path': str(target.relative_to(self.root)),
+                'bytes': size,
+            })
+            entries = self._evict(entries)
+            self._save_index(entries)
+
+        logger.info(f"已保存故障现场：{target}（{size / 1024:.0f}KB）")
+        return target
+
+    def _evict(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """超出上限时删除最旧的记录，至少保留最新的一条"""
+        while len(entries) > 1 and (
+            len(entries) > self.max_entries or sum(entry['bytes'] for entry in entries) > self.max_bytes
+        ):
+            oldest = entries.pop(0)
+            shutil.rmtree(self.root / oldest['path'], ignore_errors=True)
+            run_dir = (self.root / oldest['path']).parent
+            if run_dir.exists() and not any(run_dir.iterdir()):
+                run_dir.rmdir()
+            logger.debug(f"删除最旧的故障记录：{oldest['path']}")
+        return entries
+
+
+class FailureCapture:
+    """
+    故障采集步骤钩子
+
+    挂到发布器的 ``step_hooks`` 上，步骤失败时自动保存现场。
+    """
+
+    def __init__(self, store: FailureArtifacts):
+        self.store = store
+
+    def after_step(self, publisher, name: str, ok: bool, elapsed: float):
+        if ok or not publisher.driver:
+            return
+        self.store.capture(
+            publisher.driver, publisher.run_id, name,
+            error=getattr(publisher, 'last_step_error', '') or '',
+            extra={'platform': publisher.PLATFORM_NAME, 'step_timings': publisher.step_timings},
+        )
+
+
+def _safe(func, default=None):
+    """执行采集函数，出错时返回默认值"""
+    try:
+        return func()
+    except Exception as e:
+        logger.debug(f"采集故障现场时出错：{e}")
+        return default
+
+
+def _write_json(path: Path, data: Any):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
@@ -0,0 +1,237 @@
+"""
+配置模块
+统一加载 config/ 目录下的 YAML 配置：首次读取时解析并按结构校验，之后从内存返回，
+文件修改时间变化时自动重新加载（长时间运行的进程无需重启即可生效）。
+配置目录固定为项目根目录下的 config/，与当前工作目录无关。
+"""
+
+import copy
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# 配置目录
+CONFIG_DIR = Path(__file__).parent.parent.parent / 'config'
+
+# 通用配置文件；不存在时从模板复制
+COMMON_FILE = 'common.yaml'
+COMMON_TEMPLATES = ('common.default.yaml', 'common.yaml.example')
+
+_NUMBER = (int, float)
+
+# 通用配置的结构：键 -> 类型（或类型元组），嵌套的 dict 表示子配置的结构。
+# 未列出的键不校验；类型不符的键会被丢弃并记录错误，调用方使用各自的默认值。
+COMMON_SCHEMA: Dict[str, Any] = {
+    'debugger_address': str,
+    'service_location': str,
+    'background_mode': bool,
+    'headless_mode': bool,
+    'network_log': bool,
+    'chrome_arguments': list,
+    'navigation': {
+        'page_load_strategy': str,
+        'block_resources': bool,
+        'blocked_urls': list,
+        'platforms': dict,
+        'ready_timeout': _NUMBER,
+    },
+    'content_dir': str,
+    'include_footer': bool,
+    'auto_publish': bool,
+    'content_verify_timeout': _NUMBER,
+    'chunked_injection': {'enabled': bool, 'threshold': int, 'chunk_chars': int},
+    'publish_confirm': {'enabled': bool, 'timeout': _NUMBER},
+    'preflight': {'enabled': bool, 'auto_fix': bool},
+    'markdown_transforms': dict,
+    'publish_attempts': int,
+    'wait_login': bool,
+    'wait_login_time': _NUMBER,
+    'login_queue': {'enabled': bool, 'timeout': _NUMBER, 'poll': _NUMBER, 'desktop_notify': bool},
+    'rate_limits': dict,
+    'duplicate_check': {'enabled': bool, 'ttl': _NUMBER},
+    'service': {'host': str, 'port': int},
+    'watch': {'dirs': list, 'platforms': list, 'debounce': _NUMBER, 'poll_interval': _NUMBER,
+              'retry_interval': _NUMBER},
+    'enable': dict,
+    'logging': {'level': str, 'file': str, 'console': bool, 'rotation': str, 'max_size': _NUMBER,
+                'backup_count': int},
+    'metrics': {'enabled': bool, 'state': str, 'textfile': str, 'port': int},
+    'failure_artifacts': {'enabled': bool, 'max_entries': int, 'max_mb': _NUMBER},
+    'ai': dict,
+    'advanced': dict,
+}
+
+# 平台配置的结构
+PLATFORM_SCHEMA: Dict[str, Any] = {
+    'site': str,
+}
+
+# 平台名称 -> 配置文件名（与平台名称不同的）
+PLATFORM_FILES = {
+    'cto51': '51cto.yaml',
+    'alicloud': 'alicloud.yaml',
+    'mpweixin': 'wechat.yaml',
+}
+
+
+class ConfigError(ValueError):
+    """配置文件不存在、无法解析或结构不正确"""
+
+
+def validate(data: Dict[str, Any], schema: Dict[str, Any], prefix: str = '') -> List[str]:
+    """
+    按结构校验配置，丢弃类型不符的键
+
+    Args:
+        data: 配置（原地修改）
+        schema: 结构
+        prefix: 错误信息中的键路径前缀
+
+    Returns:
+        List[str]: 错误信息
+    """
+    errors = []
+    for key, expected in schema.items():
+        if key not in data or data[key] is None:
+            continue
+        value = data[key]
+        name = f"{prefix}{key}"
+        if isinstance(expected, dict):
+            if not isinstance(value, dict):
+                errors.append(f"{name} 应为映射，实际为 {type(value).__name__}")
+                del data[key]
+            else:
+                errors.extend(validate(value, expected, prefix=f"{name}."))
+            continue
+        types = expected if isinstance(expected, tuple) else (expected,)
+        # YAML 中的 true/false 是 bool，bool 又是 int 的子类，数值字段不接受布尔值
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            expected_names = '/'.join(t.__name__ for t in types)
+            errors.append(f"{name} 应为 {expected_names}，实际为 {type(value).__name__}：{value!r}")
+            del data[key]
+    return errors
+
+
+class ConfigStore:
+    """
+    配置缓存
+
+    每个文件只在首次读取和修改时间（或大小）变化时解析，其余调用只做一次 stat。
+    返回的是副本，调用方可以随意修改。重新加载时文件无法解析（如正在编辑）则继续使用上一次的内容。
+
+    Example:
+        config = get_config()
+        common_config = config.common()
+        csdn_config = config.platform('csdn')
+    """
+
+    def __init__(self, config_dir: Optional[Path] = None):
+        """
+        初始化配置缓存
+
+        Args:
+            config_dir: 配置目录，默认为项目根目录下的 config/
+        """
+        self.config_dir = Path(config_dir or CONFIG_DIR)
+        self._lock = threading.Lock()
+        # 文件路径 -> ((修改时间, 大小), 配置)
+        self._cache: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+    def load(self, filename: str, schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        读取配置文件
+
+        Args:
+            filename: 配置目录下的文件名
+            schema: 校验结构
+
+        Returns:
+            Dict: 配置副本
+
+        Raises:
+            ConfigError: 文件不存在，或首次读取时无法解析
+        """
+        path = self.config_dir / filename
+        try:
+            stat = path.stat()
+        except OSError:
+            raise ConfigError(f"配置文件不存在：{path}")
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is None or cached[0] != stamp:
+                try:
+                    data = self._parse(path, schema)
+                except ConfigError:
+                    if cached is None:
+                        raise
+                    logger.warning(f"⚠ 重新加载 {path} 失败，继续使用上一次的配置", exc_info=True)
+                    data = cached[1]
+                else:
+                    if cached is not None:
+                        logger.info(f"✓ 配置文件已更新，重新加载：{path}")
+                cached = (stamp, data)
+                self._cache[path] = cached
+            return copy.deepcopy(cached[1])
+
+    def _parse(self, path: Path, schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        try:
+            with open(path, 'r', encoding='UTF-8') as f:
+                data = yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise ConfigError(f"配置文件无法解析：{path}，错误：{e}")
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            raise ConfigError(f"配置文件的顶层应为映射：{path}")
+        for error in validate(data, schema or {}):
+            logger.error(f"✗ {path.name} 配置项无效，已忽略：{error}")
+        return data
+
+    def common(self) -> Dict[str, Any]:
+        """读取通用配置（config/common.yaml 不存在时从模板复制）"""
+        path = self.config_dir / COMMON_FILE
+        if not path.exists():
+            for template in COMMON_TEMPLATES:
+                template_path = self.config_dir / template
+                if template_path.exists():
+                    shutil.copy(template_path, path)
+                    logger.info(f"已复制 {template_path} 到 {path}")
+                    break
+        return self.load(COMMON_FILE, COMMON_SCHEMA)
+
+    def platform(self, platform: str) -> Dict[str, Any]:
+        """
+        读取平台配置
+
+        Args:
+            platform: 平台名称
+
+        Returns:
+            Dict: 平台配置副本
+        """
+        return self.load(PLATFORM_FILES.get(platform, f"{platform}.yaml"), PLATFORM_SCHEMA)
+
+    def path(self, filename: str) -> str:
+        """配置目录下文件的完整路径"""
+        return os.path.join(self.config_dir, filename)
+
+
+_config: Optional[ConfigStore] = None
+
+
+def get_config() -> ConfigStore:
+    """获取全局配置缓存"""
+    global _config
+    if _config is None:
+        _config = ConfigStore()
+    return _config
@@ -1,70 +1,276 @@
 """
 日志管理模块
 提供统一的日志输出功能，支持控制台和文件输出
+
+所有 logger 共用同一组处理器：调用方只把日志记录放入队列（不做任何 I/O），
+后台线程负责写控制台和日志文件。日志文件为 JSON Lines，每行带运行ID、任务和平台，
+按大小或按天轮转（见通用配置的 ``logging`` 段）。
 """
 
+import atexit
+import contextvars
+import json
 import logging
-import os
+import logging.handlers
+import queue
+import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# 日志配置的默认值（与 config/common.yaml.example 的 logging 段一致）
+DEFAULT_LOGGING = {
+    'level': 'INFO',
+    'file': 'data/logs/publisher.log',
+    'console': True,
+    # 轮转方式：size 按大小（max_size MB），daily 每天零点
+    'rotation': 'size',
+    'max_size': 10,
+    'backup_count': 5,
+}
+
+# 控制台使用的可读格式
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+
+# 日志上下文：在发布器、调度器中设置，自动附加到之后的每条日志
+_context: contextvars.ContextVar = contextvars.ContextVar('log_context', default={})
+
+_lock = threading.Lock()
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_level = logging.INFO
+# 当前生效的日志配置
+_settings: Dict[str, Any] = {}
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    设置日志上下文（如 run_id、job、platform），退出时恢复
+
+    Example:
+        with log_context(run_id=publisher.run_id, platform='csdn'):
+            publisher.publish(article_path)
+    """
+    token = _context.set({**_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def current_context() -> Dict[str, Any]:
+    """当前的日志上下文（副本）"""
+    return dict(_context.get())
+
+
+class _ContextFilter(logging.Filter):
+    """在调用方线程中把当前日志上下文写入日志记录"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.context = _context.get()
+        return True
+
 
+class JsonFormatter(logging.Formatter):
+    """JSON Lines 格式：时间、级别、logger、消息、位置和日志上下文"""
 
-def setup_logger(name='blog_publisher', log_level=logging.INFO):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'file': f"{record.filename}:{record.lineno}",
+            'thread': record.threadName,
+        }
+        entry.update(getattr(record, 'context', None) or {})
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    放入队列前只合并消息参数、格式化异常堆栈，保留 context 等属性给后台线程的格式化器
+    （默认的 QueueHandler 会把消息按自己的格式化器预先格式化）
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # 日志系统已关闭（shutdown_logging）时没有后台线程读取队列：不再入队，警告及以上直接写到标准错误
+        if self.queue is None:
+            if record.levelno >= logging.lastResort.level:
+                logging.lastResort.handle(record)
+            return
+        super().enqueue(record)
+
+
+class _StderrHandler(logging.StreamHandler):
+    """控制台处理器：每次输出时取当前的 sys.stderr（测试框架等替换或关闭原来的 stderr 后仍然可用）"""
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _read_logging_config() -> Dict[str, Any]:
+    """
+    读取 config/common.yaml 的 logging 段
+
+    配置模块本身依赖日志，这里直接读取 YAML，不经过 src.core.config。
+    """
+    import yaml
+
+    path = PROJECT_ROOT / 'config' / 'common.yaml'
+    try:
+        with open(path, 'r', encoding='UTF-8') as f:
+            config = yaml.safe_load(f) or {}
+        return config.get('logging') or {}
+    except Exception:
+        return {}
+
+
+def _file_handler(config: Dict[str, Any]) -> logging.Handler:
+    """日志文件处理器；第一条日志写入时才打开文件（delay），只查询不写日志的命令不碰日志文件"""
+    log_file = Path(config['file'])
+    if not log_file.is_absolute():
+        log_file = PROJECT_ROOT / log_file
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    if config.get('rotation') == 'daily':
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file, when='midnight', backupCount=int(config['backup_count']), encoding='utf-8',
+            delay=True)
+    return logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=int(float(config['max_size']) * 1024 * 1024),
+        backupCount=int(config['backup_count']), encoding='utf-8', delay=True)
+
+
+def configure_logging(config: Optional[Dict[str, Any]] = None) -> logging.Handler:
+    """
+    （重新）配置日志处理器，已有的 logger 立即使用新的处理器
+
+    Args:
+        config: logging 配置（level / file / console / rotation / max_size / backup_count），
+                None 时读取 config/common.yaml 的 logging 段
+
+    Returns:
+        logging.Handler: 所有 logger 共用的队列处理器
+    """
+    global _queue_handler, _listener, _level, _settings
+    settings = {**DEFAULT_LOGGING, **(_read_logging_config() if config is None else config)}
+
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+
+        _level = logging.getLevelName(str(settings['level']).upper())
+        if not isinstance(_level, int):
+            _level = logging.INFO
+
+        handlers = []
+        if settings.get('console', True):
+            console_handler = _StderrHandler()
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT, datefmt='%Y-%m-%d %H:%M:%S'))
+            handlers.append(console_handler)
+        if settings.get('file'):
+            file_handler = _file_handler(settings)
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        if _queue_handler is None:
+            _queue_handler = _QueueHandler(log_queue)
+            _queue_handler.addFilter(_ContextFilter())
+        else:
+            _queue_handler.queue = log_queue
+        _queue_handler.setLevel(_level)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=False)
+        _listener.start()
+        _settings = settings
+        return _queue_handler
+
+
+def logging_settings() -> Dict[str, Any]:
+    """当前生效的日志配置（可传给 configure_logging 恢复），尚未初始化时为空字典"""
+    return dict(_settings)
+
+
+def shutdown_logging():
+    """
+    写出队列中剩余的日志并停止后台线程（进程退出时自动调用）
+
+    之后的日志不再进入队列（警告及以上写到标准错误），再次调用 configure_logging 后恢复。
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+        if _queue_handler is not None:
+            _queue_handler.queue = None
+
+
+atexit.register(shutdown_logging)
+
+
+def setup_logger(name='blog_publisher', log_level=None):
     """
     设置并返回一个logger实例
-    
+
     Args:
         name: logger名称
-        log_level: 日志级别
-    
+        log_level: 日志级别，默认为配置中的 logging.level
+
     Returns:
         logging.Logger: 配置好的logger实例
     """
     logger = logging.getLogger(name)
-    
+
     # 如果logger已经有handler，说明已经初始化过，直接返回
     if logger.handlers:
         return logger
-    
-    logger.setLevel(log_level)
-    
-    # 创建日志目录
-    log_dir = Path(__file__).parent.parent.parent / 'data' / 'logs'
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
-    # 生成日志文件名（按日期）
-    log_file = log_dir / f"{datetime.now().strftime('%Y-%m-%d')}.log"
-    
-    # 定义日志格式
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # 控制台处理器
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(log_level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # 文件处理器
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(log_level)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
-    logger.info(f"日志系统初始化完成，日志文件：{log_file}")
-    
+
+    first = _queue_handler is None
+    handler = configure_logging() if first else _queue_handler
+    logger.setLevel(log_level if log_level is not None else _level)
+    logger.addHandler(handler)
+
+    if first:
+        logger.debug("日志系统初始化完成")
+
     return logger
 
 
 def get_logger(name='blog_publisher'):
     """
     获取已存在的logger实例
-    
+
     Args:
         name: logger名称
-    
+
     Returns:
         logging.Logger: logger实例
     """
@@ -75,5 +281,8 @@ def get_logger(name='blog_publisher'):
     return logger
 
 
-# 为方便使用，提供一个默认的logger实例
-default_logger = setup_logger()
+def __getattr__(name):
+    # 为方便使用，提供一个默认的logger实例（首次访问时才创建，导入本模块不初始化日志系统）
+    if name == 'default_logger':
+        return setup_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
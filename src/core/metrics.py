@@ -0,0 +1,474 @@
+"""
+运行指标模块
+进程内的计数器、直方图和仪表，由发布器、调度器、新闻抓取和大模型调用写入。
+
+- 单次运行（publish.py、内容生成流水线）结束时打印本次运行的摘要，并把指标累加到
+  data/metrics/state.json，再写出 Prometheus 文本文件（node_exporter 的 textfile 采集器可直接读取），
+  多次运行之间的计数器是累计的，可以在 Prometheus 中看趋势；
+- 长时间运行的进程可以用 start_http_server() 提供 /metrics 接口。
+
+Example:
+    JOBS = get_metrics().counter('publish_jobs_total', '发布任务数', ('platform', 'result'))
+    JOBS.inc(platform='csdn', result='succeeded')
+
+    LATENCY = get_metrics().histogram('publish_step_seconds', '发布步骤耗时', ('platform', 'step'))
+    with LATENCY.time(platform='csdn', step='fill_title'):
+        ...
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# 指标名前缀
+NAMESPACE = 'posts_copilot'
+
+# 指标配置的默认值（与 config/common.yaml.example 的 metrics 段一致）
+DEFAULT_METRICS = {
+    'enabled': True,
+    'state': 'data/metrics/state.json',
+    'textfile': 'data/metrics/posts_copilot.prom',
+    'port': 0,
+}
+
+# 直方图的默认分桶（秒）：覆盖页面步骤（亚秒级）到大模型长文生成（分钟级）
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    """指标基类：按标签值分组保存数据"""
+
+    TYPE = ''
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"指标 {self.name} 的标签应为 {self.labels}，实际为 {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def samples(self) -> List[Tuple[LabelValues, Any]]:
+        """所有标签组合及其值（副本）"""
+        with self._lock:
+            return [(key, self._copy(value)) for key, value in sorted(self._values.items())]
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """只增不减的计数器"""
+
+    TYPE = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError(f"计数器 {self.name} 不能减少")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """可增可减的当前值（如待执行的任务数）"""
+
+    TYPE = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """
+    直方图：按分桶计数，同时记录总和、次数和最大值（最大值只用于命令行摘要）
+    """
+
+    TYPE = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0, 'max': 0.0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data['buckets'][i] += 1
+            data['sum'] += value
+            data['count'] += 1
+            data['max'] = max(data['max'], value)
+
+    @contextmanager
+    def time(self, **labels):
+        """记录 with 块的耗时（出现异常也记录）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    @staticmethod
+    def _copy(value):
+        return {**value, 'buckets': list(value['buckets'])}
+
+
+class MetricsRegistry:
+    """
+    指标注册表
+
+    同名指标只创建一次，各模块可以在导入时声明自己用到的指标。
+    """
+
+    def __init__(self, namespace: str = NAMESPACE):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name: str, help: str, labels: Sequence[str], **kwargs) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labels, **kwargs)
+            elif not isinstance(metric, cls) or metric.labels != tuple(labels):
+                raise ValueError(f"指标 {name} 已注册为不同的类型或标签")
+            return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labels, buckets=buckets)
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def clear(self):
+        """清空所有指标的数据（保留注册）"""
+        for metric in self.metrics():
+            metric.clear()
+
+    # ---------- 累计状态 ----------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """可 JSON 序列化的全部指标数据"""
+        data = {}
+        for metric in self.metrics():
+            entry = {'type': metric.TYPE, 'help': metric.help, 'labels': list(metric.labels),
+                     'samples': [[list(key), value] for key, value in metric.samples()]}
+            if isinstance(metric, Histogram):
+                entry['buckets'] = list(metric.buckets)
+            data[metric.name] = entry
+        return data
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """
+        合并另一份快照：计数器和直方图累加，仪表取快照中的值
+
+        标签或分桶与已注册的指标不一致的条目会被忽略（如指标定义改过）。
+        """
+        for name, entry in snapshot.items():
+            try:
+                kind, labels = entry['type'], tuple(entry['labels'])
+                if kind == 'counter':
+                    metric = self.counter(name, entry['help'], labels)
+                elif kind == 'gauge':
+                    metric = self.gauge(name, entry['help'], labels)
+                elif kind == 'histogram':
+                    metric = self.histogram(name, entry['help'], labels, entry['buckets'])
+                    if list(metric.buckets) != [float(b) for b in entry['buckets']]:
+                        raise ValueError('分桶不一致')
+                else:
+                    continue
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug(f"忽略无法合并的指标 {name}：{e}")
+                continue
+
+            with metric._lock:
+                for key, value in entry['samples']:
+                    key = tuple(str(v) for v in key)
+                    if kind == 'gauge':
+                        metric._values[key] = value
+                    elif kind == 'counter':
+                        metric._values[key] = metric._values.get(key, 0) + value
+                    else:
+                        current = metric._values.get(key)
+                        if current is None:
+                            metric._values[key] = Histogram._copy(value)
+                            continue
+                        current['buckets'] = [a + b for a, b in zip(current['buckets'], value['buckets'])]
+                        current['sum'] += value['sum']
+                        current['count'] += value['count']
+                        current['max'] = max(current['max'], value.get('max', 0.0))
+
+    # ---------- 输出 ----------
+
+    def render_prometheus(self) -> str:
+        """Prometheus 文本格式（0.0.4）"""
+        lines = []
+        for metric in self.metrics():
+            samples = metric.samples()
+            if not samples:
+                continue
+            full_name = f"{self.namespace}_{metric.name}" if self.namespace else metric.name
+            lines.append(f"# HELP {full_name} {_escape_help(metric.help)}")
+            lines.append(f"# TYPE {full_name} {metric.TYPE}")
+            for key, value in samples:
+                labels = list(zip(metric.labels, key))
+                if isinstance(metric, Histogram):
+                    for bound, count in zip(metric.buckets, value['buckets']):
+                        lines.append(f"{full_name}_bucket{_labels(labels + [('le', _number(bound))])} {count}")
+                    lines.append(f"{full_name}_bucket{_labels(labels + [('le', '+Inf')])} {value['count']}")
+                    lines.append(f"{full_name}_sum{_labels(labels)} {_number(value['sum'])}")
+                    lines.append(f"{full_name}_count{_labels(labels)} {value['count']}")
+                else:
+                    lines.append(f"{full_name}{_labels(labels)} {_number(value)}")
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def summary(self) -> str:
+        """命令行摘要：计数器和仪表的值，直方图的次数、平均值和最大值"""
+        lines = []
+        for metric in self.metrics():
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f"{metric.help}（{metric.name}）")
+            for key, value in samples:
+                label = ', '.join(f"{k}={v}" for k, v in zip(metric.labels, key)) or '-'
+                if isinstance(metric, Histogram):
+                    average = value['sum'] / value['count'] if value['count'] else 0
+                    lines.append(f"  {label}: {value['count']} 次，平均 {average:.2f}，最大 {value['max']:.2f}")
+                else:
+                    lines.append(f"  {label}: {_number(value)}")
+        return '\n'.join(lines)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ''
+    escaped = (name + '="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+               for name, value in pairs)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _number(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        if value.is_integer():
+            return str(int(value))
+        return repr(round(value, 6))
+    return str(value)
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """获取全局指标注册表"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
+
+
+def _settings(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    if config is None:
+        from .config import ConfigError, get_config
+        try:
+            config = get_config().common().get('metrics') or {}
+        except ConfigError:
+            config = {}
+    return {**DEFAULT_METRICS, **config}
+
+
+def _resolve(path: str) -> Path:
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def _atomic_write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def export_metrics(registry: Optional[MetricsRegistry] = None,
+                   config: Optional[Dict[str, Any]] = None) -> Optional[MetricsRegistry]:
+    """
+    把本次运行的指标累加到状态文件，并写出 Prometheus 文本文件
+
+    Args:
+        registry: 本次运行的指标，默认为全局注册表
+        config: metrics 配置（enabled / state / textfile），None 时读取通用配置
+
+    Returns:
+        MetricsRegistry: 累计后的指标；未启用时返回 None
+    """
+    settings = _settings(config)
+    if not settings.get('enabled', True):
+        return None
+    registry = registry or get_metrics()
+
+    total = MetricsRegistry(registry.namespace)
+    state_path = _resolve(settings['state']) if settings.get('state') else None
+    if state_path is not None and state_path.exists():
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                total.merge(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠ 指标状态文件无法读取，从零开始累计：{state_path}，{e}")
+    total.merge(registry.snapshot())
+    total.gauge('last_run_timestamp_seconds', '最近一次运行结束的时间').set(time.time())
+
+    try:
+        if state_path is not None:
+            _atomic_write(state_path, json.dumps(total.snapshot(), ensure_ascii=False))
+        if settings.get('textfile'):
+            _atomic_write(_resolve(settings['textfile']), total.render_prometheus())
+    except OSError as e:
+        logger.warning(f"⚠ 写出指标失败：{e}")
+    return total
+
+
+def print_summary(registry: Optional[MetricsRegistry] = None, title: str = '本次运行指标'):
+    """在控制台打印本次运行的指标摘要（没有数据时不打印）"""
+    text = (registry or get_metrics()).summary()
+    if text:
+        print(f"\n📈 {title}\n{text}")
+
+
+def start_http_server(port: int, host: str = '127.0.0.1',
+                      registry: Optional[MetricsRegistry] = None) -> 'ThreadingHTTPServer':
+    """
+    在后台线程中提供 /metrics 接口（Prometheus 文本格式）
+
+    Args:
+        port: 端口，0 表示随机端口（实际端口见返回值的 server_port）
+        host: 监听地址，默认只监听本机
+        registry: 指标注册表，默认为全局注册表
+
+    Returns:
+        ThreadingHTTPServer: 服务器，调用 shutdown() 停止
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = registry or get_metrics()
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(f"指标接口 {self.address_string()} {format % args}")
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True)
+    thread.start()
+    logger.info(f"✓ 指标接口已启动：http://{host}:{server.server_port}/metrics")
+    return server
+
+
+def instrument_llm_client(client, caller: str):
+    """
+    记录大模型调用的耗时、结果和 token 用量
+
+    包装 client.chat.completions.create（智谱AI / OpenAI 兼容的客户端），调用方式不变。
+
+    Args:
+        client: 大模型客户端
+        caller: 调用方名称（如 generator、searcher），作为指标标签
+    """
+    registry = get_metrics()
+    latency = registry.histogram('llm_request_seconds', '大模型请求耗时（秒）', ('caller', 'model'))
+    requests_total = registry.counter('llm_requests_total', '大模型请求数', ('caller', 'model', 'result'))
+    tokens = registry.counter('llm_tokens_total', '大模型 token 用量', ('caller', 'model', 'kind'))
+
+    completions = client.chat.completions
+    create = completions.create
+
+    def timed_create(*args, **kwargs):
+        model = str(kwargs.get('model', 'unknown'))
+        start = time.perf_counter()
+        result = 'error'
+        try:
+            response = create(*args, **kwargs)
+            result = 'ok'
+        finally:
+            latency.observe(time.perf_counter() - start, caller=caller, model=model)
+            requests_total.inc(caller=caller, model=model, result=result)
+        usage = getattr(response, 'usage', None)
+        for kind in ('prompt_tokens', 'completion_tokens'):
+            count = getattr(usage, kind, None)
+            if isinstance(count, (int, float)) and count > 0:
+                tokens.inc(count, caller=caller, model=model, kind=kind.split('_')[0])
+        return response
+
+    completions.create = timed_create
+    return client
@@ -0,0 +1,164 @@
+"""
+页面导航模块
+按平台屏蔽统计、广告、推荐组件和字体等自动化用不到的资源，
+配合 eager 页面加载策略，用就绪探针代替页面打开后的固定等待
+"""
+
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Sequence
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# 所有平台都屏蔽的资源（Network.setBlockedURLs 的通配符模式）
+DEFAULT_BLOCKED_URLS = [
+    # 统计与埋点
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*hm.baidu.com*',
+    '*cnzz.com*',
+    '*growingio.com*',
+    '*hotjar.com*',
+    # 广告
+    '*doubleclick.net*',
+    '*googlesyndication.com*',
+    '*pos.baidu.com*',
+    '*cpro.baidu.com*',
+    # 网页字体（按钮按文字定位，不依赖字体）
+    '*.woff2',
+    '*.woff',
+    '*.ttf',
+    '*.otf',
+]
+
+# 各平台额外屏蔽的资源
+PLATFORM_BLOCKED_URLS: Dict[str, List[str]] = {
+    'csdn': ['*event.csdn.net*', '*redpacket.csdn.net*'],
+    'juejin': ['*mcs.snssdk.com*'],
+    'toutiao': ['*mcs.snssdk.com*'],
+    'zhihu': ['*zhihu-web-analytics.zhihu.com*', '*datahub.zhihu.com*'],
+}
+
+# 判断页面是否就绪：文档已解析完成，且（给定时）任一探针元素已出现
+_READY_SCRIPT = """
+var selectors = arguments[0];
+if (document.readyState === 'loading') { return false; }
+if (!selectors.length) { return true; }
+for (var i = 0; i < selectors.length; i++) {
+    if (document.querySelector(selectors[i])) { return true; }
+}
+return false;
+"""
+
+# 每个驱动各标签页当前生效的屏蔽列表（CDP 的 Network 设置只对当前标签页生效），避免每次导航都重复下发
+_applied: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _window_handle(driver) -> Optional[str]:
+    """当前标签页的句柄，无法获取（标签页已关闭）时返回 None"""
+    try:
+        return driver.current_window_handle
+    except Exception:
+        return None
+
+
+def wait_for_page(driver, selectors: Sequence[str] = (), timeout: float = 10, interval: float = 0.2) -> bool:
+    """
+    等待页面就绪
+
+    Args:
+        driver: WebDriver实例
+        selectors: 就绪探针（CSS选择器），任一出现即视为就绪；为空时只等待文档解析完成
+        timeout: 最长等待时间（秒）
+        interval: 检查间隔（秒）
+
+    Returns:
+        bool: 是否在超时前就绪
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if driver.execute_script(_READY_SCRIPT, list(selectors)):
+                return True
+        except Exception as e:
+            logger.debug(f"检查页面就绪状态失败：{e}")
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+class NavigationProfile:
+    """
+    平台的导航配置
+
+    读取通用配置的 ``navigation`` 段：
+    - block_resources: 是否屏蔽资源（默认 true）
+    - blocked_urls: 追加到所有平台的屏蔽模式
+    - platforms.<platform>: 追加到该平台的屏蔽模式
+    - ready_timeout: 等待就绪探针的最长时间（秒）
+
+    Example:
+        profile = NavigationProfile('csdn', common_config.get('navigation'))
+        profile.open(driver, 'https://editor.csdn.net/md/', ready=['.editor'])
+    """
+
+    def __init__(self, platform: str, config: Optional[Dict[str, Any]] = None):
+        """
+        初始化导航配置
+
+        Args:
+            platform: 平台名称
+            config: 通用配置中的 navigation 段
+        """
+        config = config or {}
+        self.platform = platform
+        self.enabled = config.get('block_resources', True)
+        self.ready_timeout = config.get('ready_timeout', 10)
+
+        platforms = config.get('platforms') or {}
+        patterns = (DEFAULT_BLOCKED_URLS + PLATFORM_BLOCKED_URLS.get(platform, [])
+                    + list(config.get('blocked_urls') or []) + list(platforms.get(platform) or []))
+        self.blocked_urls = list(dict.fromkeys(patterns))
+
+    def apply(self, driver):
+        """
+        在驱动的当前标签页上启用本平台的资源屏蔽
+        （多个平台共用一个浏览器时，导航前切换为当前平台的列表；新打开的标签页需要重新下发）
+
+        Args:
+            driver: WebDriver实例
+        """
+        urls = self.blocked_urls if self.enabled else []
+        handle = _window_handle(driver)
+        tabs = _applied.setdefault(driver, {})
+        if handle is not None and tabs.get(handle) == urls:
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': urls})
+            if handle is not None:
+                tabs[handle] = urls
+            logger.debug(f"{self.platform} 屏蔽 {len(urls)} 类资源")
+        except Exception as e:
+            logger.debug(f"设置资源屏蔽失败（驱动可能不支持CDP）：{e}")
+
+    def open(self, driver, url: str, ready: Sequence[str] = ()) -> bool:
+        """
+        打开页面并等待就绪
+
+        Args:
+            driver: WebDriver实例
+            url: 页面地址
+            ready: 就绪探针（CSS选择器）
+
+        Returns:
+            bool: 是否在超时前就绪
+        """
+        self.apply(driver)
+        start = time.monotonic()
+        driver.get(url)
+        ready_ok = wait_for_page(driver, ready, timeout=self.ready_timeout)
+        logger.debug(f"打开 {url} 耗时 {time.monotonic() - start:.1f}秒（就绪：{ready_ok}）")
+        return ready_ok
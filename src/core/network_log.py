@@ -0,0 +1,208 @@
+"""
+网络日志模块
+从 Chrome 性能日志中解析网络请求，供录制回放和故障诊断使用
+"""
+
+import json
+import re
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import unquote
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# 回放服务器把页面发出的请求改写为 /__replay__/proxy?url=<原始地址>（见 src/replay/server.py）
+_REPLAY_PROXY = re.compile(r'/__replay__/proxy\?url=([^&#]+)')
+
+
+def _original_url(url: str) -> str:
+    """回放时记录请求的原始地址，发布确认等按平台接口地址匹配"""
+    match = _REPLAY_PROXY.search(url or '')
+    return unquote(match.group(1)) if match else url
+
+
+class NetworkLog:
+    """
+    网络请求记录
+
+    读取 ``driver.get_log('performance')`` 中的 Network.* 事件，
+    按 requestId 合并为请求条目，只保留最近的 ``max_entries`` 条。
+    需要在创建驱动时开启 ``goog:loggingPrefs`` 性能日志。
+    """
+
+    def __init__(self, driver, max_entries: int = 500):
+        """
+        初始化网络日志
+
+        Args:
+            driver: WebDriver实例
+            max_entries: 保留的最大请求条数
+        """
+        self.driver = driver
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def poll(self) -> int:
+        """
+        读取浏览器中积累的性能日志并更新请求条目
+
+        Returns:
+            int: 本次读取到的网络事件数量
+        """
+        try:
+            raw_logs = self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"读取性能日志失败（可能未开启性能日志）：{e}")
+            return 0
+
+        count = 0
+        for raw in raw_logs:
+            try:
+                message = json.loads(raw['message'])['message']
+            except (KeyError, ValueError, TypeError):
+                continue
+            if self._handle(message.get('method', ''), message.get('params', {})):
+                count += 1
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return count
+
+    def _handle(self, method: str, params: Dict[str, Any]) -> bool:
+        """处理单个 Network 事件"""
+        if not method.startswith('Network.'):
+            return False
+
+        request_id = params.get('requestId')
+        if not request_id:
+            return False
+
+        entry = self.entries.get(request_id)
+        if entry is None:
+            entry = {'request_id': request_id, 'finished': False, 'failed': False}
+            self.entries[request_id] = entry
+
+        if method == 'Network.requestWillBeSent':
+            request = params.get('request', {})
+            entry.update({
+                'url': _original_url(request.get('url', '')),
+                'method': request.get('method', 'GET'),
+                'post_data': request.get('postData'),
+                'has_post_data': bool(request.get('hasPostData')),
+                'type': params.get('type', ''),
+                'timestamp': params.get('wallTime'),
+            })
+        elif method == 'Network.responseReceived':
+            response = params.get('response', {})
+            entry.update({
+                'url': _original_url(response.get('url', entry.get('url', ''))),
+                'status': response.get('status'),
+                'mime_type': response.get('mimeType', ''),
+                'type': params.get('type', entry.get('type', '')),
+            })
+        elif method == 'Network.loadingFinished':
+            entry['finished'] = True
+        elif method == 'Network.loadingFailed':
+            entry['failed'] = True
+            entry['error'] = params.get('errorText', '')
+        return True
+
+    def recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        获取最近的请求条目
+
+        Args:
+            limit: 返回的最大条数
+
+        Returns:
+            List[Dict]: 请求条目列表（按时间顺序）
+        """
+        self.poll()
+        return list(self.entries.values())[-limit:]
+
+    def find(self, predicate: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+        """
+        查找满足条件的请求条目
+
+        Args:
+            predicate: 过滤函数
+
+        Returns:
+            List[Dict]: 满足条件的请求条目
+        """
+        self.poll()
+        return [entry for entry in self.entries.values() if predicate(entry)]
+
+    def get_body(self, request_id: str) -> Optional[str]:
+        """
+        通过 CDP 获取响应体
+
+        Args:
+            request_id: 请求ID
+
+        Returns:
+            str: 响应体文本，获取失败返回 None
+        """
+        try:
+            result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception as e:
+            logger.debug(f"获取响应体失败（{request_id}）：{e}")
+            return None
+
+        body = result.get('body')
+        if result.get('base64Encoded'):
+            import base64
+            return base64.b64decode(body).decode('utf-8', errors='replace')
+        return body
+
+    def get_post_data(self, entry: Dict[str, Any]) -> Optional[str]:
+        """
+        获取请求体：性能日志中没有带上的（请求体较大时）通过 CDP 获取，并缓存到条目中
+
+        Args:
+            entry: 请求条目
+
+        Returns:
+            str: 请求体文本，没有请求体或获取失败返回 None
+        """
+        if entry.get('post_data') is not None or not entry.get('has_post_data'):
+            return entry.get('post_data')
+        try:
+            result = self.driver.execute_cdp_cmd('Network.getRequestPostData', {'requestId': entry['request_id']})
+        except Exception as e:
+            logger.debug(f"获取请求体失败（{entry['request_id']}）：{e}")
+            return None
+        entry['post_data'] = result.get('postData')
+        return entry['post_data']
+
+    def clear(self):
+        """丢弃已积累的日志和请求条目"""
+        self.poll()
+        self.entries.clear()
+
+
+# 每个驱动共享一个网络日志：性能日志读取后即从浏览器中清除，多个读取方各自读取会互相丢数据
+_shared_logs: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_network_log(driver, max_entries: int = 500) -> NetworkLog:
+    """
+    获取驱动共享的网络日志
+
+    Args:
+        driver: WebDriver实例
+        max_entries: 需要保留的最大请求条数（取各调用方的最大值）
+
+    Returns:
+        NetworkLog: 网络日志实例
+    """
+    network_log = _shared_logs.get(driver)
+    if network_log is None:
+        network_log = NetworkLog(driver, max_entries=max_entries)
+        _shared_logs[driver] = network_log
+    else:
+        network_log.max_entries = max(network_log.max_entries, max_entries)
+    return network_log
@@ -0,0 +1,50 @@
+"""
+提醒模块
+需要人工处理时（如扫码登录）在终端响铃并发送桌面通知
+"""
+
+import shutil
+import subprocess
+import sys
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def notify(title: str, message: str, desktop: bool = True):
+    """
+    发送提醒：写日志、终端响铃，可选桌面通知（macOS 使用 osascript，Linux 使用 notify-send）
+
+    桌面通知失败不影响调用方。
+
+    Args:
+        title: 标题
+        message: 内容
+        desktop: 是否发送桌面通知
+    """
+    logger.warning(f"⚠ {title}：{message}")
+    try:
+        sys.stderr.write('\a')
+        sys.stderr.flush()
+    except Exception:
+        pass
+
+    if not desktop:
+        return
+    if sys.platform == 'darwin':
+        script = f'display notification {_quote(message)} with title {_quote(title)}'
+        command = ['osascript', '-e', script]
+    elif shutil.which('notify-send'):
+        command = ['notify-send', title, message]
+    else:
+        return
+    try:
+        subprocess.run(command, timeout=5, check=False, capture_output=True)
+    except Exception as e:
+        logger.debug(f"发送桌面通知失败：{e}")
+
+
+def _quote(text: str) -> str:
+    """AppleScript 字符串字面量"""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
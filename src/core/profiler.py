@@ -0,0 +1,251 @@
+"""
+性能剖析模块
+按固定间隔对线程调用栈采样（墙钟时间，等待网络、子进程、sleep 的时间也计入），
+用来回答一次运行慢在哪里：Selenium 往返、pandoc、YAML 解析、BeautifulSoup 还是大模型调用。
+
+- 发布脚本和各内容生成入口都支持 --profile（或环境变量 POSTS_COPILOT_PROFILE=1）；
+- 结果写到 data/profiles/：``<名称>-<时间>.folded`` 为折叠调用栈（flamegraph.pl、speedscope 可直接打开），
+  ``<名称>-<时间>.txt`` 为按类别的耗时分布和最耗时的函数。
+
+Example:
+    with profiling('publish', enabled=args.profile):
+        run(args)
+"""
+
+import linecache
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+_ROOT_PREFIX = str(PROJECT_ROOT.resolve()).replace(os.sep, '/') + '/'
+
+# 剖析结果目录
+PROFILE_DIR = PROJECT_ROOT / 'data' / 'profiles'
+
+# 开启剖析的环境变量
+PROFILE_ENV = 'POSTS_COPILOT_PROFILE'
+
+# 默认采样间隔（秒）
+DEFAULT_INTERVAL = 0.005
+
+# 耗时类别：调用栈中从外到内第一个命中的库决定类别（Selenium 命令经由 urllib3 发出，算 Selenium）
+CATEGORIES = (
+    ('Selenium', ('/selenium/',)),
+    ('大模型调用', ('/openai/', '/zhipuai/', '/zai/', '/httpx/')),
+    ('BeautifulSoup', ('/bs4/',)),
+    ('YAML 解析', ('/yaml/', 'front_matter.py')),
+    ('Markdown 转换', ('/markdown/', 'markdown_pipeline.py')),
+    ('子进程（pandoc 等）', ('/subprocess.py',)),
+    ('网络请求', ('/requests/', '/urllib3/', '/http/client.py', '/urllib/request.py')),
+)
+WAITING = '等待（sleep / 锁 / 队列）'
+OTHER = '其他 Python 代码'
+
+# 最内层是这些模块时算作等待
+_WAIT_FILES = ('/threading.py', '/queue.py', '/selectors.py')
+
+# 最耗时的函数列出多少个
+TOP_FUNCTIONS = 20
+
+
+def profile_enabled(flag: bool = False) -> bool:
+    """命令行指定了 --profile，或设置了环境变量 POSTS_COPILOT_PROFILE"""
+    return flag or os.environ.get(PROFILE_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _short_path(filename: str) -> str:
+    """项目内的文件用相对路径，第三方库从包名开始，标准库只保留文件名"""
+    path = filename.replace(os.sep, '/')
+    if path.startswith(_ROOT_PREFIX):
+        return path[len(_ROOT_PREFIX):]
+    for marker in ('/site-packages/', '/dist-packages/'):
+        if marker in path:
+            return path.split(marker, 1)[1]
+    return os.path.basename(path)
+
+
+class SamplingProfiler:
+    """
+    采样剖析器
+
+    后台线程每隔 interval 秒读取一次主线程和开始采样后启动的线程的调用栈
+    （之前就在运行的后台线程，如日志线程，一直在等待，不采样）。
+    每个样本按距上次采样的实际时间计入，结果是墙钟时间。
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        # (线程名, 类别, 调用栈) -> [样本数, 秒]
+        self._stacks: Dict[Tuple[str, str, Tuple[str, ...]], List[float]] = {}
+        self._labels: Dict[object, str] = {}
+        # 项目代码中的函数（不含第三方库和标准库）
+        self._project_labels: set = set()
+        self._ignored: set = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.duration = 0.0
+
+    def start(self):
+        main_id = threading.main_thread().ident
+        self._ignored = {ident for ident in sys._current_frames() if ident != main_id}
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self):
+        own_id = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(own_id, now - last)
+            last = now
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+            if code.co_filename.replace(os.sep, '/').startswith(_ROOT_PREFIX):
+                self._project_labels.add(label)
+        return label
+
+    def _sample(self, own_id: int, seconds: float):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_id or ident in self._ignored:
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(frame)
+                frame = frame.f_back
+            frames.reverse()
+            stack = tuple(self._label(f.f_code) for f in frames)
+            key = (names.get(ident, str(ident)), self._category(frames), stack)
+            entry = self._stacks.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    @staticmethod
+    def _category(frames) -> str:
+        filenames = [f.f_code.co_filename.replace(os.sep, '/') for f in frames]
+        for filename in filenames:
+            for category, markers in CATEGORIES:
+                if any(marker in filename for marker in markers):
+                    return category
+        innermost = frames[-1] if frames else None
+        if innermost is not None:
+            line = linecache.getline(innermost.f_code.co_filename, innermost.f_lineno)
+            if filenames[-1].endswith(_WAIT_FILES) or 'sleep(' in line or '.wait(' in line:
+                return WAITING
+        return OTHER
+
+    def folded(self) -> List[str]:
+        """折叠调用栈（每行：线程;外层函数;...;内层函数 样本数）"""
+        counts: Counter = Counter()
+        for (thread, _, stack), (count, _) in self._stacks.items():
+            counts[';'.join((thread,) + stack)] += count
+        return [f"{stack} {int(count)}" for stack, count in sorted(counts.items())]
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        """各线程按类别的耗时（秒）"""
+        result: Dict[str, Dict[str, float]] = {}
+        for (thread, category, _), (_, seconds) in self._stacks.items():
+            by_category = result.setdefault(thread, {})
+            by_category[category] = by_category.get(category, 0.0) + seconds
+        return result
+
+    def functions(self) -> Tuple[Counter, Counter]:
+        """各函数的耗时（秒）：(项目代码中的函数，含调用的函数, 所有函数的自身耗时)"""
+        inclusive: Counter = Counter()
+        own: Counter = Counter()
+        for (_, _, stack), (_, seconds) in self._stacks.items():
+            for label in set(stack) & self._project_labels:
+                inclusive[label] += seconds
+            if stack:
+                own[stack[-1]] += seconds
+        return inclusive, own
+
+    def report(self, title: str = '') -> str:
+        """耗时分布和最耗时的函数（文本）"""
+        samples = sum(int(count) for count, _ in self._stacks.values())
+        lines = [f"{title or '性能剖析'}：墙钟 {self.duration:.2f} 秒，采样间隔 {self.interval * 1000:.0f} 毫秒，"
+                 f"样本 {samples} 个", '']
+        breakdown = self.breakdown()
+        for thread, by_category in sorted(breakdown.items(), key=lambda item: -sum(item[1].values())):
+            total = sum(by_category.values()) or 1
+            lines.append(f"[线程 {thread}] 按类别（{total:.2f} 秒）：")
+            for category, seconds in sorted(by_category.items(), key=lambda item: -item[1]):
+                lines.append(f"  {category:<20} {seconds:8.2f} 秒  {seconds / total:6.1%}")
+            lines.append('')
+
+        inclusive, own = self.functions()
+        for heading, counter in (('项目代码（含调用的函数）', inclusive), ('自身耗时（不含调用的函数）', own)):
+            lines.append(f"最耗时的函数：{heading}")
+            for label, seconds in counter.most_common(TOP_FUNCTIONS):
+                lines.append(f"  {seconds:8.2f} 秒  {label}")
+            lines.append('')
+        return '\n'.join(lines)
+
+    def save(self, name: str, directory: Path = PROFILE_DIR) -> Tuple[Path, Path]:
+        """
+        写出折叠调用栈和耗时报告
+
+        Returns:
+            Tuple[Path, Path]: (.folded 文件, .txt 报告)
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        folded_path = directory / f"{stem}.folded"
+        report_path = directory / f"{stem}.txt"
+        folded_path.write_text('\n'.join(self.folded()) + '\n', encoding='utf-8')
+        report_path.write_text(self.report(name) + '\n', encoding='utf-8')
+        return folded_path, report_path
+
+
+@contextmanager
+def profiling(name: str, enabled: bool = False, interval: float = DEFAULT_INTERVAL,
+              directory: Path = PROFILE_DIR) -> Iterator[Optional[SamplingProfiler]]:
+    """
+    剖析一段运行，结束时（包括异常、Ctrl+C 退出）写出结果
+
+    Args:
+        name: 结果文件名前缀，如 publish / generate
+        enabled: 是否剖析（命令行的 --profile），环境变量 POSTS_COPILOT_PROFILE 也可开启
+        interval: 采样间隔（秒）
+        directory: 结果目录
+    """
+    if not profile_enabled(enabled):
+        yield None
+        return
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        try:
+            folded_path, report_path = profiler.save(name, directory)
+        except OSError as e:
+            logger.warning(f"⚠ 写出性能剖析结果失败：{e}")
+        else:
+            logger.info(f"✓ 性能剖析结果：{report_path}（火焰图数据：{folded_path}）")
@@ -0,0 +1,359 @@
+"""
+发布调度模块
+按平台限流（令牌桶 + 每日上限），某个平台冷却时先执行其他平台的任务
+"""
+
+import json
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .logger import get_logger, log_context
+from .metrics import get_metrics
+
+logger = get_logger(__name__)
+
+JOBS_TOTAL = get_metrics().counter('publish_jobs_total', '发布任务数', ('platform', 'result'))
+JOB_SECONDS = get_metrics().histogram('publish_job_seconds', '发布任务耗时（秒）', ('platform',))
+PENDING_JOBS = get_metrics().gauge('publish_jobs_pending', '等待执行和暂放的发布任务数')
+WAIT_SECONDS = get_metrics().counter('scheduler_wait_seconds_total', '所有平台冷却时的等待时间（秒）')
+
+# 限流状态文件：记录每个平台的令牌桶状态和当天的发布次数，重启后仍然生效
+STATE_FILE = Path(__file__).parent.parent.parent / 'data' / 'rate_limits.json'
+
+# 未配置的平台使用的默认限制
+DEFAULT_LIMIT = {'interval': 60, 'burst': 1, 'daily_cap': 0}
+
+
+class TokenBucket:
+    """
+    令牌桶
+
+    每 ``interval`` 秒补充一个令牌，最多积累 ``burst`` 个。
+    """
+
+    def __init__(self, interval: float, burst: int = 1, tokens: Optional[float] = None,
+                 updated_at: Optional[float] = None):
+        """
+        初始化令牌桶
+
+        Args:
+            interval: 补充一个令牌的时间（秒），0 表示不限速
+            burst: 最多积累的令牌数
+            tokens: 初始令牌数，默认满
+            updated_at: 令牌数对应的时间戳
+        """
+        self.interval = max(float(interval), 0.0)
+        self.burst = max(int(burst), 1)
+        self.tokens = float(self.burst if tokens is None else tokens)
+        self.updated_at = time.time() if updated_at is None else updated_at
+
+    def _refill(self, now: float):
+        if self.interval <= 0:
+            self.tokens = float(self.burst)
+        else:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) / self.interval)
+        self.updated_at = now
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """距离下一个可用令牌的时间（秒），0 表示当前可用"""
+        now = time.time() if now is None else now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) * self.interval
+
+    def consume(self, now: Optional[float] = None):
+        """消耗一个令牌"""
+        now = time.time() if now is None else now
+        self._refill(now)
+        self.tokens = max(self.tokens - 1, 0.0)
+
+
+class RateLimiter:
+    """
+    多平台限流器
+
+    配置来自 common.yaml 的 ``rate_limits``::
+
+        rate_limits:
+          default: {interval: 60, burst: 1, daily_cap: 0}
+          csdn: {interval: 300, burst: 2, daily_cap: 10}
+
+    ``daily_cap`` 为 0 表示不限制每日次数。
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, state_file: Optional[Path] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        初始化限流器
+
+        Args:
+            config: rate_limits 配置
+            state_file: 状态文件路径，默认 data/rate_limits.json
+            clock: 时间函数（测试时可替换）
+        """
+        self.config = config or {}
+        self.clock = clock
+        self.state_file = Path(state_file or STATE_FILE)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._state = self._load_state()
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"⚠ 读取限流状态失败：{e}")
+        return {'buckets': {}, 'daily': {}}
+
+    def _save_state(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self._state['buckets'] = {
+            platform: {'tokens': bucket.tokens, 'updated_at': bucket.updated_at}
+            for platform, bucket in self._buckets.items()
+        }
+        # 只保留当天的计数
+        today = date.today().isoformat()
+        self._state['daily'] = {today: self._state.get('daily', {}).get(today, {})}
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+
+    def limit_for(self, platform: str) -> Dict[str, Any]:
+        """获取平台的限流配置（平台配置覆盖 default，default 覆盖内置默认值）"""
+        limit = dict(DEFAULT_LIMIT)
+        limit.update(self.config.get('default') or {})
+        limit.update(self.config.get(platform) or {})
+        return limit
+
+    def _bucket(self, platform: str) -> TokenBucket:
+        if platform not in self._buckets:
+            limit = self.limit_for(platform)
+            saved = self._state.get('buckets', {}).get(platform, {})
+            self._buckets[platform] = TokenBucket(
+                limit['interval'], limit['burst'],
+                tokens=saved.get('tokens'), updated_at=saved.get('updated_at', self.clock()),
+            )
+        return self._buckets[platform]
+
+    def published_today(self, platform: str) -> int:
+        """平台当天已发布的次数"""
+        return self._state.get('daily', {}).get(date.today().isoformat(), {}).get(platform, 0)
+
+    def cap_reached(self, platform: str) -> bool:
+        """是否达到每日上限"""
+        cap = self.limit_for(platform).get('daily_cap') or 0
+        return cap > 0 and self.published_today(platform) >= cap
+
+    def wait_time(self, platform: str) -> float:
+        """
+        平台距离可以发布还需等待的时间（秒）
+
+        Returns:
+            float: 等待时间；达到每日上限时返回 inf
+        """
+        with self._lock:
+            if self.cap_reached(platform):
+                return float('inf')
+            return self._bucket(platform).wait_time(self.clock())
+
+    def record(self, platform: str):
+        """记录一次发布（无论成功与否都计入，失败的尝试同样会被平台计数）"""
+        with self._lock:
+            self._bucket(platform).consume(self.clock())
+            today = date.today().isoformat()
+            daily = self._state.setdefault('daily', {}).setdefault(today, {})
+            daily[platform] = daily.get(platform, 0) + 1
+            self._save_state()
+
+    def refund(self, platform: str):
+        """退回一次发布记录（任务在到达平台之前就中止，如需要登录而被暂放）"""
+        with self._lock:
+            bucket = self._bucket(platform)
+            bucket.tokens = min(bucket.tokens + 1, bucket.burst)
+            daily = self._state.setdefault('daily', {}).setdefault(date.today().isoformat(), {})
+            daily[platform] = max(daily.get(platform, 0) - 1, 0)
+            self._save_state()
+
+    def acquire(self, platform: str) -> bool:
+        """
+        阻塞直到平台可以发布，并记录一次发布
+
+        Returns:
+            bool: 是否获得许可（达到每日上限时返回 False）
+        """
+        wait = self.wait_time(platform)
+        if wait == float('inf'):
+            logger.warning(f"⚠ {platform} 今日发布次数已达上限（{self.published_today(platform)}）")
+            return False
+        if wait > 0:
+            logger.info(f"{platform} 冷却中，等待 {wait:.0f} 秒...")
+            time.sleep(wait)
+        self.record(platform)
+        return True
+
+
+class PublishJob:
+    """
+    一个发布任务（文章 + 平台）
+
+    Args:
+        platform: 平台名称
+        article_path: 文章路径
+    """
+
+    def __init__(self, platform: str, article_path: str):
+        self.platform = platform
+        self.article_path = article_path
+        # 日志中的任务标识
+        self.job_id = f"{platform}:{Path(article_path).stem}"
+        self.result: Optional[bool] = None
+        # 任务需要等待的外部条件（如人工登录）：执行失败且设置了该条件时任务被暂放，
+        # 条件满足（函数返回 True）后重新执行
+        self.wait_for: Optional[Callable[[], bool]] = None
+        self.parked_at: Optional[float] = None
+        # 发布成功后平台返回的文章链接
+        self.url = ''
+
+    def __repr__(self):
+        return f"PublishJob({self.platform}, {Path(self.article_path).name})"
+
+
+class PublishScheduler:
+    """
+    发布调度器
+
+    任务按加入顺序排队；每次选择第一个所在平台不在冷却中的任务执行，
+    所有平台都在冷却时等待最早可用的平台。这样总吞吐量接近各平台限额之和，
+    而不是被最慢的平台拖住。
+
+    执行失败且设置了 ``wait_for`` 的任务（如登录过期）被暂放，同平台的其他任务随之暂停，
+    其他平台的任务继续执行；每隔 ``park_poll`` 秒检查一次条件，满足后重新执行，
+    超过 ``park_timeout`` 秒仍不满足则计为失败。
+    """
+
+    def __init__(self, limiter: RateLimiter, sleep: Callable[[float], None] = time.sleep,
+                 park_timeout: float = 1800, park_poll: float = 10):
+        """
+        初始化调度器
+
+        Args:
+            limiter: 限流器
+            sleep: 等待函数（测试时可替换）
+            park_timeout: 暂放任务的最长等待时间（秒）
+            park_poll: 检查暂放任务条件的间隔（秒）
+        """
+        self.limiter = limiter
+        self.sleep = sleep
+        self.park_timeout = park_timeout
+        self.park_poll = park_poll
+        self.jobs: List[PublishJob] = []
+
+    def add(self, platform: str, article_path: str) -> PublishJob:
+        """加入一个发布任务"""
+        job = PublishJob(platform, article_path)
+        self.jobs.append(job)
+        return job
+
+    def run(self, execute: Callable[[PublishJob], bool]) -> Dict[str, List[PublishJob]]:
+        """
+        执行所有任务
+
+        Args:
+            execute: 执行单个任务的函数，返回是否成功
+
+        Returns:
+            Dict: succeeded / failed / skipped 三组任务
+        """
+        pending = list(self.jobs)
+        parked: List[PublishJob] = []
+        summary: Dict[str, List[PublishJob]] = {'succeeded': [], 'failed': [], 'skipped': []}
+
+        last_check = 0.0
+        while pending or parked:
+            PENDING_JOBS.set(len(pending) + len(parked))
+            now = self.limiter.clock()
+            if parked and now - last_check >= self.park_poll:
+                self._check_parked(parked, pending, summary)
+                last_check = now
+            blocked = {job.platform for job in parked}
+            runnable = [job for job in pending if job.platform not in blocked]
+            waits = {job.platform: self.limiter.wait_time(job.platform) for job in runnable}
+
+            # 达到每日上限的平台，剩余任务全部跳过
+            capped = [job for job in runnable if waits[job.platform] == float('inf')]
+            for job in capped:
+                logger.warning(f"⚠ {job.platform} 今日发布次数已达上限，跳过：{job}")
+                summary['skipped'].append(job)
+                JOBS_TOTAL.inc(platform=job.platform, result='skipped')
+                pending.remove(job)
+                runnable.remove(job)
+
+            ready = next((job for job in runnable if waits[job.platform] <= 0), None)
+            if ready is None:
+                if runnable:
+                    wait = min(waits[job.platform] for job in runnable)
+                    logger.info(f"所有平台都在冷却中，等待 {wait:.0f} 秒...")
+                elif parked:
+                    wait = self.park_poll
+                    logger.info(f"等待暂放的任务：{parked}")
+                else:
+                    break
+                wait = min(wait, self.park_poll) if parked else wait
+                WAIT_SECONDS.inc(wait)
+                self.sleep(wait)
+                continue
+
+            pending.remove(ready)
+            self.limiter.record(ready.platform)
+            with log_context(job=ready.job_id, platform=ready.platform), JOB_SECONDS.time(platform=ready.platform):
+                try:
+                    ready.result = bool(execute(ready))
+                except Exception as e:
+                    logger.error(f"✗ 任务执行出错：{ready}，{e}", exc_info=True)
+                    ready.result = False
+
+            if not ready.result and ready.wait_for is not None:
+                # 任务没有到达平台就中止了，不占用发布次数
+                self.limiter.refund(ready.platform)
+                ready.parked_at = last_check = self.limiter.clock()
+                parked.append(ready)
+                JOBS_TOTAL.inc(platform=ready.platform, result='parked')
+                logger.warning(f"⚠ 任务已暂放，等待条件满足后继续：{ready}")
+                continue
+            result = 'succeeded' if ready.result else 'failed'
+            summary[result].append(ready)
+            JOBS_TOTAL.inc(platform=ready.platform, result=result)
+
+        PENDING_JOBS.set(0)
+        logger.info(
+            f"调度完成：成功 {len(summary['succeeded'])}，失败 {len(summary['failed'])}，"
+            f"跳过 {len(summary['skipped'])}"
+        )
+        return summary
+
+    def _check_parked(self, parked: List[PublishJob], pending: List[PublishJob],
+                      summary: Dict[str, List[PublishJob]]):
+        """检查暂放的任务：条件满足的放回队首，超时的计为失败"""
+        now = self.limiter.clock()
+        for job in list(parked):
+            try:
+                ready = bool(job.wait_for())
+            except Exception as e:
+                logger.debug(f"检查暂放任务的条件失败：{job}，{e}")
+                ready = False
+            if ready:
+                logger.info(f"✓ 暂放的任务条件已满足，继续执行：{job}")
+                parked.remove(job)
+                job.wait_for = None
+                pending.insert(0, job)
+            elif now - job.parked_at >= self.park_timeout:
+                logger.error(f"✗ 暂放的任务等待超时（{self.park_timeout:.0f}秒）：{job}")
+                parked.remove(job)
+                job.result = False
+                summary['failed'].append(job)
+                JOBS_TOTAL.inc(platform=job.platform, result='failed')
@@ -6,7 +6,6 @@
 import os
 import json
 import pickle
-import time
 from pathlib import Path
 from typing import Optional, Dict, Any
 from selenium import webdriver
@@ -14,6 +13,7 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 
 from .logger import get_logger
+from .navigation import wait_for_page
 
 logger = get_logger(__name__)
 
@@ -55,6 +55,14 @@ class SessionManager:
         else:
             logger.info("浏览器模式: 正常模式")
     
+    def performance_log_enabled(self) -> bool:
+        """
+        是否开启 Chrome 性能日志：network_log 为 true（录制和回放时自动开启），
+        或开启了发布结果确认（publish_confirm.enabled，默认开启）
+        """
+        confirm_config = self.config.get('publish_confirm') or {}
+        return bool(self.config.get('network_log', False) or confirm_config.get('enabled', True))
+    
     def create_driver(self, use_existing: bool = True) -> webdriver.Chrome:
         """
         创建Chrome驱动实例
@@ -72,7 +80,14 @@ class SessionManager:
         if driver_type == 'chrome':
             service = ChromeService(self.config.get('service_location'))
             options = ChromeOptions()
-            options.page_load_strategy = 'normal'
+            # eager：文档解析完成即返回，不等待图片、统计脚本等子资源；页面是否可用由就绪探针判断
+            navigation_config = self.config.get('navigation') or {}
+            options.page_load_strategy = navigation_config.get('page_load_strategy', 'eager')
+            
+            # 开启性能日志，用于读取网络请求（录制回放、发布结果确认、故障诊断）
+            if self.performance_log_enabled():
+                options.set_capability('goog:loggingPrefs', {'performance': 'ALL', 'browser': 'ALL'})
+                options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
             
             # # New Headless 模式配置（优先级最高）
             # if self.headless_mode and not use_existing:
@@ -116,7 +131,11 @@ class SessionManager:
                 # 创建新的Chrome实例
                 options.add_argument('--start-maximized')
                 options.add_argument('--disable-blink-features=AutomationControlled')
-                
+
+                # 额外的启动参数（如回放时的 --headless=new、--host-resolver-rules）
+                for argument in self.config.get('chrome_arguments', []):
+                    options.add_argument(argument)
+
                 # # 后台模式配置
                 # if self.background_mode:
                 #     logger.info("启用后台模式配置（新实例）")
@@ -155,7 +174,7 @@ class SessionManager:
                 if not current_url.startswith(url):
                     logger.info(f"访问URL以获取Cookie：{url}")
                     self.driver.get(url)
-                    time.sleep(2)
+                    wait_for_page(self.driver)
             
             cookies = self.driver.get_cookies()
             
@@ -214,7 +233,7 @@ class SessionManager:
             if 'about:blank' in current_url or target_domain not in current_url:
                 logger.info(f"访问目标网站：{url}")
                 self.driver.get(url)
-                time.sleep(2)
+                wait_for_page(self.driver)
             else:
                 logger.info(f"已在目标网站，跳过访问")
             
@@ -257,7 +276,7 @@ class SessionManager:
             # 刷新页面以应用cookies
             logger.info("刷新页面以应用Cookie...")
             self.driver.refresh()
-            time.sleep(2)
+            wait_for_page(self.driver)
             
             return True
             
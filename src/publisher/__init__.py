@@ -2,32 +2,48 @@
 Publisher modules
 """
 
-from .base_publisher import BasePublisher
-from .csdn_publisher import CSDNPublisher
-from .cto51_publisher import CTO51Publisher
-from .toutiao_publisher import ToutiaoPublisher
-from .common_handler import (
-    wait_login, 
-    safe_click, 
-    safe_input, 
-    check_element_exists,
-    scroll_to_element,
-    retry_on_failure,
-    switch_to_new_tab,
-    close_current_tab
-)
+import importlib
 
-__all__ = [
-    'BasePublisher',
-    'CSDNPublisher',
-    'CTO51Publisher',
-    'ToutiaoPublisher',
-    'wait_login',
-    'safe_click',
-    'safe_input',
-    'check_element_exists',
-    'scroll_to_element',
-    'retry_on_failure',
-    'switch_to_new_tab',
-    'close_current_tab'
-]
+# 导出的名称 -> 所在模块；首次访问时才导入，导入包中的某个模块不会连带导入
+# Selenium 等依赖
+_EXPORTS = {
+    'BasePublisher': '.base_publisher',
+    'CSDNPublisher': '.csdn_publisher',
+    'CTO51Publisher': '.cto51_publisher',
+    'ToutiaoPublisher': '.toutiao_publisher',
+    'FlowEngine': '.flow_engine',
+    'FlowStep': '.flow_engine',
+    'PublishFlow': '.flow_engine',
+    'TaxonomyCache': '.taxonomy',
+    'get_taxonomy': '.taxonomy',
+    'DuplicateChecker': '.duplicates',
+    'PublishLedger': '.duplicates',
+    'DraftStore': '.drafts',
+    'PublishEndpoint': '.publish_response',
+    'PLATFORM_CAPABILITIES': '.capabilities',
+    'check_article': '.capabilities',
+    'fill_element': '.form_filler',
+    'fill_elements': '.form_filler',
+    'fill_fields': '.form_filler',
+    'wait_login': '.common_handler',
+    'safe_click': '.common_handler',
+    'safe_input': '.common_handler',
+    'check_element_exists': '.common_handler',
+    'scroll_to_element': '.common_handler',
+    'retry_on_failure': '.common_handler',
+    'switch_to_new_tab': '.common_handler',
+    'close_current_tab': '.common_handler',
+    'collect_texts': '.common_handler',
+    'click_by_texts': '.common_handler',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -14,7 +14,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from src.publisher.base_publisher import BasePublisher
-from src.publisher.common_handler import wait_login, safe_click, safe_input, switch_to_new_tab
+from src.publisher.common_handler import wait_login, safe_click, safe_input
+from src.publisher.form_filler import fill_fields
 from src.core.logger import get_logger
 from src.utils.file_utils import read_file_with_footer, parse_front_matter
 from src.utils.yaml_file_utils import read_alcloud, read_common
@@ -27,6 +28,9 @@ class AlicloudPublisher(BasePublisher):
     
     PLATFORM_NAME = "alicloud"
     
+    # 页面就绪探针：编辑器出现即可开始填写
+    READY_SELECTORS = ['.editor textarea.textarea']
+    
     def __init__(self, common_config: Dict[str, Any] = None, platform_config: Dict[str, Any] = None):
         """
         初始化阿里云发布器
@@ -216,9 +220,9 @@ class AlicloudPublisher(BasePublisher):
         logger.error(f"✗ 滑块验证失败，已重试 {max_retry} 次")
         return False
     
-    def _fill_title(self, front_matter: Dict[str, Any]) -> bool:
+    def _fill_title_and_summary(self, front_matter: Dict[str, Any]) -> bool:
         """
-        填写文章标题
+        填写文章标题和摘要（摘要填写失败不影响发布）
         
         Args:
             front_matter: 文章元数据
@@ -228,9 +232,6 @@ class AlicloudPublisher(BasePublisher):
         """
         try:
             logger.info("正在填写标题...")
-            title_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, '//input[@placeholder="请填写标题"]'))
-            )
             
             title = front_matter.get('title', self.common_config.get('title', ''))
             if not title:
@@ -240,10 +241,23 @@ class AlicloudPublisher(BasePublisher):
             # 清理标题中的引号
             title = self.clean_title(title)
             
-            title_element.clear()
-            title_element.send_keys(title)
+            # 摘要输入框与标题在同一页面，一次脚本调用一起填写
+            summary = self._summary(front_matter)
+            fields = [(By.XPATH, '//input[@placeholder="请填写标题"]', title)]
+            if summary:
+                fields.append((By.XPATH, '//div[@class="abstractContent-box"]//textarea[@placeholder="请填写摘要"]',
+                               summary))
+            results = fill_fields(self.driver, fields)
+            
+            if not results[0]:
+                logger.error("✗ 标题输入框的值与标题不一致")
+                return False
             logger.info(f"✓ 标题已填写：{title}")
-            time.sleep(2)
+            if summary:
+                if results[1]:
+                    logger.info(f"✓ 摘要已填写：{summary[:50]}...")
+                else:
+                    logger.warning("⚠ 摘要输入框的值与摘要不一致，继续...")
             return True
         except Exception as e:
             logger.error(f"✗ 填写标题失败：{e}", exc_info=True)
@@ -263,7 +277,7 @@ class AlicloudPublisher(BasePublisher):
             logger.info("正在填写文章内容...")
             
             # 读取 Markdown 内容（包含页脚）
-            file_content = read_file_with_footer(article_path)
+            file_content = read_file_with_footer(article_path, self.PLATFORM_NAME)
             logger.info(f"已读取文章内容，长度：{len(file_content)}")
             
             # 查找内容编辑区域（阿里云使用 textarea）
@@ -278,55 +292,33 @@ class AlicloudPublisher(BasePublisher):
             content_element.clear()
             content_element.send_keys(file_content)
             
-            logger.info("✓ 内容已填写")
-            time.sleep(3)
+            if not self.verify_editor_content(['.editor textarea.textarea'], file_content):
+                return False
             
+            logger.info("✓ 内容已填写")
             return True
         except Exception as e:
             logger.error(f"✗ 填写内容失败：{e}", exc_info=True)
             return False
     
-    def _fill_summary(self, front_matter: Dict[str, Any]) -> bool:
+    def _summary(self, front_matter: Dict[str, Any]) -> str:
         """
-        填写文章摘要
+        要填写的摘要：未启用自动摘要或没有设置摘要时为空字符串
         
         Args:
             front_matter: 文章元数据
         
         Returns:
-            bool: 是否成功
+            str: 摘要
         """
-        try:
-            if not self.auto_summary:
-                logger.info("未启用自动摘要，跳过")
-                return True
-            
-            logger.info("正在填写摘要...")
-            
-            # 从 front matter 或通用配置获取摘要
-            summary = front_matter.get('description', self.common_config.get('summary', ''))
-            
-            if not summary:
-                logger.info("未设置摘要，跳过")
-                return True
-            
-            # 查找摘要输入框
-            summary_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((
-                    By.XPATH, 
-                    '//div[@class="abstractContent-box"]//textarea[@placeholder="请填写摘要"]'
-                ))
-            )
-            
-            summary_element.clear()
-            summary_element.send_keys(summary)
-            
-            logger.info(f"✓ 摘要已填写：{summary[:50]}...")
-            time.sleep(1)
-            return True
-        except Exception as e:
-            logger.error(f"✗ 填写摘要失败：{e}", exc_info=True)
-            return False
+        if not self.auto_summary:
+            logger.info("未启用自动摘要，跳过摘要")
+            return ''
+        # 从 front matter 或通用配置获取摘要
+        summary = front_matter.get('description', self.common_config.get('summary', ''))
+        if not summary:
+            logger.info("未设置摘要，跳过摘要")
+        return summary or ''
     
     def _select_community(self) -> bool:
         """
@@ -374,6 +366,7 @@ class AlicloudPublisher(BasePublisher):
                     '//div[@class="publish-fixed-box-btn"]/button[contains(text(),"发布文章")]'
                 ))
             )
+            watcher = self.watch_publish()
             publish_button.click()
             
             logger.info("已点击发布按钮，等待响应...")
@@ -385,8 +378,9 @@ class AlicloudPublisher(BasePublisher):
                 logger.error("✗ 发布时滑块验证失败")
                 return False
             
+            if not self.confirm_publish(watcher):
+                return False
             logger.info("✓ 文章发布成功")
-            time.sleep(3)
             return True
         except Exception as e:
             logger.error(f"✗ 发布文章失败：{e}", exc_info=True)
@@ -411,37 +405,37 @@ class AlicloudPublisher(BasePublisher):
             if not self.driver:
                 self.setup_driver(use_existing=True)
             
-            # 2. 打开新标签页
-            switch_to_new_tab(self.driver, self.site_url)
-            
-            # 3. 尝试加载Cookie
-            cookie_loaded = self.load_cookies_if_exists(self.site_url)
-            if cookie_loaded:
-                logger.info("✓ 成功加载已保存的登录状态")
-                # 刷新页面以应用cookie
-                self.driver.refresh()
-                time.sleep(3)
-            else:
-                logger.info("⚠ 未找到保存的登录状态，需要手动登录")
-            
-            # 4. 等待登录（如果需要）
-            if not self._check_login_status():
-                logger.info("检测到未登录，等待用户登录...")
-                if not self._wait_for_login():
-                    logger.error("✗ 登录超时或失败")
-                    return False
+            # 重试时回到上次失败时的编辑器标签页，跳过打开页面和登录
+            if not self.resume_editor(article_path):
+                # 2. 打开新标签页
+                self.open_page(self.site_url, new_tab=True, wait_ready=False)
+                
+                # 3. 尝试加载Cookie（加载后已刷新页面）
+                cookie_loaded = self.load_cookies_if_exists(self.site_url)
+                if cookie_loaded:
+                    logger.info("✓ 成功加载已保存的登录状态")
+                    self.wait_page_ready()
+                else:
+                    logger.info("⚠ 未找到保存的登录状态，需要手动登录")
                 
-                # 登录成功后保存Cookie
-                logger.info("✓ 登录成功，保存登录状态...")
-                self.save_login_state(self.site_url)
-            else:
-                # 如果已经登录，更新cookies以保持同步
-                logger.debug("已登录状态，更新cookies...")
-                self.update_cookies(self.site_url)
+                # 4. 等待登录（如果需要）
+                if not self._check_login_status():
+                    logger.info("检测到未登录，等待用户登录...")
+                    if not self.wait_for_login_or_defer():
+                        logger.error("✗ 登录超时或失败")
+                        return False
+                    
+                    # 登录成功后保存Cookie
+                    logger.info("✓ 登录成功，保存登录状态...")
+                    self.save_login_state(self.site_url)
+                else:
+                    # 如果已经登录，更新cookies以保持同步
+                    logger.debug("已登录状态，更新cookies...")
+                    self.update_cookies(self.site_url)
             
             # 5. 处理滑块验证（如果存在）
             logger.info("检查是否需要滑块验证...")
-            if not self._handle_slider_verification():
+            if not self.run_step(self._handle_slider_verification):
                 logger.error("✗ 滑块验证失败")
                 logger.info("提示：请手动完成滑块验证后重试")
                 return False
@@ -449,26 +443,22 @@ class AlicloudPublisher(BasePublisher):
             # 6. 解析文章元数据
             front_matter = self.parse_article_metadata(article_path)
             
-            # 7. 填写标题
-            if not self._fill_title(front_matter):
+            # 7. 填写标题和摘要
+            if not self.run_step(self._fill_title_and_summary, front_matter):
                 logger.error("✗ 填写标题失败")
                 return False
             
             # 8. 填写内容
-            if not self._fill_content(article_path):
+            if not self.run_step(self._fill_content, article_path):
                 logger.error("✗ 填写内容失败")
                 return False
             
-            # 9. 填写摘要
-            if not self._fill_summary(front_matter):
-                logger.warning("⚠ 填写摘要失败，继续...")
-            
-            # 10. 选择子社区
-            if not self._select_community():
+            # 9. 选择子社区
+            if not self.run_step(self._select_community):
                 logger.warning("⚠ 选择子社区失败，继续...")
             
-            # 11. 发布文章（可能再次出现滑块验证）
-            if not self._publish_article():
+            # 10. 发布文章（可能再次出现滑块验证）
+            if not self.run_step(self._publish_article):
                 logger.error("✗ 发布文章失败")
                 return False
             
@@ -0,0 +1,305 @@
+"""
+文章索引
+记录文章目录中每篇文章的路径、修改时间、大小、正文指纹和 front matter，
+按修改时间和正文指纹增量更新，结合发布记录按标题、标签、日期和发布状态筛选文章
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.core.logger import get_logger
+from src.publisher.duplicates import PublishLedger, content_hash, normalize_title
+from src.utils.front_matter import split_front_matter
+
+logger = get_logger(__name__)
+
+# 索引文件
+INDEX_FILE = Path(__file__).parent.parent.parent / 'data' / 'article_index.json'
+
+# 索引格式版本，格式变化时整体重建
+INDEX_VERSION = 1
+
+def _as_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in re.split(r'[,，]', value) if item.strip()]
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    return [str(value)]
+
+
+def _as_date(value: Any, mtime: float) -> str:
+    """front matter 的 date 统一为 ISO 日期字符串，没有时使用修改时间"""
+    match = re.match(r'(\d{4})-(\d{1,2})-(\d{1,2})', str(value or '').strip())
+    if match:
+        year, month, day = match.groups()
+        return f"{year}-{int(month):02d}-{int(day):02d}"
+    return datetime.fromtimestamp(mtime).date().isoformat()
+
+
+def build_entry(path: str, text: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    由文章内容生成索引记录
+
+    Args:
+        path: 文章路径
+        text: 文章全文
+        mtime_ns: 修改时间（纳秒）
+        size: 文件大小
+
+    Returns:
+        Dict: 索引记录
+    """
+    from src.utils.file_utils import remove_truncate_content
+
+    front_matter, body = split_front_matter(text)
+    # 日期等非 JSON 类型转为字符串，与从索引文件读回的记录一致
+    front_matter = json.loads(json.dumps(front_matter, ensure_ascii=False, default=str))
+    title = str(front_matter.get('title') or '').strip()
+    return {
+        'path': path,
+        'name': os.path.basename(path),
+        'mtime_ns': mtime_ns,
+        'size': size,
+        'hash': content_hash(remove_truncate_content(body)),
+        'title': title,
+        'title_key': normalize_title(title),
+        'tags': _as_list(front_matter.get('tags')),
+        'categories': _as_list(front_matter.get('categories')),
+        'date': _as_date(front_matter.get('date'), mtime_ns / 1e9),
+        'front_matter': front_matter,
+    }
+
+
+def parse_query(text: str) -> Dict[str, Any]:
+    """
+    解析筛选条件
+
+    空格分隔，支持 ``tag:标签``、``since:2024-01-01``、``until:2024-12-31``、
+    ``platform:csdn``、``published`` / ``unpublished``（或 已发布 / 未发布），
+    其余词语匹配标题或文件名。
+
+    Args:
+        text: 筛选条件
+
+    Returns:
+        Dict: ArticleIndex.query 的参数
+    """
+    kwargs: Dict[str, Any] = {}
+    words = []
+    for token in (text or '').split():
+        key, sep, value = token.partition(':')
+        key = key.lower()
+        if sep and value and key in ('tag', 'since', 'until', 'platform'):
+            if key == 'tag':
+                kwargs.setdefault('tags', []).append(value)
+            else:
+                kwargs[key] = value
+        elif key in ('published', '已发布'):
+            kwargs['published'] = True
+        elif key in ('unpublished', '未发布'):
+            kwargs['published'] = False
+        else:
+            words.append(token)
+    if words:
+        kwargs['text'] = ' '.join(words)
+    return kwargs
+
+
+class ArticleIndex:
+    """
+    文章目录索引
+
+    数据保存在 ``data/article_index.json``。``refresh()`` 只重新读取修改时间或大小变化的文件，
+    正文指纹没变时只更新修改时间；发布状态在查询时从发布记录（PublishLedger）读取。
+
+    Example:
+        index = ArticleIndex(content_dir)
+        index.refresh()
+        for entry in index.query(tags=['Python'], published=False, platform='csdn'):
+            print(entry['path'], entry['title'])
+    """
+
+    def __init__(self, content_dir: str, path: Optional[Path] = None, ledger: Optional[PublishLedger] = None):
+        """
+        初始化文章索引
+
+        Args:
+            content_dir: 文章目录
+            path: 索引文件路径，默认 data/article_index.json
+            ledger: 发布记录，默认 data/publish_ledger.json
+        """
+        self.content_dir = os.path.abspath(content_dir)
+        self.path = Path(path or INDEX_FILE)
+        self.ledger = ledger
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == INDEX_VERSION and data.get('content_dir') == self.content_dir:
+                    return data.get('articles', {})
+            except Exception as e:
+                logger.warning(f"⚠ 读取文章索引失败：{self.path}，错误：{e}")
+        return {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_suffix('.tmp')
+        data = {'version': INDEX_VERSION, 'content_dir': self.content_dir, 'articles': self._entries}
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        tmp_file.replace(self.path)
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        增量更新索引
+
+        Returns:
+            Dict: added / updated / removed / unchanged 的文章数
+        """
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+        with self._lock:
+            seen = set()
+            for root, dirs, files in os.walk(self.content_dir):
+                dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+                for filename in files:
+                    if not filename.endswith('.md'):
+                        continue
+                    path = os.path.join(root, filename)
+                    seen.add(path)
+                    self._refresh_file(path, stats)
+
+            for path in [path for path in self._entries if path not in seen]:
+                del self._entries[path]
+                stats['removed'] += 1
+
+            if stats['added'] or stats['updated'] or stats['removed']:
+                self._save()
+        logger.debug(f"文章索引已更新：{stats}")
+        return stats
+
+    def _refresh_file(self, path: str, stats: Dict[str, int]):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        entry = self._entries.get(path)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            stats['unchanged'] += 1
+            return
+
+        try:
+            with open(path, 'r', encoding='UTF-8') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"⚠ 读取文章失败：{path}，错误：{e}")
+            return
+        new_entry = build_entry(path, text, stat.st_mtime_ns, stat.st_size)
+        if entry and entry['hash'] == new_entry['hash'] and entry['front_matter'] == new_entry['front_matter']:
+            # 只是修改时间变了（如 touch、同步工具），内容没变
+            entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            stats['updated'] += 1
+            return
+        self._entries[path] = new_entry
+        stats['added' if entry is None else 'updated'] += 1
+
+    def _published(self) -> Dict[str, Dict[str, List[str]]]:
+        """发布记录中正文指纹/规范化标题 -> 已发布的平台"""
+        ledger = self.ledger or PublishLedger()
+        by_hash: Dict[str, List[str]] = {}
+        by_title: Dict[str, List[str]] = {}
+        for platform, entries in ledger.all_entries().items():
+            for record in entries:
+                if record.get('hash'):
+                    by_hash.setdefault(record['hash'], []).append(platform)
+                if record.get('title_key'):
+                    by_title.setdefault(record['title_key'], []).append(platform)
+        return {'hash': by_hash, 'title': by_title}
+
+    def query(self, text: str = '', tags: Optional[Iterable[str]] = None, since: str = '', until: str = '',
+              platform: str = '', published: Optional[bool] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        筛选文章（新的在前）
+
+        Args:
+            text: 标题或文件名包含的关键字（忽略大小写）
+            tags: 必须全部包含的标签（忽略大小写）
+            since: 最早日期（含），ISO 格式
+            until: 最晚日期（含），ISO 格式
+            platform: 与 published 一起使用，只看该平台的发布状态
+            published: True 只返回已发布的文章，False 只返回未发布的，None 不限
+            limit: 最多返回的文章数
+
+        Returns:
+            List[Dict]: 索引记录副本，published 字段为已发布的平台列表
+        """
+        keyword = (text or '').casefold()
+        wanted_tags = {tag.casefold() for tag in tags or []}
+        published_map = self._published()
+
+        results = []
+        with self._lock:
+            entries = list(self._entries.values())
+        for entry in entries:
+            if keyword and keyword not in entry['title'].casefold() and keyword not in entry['name'].casefold():
+                continue
+            if wanted_tags and not wanted_tags <= {tag.casefold() for tag in entry['tags']}:
+                continue
+            if since and entry['date'] < since:
+                continue
+            if until and entry['date'] > until:
+                continue
+
+            platforms = set(published_map['hash'].get(entry['hash'], []))
+            if entry['title_key']:
+                platforms.update(published_map['title'].get(entry['title_key'], []))
+            if published is not None:
+                is_published = platform in platforms if platform else bool(platforms)
+                if is_published != published:
+                    continue
+            results.append(dict(entry, published=sorted(platforms)))
+
+        results.sort(key=lambda entry: (entry['date'], entry['path']), reverse=True)
+        return results[:limit] if limit else results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """列出文章目录中的文章：python cli.py list [筛选条件]"""
+    import argparse
+
+    from src.utils.yaml_file_utils import read_common
+
+    parser = argparse.ArgumentParser(description='列出文章目录中的文章（新的在前）')
+    parser.add_argument('query', nargs='*',
+                        help='筛选条件，如 tag:python since:2024-01-01 unpublished platform:csdn')
+    parser.add_argument('--dir', help='文章目录，默认为 common.yaml 的 content_dir')
+    parser.add_argument('--limit', type=int, help='最多列出的文章数')
+    args = parser.parse_args(argv)
+
+    content_dir = args.dir or read_common().get('content_dir')
+    if not content_dir or not os.path.isdir(content_dir):
+        print(f"✗ 文章目录不存在：{content_dir}", file=sys.stderr)
+        return 1
+    index = ArticleIndex(content_dir)
+    index.refresh()
+    entries = index.query(limit=args.limit, **parse_query(' '.join(args.query)))
+    for entry in entries:
+        published = f"  [已发布：{', '.join(entry['published'])}]" if entry['published'] else ''
+        print(f"{entry['date']}  {entry['title'] or entry['name']}  {entry['path']}{published}")
+    print(f"共 {len(entries)} 篇")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
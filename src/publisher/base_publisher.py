@@ -3,15 +3,29 @@
 定义所有平台发布器的通用接口
 """
 
+import re
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Callable
 from pathlib import Path
 
-from src.core.logger import get_logger
+from src.core.artifacts import FailureArtifacts, FailureCapture, new_run_id
+from src.core.logger import get_logger, log_context
+from src.core.metrics import get_metrics
+from src.core.navigation import NavigationProfile, wait_for_page
+from src.core.notify import notify
 from src.core.session_manager import SessionManager
+from src.publisher.content_injector import inject_chunks
+from src.publisher.content_verifier import wait_for_content
+from src.publisher.flow_engine import FlowEngine, FlowStep, PublishFlow
+from src.publisher.publish_response import PublishEndpoint, PublishResponseWatcher
+from src.publisher.taxonomy import get_taxonomy
 
 logger = get_logger(__name__)
 
+STEP_SECONDS = get_metrics().histogram('publish_step_seconds', '发布步骤耗时（秒）', ('platform', 'step'))
+STEPS_TOTAL = get_metrics().counter('publish_steps_total', '发布步骤数', ('platform', 'step', 'result'))
+
 
 class BasePublisher(ABC):
     """
@@ -21,6 +35,27 @@ class BasePublisher(ABC):
     # 平台名称，子类需要覆盖
     PLATFORM_NAME = "base"
     
+    # 步骤探针：步骤名 -> 探针方法名。探针接收与步骤相同的参数，
+    # 返回 True 表示编辑器中已经有该步骤的结果（如标题已填写），重试时跳过该步骤
+    STEP_PROBES: Dict[str, str] = {}
+    
+    # 发布接口：点击最终发布后根据该接口的响应确认结果，子类按需覆盖
+    PUBLISH_ENDPOINT: Optional[PublishEndpoint] = None
+    # 发布成功页：等待发布接口响应超时时，根据页面地址（可含命名分组 id）或页面文字确认结果
+    PUBLISH_SUCCESS_URL: Optional[str] = None
+    PUBLISH_SUCCESS_TEXTS: List[str] = ['发布成功']
+    
+    # 页面就绪探针（CSS选择器）：打开编辑器页面后任一出现即可开始操作，子类按需覆盖
+    READY_SELECTORS: List[str] = []
+    
+    # 草稿地址中的草稿ID（命名分组 id）。声明后支持两阶段发布：save 阶段保存草稿，审阅后 publish_draft 发布
+    DRAFT_URL_PATTERN: Optional[str] = None
+    # 打开草稿后的就绪探针，为空时使用 READY_SELECTORS
+    DRAFT_READY_SELECTORS: List[str] = []
+    
+    # 登录后才有的Cookie名：暂放的任务通过它的变化判断用户是否已重新登录，无需切换标签页
+    LOGIN_COOKIE: Optional[str] = None
+    
     def __init__(self, common_config: Dict[str, Any], platform_config: Dict[str, Any]):
         """
         初始化发布器
@@ -37,6 +72,50 @@ class BasePublisher(ABC):
         self.session_manager = SessionManager(self.PLATFORM_NAME, common_config)
         self.driver = None
         
+        # 步骤钩子（录制、回放等），需实现 before_step / after_step
+        self.step_hooks: List[Any] = []
+        # 每个发布步骤的耗时记录
+        self.step_timings: List[Dict[str, Any]] = []
+        # 本次运行ID（每次 publish_with_resume / publish_draft 重新生成）和最近一次步骤异常，用于故障现场归档
+        self.run_id = new_run_id(self.PLATFORM_NAME)
+        self.last_step_error = ''
+        
+        # 检查点：当前文章、编辑器标签页和已完成的步骤，失败重试时从失败的步骤继续
+        self.checkpoint: Dict[str, Any] = {'article': None, 'window': None, 'completed': []}
+        self.resuming = False
+        self._trust_checkpoint = False
+        self._retry_pending = False
+        
+        # 最近一次发布的文章ID和链接；confirmed 为 True 表示已点击最终发布并确认成功
+        # （未开启自动发布、停在编辑器等待人工发布时没有该标志）
+        self.publish_result: Dict[str, Any] = {}
+        
+        # 草稿模式：填写完标题和正文后保存草稿并结束，草稿ID和地址记录在 draft_result
+        self.draft_mode = False
+        self.draft_result: Dict[str, str] = {}
+        
+        # 延后登录：需要登录时不阻塞等待，标记 login_required 后返回，由调度器暂放任务
+        self.defer_login = False
+        self.login_required = False
+        self.login_window: Optional[str] = None
+        self._stale_login_cookie: Optional[str] = None
+        
+        # 步骤失败时自动保存截图、DOM、控制台和网络日志
+        failure_config = common_config.get('failure_artifacts') or {}
+        if failure_config.get('enabled', True):
+            self.step_hooks.append(FailureCapture(FailureArtifacts(
+                max_entries=failure_config.get('max_entries', 50),
+                max_mb=failure_config.get('max_mb', 200),
+            )))
+        
+        # 导航配置：按平台屏蔽用不到的资源
+        self.navigation = NavigationProfile(self.PLATFORM_NAME, common_config.get('navigation'))
+        
+        # 分类体系缓存（标签、分类、专栏、话题），过期时在后台刷新（同一平台共享缓存，
+        # 未过期或刚刷新失败时不发请求）
+        self.taxonomy = get_taxonomy(self.PLATFORM_NAME)
+        self.taxonomy.refresh_async()
+        
         self.logger.info(f"初始化 {self.PLATFORM_NAME} 发布器")
     
     def setup_driver(self, use_existing: bool = True):
@@ -59,8 +138,91 @@ class BasePublisher(ABC):
         Returns:
             bool: 是否成功加载Cookie
         """
+        self.navigation.apply(self.driver)
         return self.session_manager.load_cookies(site_url)
     
+    def open_page(self, url: str, new_tab: bool = False, wait_ready: bool = True) -> bool:
+        """
+        打开页面（屏蔽本平台用不到的资源），等待就绪探针出现
+        
+        Args:
+            url: 页面地址
+            new_tab: 是否在新标签页中打开
+            wait_ready: 是否等待就绪探针；为 False 时只等待文档解析完成（如加载Cookie前先打开页面）
+        
+        Returns:
+            bool: 是否在超时前就绪（未登录时探针不会出现，返回 False）
+        """
+        if new_tab:
+            self.driver.switch_to.new_window('tab')
+        return self.navigation.open(self.driver, url, ready=self.READY_SELECTORS if wait_ready else ())
+    
+    def wait_page_ready(self) -> bool:
+        """
+        等待当前页面的就绪探针出现（如加载Cookie刷新页面之后）
+        
+        Returns:
+            bool: 是否在超时前就绪
+        """
+        return wait_for_page(self.driver, self.READY_SELECTORS, timeout=self.navigation.ready_timeout)
+    
+    def wait_for_login_or_defer(self) -> bool:
+        """
+        需要登录时调用：默认阻塞等待用户登录（_wait_for_login）；
+        开启 defer_login 时发送提醒、保留登录标签页并立即返回 False，
+        调用方通过 login_probe() 得到判断是否已登录的函数
+        
+        Returns:
+            bool: 是否已登录
+        """
+        if not self.defer_login:
+            return self._wait_for_login()
+        
+        self.login_required = True
+        self.login_window = self.driver.current_window_handle
+        self._stale_login_cookie = self._login_cookie_value()
+        config = self.common_config.get('login_queue') or {}
+        notify(f"{self.PLATFORM_NAME} 需要登录",
+               f"请在浏览器中切换到 {self.PLATFORM_NAME} 的登录页完成登录，登录后自动继续发布",
+               desktop=config.get('desktop_notify', True))
+        return False
+    
+    def _login_cookie_value(self) -> Optional[str]:
+        """通过 CDP 读取站点的登录Cookie（不切换标签页）"""
+        if not self.LOGIN_COOKIE:
+            return None
+        try:
+            cookies = self.driver.execute_cdp_cmd('Network.getCookies', {'urls': [self.site_url]})['cookies']
+        except Exception as e:
+            self.logger.debug(f"读取登录Cookie失败：{e}")
+            return None
+        return next((cookie['value'] for cookie in cookies if cookie['name'] == self.LOGIN_COOKIE), None)
+    
+    def login_probe(self) -> Callable[[], bool]:
+        """
+        返回判断用户是否已在登录标签页完成登录的函数
+        
+        有 LOGIN_COOKIE 时比较登录Cookie是否出现或变化；否则切换到登录标签页检查登录状态。
+        检测到登录后保存Cookie，重新执行任务时不会再加载过期的Cookie。
+        
+        Returns:
+            Callable: 已登录时返回 True
+        """
+        def probe() -> bool:
+            if self.LOGIN_COOKIE:
+                value = self._login_cookie_value()
+                if not value or value == self._stale_login_cookie:
+                    return False
+                self.driver.switch_to.window(self.login_window)
+            else:
+                self.driver.switch_to.window(self.login_window)
+                if not self._check_login_status():
+                    return False
+            self.logger.info(f"✓ 检测到 {self.PLATFORM_NAME} 已登录，保存登录状态")
+            self.save_login_state(self.site_url)
+            return True
+        return probe
+    
     def save_login_state(self, site_url: str):
         """
         保存登录状态（Cookie）
@@ -79,6 +241,438 @@ class BasePublisher(ABC):
         """
         self.session_manager.update_cookies(site_url)
     
+    def run_step(self, func: Callable, *args, **kwargs):
+        """
+        执行一个发布步骤，记录耗时并通知步骤钩子
+        
+        步骤名取自方法名（去掉前导下划线）；返回 False 或抛出异常视为步骤失败。
+        
+        Args:
+            func: 步骤方法，如 self._fill_title
+            *args: 传给步骤方法的位置参数
+            **kwargs: 传给步骤方法的关键字参数
+        
+        Returns:
+            步骤方法的返回值
+        """
+        name = func.__name__.lstrip('_')
+        if self.resuming and self._step_already_done(name, *args, **kwargs):
+            self.logger.info(f"↷ 跳过已完成的步骤：{name}")
+            self.step_timings.append({'step': name, 'seconds': 0.0, 'ok': True, 'skipped': True})
+            STEPS_TOTAL.inc(platform=self.PLATFORM_NAME, step=name, result='skipped')
+            return True
+        # 有步骤重新执行后，后续没有探针的步骤不能再信任检查点
+        self._trust_checkpoint = False
+        
+        self._notify_step_hooks('before_step', name)
+        
+        start = time.perf_counter()
+        ok = False
+        self.last_step_error = ''
+        try:
+            result = func(*args, **kwargs)
+            ok = result is not False
+            if ok:
+                self._save_checkpoint(name)
+            return result
+        except Exception as e:
+            self.last_step_error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.step_timings.append({'step': name, 'seconds': round(elapsed, 3), 'ok': ok})
+            STEP_SECONDS.observe(elapsed, platform=self.PLATFORM_NAME, step=name)
+            STEPS_TOTAL.inc(platform=self.PLATFORM_NAME, step=name, result='ok' if ok else 'failed')
+            self.logger.debug(f"步骤 {name} 耗时 {elapsed:.2f}秒（{'成功' if ok else '失败'}）")
+            self._notify_step_hooks('after_step', name, ok, elapsed)
+    
+    def _step_already_done(self, name: str, *args, **kwargs) -> bool:
+        """判断重试时步骤能否跳过：有探针以探针为准，没有探针时看检查点"""
+        probe_name = self.STEP_PROBES.get(name)
+        if probe_name:
+            try:
+                return bool(getattr(self, probe_name)(*args, **kwargs))
+            except Exception as e:
+                self.logger.debug(f"步骤探针 {probe_name} 执行失败：{e}")
+                return False
+        return self._trust_checkpoint and name in self.checkpoint['completed']
+    
+    def _save_checkpoint(self, name: str):
+        """记录已完成的步骤和所在的标签页"""
+        if name not in self.checkpoint['completed']:
+            self.checkpoint['completed'].append(name)
+        try:
+            self.checkpoint['window'] = self.driver.current_window_handle
+        except Exception:
+            pass
+    
+    def resume_editor(self, article_path: str) -> bool:
+        """
+        重试时回到上次失败时的编辑器标签页
+        
+        由 publish_with_resume 发起重试、同一篇文章且标签页仍然存在时，
+        切回该标签页并返回 True，调用方可以跳过
+        打开页面、加载Cookie和登录检查；否则清空检查点并返回 False。
+        没有声明 STEP_PROBES 的平台无法判断编辑器中哪些步骤已经生效，重试总是从头开始。
+        
+        Args:
+            article_path: 文章文件路径
+        
+        Returns:
+            bool: 是否从检查点继续
+        """
+        window = self.checkpoint.get('window')
+        retry_pending, self._retry_pending = self._retry_pending, False
+        if retry_pending and not self.STEP_PROBES:
+            self.logger.info("平台没有步骤探针，重新打开编辑器从头发布")
+            retry_pending = False
+        if retry_pending and self.checkpoint.get('article') == article_path and window and self.driver:
+            try:
+                if window in self.driver.window_handles:
+                    self.driver.switch_to.window(window)
+                    self.resuming = True
+                    self._trust_checkpoint = True
+                    self.logger.info(f"✓ 从检查点继续，已完成步骤：{self.checkpoint['completed']}")
+                    return True
+            except Exception as e:
+                self.logger.warning(f"⚠ 无法回到上次的编辑器标签页：{e}")
+        
+        self.checkpoint = {'article': article_path, 'window': None, 'completed': []}
+        self.resuming = False
+        self._trust_checkpoint = False
+        return False
+    
+    def publish_with_resume(self, article_path: str, attempts: int = 2) -> bool:
+        """
+        发布文章，失败时在同一个编辑器标签页中从失败的步骤重试
+        
+        Args:
+            article_path: 文章文件路径
+            attempts: 最多尝试次数
+        
+        Returns:
+            bool: 是否发布成功
+        """
+        self.checkpoint = {'article': None, 'window': None, 'completed': []}
+        self.publish_result = {}
+        self.run_id = new_run_id(self.PLATFORM_NAME)
+        with log_context(run_id=self.run_id, platform=self.PLATFORM_NAME):
+            for attempt in range(1, attempts + 1):
+                if self.publish(article_path):
+                    self.checkpoint = {'article': None, 'window': None, 'completed': []}
+                    self.resuming = False
+                    return True
+                if not self.checkpoint.get('window'):
+                    # 还没有任何步骤完成（如登录失败），重试没有意义
+                    break
+                if attempt < attempts:
+                    self.logger.warning(f"⚠ 第 {attempt} 次发布失败，从失败的步骤重试...")
+                    self._retry_pending = True
+        self.resuming = False
+        self._retry_pending = False
+        return False
+    
+    def _notify_step_hooks(self, event: str, *args):
+        """通知所有步骤钩子，钩子本身的异常不影响发布流程"""
+        for hook in self.step_hooks:
+            handler = getattr(hook, event, None)
+            if not handler:
+                continue
+            try:
+                handler(self, *args)
+            except Exception as e:
+                self.logger.warning(f"⚠ 步骤钩子 {hook.__class__.__name__}.{event} 执行失败：{e}")
+    
+    def resolve_taxonomy(self, kind: str, names, limit: Optional[int] = None) -> List[str]:
+        """
+        把文章中的标签等名称映射为平台可用的值（纯本地计算，不访问浏览器）
+        
+        别名取自平台配置的 ``{kind}_aliases``，如 ``tags_aliases: {py: Python}``。
+        
+        Args:
+            kind: tags / categories / columns / topics
+            names: 文章中的名称
+            limit: 最多返回的数量
+        
+        Returns:
+            List[str]: 映射后的名称
+        """
+        aliases = self.platform_config.get(f'{kind}_aliases') or {}
+        return self.taxonomy.resolve(kind, names, aliases=aliases, limit=limit)
+    
+    def verify_editor_content(self, selectors: List[str], expected: str, markup: str = 'markdown') -> bool:
+        """
+        粘贴正文后等待编辑器完整接收，代替固定等待
+        
+        超时时间取自通用配置的 ``content_verify_timeout``（默认30秒）。
+        读取不到编辑器文本（如旧版iframe编辑器）时无法校验，只记录警告。
+        
+        Args:
+            selectors: 编辑器的候选CSS选择器
+            expected: 粘贴的原文（Markdown 源码或HTML）
+            markup: 原文格式，markdown 或 html
+        
+        Returns:
+            bool: 正文是否完整
+        """
+        result = wait_for_content(self.driver, selectors, expected, markup=markup,
+                                  timeout=self.common_config.get('content_verify_timeout', 30))
+        detail = (f"长度比例 {result['length_ratio']:.2f}，相似度 {result['similarity']:.2f}，"
+                  f"耗时 {result['elapsed']:.1f}秒")
+        if result['status'] == 'match':
+            self.logger.info(f"✓ 正文已完整写入编辑器（{detail}）")
+            return True
+        if result['status'] == 'unreadable':
+            self.logger.warning("⚠ 无法读取编辑器文本，跳过正文校验")
+            return True
+        reason = '内容被截断或粘贴失败' if result['status'] == 'mismatch' else '等待编辑器处理超时'
+        self.logger.error(f"✗ 编辑器中的正文与原文不一致：{reason}（{detail}）")
+        return False
+    
+    def should_inject_in_chunks(self, content: str) -> bool:
+        """
+        正文是否需要分块写入（通用配置 ``chunked_injection``，默认超过2万字符时分块）
+        
+        Args:
+            content: 正文
+        
+        Returns:
+            bool: 是否分块写入
+        """
+        config = self.common_config.get('chunked_injection') or {}
+        return config.get('enabled', True) and len(content) > config.get('threshold', 20000)
+    
+    def inject_content(self, selectors: List[str], content: str, markup: str = 'markdown') -> bool:
+        """
+        分块写入正文，每块写入后等待编辑器处理完成并校验进度
+        
+        不经过系统剪贴板；最后一块写入后的校验即为全文校验。
+        
+        Args:
+            selectors: 编辑器的候选CSS选择器
+            content: 正文（Markdown 源码或HTML）
+            markup: 正文格式，markdown 或 html
+        
+        Returns:
+            bool: 是否全部写入
+        """
+        config = self.common_config.get('chunked_injection') or {}
+        return inject_chunks(self.driver, selectors, content, markup=markup,
+                             max_chars=config.get('chunk_chars', 6000),
+                             chunk_timeout=self.common_config.get('content_verify_timeout', 30))
+    
+    def watch_publish(self) -> Optional[PublishResponseWatcher]:
+        """
+        在点击最终发布按钮之前调用，开始等待发布接口的响应
+        
+        平台没有声明 ``PUBLISH_ENDPOINT``、通用配置 ``publish_confirm.enabled`` 为 false，
+        或浏览器没有开启性能日志时返回 None。
+        
+        Returns:
+            PublishResponseWatcher: 传给 confirm_publish
+        """
+        self.publish_result = {}
+        if not self._publish_confirm_enabled():
+            return None
+        if not self.session_manager.performance_log_enabled():
+            self.logger.debug("未开启性能日志，发布后改为检查发布成功页")
+            return None
+        return PublishResponseWatcher(self.driver, self.PUBLISH_ENDPOINT).start()
+    
+    def _publish_confirm_enabled(self) -> bool:
+        """平台声明了发布接口，且没有关闭发布结果确认"""
+        config = self.common_config.get('publish_confirm') or {}
+        return self.PUBLISH_ENDPOINT is not None and config.get('enabled', True)
+    
+    def confirm_publish(self, watcher: Optional[PublishResponseWatcher], fallback_wait: float = 3) -> bool:
+        """
+        点击最终发布按钮之后，根据发布接口的响应确认结果
+        
+        确认成功时 ``self.publish_result`` 中 confirmed 为 True，接口返回了文章ID和链接时一并记录；
+        接口返回失败时返回 False；
+        等待接口响应超时、没有网络日志（点击后没有任何网络事件，或未开启性能日志）时
+        改为检查发布成功页（check_publish_page），页面上也没有成功标志时视为失败；
+        平台没有发布接口或关闭了发布结果确认时，等待 fallback_wait 秒后按页面操作结果处理。
+        
+        Args:
+            watcher: watch_publish 的返回值
+            fallback_wait: 未等待接口响应时（watcher 为 None）点击后的等待时间（秒）
+        
+        Returns:
+            bool: 是否发布成功
+        """
+        if watcher is None:
+            time.sleep(fallback_wait)
+            if self._publish_confirm_enabled():
+                self.logger.warning("⚠ 没有网络日志，无法读取发布接口的响应，检查发布成功页")
+                return self._confirm_by_page()
+            self.publish_result['confirmed'] = True
+            return True
+        
+        config = self.common_config.get('publish_confirm') or {}
+        result = watcher.wait(timeout=config.get('timeout', 20))
+        if result['status'] == 'ok':
+            self.publish_result = {'id': result['id'], 'url': result['url'], 'confirmed': True}
+            self.logger.info(f"✓ 发布接口返回成功（{result['elapsed']:.1f}秒）：{result['url'] or result['id']}")
+            return True
+        if result['status'] == 'error':
+            self.logger.error(f"✗ 发布接口返回失败：{result['message']}")
+            return False
+        if result['status'] == 'unavailable':
+            self.logger.warning(f"⚠ 点击发布后 {result['elapsed']:.1f} 秒内没有网络日志，检查发布成功页")
+        else:
+            self.logger.warning(f"⚠ 等待发布接口响应超时（{result['elapsed']:.1f}秒），检查发布成功页")
+        return self._confirm_by_page()
+    
+    def _confirm_by_page(self) -> bool:
+        """根据发布成功页确认结果，没有成功标志时视为失败"""
+        if self.check_publish_page():
+            self.publish_result['confirmed'] = True
+            return True
+        self.logger.error("✗ 无法确认发布结果：没有发布接口的响应，页面上也没有发布成功的标志")
+        return False
+    
+    def check_publish_page(self, timeout: float = 5) -> bool:
+        """
+        检查当前页面是否为发布成功页：地址匹配 ``PUBLISH_SUCCESS_URL``，或页面中有 ``PUBLISH_SUCCESS_TEXTS``
+        
+        地址中有文章ID（命名分组 id）时记录到 ``self.publish_result``。
+        
+        Args:
+            timeout: 最长等待时间（秒）
+        
+        Returns:
+            bool: 是否为发布成功页
+        """
+        pattern = re.compile(self.PUBLISH_SUCCESS_URL) if self.PUBLISH_SUCCESS_URL else None
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                url = self.driver.current_url
+                match = pattern.search(url) if pattern else None
+                if match:
+                    article_id = match.groupdict().get('id') or ''
+                    self.publish_result = {'id': article_id, 'url': url}
+                    self.logger.info(f"✓ 已进入发布成功页：{url}")
+                    return True
+                if self.PUBLISH_SUCCESS_TEXTS:
+                    text = self.driver.execute_script("return document.body ? document.body.innerText : '';") or ''
+                    found = next((t for t in self.PUBLISH_SUCCESS_TEXTS if t in text), None)
+                    if found:
+                        self.logger.info(f"✓ 页面提示：{found}")
+                        return True
+            except Exception as e:
+                self.logger.debug(f"检查发布成功页失败：{e}")
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.5)
+    
+    @classmethod
+    def supports_drafts(cls) -> bool:
+        """是否支持两阶段发布（保存草稿、审阅后发布草稿）"""
+        return cls.DRAFT_URL_PATTERN is not None
+    
+    def capture_draft(self, timeout: float = 20) -> bool:
+        """
+        保存草稿后等待编辑器地址中出现草稿ID，记录到 ``self.draft_result``
+        
+        Args:
+            timeout: 最长等待时间（秒）
+        
+        Returns:
+            bool: 是否取得草稿ID
+        """
+        pattern = re.compile(self.DRAFT_URL_PATTERN)
+        deadline = time.monotonic() + timeout
+        while True:
+            url = self.driver.current_url
+            match = pattern.search(url)
+            if match:
+                self.draft_result = {'id': match.group('id'), 'url': url}
+                self.logger.info(f"✓ 草稿已保存：{match.group('id')}")
+                return True
+            if time.monotonic() >= deadline:
+                self.logger.error(f"✗ 没有取得草稿ID，当前地址：{url}")
+                return False
+            time.sleep(0.5)
+    
+    def publish_draft(self, draft: Dict[str, Any]) -> bool:
+        """
+        发布已保存的草稿：打开草稿编辑地址，执行发布设置和最终发布
+        
+        不再填写标题和正文，也不受 auto_publish 限制（执行第二阶段即表示已审阅）。
+        
+        Args:
+            draft: DraftStore 中的草稿记录
+        
+        Returns:
+            bool: 是否发布成功
+        """
+        self.publish_result = {}
+        self.run_id = new_run_id(self.PLATFORM_NAME)
+        with log_context(run_id=self.run_id, platform=self.PLATFORM_NAME):
+            return self._publish_draft(draft)
+    
+    def _publish_draft(self, draft: Dict[str, Any]) -> bool:
+        """打开草稿并完成发布（publish_draft 的实现）"""
+        if not self.driver:
+            self.setup_driver(use_existing=True)
+        
+        self.logger.info(f"打开草稿：{draft['draft_url']}")
+        self.driver.switch_to.new_window('tab')
+        ready = self.navigation.open(self.driver, draft['draft_url'],
+                                     ready=self.DRAFT_READY_SELECTORS or self.READY_SELECTORS)
+        if not ready:
+            self.logger.error("✗ 草稿编辑器没有打开（草稿可能已删除，或需要重新登录）")
+            return False
+        
+        front_matter = self.parse_article_metadata(draft['article'])
+        if not self.finish_draft(front_matter):
+            return False
+        self.update_cookies(self.site_url)
+        return True
+    
+    def finish_draft(self, front_matter: Dict[str, Any]) -> bool:
+        """
+        在已打开的草稿中执行发布设置和最终发布，支持草稿的子类需要实现
+        
+        Args:
+            front_matter: 文章元数据
+        
+        Returns:
+            bool: 是否发布成功
+        """
+        raise NotImplementedError(f"{self.PLATFORM_NAME} 不支持发布草稿")
+    
+    def run_flow(self, flow: PublishFlow, context: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        使用流程引擎执行声明式流程
+        
+        Args:
+            flow: 发布流程
+            context: 流程上下文
+        
+        Returns:
+            bool: 是否执行成功
+        """
+        return FlowEngine(self.driver).run(flow, context)
+    
+    def run_flow_step(self, step: FlowStep, context: Optional[Dict[str, Any]] = None):
+        """
+        使用流程引擎执行单个步骤
+        
+        Args:
+            step: 流程步骤
+            context: 流程上下文
+        
+        Returns:
+            WebElement: 步骤操作的元素
+        
+        Raises:
+            FlowStepError: 未找到元素或成功条件不满足
+        """
+        return FlowEngine(self.driver).run_step(step, context)
+    
     @abstractmethod
     def get_platform_name(self) -> str:
         """
@@ -105,18 +699,26 @@ class BasePublisher(ABC):
     def parse_article_metadata(self, article_path: str) -> Dict[str, Any]:
         """
         解析文章的front matter元数据
-        
+
+        开启预检自动修正（preflight.auto_fix）时，返回按平台能力矩阵修正后的元数据
+        （截断超长的标题、标签、摘要等，见 capabilities.check_article）。
+
         Args:
             article_path: 文章文件路径
-        
+
         Returns:
             Dict: 文章元数据
         """
         from src.utils.file_utils import parse_front_matter
-        
+        from src.publisher.capabilities import check_article
+
         try:
             metadata = parse_front_matter(article_path)
             self.logger.info(f"成功解析文章元数据：{metadata.keys() if metadata else '无'}")
+            config = self.common_config.get('preflight') or {}
+            if metadata and config.get('enabled', True) and config.get('auto_fix', True):
+                metadata = check_article(self.PLATFORM_NAME, article_path, metadata=metadata,
+                                         defaults=self.common_config).metadata
             return metadata or {}
         except Exception as e:
             self.logger.error(f"解析文章元数据失败：{e}", exc_info=True)
@@ -164,7 +766,7 @@ class BasePublisher(ABC):
         
         try:
             if include_footer:
-                content = read_file_with_footer(article_path)
+                content = read_file_with_footer(article_path, self.PLATFORM_NAME)
             else:
                 content = read_file(article_path)
             
@@ -0,0 +1,298 @@
+"""
+平台能力矩阵与发布前预检
+声明各平台的标题/标签/摘要限制、必填字段和支持的 Markdown 特性，
+在打开浏览器之前离线检查每个（文章, 平台）任务：能自动修正的（截断标题、标签、摘要，
+从正文生成摘要，去掉不支持的封面）直接修正，注定失败的任务在占用浏览器之前拒绝
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 常见图片格式
+_COMMON_IMAGE_FORMATS = ('png', 'jpg', 'jpeg', 'gif', 'webp')
+
+# 平台能力矩阵
+#   title: 标题长度范围（字符数）
+#   tags: 从 front matter 读取标签的平台的数量和单个标签长度上限
+#   summary: 摘要长度上限；required 为 True 时缺少摘要会从正文生成，min 为最短长度
+#   image_formats: 正文图片和封面支持的格式
+#   features: 支持的 Markdown 特性（math、mermaid、table、footnote、html），不支持时只提示
+PLATFORM_CAPABILITIES: Dict[str, Dict[str, Any]] = {
+    'csdn': {
+        'title': {'min': 5, 'max': 100},
+        'tags': {'max': 7},
+        'summary': {'max': 256},
+        'image_formats': _COMMON_IMAGE_FORMATS + ('bmp', 'svg'),
+        'features': {'math', 'mermaid', 'table', 'footnote', 'html'},
+    },
+    'juejin': {
+        'title': {'min': 1, 'max': 100},
+        'summary': {'min': 50, 'max': 100},
+        'image_formats': _COMMON_IMAGE_FORMATS + ('svg',),
+        'features': {'math', 'mermaid', 'table', 'footnote', 'html'},
+    },
+    'zhihu': {
+        'title': {'min': 1, 'max': 100},
+        'image_formats': _COMMON_IMAGE_FORMATS,
+        'features': {'math', 'table', 'footnote'},
+    },
+    'cto51': {
+        'title': {'min': 1, 'max': 100},
+        'tags': {'max': 5, 'max_len': 20},
+        'summary': {'max': 500},
+        'image_formats': _COMMON_IMAGE_FORMATS,
+        'features': {'math', 'table', 'html'},
+    },
+    'toutiao': {
+        'title': {'min': 2, 'max': 30},
+        'image_formats': ('png', 'jpg', 'jpeg', 'gif'),
+        'features': {'table'},
+    },
+    'alicloud': {
+        'title': {'min': 1, 'max': 100},
+        'summary': {'max': 300, 'required': True},
+        'image_formats': _COMMON_IMAGE_FORMATS,
+        'features': {'math', 'table', 'html'},
+    },
+    'wechat': {
+        'title': {'min': 1, 'max': 64},
+        'summary': {'max': 120},
+        'image_formats': ('png', 'jpg', 'jpeg', 'gif'),
+        'features': {'table', 'html'},
+    },
+}
+
+# Markdown 特性的识别规则
+_FEATURE_PATTERNS = {
+    'math': re.compile(r'\$\$[\s\S]+?\$\$|\\\([\s\S]+?\\\)'),
+    'mermaid': re.compile(r'^\s*```\s*mermaid', re.MULTILINE),
+    'table': re.compile(r'^\s*\|?\s*:?-{3,}:?\s*\|', re.MULTILINE),
+    'footnote': re.compile(r'\[\^[^\]]+\]:'),
+    'html': re.compile(r'<(div|span|table|iframe|video|details|center)\b', re.IGNORECASE),
+}
+
+# 正文图片：![alt](url "title") 和 <img src="url">
+_IMAGE_PATTERN = re.compile(r'!\[[^\]]*\]\(\s*<?([^)\s>]+)>?[^)]*\)|<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+
+_FEATURE_NAMES = {
+    'math': '数学公式',
+    'mermaid': 'Mermaid 图表',
+    'table': '表格',
+    'footnote': '脚注',
+    'html': 'HTML 标签',
+}
+
+
+class PreflightReport:
+    """
+    一个（文章, 平台）任务的预检结果
+
+    Attributes:
+        errors: 无法自动修正、发布注定失败的问题
+        warnings: 不影响发布的提示（如平台不支持的 Markdown 特性）
+        fixes: 已自动修正的问题
+        metadata: 修正后的文章元数据
+    """
+
+    def __init__(self, platform: str, article_path: str, metadata: Dict[str, Any]):
+        self.platform = platform
+        self.article_path = article_path
+        self.metadata = metadata
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        self.fixes: List[str] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def __repr__(self):
+        return f"PreflightReport({self.platform}, errors={len(self.errors)}, fixes={len(self.fixes)})"
+
+
+def check_article(platform: str, article_path: str, metadata: Optional[Dict[str, Any]] = None,
+                  content: Optional[str] = None, defaults: Optional[Dict[str, Any]] = None,
+                  auto_fix: bool = True) -> PreflightReport:
+    """
+    按平台能力矩阵检查文章
+
+    Args:
+        platform: 平台名称
+        article_path: 文章路径
+        metadata: 文章元数据，None 时从文章的 front matter 读取
+        content: 正文（不含 front matter），None 时从文章读取
+        defaults: 通用配置（发布器在 front matter 缺少标题/摘要时使用其中的 title/summary）
+        auto_fix: 是否自动修正超长的标题、标签、摘要等；为 False 时这些问题计为错误
+
+    Returns:
+        PreflightReport: 预检结果，metadata 为修正后的元数据
+    """
+    from src.utils.file_utils import remove_truncate_content
+    from src.utils.front_matter import read_article
+
+    if metadata is None or content is None:
+        file_metadata, body = read_article(article_path)
+        if metadata is None:
+            metadata = file_metadata
+        if content is None:
+            content = remove_truncate_content(body)
+    metadata = dict(metadata) if isinstance(metadata, dict) else {}
+    defaults = defaults or {}
+
+    report = PreflightReport(platform, article_path, metadata)
+    capabilities = PLATFORM_CAPABILITIES.get(platform)
+    if capabilities is None:
+        return report
+
+    def fixable(message: str, apply):
+        if auto_fix:
+            apply()
+            report.fixes.append(message)
+        else:
+            report.errors.append(message)
+
+    if not content.strip():
+        report.errors.append("正文为空")
+
+    _check_title(report, capabilities.get('title'), defaults, fixable)
+    _check_tags(report, capabilities.get('tags'), fixable)
+    _check_summary(report, capabilities.get('summary'), content, defaults, fixable)
+    _check_images(report, capabilities.get('image_formats') or (), content, fixable)
+    _check_features(report, capabilities.get('features') or set(), content)
+    return report
+
+
+def _check_title(report: PreflightReport, limits: Optional[Dict[str, int]], defaults: Dict[str, Any], fixable):
+    if not limits:
+        return
+    metadata = report.metadata
+    title = str(metadata.get('title') or defaults.get('title') or '').strip()
+    if len(title) < limits.get('min', 1):
+        report.errors.append(f"标题过短（{len(title)} 字，至少 {limits.get('min', 1)} 字）：{title!r}")
+        return
+    limit = limits.get('max')
+    if limit and len(title) > limit:
+        fixable(f"标题超过 {limit} 字（{len(title)} 字），已截断",
+                lambda: metadata.__setitem__('title', title[:limit]))
+
+
+def _check_tags(report: PreflightReport, limits: Optional[Dict[str, int]], fixable):
+    metadata = report.metadata
+    tags = metadata.get('tags')
+    if not limits or not tags:
+        return
+    if isinstance(tags, str):
+        tags = [tag.strip() for tag in re.split(r'[,，]', tags) if tag.strip()]
+    tags = [str(tag) for tag in tags]
+
+    max_len = limits.get('max_len')
+    if max_len and any(len(tag) > max_len for tag in tags):
+        shortened = [tag[:max_len] for tag in tags]
+        fixable(f"标签超过 {max_len} 字，已截断", lambda: metadata.__setitem__('tags', shortened))
+        tags = shortened
+    limit = limits.get('max')
+    if limit and len(tags) > limit:
+        fixable(f"标签超过 {limit} 个（{len(tags)} 个），只保留前 {limit} 个",
+                lambda: metadata.__setitem__('tags', list(tags[:limit])))
+
+
+def _check_summary(report: PreflightReport, limits: Optional[Dict[str, Any]], content: str,
+                   defaults: Dict[str, Any], fixable):
+    if not limits:
+        return
+    metadata = report.metadata
+    summary = str(metadata.get('description') or defaults.get('summary') or '').strip()
+    minimum, limit = limits.get('min', 0), limits.get('max')
+
+    if not summary:
+        if not limits.get('required'):
+            return
+        generated = summarize(content, limit or 200)
+        if not generated:
+            report.errors.append("缺少摘要，且无法从正文生成")
+            return
+        fixable("缺少摘要，已从正文生成", lambda: metadata.__setitem__('description', generated))
+        return
+
+    if minimum and len(summary) < minimum:
+        generated = summarize(content, limit or 200)
+        if len(generated) >= minimum:
+            fixable(f"摘要不足 {minimum} 字（{len(summary)} 字），已从正文生成",
+                    lambda: metadata.__setitem__('description', generated))
+        else:
+            report.warnings.append(f"摘要不足 {minimum} 字（{len(summary)} 字）")
+    elif limit and len(summary) > limit:
+        fixable(f"摘要超过 {limit} 字（{len(summary)} 字），已截断",
+                lambda: metadata.__setitem__('description', summary[:limit]))
+
+
+def _check_images(report: PreflightReport, formats, content: str, fixable):
+    metadata = report.metadata
+    for match in _IMAGE_PATTERN.finditer(content):
+        url = match.group(1) or match.group(2)
+        extension = _image_extension(url)
+        if extension and extension not in formats:
+            report.errors.append(f"正文图片格式 {extension} 不受支持：{url}")
+        elif not url.startswith(('http://', 'https://', 'data:')):
+            report.warnings.append(f"正文引用了本地图片，平台无法显示：{url}")
+
+    cover = metadata.get('image')
+    if not cover:
+        return
+    cover = str(cover)
+    extension = _image_extension(cover)
+    if extension and extension not in formats:
+        fixable(f"封面格式 {extension} 不受支持，已去掉封面", lambda: metadata.pop('image', None))
+    elif not cover.startswith(('http://', 'https://')) and not os.path.exists(cover):
+        fixable(f"封面文件不存在，已去掉封面：{cover}", lambda: metadata.pop('image', None))
+
+
+def _check_features(report: PreflightReport, supported, content: str):
+    for feature, pattern in _FEATURE_PATTERNS.items():
+        if feature not in supported and pattern.search(content):
+            report.warnings.append(f"平台不支持{_FEATURE_NAMES[feature]}，发布后可能显示为原始文本")
+
+
+def _image_extension(url: str) -> str:
+    if url.startswith('data:'):
+        return ''
+    _, extension = os.path.splitext(urlparse(url).path)
+    return extension.lstrip('.').lower()
+
+
+def summarize(content: str, limit: int) -> str:
+    """
+    从正文生成纯文本摘要：去掉代码块、图片、链接地址、标题符号和 HTML 标签
+
+    Args:
+        content: Markdown 正文
+        limit: 最大长度
+
+    Returns:
+        str: 摘要
+    """
+    text = re.sub(r'```[\s\S]*?```', ' ', content)
+    text = re.sub(r'!\[[^\]]*\]\([^)]*\)', ' ', text)
+    text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'<[^>]+>', ' ', text)
+    text = re.sub(r'^\s*(#{1,6}|>|[-*+]|\d+\.)\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'[`*_~]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text[:limit]
+
+
+def log_report(report: PreflightReport):
+    """按 ✓/⚠/✗ 格式输出预检结果"""
+    name = f"{report.platform.upper()} {os.path.basename(report.article_path)}"
+    for message in report.fixes:
+        logger.info(f"✓ {name} 预检已修正：{message}")
+    for message in report.warnings:
+        logger.warning(f"⚠ {name} 预检提示：{message}")
+    for message in report.errors:
+        logger.error(f"✗ {name} 预检未通过：{message}")
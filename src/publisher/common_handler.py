@@ -4,13 +4,14 @@
 """
 
 import time
-from typing import Tuple
+from typing import List, Sequence, Tuple
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from src.core.logger import get_logger
+from src.publisher.form_filler import fill_element
 
 logger = get_logger(__name__)
 
@@ -83,6 +84,9 @@ def safe_input(driver: WebDriver, by: str, locator: str, text: str,
     """
     安全地输入文本，包含等待和异常处理
     
+    先清空时直接设置值并回读校验（见 form_filler），框架不接受时才逐字输入；
+    不清空时在原有内容后追加输入。
+    
     Args:
         driver: WebDriver实例
         by: 元素定位方式
@@ -102,10 +106,11 @@ def safe_input(driver: WebDriver, by: str, locator: str, text: str,
         )
         
         if clear_first:
-            element.clear()
-            time.sleep(0.5)
-        
-        element.send_keys(text)
+            if not fill_element(driver, element, text):
+                logger.warning(f"✗ 输入框的值与输入文本不一致：{by}={locator}")
+                return False
+        else:
+            element.send_keys(text)
         logger.debug(f"✓ 成功输入文本（长度：{len(text)}）")
         time.sleep(wait_time)
         return True
@@ -215,3 +220,68 @@ def close_current_tab(driver: WebDriver):
         logger.debug("✓ 已关闭当前标签页")
     except Exception as e:
         logger.error(f"✗ 关闭标签页失败：{e}", exc_info=True)
+
+
+# 按 XPath 在页面内收集所有匹配元素的文本
+_COLLECT_TEXTS_SCRIPT = """
+var result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var texts = [];
+for (var i = 0; i < result.snapshotLength; i++) {
+    var text = (result.snapshotItem(i).textContent || '').trim();
+    if (text && texts.indexOf(text) < 0) { texts.push(text); }
+}
+return texts;
+"""
+
+# 按文本在匹配元素中批量点击，返回实际点击到的文本
+_CLICK_BY_TEXTS_SCRIPT = """
+var result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var wanted = arguments[1];
+var clicked = [];
+for (var i = 0; i < result.snapshotLength; i++) {
+    var node = result.snapshotItem(i);
+    var text = (node.textContent || '').trim();
+    if (wanted.indexOf(text) >= 0 && clicked.indexOf(text) < 0) {
+        node.click();
+        clicked.push(text);
+    }
+}
+return clicked;
+"""
+
+
+def collect_texts(driver: WebDriver, xpath: str) -> List[str]:
+    """
+    一次性收集页面中所有匹配元素的文本（去重，保持顺序）
+    
+    Args:
+        driver: WebDriver实例
+        xpath: 元素XPath
+    
+    Returns:
+        List[str]: 元素文本列表
+    """
+    try:
+        return driver.execute_script(_COLLECT_TEXTS_SCRIPT, xpath) or []
+    except Exception as e:
+        logger.debug(f"收集元素文本失败：{xpath}，错误：{e}")
+        return []
+
+
+def click_by_texts(driver: WebDriver, xpath: str, texts: Sequence[str]) -> List[str]:
+    """
+    在一次脚本调用中点击所有文本匹配的元素
+    
+    Args:
+        driver: WebDriver实例
+        xpath: 候选元素XPath
+        texts: 需要点击的元素文本
+    
+    Returns:
+        List[str]: 实际点击到的文本
+    """
+    try:
+        return driver.execute_script(_CLICK_BY_TEXTS_SCRIPT, xpath, list(texts)) or []
+    except Exception as e:
+        logger.debug(f"批量点击失败：{xpath}，错误：{e}")
+        return []
@@ -0,0 +1,213 @@
+"""
+长文分块注入模块
+把很长的正文在块边界（空行、顶层HTML元素）处切分，逐块写入编辑器，
+每块写入后等待编辑器处理完成并校验进度，避免一次性粘贴卡死标签页或被截断
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import List, Sequence
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.core.logger import get_logger
+from src.publisher.content_verifier import wait_for_content
+
+logger = get_logger(__name__)
+
+# 默认每块的最大字符数
+DEFAULT_CHUNK_CHARS = 6000
+
+# 在编辑器末尾追加一块内容：
+# CodeMirror 通过实例追加；输入框通过原生 setter 追加；
+# contenteditable 编辑器把光标移到末尾后派发带 clipboardData 的 paste 事件，
+# 编辑器没有处理该事件时退回到 insertText / insertHTML 命令
+_APPEND_SCRIPT = """
+var selectors = arguments[0], chunk = arguments[1], mime = arguments[2];
+var done = arguments[arguments.length - 1];
+var el = null;
+for (var i = 0; i < selectors.length && !el; i++) { el = document.querySelector(selectors[i]); }
+if (!el) { done('not_found'); return; }
+
+var host = el.CodeMirror ? el : (el.closest ? el.closest('.CodeMirror') : null);
+if (host && host.CodeMirror) {
+    var cm = host.CodeMirror;
+    cm.replaceRange(chunk, {line: cm.lastLine(), ch: cm.getLine(cm.lastLine()).length});
+    done('codemirror');
+    return;
+}
+if (typeof el.value === 'string') {
+    var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, el.value + chunk);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    done('value');
+    return;
+}
+
+el.focus();
+var range = document.createRange();
+range.selectNodeContents(el);
+range.collapse(false);
+var selection = window.getSelection();
+selection.removeAllRanges();
+selection.addRange(range);
+// 等编辑器处理 selectionchange 后再粘贴
+setTimeout(function () {
+    var data = new DataTransfer();
+    data.setData(mime, chunk);
+    if (mime !== 'text/plain') { data.setData('text/plain', chunk); }
+    var event = new ClipboardEvent('paste', {clipboardData: data, bubbles: true, cancelable: true});
+    el.dispatchEvent(event);
+    if (!event.defaultPrevented) {
+        document.execCommand(mime === 'text/html' ? 'insertHTML' : 'insertText', false, chunk);
+        done('exec_command');
+        return;
+    }
+    done('paste_event');
+}, 50);
+"""
+
+# HTML 空元素（没有结束标签）
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+def _group(blocks: Sequence[str], max_chars: int) -> List[str]:
+    """把相邻的块合并为不超过 max_chars 的分块（单个超长块单独成块）"""
+    chunks: List[str] = []
+    current = ''
+    for block in blocks:
+        if current and len(current) + len(block) > max_chars:
+            chunks.append(current)
+            current = ''
+        current += block
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_markdown(text: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """
+    在块边界切分 Markdown
+
+    只在代码块之外的空行后切分；单个块超过 max_chars 时（如很长的代码块）按行切分。
+    所有分块按顺序拼接后与原文完全相同。
+
+    Args:
+        text: Markdown 文本
+        max_chars: 每块的最大字符数
+
+    Returns:
+        List[str]: 分块
+    """
+    blocks: List[str] = []
+    current = ''
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        if re.match(r'\s*(```|~~~)', line):
+            in_fence = not in_fence
+        current += line
+        if (not in_fence and not line.strip()) or len(current) >= max_chars:
+            blocks.append(current)
+            current = ''
+    if current:
+        blocks.append(current)
+    return _group(blocks, max_chars)
+
+
+class _TopLevelOffsets(HTMLParser):
+    """记录每个顶层元素的起始位置（行、列）"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.depth = 0
+        self.starts = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.depth == 0:
+            self.starts.append(self.getpos())
+        if tag not in _VOID_TAGS:
+            self.depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self.depth == 0:
+            self.starts.append(self.getpos())
+
+    def handle_endtag(self, tag):
+        if tag not in _VOID_TAGS and self.depth:
+            self.depth -= 1
+
+
+def split_html(html: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """
+    在顶层元素边界切分HTML正文
+
+    完整的HTML文档只取 body 的内容，每块都是完整的元素，可以单独粘贴。
+
+    Args:
+        html: HTML内容
+        max_chars: 每块的最大字符数
+
+    Returns:
+        List[str]: 分块
+    """
+    match = re.search(r'<body[^>]*>(.*)</body>', html, re.S | re.I)
+    body = match.group(1) if match else html
+
+    parser = _TopLevelOffsets()
+    parser.feed(body)
+    parser.close()
+
+    line_starts = [0] + [m.end() for m in re.finditer('\n', body)]
+    offsets = sorted({0} | {line_starts[line - 1] + column for line, column in parser.starts})
+    blocks = [body[start:end] for start, end in zip(offsets, offsets[1:] + [len(body)])]
+    return _group([block for block in blocks if block], max_chars)
+
+
+def inject_chunks(driver: WebDriver, selectors: Sequence[str], content: str, markup: str = 'markdown',
+                  max_chars: int = DEFAULT_CHUNK_CHARS, chunk_timeout: float = 30) -> bool:
+    """
+    分块写入编辑器
+
+    每写入一块，等待编辑器文本与已写入部分一致且不再变化后再写下一块；
+    某一块写入后确认不一致或超时，立即停止并返回 False。
+
+    Args:
+        driver: WebDriver实例
+        selectors: 编辑器的候选CSS选择器（编辑器应为空，光标位置不影响结果）
+        content: 正文（Markdown 源码或HTML）
+        markup: 正文格式，markdown 或 html
+        max_chars: 每块的最大字符数
+        chunk_timeout: 每块的最长等待时间（秒）
+
+    Returns:
+        bool: 是否全部写入
+    """
+    chunks = split_html(content, max_chars) if markup == 'html' else split_markdown(content, max_chars)
+    mime = 'text/html' if markup == 'html' else 'text/plain'
+    logger.info(f"正文共 {len(content)} 字符，分 {len(chunks)} 块写入编辑器")
+
+    written = ''
+    readable = True
+    for index, chunk in enumerate(chunks, start=1):
+        method = driver.execute_async_script(_APPEND_SCRIPT, list(selectors), chunk, mime)
+        if method == 'not_found':
+            logger.error(f"✗ 未找到编辑器：{list(selectors)}")
+            return False
+
+        written += chunk
+        result = wait_for_content(driver, selectors, written, markup=markup, timeout=chunk_timeout)
+        if result['status'] == 'unreadable':
+            # 读取不到文本时仍按 settle 时间间隔写入，只是无法校验
+            if readable:
+                logger.warning("⚠ 无法读取编辑器文本，无法校验分块进度")
+            readable = False
+        elif result['status'] != 'match':
+            logger.error(
+                f"✗ 第 {index}/{len(chunks)} 块写入后编辑器内容不一致（{result['status']}，"
+                f"长度比例 {result['length_ratio']:.2f}，相似度 {result['similarity']:.2f}）"
+            )
+            return False
+        logger.debug(f"第 {index}/{len(chunks)} 块已写入（{method}，{result['elapsed']:.1f}秒）")
+
+    logger.info(f"✓ 已分 {len(chunks)} 块写入正文")
+    return True
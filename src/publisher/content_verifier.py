@@ -0,0 +1,203 @@
+"""
+正文校验模块
+粘贴正文后读取编辑器中的文本，与原文比较长度和分片指纹，
+自适应等待编辑器处理完成，代替粘贴后的固定等待
+"""
+
+import re
+import time
+import unicodedata
+import zlib
+from html.parser import HTMLParser
+from typing import Any, Dict, Optional, Sequence, Set
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 分片长度（字符）：规范化后的文本按此长度滑动切片计算指纹
+SHINGLE_SIZE = 8
+
+# 一次脚本调用读取编辑器全文：CodeMirror 只渲染可见行，需要通过实例读取；
+# 输入框读取 value，其他编辑器读取 innerText
+_EDITOR_TEXT_SCRIPT = """
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    var el = document.querySelector(selectors[i]);
+    if (!el) { continue; }
+    var host = el.CodeMirror ? el : (el.closest ? el.closest('.CodeMirror') : null);
+    if (host && host.CodeMirror) { return host.CodeMirror.getValue(); }
+    if (typeof el.value === 'string') { return el.value; }
+    return el.innerText;
+}
+return null;
+"""
+
+
+class _TextExtractor(HTMLParser):
+    """提取HTML正文文本（忽略 head、script、style）"""
+
+    SKIP_TAGS = {'head', 'script', 'style', 'title'}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """
+    提取HTML中的正文文本
+
+    Args:
+        html: HTML内容
+
+    Returns:
+        str: 正文文本
+    """
+    parser = _TextExtractor()
+    parser.feed(html)
+    return '\n'.join(parser.parts)
+
+
+def normalize_text(text: str) -> str:
+    """
+    规范化文本用于比较
+
+    去掉图片、链接地址（平台会把外链图片转存到自己的CDN）、空白和标点，
+    这样 Markdown 源码与编辑器渲染后的文本也可以直接比较。
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        str: 只保留文字的规范化文本
+    """
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    text = re.sub(r'!\[[^\]]*\]\([^)]*\)', '', text)
+    text = re.sub(r'\]\([^)]*\)', ']', text)
+    text = re.sub(r'https?://\S+', '', text)
+    return re.sub(r'[\W_]+', '', text)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """
+    计算规范化文本的分片指纹集合
+
+    Args:
+        text: 规范化后的文本
+        size: 分片长度
+
+    Returns:
+        Set[int]: 分片的 CRC32 集合
+    """
+    if len(text) <= size:
+        return {zlib.crc32(text.encode('utf-8'))} if text else set()
+    return {zlib.crc32(text[i:i + size].encode('utf-8')) for i in range(len(text) - size + 1)}
+
+
+def compare_text(expected: str, actual: str) -> Dict[str, float]:
+    """
+    比较原文与编辑器文本（都应已规范化）
+
+    Args:
+        expected: 原文
+        actual: 编辑器文本
+
+    Returns:
+        Dict: length_ratio（编辑器/原文长度）和 similarity（原文分片出现在编辑器中的比例）
+    """
+    if not expected:
+        return {'length_ratio': 1.0, 'similarity': 1.0}
+    expected_shingles = shingles(expected)
+    actual_shingles = shingles(actual)
+    return {
+        'length_ratio': len(actual) / len(expected),
+        'similarity': len(expected_shingles & actual_shingles) / len(expected_shingles),
+    }
+
+
+def read_editor_text(driver: WebDriver, selectors: Sequence[str]) -> Optional[str]:
+    """
+    一次脚本调用读取编辑器全文
+
+    Args:
+        driver: WebDriver实例
+        selectors: 编辑器的候选CSS选择器，使用第一个存在的
+
+    Returns:
+        str: 编辑器文本，找不到编辑器时返回 None
+    """
+    try:
+        return driver.execute_script(_EDITOR_TEXT_SCRIPT, list(selectors))
+    except Exception as e:
+        logger.debug(f"读取编辑器文本失败：{e}")
+        return None
+
+
+def wait_for_content(driver: WebDriver, selectors: Sequence[str], expected: str, markup: str = 'markdown',
+                     timeout: float = 30, interval: float = 0.3, threshold: float = 0.97,
+                     settle: float = 2.0) -> Dict[str, Any]:
+    """
+    等待编辑器完整接收正文
+
+    反复读取编辑器文本直到：
+    - 长度比例和分片相似度都达到阈值，且文本不再变化（match）
+    - 文本已经 settle 秒没有变化但仍不一致，确认被截断或粘贴失败（mismatch）
+    - 超时（timeout）
+    - 始终读取不到编辑器文本，无法校验（unreadable）
+
+    Args:
+        driver: WebDriver实例
+        selectors: 编辑器的候选CSS选择器
+        expected: 原文（Markdown 源码或HTML）
+        markup: 原文格式，markdown 或 html
+        timeout: 最长等待时间（秒）
+        interval: 读取间隔（秒）
+        threshold: 长度比例和相似度的阈值
+        settle: 文本保持不变多久视为编辑器已处理完成（秒）
+
+    Returns:
+        Dict: status / length_ratio / similarity / elapsed
+    """
+    expected_text = normalize_text(html_to_text(expected) if markup == 'html' else expected)
+    start = time.monotonic()
+    last_raw: Optional[str] = None
+    last_change = start
+    metrics = {'length_ratio': 0.0, 'similarity': 0.0}
+
+    while True:
+        now = time.monotonic()
+        raw = read_editor_text(driver, selectors)
+        if raw != last_raw:
+            last_raw, last_change = raw, now
+
+        if raw is not None:
+            metrics = compare_text(expected_text, normalize_text(raw))
+            matched = (metrics['similarity'] >= threshold
+                       and threshold <= metrics['length_ratio'] <= 2 - threshold)
+            # 内容一致且至少连续两次读取没有变化，说明编辑器已经处理完成
+            if matched and now > last_change:
+                return dict(metrics, status='match', elapsed=now - start)
+            if not matched and now - last_change >= settle:
+                return dict(metrics, status='mismatch', elapsed=now - start)
+        elif now - start >= settle:
+            return dict(metrics, status='unreadable', elapsed=now - start)
+
+        if now - start >= timeout:
+            return dict(metrics, status='timeout', elapsed=now - start)
+        time.sleep(interval)
@@ -13,7 +13,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from src.publisher.base_publisher import BasePublisher
-from src.publisher.common_handler import wait_login, safe_click, safe_input, switch_to_new_tab
+from src.publisher.common_handler import (
+    wait_login, safe_click, safe_input, collect_texts, click_by_texts
+)
+from src.publisher.flow_engine import FlowEngine
+from src.publisher.content_verifier import wait_for_content
+from src.publisher.form_filler import fill_element
+from src.publisher.publish_response import PublishEndpoint
 from src.core.logger import get_logger
 from src.utils.file_utils import read_file_with_footer, parse_front_matter, download_image
 from src.utils.yaml_file_utils import read_csdn, read_common
@@ -26,6 +32,31 @@ class CSDNPublisher(BasePublisher):
     
     PLATFORM_NAME = "csdn"
     
+    # 重试时判断编辑器状态的探针
+    STEP_PROBES = {
+        'fill_title': '_probe_title_filled',
+        'fill_content': '_probe_content_filled',
+        'click_publish_button': '_probe_publish_dialog_open',
+    }
+    
+    # 标题输入框
+    TITLE_INPUT_XPATH = '//div[contains(@class,"article-bar")]//input[contains(@placeholder,"请输入文章标题")]'
+    # 正文编辑器（用于校验粘贴结果）
+    EDITOR_SELECTORS = ['.editor pre.editor__inner', '.editor']
+    # 编辑器出现即可开始填写
+    READY_SELECTORS = EDITOR_SELECTORS
+    # 发布文章接口：code 为 200 时成功，data 中有文章ID和链接。
+    # 保存草稿、自动保存也调用 saveArticle，请求体中 status 为 0 的才是发布
+    PUBLISH_ENDPOINT = PublishEndpoint(r'bizapi\.csdn\.net/blog-console-api/.*/saveArticle',
+                                       ok_key='code', ok_values=(200,), id_keys=('id', 'article_id'),
+                                       body_pattern=r'"status"\s*:\s*0\b')
+    # 发布成功后跳转的页面，地址中有文章ID
+    PUBLISH_SUCCESS_URL = r'mp\.csdn\.net/mp_blog/creation/success/(?P<id>\d+)'
+    # 保存草稿后编辑器地址带上文章ID：https://editor.csdn.net/md/?articleId=123
+    DRAFT_URL_PATTERN = r'[?&]articleId=(?P<id>\d+)'
+    # 登录后才有的Cookie
+    LOGIN_COOKIE = 'UserName'
+    
     def __init__(self, common_config: Dict[str, Any] = None, platform_config: Dict[str, Any] = None):
         """
         初始化CSDN发布器
@@ -70,60 +101,64 @@ class CSDNPublisher(BasePublisher):
             if not self.driver:
                 self.setup_driver(use_existing=True)
             
-            # 2. 打开新标签页
-            switch_to_new_tab(self.driver, self.site_url)
-            
-            # 3. 尝试加载Cookie
-            cookie_loaded = self.load_cookies_if_exists(self.site_url)
-            if cookie_loaded:
-                logger.info("✓ 成功加载已保存的登录状态")
-                # 刷新页面以应用cookie
-                self.driver.refresh()
-                time.sleep(3)
-            else:
-                logger.info("⚠ 未找到保存的登录状态，需要手动登录")
-            
-            # 4. 等待登录（如果需要）
-            if not self._check_login_status():
-                logger.info("检测到未登录，等待用户登录...")
-                if not self._wait_for_login():
-                    logger.error("✗ 登录超时或失败")
-                    return False
+            # 重试时回到上次失败时的编辑器标签页，跳过打开页面和登录
+            if not self.resume_editor(article_path):
+                # 2. 打开新标签页
+                self.open_page(self.site_url, new_tab=True, wait_ready=False)
                 
-                # 登录成功后保存Cookie
-                logger.info("✓ 登录成功，保存登录状态...")
-                self.save_login_state(self.site_url)
-            else:
-                # 如果已经登录，更新cookies以保持同步
-                logger.debug("已登录状态，更新cookies...")
-                self.update_cookies(self.site_url)
+                # 3. 尝试加载Cookie（加载后已刷新页面）
+                cookie_loaded = self.load_cookies_if_exists(self.site_url)
+                if cookie_loaded:
+                    logger.info("✓ 成功加载已保存的登录状态")
+                    self.wait_page_ready()
+                else:
+                    logger.info("⚠ 未找到保存的登录状态，需要手动登录")
+                
+                # 4. 等待登录（如果需要）
+                if not self._check_login_status():
+                    logger.info("检测到未登录，等待用户登录...")
+                    if not self.wait_for_login_or_defer():
+                        logger.error("✗ 登录超时或失败")
+                        return False
+                    
+                    # 登录成功后保存Cookie
+                    logger.info("✓ 登录成功，保存登录状态...")
+                    self.save_login_state(self.site_url)
+                else:
+                    # 如果已经登录，更新cookies以保持同步
+                    logger.debug("已登录状态，更新cookies...")
+                    self.update_cookies(self.site_url)
             
             # 5. 解析文章元数据
             front_matter = self.parse_article_metadata(article_path)
             
             # 6. 填充文章标题
-            if not self._fill_title(front_matter):
+            if not self.run_step(self._fill_title, front_matter):
                 logger.error("✗ 填充标题失败")
                 return False
             
             # 7. 填充文章内容
-            if not self._fill_content(article_path):
+            if not self.run_step(self._fill_content, article_path):
                 logger.error("✗ 填充内容失败")
                 return False
             
+            # 草稿模式：保存草稿后结束，审阅后由 publish_draft 完成发布设置和最终发布
+            if self.draft_mode:
+                return self.run_step(self._save_draft)
+            
             # 8. 点击发布按钮
-            if not self._click_publish_button():
+            if not self.run_step(self._click_publish_button):
                 logger.error("✗ 点击发布按钮失败")
                 return False
             
             # 9. 填充发布设置
-            if not self._fill_publish_settings(front_matter):
+            if not self.run_step(self._fill_publish_settings, front_matter):
                 logger.error("✗ 填充发布设置失败")
                 return False
             
             # 10. 最终发布
             if self.auto_publish:
-                if not self._final_publish():
+                if not self.run_step(self._final_publish):
                     logger.error("✗ 最终发布失败")
                     return False
                 logger.info("✓ 文章发布成功！")
@@ -154,7 +189,7 @@ class CSDNPublisher(BasePublisher):
         try:
             # 检查是否存在标题输入框（登录后才会出现）
             WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, '//div[contains(@class,"article-bar")]//input[contains(@placeholder,"请输入文章标题")]'))
+                EC.presence_of_element_located((By.XPATH, self.TITLE_INPUT_XPATH))
             )
             logger.info("✓ 检测到已登录状态")
             return True
@@ -173,7 +208,7 @@ class CSDNPublisher(BasePublisher):
         return wait_login(
             self.driver,
             By.XPATH,
-            '//div[contains(@class,"article-bar")]//input[contains(@placeholder,"请输入文章标题")]',
+            self.TITLE_INPUT_XPATH,
             timeout=wait_time
         )
     
@@ -191,26 +226,40 @@ class CSDNPublisher(BasePublisher):
             logger.info("正在填充文章标题...")
             
             title_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, '//div[contains(@class,"article-bar")]//input[contains(@placeholder,"请输入文章标题")]'))
+                EC.presence_of_element_located((By.XPATH, self.TITLE_INPUT_XPATH))
             )
             
-            title_element.clear()
-            time.sleep(1)
-            
             # 优先使用front matter中的标题
             title = front_matter.get('title') or self.common_config.get('title', '未命名文章')
             # 清理标题中的引号
             title = self.clean_title(title)
-            title_element.send_keys(title)
+            if not fill_element(self.driver, title_element, title):
+                logger.error("✗ 标题输入框的值与标题不一致")
+                return False
             
             logger.info(f"✓ 标题填充完成：{title}")
-            time.sleep(2)
             return True
             
         except Exception as e:
             logger.error(f"✗ 填充标题失败：{e}", exc_info=True)
             return False
     
+    def _probe_title_filled(self, front_matter: Dict[str, Any]) -> bool:
+        """标题输入框中是否已经是本文标题"""
+        title = self.clean_title(front_matter.get('title') or self.common_config.get('title', '未命名文章'))
+        value = self.driver.find_element(By.XPATH, self.TITLE_INPUT_XPATH).get_attribute('value')
+        return value == title
+    
+    def _probe_content_filled(self, article_path: str) -> bool:
+        """编辑器中是否已经是完整的正文（被截断时重新粘贴）"""
+        result = wait_for_content(self.driver, self.EDITOR_SELECTORS, read_file_with_footer(article_path, self.PLATFORM_NAME),
+                                  timeout=1, settle=0.5)
+        return result['status'] == 'match'
+    
+    def _probe_publish_dialog_open(self) -> bool:
+        """发布设置弹窗是否已经打开"""
+        return bool(self.driver.find_elements(By.XPATH, '//div[@class="mark_selection"]'))
+    
     def _fill_content(self, article_path: str) -> bool:
         """
         填充文章内容
@@ -225,33 +274,66 @@ class CSDNPublisher(BasePublisher):
             logger.info("正在填充文章内容...")
             
             # 读取文章内容
-            file_content = read_file_with_footer(article_path)
+            file_content = read_file_with_footer(article_path, self.PLATFORM_NAME)
             logger.info(f"文章内容长度：{len(file_content)} 字符")
             
-            # 复制内容到剪贴板
-            pyperclip.copy(file_content)
-            logger.debug("内容已复制到剪贴板")
-            
             # 定位编辑器
             content_element = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.XPATH, '//div[@class="editor"]//div[@class="cledit-section"]'))
             )
             content_element.click()
-            time.sleep(2)
-            
-            # 粘贴内容
             cmd_ctrl = Keys.COMMAND if sys.platform == 'darwin' else Keys.CONTROL
-            action_chains = ActionChains(self.driver)
-            action_chains.key_down(cmd_ctrl).send_keys('v').key_up(cmd_ctrl).perform()
+            
+            if self.should_inject_in_chunks(file_content):
+                # 长文：清空编辑器后分块写入，避免一次性粘贴卡死标签页
+                ActionChains(self.driver).key_down(cmd_ctrl).send_keys('a').key_up(cmd_ctrl) \
+                    .send_keys(Keys.DELETE).perform()
+                if not self.inject_content(self.EDITOR_SELECTORS, file_content):
+                    return False
+            else:
+                # 复制内容到剪贴板
+                pyperclip.copy(file_content)
+                logger.debug("内容已复制到剪贴板")
+                
+                # 全选后粘贴：重试时替换编辑器中不完整的正文，而不是追加一份
+                action_chains = ActionChains(self.driver)
+                action_chains.key_down(cmd_ctrl).send_keys('a').send_keys('v').key_up(cmd_ctrl).perform()
+                
+                # 等待编辑器完整接收正文（代替固定等待）
+                if not self.verify_editor_content(self.EDITOR_SELECTORS, file_content):
+                    return False
             
             logger.info("✓ 内容填充完成")
-            time.sleep(3)
             return True
             
         except Exception as e:
             logger.error(f"✗ 填充内容失败：{e}", exc_info=True)
             return False
     
+    def _save_draft(self) -> bool:
+        """
+        保存草稿
+        
+        Returns:
+            bool: 是否取得草稿ID
+        """
+        logger.info("正在保存草稿...")
+        save_button = WebDriverWait(self.driver, 10).until(
+            EC.element_to_be_clickable((By.XPATH, '//button[contains(., "保存草稿")]'))
+        )
+        save_button.click()
+        return self.capture_draft()
+    
+    def finish_draft(self, front_matter: Dict[str, Any]) -> bool:
+        """在已打开的草稿中执行发布设置和最终发布"""
+        if not self.run_step(self._click_publish_button):
+            logger.error("✗ 点击发布按钮失败")
+            return False
+        if not self.run_step(self._fill_publish_settings, front_matter):
+            logger.error("✗ 填充发布设置失败")
+            return False
+        return self.run_step(self._final_publish)
+    
     def _click_publish_button(self) -> bool:
         """
         点击发布文章按钮
@@ -313,7 +395,9 @@ class CSDNPublisher(BasePublisher):
     def _fill_tags(self, front_matter: Dict[str, Any]):
         """填充文章标签"""
         try:
-            tags = front_matter.get('tags') or self.platform_config.get('tags', [])
+            raw_tags = front_matter.get('tags') or self.platform_config.get('tags', [])
+            # 先用缓存的平台标签校验映射，无效标签不再进入浏览器逐个搜索
+            tags = self.resolve_taxonomy('tags', raw_tags)
             
             if not tags:
                 logger.info("⚠ 未配置标签，跳过")
@@ -325,20 +409,26 @@ class CSDNPublisher(BasePublisher):
             add_tag_btn = self.driver.find_element(By.XPATH,
                 '//div[@class="mark_selection"]//button[@class="tag__btn-tag" and contains(text(),"添加文章标签")]')
             add_tag_btn.click()
-            time.sleep(1)
             
             # 输入标签
-            tag_input = self.driver.find_element(By.XPATH,
-                '//div[@class="mark_selection_box"]//input[contains(@placeholder,"请输入文字搜索")]')
+            tag_input = WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable((By.XPATH,
+                '//div[@class="mark_selection_box"]//input[contains(@placeholder,"请输入文字搜索")]')))
+            engine = FlowEngine(self.driver)
             
             for tag in tags:
-                tag_input.clear()
-                tag_input.send_keys(tag)
-                time.sleep(2)
+                # 一次脚本调用替换搜索框内容（框架收到 input 事件后开始搜索），不再清空后逐字输入
+                fill_element(self.driver, tag_input, tag)
+                # 等待搜索结果中出现该标签，出现即回车，不再固定等待
+                engine.find_first([(By.XPATH,
+                    f'//div[@class="mark_selection_box"]//*[normalize-space(text())="{tag}"]')],
+                    timeout=2, condition='visible')
                 tag_input.send_keys(Keys.ENTER)
-                time.sleep(1)
                 logger.debug(f"  ✓ 添加标签：{tag}")
             
+            # 记录搜索时看到的平台标签，供下次映射使用
+            self.taxonomy.update('tags', collect_texts(self.driver,
+                '//div[@class="mark_selection_box"]//li'))
+            
             # 关闭标签选择框
             close_btn = self.driver.find_element(By.XPATH,
                 '//div[@class="mark_selection_box"]//button[@title="关闭"]')
@@ -387,11 +477,10 @@ class CSDNPublisher(BasePublisher):
             
             summary_input = self.driver.find_element(By.XPATH,
                 '//div[@class="desc-box"]//textarea[contains(@placeholder,"摘要：会在推荐、列表等场景外露")]')
-            summary_input.clear()
-            summary_input.send_keys(summary)
-            
-            logger.info("✓ 摘要填充完成")
-            time.sleep(2)
+            if fill_element(self.driver, summary_input, summary):
+                logger.info("✓ 摘要填充完成")
+            else:
+                logger.warning("⚠ 摘要输入框的值与摘要不一致")
             
         except Exception as e:
             logger.warning(f"⚠ 填充摘要时出错：{e}")
@@ -399,7 +488,7 @@ class CSDNPublisher(BasePublisher):
     def _fill_categories(self):
         """填充分类专栏"""
         try:
-            categories = self.platform_config.get('categories', [])
+            categories = self.resolve_taxonomy('categories', self.platform_config.get('categories', []))
             
             if not categories:
                 logger.info("⚠ 未配置分类专栏，跳过")
@@ -413,15 +502,15 @@ class CSDNPublisher(BasePublisher):
             add_category_btn.click()
             time.sleep(1)
             
-            # 选择分类
+            # 读取全部已有专栏写入缓存，并在一次脚本调用中勾选所有配置的分类
+            checkbox_xpath = '//input[@type="checkbox"]/..'
+            self.taxonomy.update('categories', collect_texts(self.driver, checkbox_xpath), complete=True)
+            categories = self.resolve_taxonomy('categories', categories) or categories
+            selected = click_by_texts(self.driver, checkbox_xpath, categories)
             for category in categories:
-                try:
-                    category_checkbox = self.driver.find_element(By.XPATH,
-                        f'//input[@type="checkbox" and @value="{category}"]/..')
-                    category_checkbox.click()
-                    time.sleep(1)
+                if category in selected:
                     logger.debug(f"  ✓ 选择分类：{category}")
-                except:
+                else:
                     logger.warning(f"  ⚠ 分类不存在：{category}")
             
             # 关闭分类选择框
@@ -467,11 +556,11 @@ class CSDNPublisher(BasePublisher):
                 EC.element_to_be_clickable((By.XPATH,
                     '//div[@class="modal__button-bar"]//button[contains(text(),"发布文章")]'))
             )
+            watcher = self.watch_publish()
             publish_button.click()
             
             logger.info("✓ 最终发布按钮已点击")
-            time.sleep(3)
-            return True
+            return self.confirm_publish(watcher)
             
         except Exception as e:
             logger.error(f"✗ 最终发布失败：{e}", exc_info=True)
@@ -11,7 +11,12 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from src.publisher.base_publisher import BasePublisher
-from src.publisher.common_handler import wait_login, safe_click, safe_input, switch_to_new_tab
+from src.publisher.common_handler import (
+    wait_login, safe_click, safe_input, collect_texts, click_by_texts
+)
+from src.publisher.flow_engine import FlowEngine, FlowStep, PublishFlow
+from src.publisher.form_filler import fill_element
+from src.publisher.publish_response import PublishEndpoint
 from src.core.logger import get_logger
 from src.utils.file_utils import read_file_with_footer, parse_front_matter
 from src.utils.yaml_file_utils import read_cto51, read_common
@@ -24,6 +29,25 @@ class CTO51Publisher(BasePublisher):
     
     PLATFORM_NAME = "cto51"
     
+    # 页面就绪探针：编辑器出现即可开始填写
+    READY_SELECTORS = ['textarea.auto-textarea-input.write-area']
+    
+    # 保存草稿后编辑器地址带上草稿ID
+    DRAFT_URL_PATTERN = r'[?&](?:did|blog_id|id)=(?P<id>\d+)'
+    
+    # 最终发布：ID / class / 文本三种定位方式在页面内并行匹配
+    FINAL_PUBLISH_FLOW = PublishFlow('51CTO最终发布', [
+        FlowStep('点击发布按钮', 'click', [
+            (By.ID, 'submitForm'),
+            (By.CLASS_NAME, 'release'),
+            (By.XPATH, '//button[contains(text(), "发布")]'),
+        ], timeout=15),
+    ])
+    
+    # 发布接口：status 为 1 时成功，data 中有文章ID和链接
+    PUBLISH_ENDPOINT = PublishEndpoint(r'blog\.51cto\.com/blogger/publish', ok_key='status', ok_values=(1,),
+                                       id_keys=('did', 'id', 'blog_id'), url_keys=('url', 'link'))
+    
     def __init__(self, common_config: Dict[str, Any] = None, platform_config: Dict[str, Any] = None):
         """
         初始化51CTO发布器
@@ -108,52 +132,58 @@ class CTO51Publisher(BasePublisher):
             if not self.driver:
                 self.setup_driver(use_existing=True)
             
-            # 2. 打开新标签页
-            switch_to_new_tab(self.driver, self.site_url)
-            
-            # 3. 尝试加载Cookie
-            cookie_loaded = self.load_cookies_if_exists(self.site_url)
-            if cookie_loaded:
-                logger.info("✓ 成功加载已保存的登录状态")
-                # 刷新页面以应用cookie
-                self.driver.refresh()
-                time.sleep(3)
-            else:
-                logger.info("⚠ 未找到保存的登录状态，需要手动登录")
-            
-            # 4. 等待登录（如果需要）
-            if not self._check_login_status():
-                logger.info("检测到未登录，等待用户登录...")
-                if not self._wait_for_login():
-                    logger.error("✗ 登录超时或失败")
-                    return False
+            # 重试时回到上次失败时的编辑器标签页，跳过打开页面和登录
+            if not self.resume_editor(article_path):
+                # 2. 打开新标签页
+                self.open_page(self.site_url, new_tab=True, wait_ready=False)
                 
-                # 登录成功后保存Cookie
-                logger.info("✓ 登录成功，保存登录状态...")
-                self.save_login_state(self.site_url)
-            else:
-                # 如果已经登录，更新cookies以保持同步
-                logger.debug("已登录状态，更新cookies...")
-                self.update_cookies(self.site_url)
+                # 3. 尝试加载Cookie（加载后已刷新页面）
+                cookie_loaded = self.load_cookies_if_exists(self.site_url)
+                if cookie_loaded:
+                    logger.info("✓ 成功加载已保存的登录状态")
+                    self.wait_page_ready()
+                else:
+                    logger.info("⚠ 未找到保存的登录状态，需要手动登录")
+                
+                # 4. 等待登录（如果需要）
+                if not self._check_login_status():
+                    logger.info("检测到未登录，等待用户登录...")
+                    if not self.wait_for_login_or_defer():
+                        logger.error("✗ 登录超时或失败")
+                        return False
+                    
+                    # 登录成功后保存Cookie
+                    logger.info("✓ 登录成功，保存登录状态...")
+                    self.save_login_state(self.site_url)
+                else:
+                    # 如果已经登录，更新cookies以保持同步
+                    logger.debug("已登录状态，更新cookies...")
+                    self.update_cookies(self.site_url)
             
             # 5. 解析文章元数据
             front_matter = self.parse_article_metadata(article_path)
             
             # 6. 填充文章标题
-            self._fill_title(front_matter)
+            self.run_step(self._fill_title, front_matter)
             
             # 7. 填充文章内容
-            self._fill_content(article_path)
+            self.run_step(self._fill_content, article_path)
+            
+            # 草稿模式：保存草稿后结束，审阅后由 publish_draft 完成发布设置和最终发布
+            if self.draft_mode:
+                return self.run_step(self._save_draft)
             
             # 8. 点击发布按钮（进入发布设置页面）
-            self._click_publish_button()
+            self.run_step(self._click_publish_button)
             
             # 9. 填充发布设置
-            self._fill_publish_settings(front_matter)
+            self.run_step(self._fill_publish_settings, front_matter)
             
             # 10. 最终发布
             if self.auto_publish:
-                self._final_publish()
+                if not self.run_step(self._final_publish):
+                    logger.error("✗ 最终发布失败")
+                    return False
                 logger.info("✓ 文章已成功发布到51CTO")
                 
                 # 发布成功后更新cookies
@@ -177,9 +207,6 @@ class CTO51Publisher(BasePublisher):
                 EC.presence_of_element_located((By.ID, 'title'))
             )
             
-            # 清空并填充标题
-            title_element.clear()
-            
             # 优先使用front matter中的标题
             if 'title' in front_matter and front_matter['title']:
                 title = front_matter['title']
@@ -194,9 +221,9 @@ class CTO51Publisher(BasePublisher):
                 title = title[:100]
                 logger.warning("⚠ 标题超过100字符，已截断")
             
-            title_element.send_keys(title)
+            if not fill_element(self.driver, title_element, title):
+                raise RuntimeError("标题输入框的值与标题不一致")
             logger.info(f"✓ 标题已填充：{title}")
-            time.sleep(1)
             
         except Exception as e:
             logger.error(f"✗ 填充标题失败：{e}")
@@ -207,7 +234,7 @@ class CTO51Publisher(BasePublisher):
         logger.info("填充文章内容...")
         try:
             # 读取文章内容
-            file_content = read_file_with_footer(article_path)
+            file_content = read_file_with_footer(article_path, self.PLATFORM_NAME)
             
             # 等待内容输入框出现并可交互
             content_element = WebDriverWait(self.driver, 10).until(
@@ -224,13 +251,33 @@ class CTO51Publisher(BasePublisher):
             content_element.send_keys(file_content)
             
             logger.info(f"✓ 内容已填充，长度：{len(file_content)}")
-            logger.info("等待5秒，让平台处理图片解析...")
-            time.sleep(5)  # 等待图片解析
+            # 等待平台处理完图片解析（编辑器文本不再变化），代替固定等待5秒
+            if not self.verify_editor_content(['textarea.auto-textarea-input.write-area'], file_content):
+                raise RuntimeError("编辑器中的正文与原文不一致")
             
         except Exception as e:
             logger.error(f"✗ 填充内容失败：{e}")
             raise
     
+    def _save_draft(self) -> bool:
+        """保存草稿"""
+        logger.info("正在保存草稿...")
+        save_button = WebDriverWait(self.driver, 10).until(
+            EC.element_to_be_clickable((By.XPATH, '//button[contains(., "草稿")]'))
+        )
+        ActionChains(self.driver).click(save_button).perform()
+        return self.capture_draft()
+    
+    def finish_draft(self, front_matter: Dict[str, Any]) -> bool:
+        """在已打开的草稿中执行发布设置和最终发布"""
+        try:
+            self.run_step(self._click_publish_button)
+            self.run_step(self._fill_publish_settings, front_matter)
+            return self.run_step(self._final_publish)
+        except Exception as e:
+            logger.error(f"✗ 发布草稿时发生错误：{e}", exc_info=True)
+            return False
+    
     def _click_publish_button(self):
         """点击发布按钮（进入发布设置页面）"""
         logger.info("点击发布按钮...")
@@ -325,6 +372,9 @@ class CTO51Publisher(BasePublisher):
             else:
                 tags = self.platform_config.get('tags', [])
             
+            # 先映射为平台标签再截取，避免无效标签占用名额
+            tags = self.resolve_taxonomy('tags', tags)
+            
             if not tags:
                 logger.warning("⚠ 未配置标签，跳过")
                 return
@@ -397,30 +447,36 @@ class CTO51Publisher(BasePublisher):
             summary_input = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, 'textarea[id="abstractData"]'))
             )
-            summary_input.clear()
-            summary_input.send_keys(summary)
-            logger.info(f"✓ 已填充摘要：{summary[:50]}...")
+            if fill_element(self.driver, summary_input, summary):
+                logger.info(f"✓ 已填充摘要：{summary[:50]}...")
+            else:
+                logger.warning("⚠ 摘要输入框的值与摘要不一致")
         except Exception as e:
             logger.warning(f"⚠ 填充摘要失败：{e}")
     
     def _select_topic(self):
         """选择话题"""
         try:
-            topic = self.platform_config.get('topic')
-            if not topic:
+            topics = self.resolve_taxonomy('topics', [self.platform_config.get('topic')], limit=1)
+            if not topics:
                 logger.warning("⚠ 未配置话题，跳过")
                 return
+            topic = topics[0]
             
             logger.info(f"选择话题：{topic}")
             
             # 点击话题下拉框
             topic_input = self.driver.find_element(By.ID, 'subjuct')
             topic_input.click()
-            time.sleep(1)
             
-            # 选择话题
-            list_item_list = self.driver.find_element(By.ID, 'listItemList')
-            list_item_list.find_element(By.XPATH, f'//li[contains(text(),"{topic}")]').click()
+            # 下拉列表包含全部话题：写入缓存，并在同一次往返中选中
+            topic_xpath = '//*[@id="listItemList"]//li'
+            FlowEngine(self.driver).find_first([(By.XPATH, topic_xpath)], timeout=3, condition='visible')
+            self.taxonomy.update('topics', collect_texts(self.driver, topic_xpath), complete=True)
+            topic = (self.resolve_taxonomy('topics', [topic], limit=1) or [topic])[0]
+            if not click_by_texts(self.driver, topic_xpath, [topic]):
+                logger.warning(f"⚠ 选择话题失败：列表中没有 {topic}")
+                return
             logger.info(f"✓ 已选择话题：{topic}")
         except Exception as e:
             logger.warning(f"⚠ 选择话题失败：{e}")
@@ -428,51 +484,10 @@ class CTO51Publisher(BasePublisher):
     def _final_publish(self):
         """最终发布"""
         logger.info("执行最终发布...")
-        try:
-            # 等待页面加载完成
-            time.sleep(2)
-            
-            # 尝试多种方式定位发布按钮
-            publish_button = None
-            
-            try:
-                # 方式1: 通过 ID
-                publish_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.ID, 'submitForm'))
-                )
-                logger.info("✓ 通过 ID 找到发布按钮")
-            except:
-                try:
-                    # 方式2: 通过 class name
-                    publish_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.CLASS_NAME, 'release'))
-                    )
-                    logger.info("✓ 通过 class name 找到发布按钮")
-                except:
-                    try:
-                        # 方式3: 通过 XPath 文本
-                        publish_button = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, '//button[contains(text(), "发布")]'))
-                        )
-                        logger.info("✓ 通过 XPath 找到发布按钮")
-                    except:
-                        logger.error("✗ 无法找到发布按钮")
-                        raise Exception("无法定位发布按钮")
-            
-            if publish_button:
-                # 滚动到按钮可见
-                self.driver.execute_script("arguments[0].scrollIntoView(true);", publish_button)
-                time.sleep(0.5)
-                
-                # 点击发布
-                publish_button.click()
-                logger.info("✓ 已点击最终发布按钮")
-                time.sleep(3)
-                
-                return True
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"✗ 最终发布失败：{e}")
-            raise
+        watcher = self.watch_publish()
+        if not self.run_flow(self.FINAL_PUBLISH_FLOW):
+            raise Exception("无法定位发布按钮")
+        logger.info("✓ 已点击最终发布按钮")
+        if not self.confirm_publish(watcher):
+            raise Exception("发布接口返回失败")
+        return True
@@ -0,0 +1,131 @@
+"""
+草稿记录
+两阶段发布：第一阶段在各平台保存草稿并记录草稿ID和编辑地址，
+人工审阅后第二阶段按记录打开草稿，只执行发布设置和最终发布
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 草稿记录文件
+DRAFTS_FILE = Path(__file__).parent.parent.parent / 'data' / 'drafts.json'
+
+# 草稿状态：已保存（待发布）、已发布、发布失败（下次仍会尝试）
+STATUS_SAVED = 'saved'
+STATUS_PUBLISHED = 'published'
+STATUS_FAILED = 'failed'
+
+
+class DraftStore:
+    """
+    草稿记录
+
+    数据保存在 ``data/drafts.json``，每个（平台, 文章）一条记录，
+    重新保存草稿时覆盖原记录。
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        初始化草稿记录
+
+        Args:
+            path: 记录文件路径，默认 data/drafts.json
+        """
+        self.path = Path(path or DRAFTS_FILE)
+        self._lock = threading.Lock()
+        self._data: List[Dict[str, Any]] = self._load()
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"⚠ 读取草稿记录失败：{self.path}，错误：{e}")
+        return []
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        tmp_file.replace(self.path)
+
+    def _find(self, platform: str, article_path: str) -> Optional[Dict[str, Any]]:
+        for entry in self._data:
+            if entry['platform'] == platform and entry['article'] == str(article_path):
+                return entry
+        return None
+
+    def record(self, platform: str, article_path: str, draft_id: str, draft_url: str, title: str = ''):
+        """
+        记录一个已保存的草稿
+
+        Args:
+            platform: 平台名称
+            article_path: 文章路径
+            draft_id: 平台上的草稿ID
+            draft_url: 草稿编辑地址（第二阶段直接打开）
+            title: 文章标题
+        """
+        with self._lock:
+            entry = self._find(platform, article_path)
+            if entry is None:
+                entry = {'platform': platform, 'article': str(article_path)}
+                self._data.append(entry)
+            entry.update({
+                'title': title,
+                'draft_id': draft_id,
+                'draft_url': draft_url,
+                'status': STATUS_SAVED,
+                'saved_at': datetime.now().isoformat(timespec='seconds'),
+                'url': '',
+                'error': '',
+            })
+            self._save()
+
+    def pending(self, platforms: Optional[Sequence[str]] = None,
+                articles: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        获取待发布的草稿（已保存或上次发布失败）
+
+        Args:
+            platforms: 只返回这些平台的草稿，None 表示全部
+            articles: 只返回这些文章的草稿，None 表示全部
+
+        Returns:
+            List[Dict]: 草稿记录（副本）
+        """
+        with self._lock:
+            return [
+                dict(entry) for entry in self._data
+                if entry.get('status') in (STATUS_SAVED, STATUS_FAILED)
+                and (platforms is None or entry['platform'] in platforms)
+                and (articles is None or entry['article'] in [str(article) for article in articles])
+            ]
+
+    def mark(self, platform: str, article_path: str, status: str, **fields):
+        """
+        更新草稿状态
+
+        Args:
+            platform: 平台名称
+            article_path: 文章路径
+            status: 新状态
+            **fields: 其他字段（如 url、error）
+        """
+        with self._lock:
+            entry = self._find(platform, article_path)
+            if entry is None:
+                return
+            entry.update(fields, status=status)
+            if status == STATUS_PUBLISHED:
+                entry['published_at'] = datetime.now().isoformat(timespec='seconds')
+            self._save()
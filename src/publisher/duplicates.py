@@ -0,0 +1,390 @@
+"""
+重复发布检测
+发布前比对本地发布记录和平台上已有的文章标题，已经发布过的文章不再重复发布
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.logger import get_logger
+from src.publisher.taxonomy import build_cookie_session
+
+logger = get_logger(__name__)
+
+# 本地发布记录：每次发布成功后写入标题和内容指纹
+LEDGER_FILE = Path(__file__).parent.parent.parent / 'data' / 'publish_ledger.json'
+# 平台文章标题缓存目录
+PUBLISHED_DIR = Path(__file__).parent.parent.parent / 'data' / 'published'
+
+# 平台标题缓存有效期：1小时
+DEFAULT_TTL = 3600
+
+# 获取函数：接收已加载Cookie的 requests.Session，返回账号最近发布的文章标题
+TitleFetcher = Callable[[Any], List[str]]
+
+
+def normalize_title(title: str) -> str:
+    """
+    规范化标题用于比较：全角转半角、忽略大小写，去掉空白、引号和标点
+
+    Args:
+        title: 原始标题
+
+    Returns:
+        str: 规范化后的标题
+    """
+    title = unicodedata.normalize('NFKC', str(title or '')).casefold()
+    return re.sub(r'[\W_]+', '', title)
+
+
+def content_hash(text: str) -> str:
+    """
+    计算正文指纹（忽略空白差异）
+
+    Args:
+        text: 正文内容
+
+    Returns:
+        str: SHA-256 十六进制摘要
+    """
+    normalized = re.sub(r'\s+', ' ', text or '').strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def article_fingerprint(article_path: str) -> Dict[str, str]:
+    """
+    读取文章的标题和正文指纹
+
+    标题只取 front matter 的 title；没有标题的文章只按正文指纹比较，
+    避免所有使用默认标题的文章被误判为重复。
+
+    Args:
+        article_path: 文章路径
+
+    Returns:
+        Dict: title / title_key / hash
+    """
+    from src.utils.file_utils import remove_truncate_content
+    from src.utils.front_matter import read_article
+
+    metadata, body = read_article(article_path)
+    title = str(metadata.get('title') or '').strip()
+    return {
+        'title': title,
+        'title_key': normalize_title(title),
+        'hash': content_hash(remove_truncate_content(body)),
+    }
+
+
+class PublishLedger:
+    """
+    本地发布记录
+
+    数据保存在 ``data/publish_ledger.json``，按平台记录已发布文章的标题、
+    规范化标题、正文指纹、文章路径和发布时间。
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        初始化发布记录
+
+        Args:
+            path: 记录文件路径，默认 data/publish_ledger.json
+        """
+        self.path = Path(path or LEDGER_FILE)
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"⚠ 读取发布记录失败：{self.path}，错误：{e}")
+        return {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        tmp_file.replace(self.path)
+
+    def entries(self, platform: str) -> List[Dict[str, Any]]:
+        """获取平台的全部发布记录"""
+        with self._lock:
+            return list(self._data.get(platform, []))
+
+    def all_entries(self) -> Dict[str, List[Dict[str, Any]]]:
+        """获取所有平台的发布记录"""
+        with self._lock:
+            return {platform: list(entries) for platform, entries in self._data.items()}
+
+    def find(self, platform: str, title_key: str = '', hash: str = '') -> Optional[Dict[str, Any]]:
+        """
+        查找正文指纹或规范化标题相同的发布记录（指纹优先）
+
+        Args:
+            platform: 平台名称
+            title_key: 规范化标题，为空时不按标题比较
+            hash: 正文指纹，为空时不按指纹比较
+
+        Returns:
+            Dict: 匹配的记录，没有时返回 None
+        """
+        entries = self.entries(platform)
+        if hash:
+            for entry in entries:
+                if entry.get('hash') == hash:
+                    return entry
+        if title_key:
+            for entry in entries:
+                if entry.get('title_key') == title_key:
+                    return entry
+        return None
+
+    def record(self, platform: str, article_path: str, fingerprint: Dict[str, str], url: str = ''):
+        """
+        写入一条发布记录
+
+        Args:
+            platform: 平台名称
+            article_path: 文章路径
+            fingerprint: article_fingerprint 的结果
+            url: 文章链接（已知时）
+        """
+        entry = {
+            'title': fingerprint['title'],
+            'title_key': fingerprint['title_key'],
+            'hash': fingerprint['hash'],
+            'article': str(article_path),
+            'url': url,
+            'published_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self._lock:
+            self._data.setdefault(platform, []).append(entry)
+            self._save()
+
+
+class PublishedTitles:
+    """
+    平台上已发布文章的标题缓存
+
+    通过平台接口（带已保存的Cookie）获取账号最近发布的文章标题，
+    保存在 ``data/published/<platform>.json``，有效期内不重复请求。
+    """
+
+    def __init__(self, platform: str, ttl: float = DEFAULT_TTL, cache_dir: Optional[Path] = None):
+        """
+        初始化缓存
+
+        Args:
+            platform: 平台名称
+            ttl: 缓存有效期（秒）
+            cache_dir: 缓存目录，默认 data/published
+        """
+        self.platform = platform
+        self.ttl = ttl
+        self.cache_file = Path(cache_dir or PUBLISHED_DIR) / f"{platform}.json"
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"⚠ 读取已发布标题缓存失败：{self.cache_file}，错误：{e}")
+        return {'updated_at': 0, 'titles': []}
+
+    def _save(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        tmp_file.replace(self.cache_file)
+
+    def is_stale(self) -> bool:
+        """缓存是否过期"""
+        return time.time() - self._data.get('updated_at', 0) > self.ttl
+
+    def keys(self, fetcher: Optional[TitleFetcher] = None) -> Dict[str, str]:
+        """
+        获取规范化标题 -> 原标题，缓存过期时先同步刷新
+
+        Args:
+            fetcher: 获取函数，默认使用 TITLE_FETCHERS 中注册的函数
+
+        Returns:
+            Dict[str, str]: 规范化标题 -> 原标题
+        """
+        fetcher = fetcher or TITLE_FETCHERS.get(self.platform)
+        if fetcher and self.is_stale():
+            self.refresh(fetcher)
+        with self._lock:
+            return {normalize_title(title): title for title in self._data.get('titles', [])}
+
+    def refresh(self, fetcher: TitleFetcher) -> bool:
+        """
+        通过平台接口刷新缓存；失败时继续使用旧数据
+
+        Args:
+            fetcher: 获取函数
+
+        Returns:
+            bool: 是否刷新成功
+        """
+        try:
+            titles = [str(title) for title in fetcher(build_cookie_session(self.platform)) if title]
+        except Exception as e:
+            logger.warning(f"⚠ 获取 {self.platform} 已发布文章列表失败，仅使用本地记录：{e}")
+            return False
+
+        with self._lock:
+            self._data = {'updated_at': time.time(), 'titles': titles}
+            self._save()
+        logger.info(f"✓ 已获取 {self.platform} 最近发布的 {len(titles)} 篇文章标题")
+        return True
+
+    def add(self, title: str):
+        """发布成功后追加标题，缓存有效期内也能识别刚发布的文章"""
+        if not title:
+            return
+        with self._lock:
+            titles = self._data.setdefault('titles', [])
+            if title not in titles:
+                titles.insert(0, title)
+                self._save()
+
+
+class DuplicateChecker:
+    """
+    重复发布检测器
+
+    按以下顺序判断文章是否已在平台上发布：
+    1. 本地发布记录中有相同的正文指纹
+    2. 本地发布记录中有相同的规范化标题
+    3. 平台接口返回的最近文章中有相同的规范化标题
+
+    所有判断都在打开浏览器之前完成。
+    """
+
+    def __init__(self, ledger: Optional[PublishLedger] = None, ttl: float = DEFAULT_TTL,
+                 cache_dir: Optional[Path] = None, fetchers: Optional[Dict[str, TitleFetcher]] = None):
+        """
+        初始化检测器
+
+        Args:
+            ledger: 本地发布记录，默认 data/publish_ledger.json
+            ttl: 平台标题缓存有效期（秒）
+            cache_dir: 平台标题缓存目录
+            fetchers: 平台标题获取函数，默认 TITLE_FETCHERS
+        """
+        self.ledger = ledger or PublishLedger()
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.fetchers = TITLE_FETCHERS if fetchers is None else fetchers
+        self._remote: Dict[str, PublishedTitles] = {}
+
+    def _published_titles(self, platform: str) -> PublishedTitles:
+        if platform not in self._remote:
+            self._remote[platform] = PublishedTitles(platform, ttl=self.ttl, cache_dir=self.cache_dir)
+        return self._remote[platform]
+
+    def check(self, platform: str, article_path: str) -> Optional[str]:
+        """
+        检查文章是否已在平台上发布
+
+        Args:
+            platform: 平台名称
+            article_path: 文章路径
+
+        Returns:
+            str: 判定为重复的原因；未发布过时返回 None
+        """
+        fingerprint = article_fingerprint(article_path)
+
+        entry = self.ledger.find(platform, hash=fingerprint['hash'])
+        if entry:
+            return f"正文与 {entry['published_at']} 发布的《{entry['title'] or entry['article']}》相同"
+
+        if not fingerprint['title_key']:
+            return None
+
+        entry = self.ledger.find(platform, title_key=fingerprint['title_key'])
+        if entry:
+            return f"标题《{fingerprint['title']}》已于 {entry['published_at']} 发布过"
+
+        remote = self._published_titles(platform).keys(self.fetchers.get(platform))
+        if fingerprint['title_key'] in remote:
+            return f"平台上已有同名文章《{remote[fingerprint['title_key']]}》"
+        return None
+
+    def record(self, platform: str, article_path: str, url: str = ''):
+        """
+        记录一次成功的发布
+
+        Args:
+            platform: 平台名称
+            article_path: 文章路径
+            url: 文章链接（已知时）
+        """
+        fingerprint = article_fingerprint(article_path)
+        self.ledger.record(platform, article_path, fingerprint, url=url)
+        self._published_titles(platform).add(fingerprint['title'])
+
+
+def fetch_csdn_titles(session) -> List[str]:
+    """通过CSDN博客主页接口获取最近发布的文章标题（用户名取自Cookie）"""
+    username = session.cookies.get('UserName')
+    if not username:
+        raise ValueError('Cookie中没有 UserName，请先登录CSDN')
+    response = session.get('https://blog.csdn.net/community/home-api/v1/get-business-list', params={
+        'page': 1, 'size': 50, 'businessType': 'blog', 'username': username,
+    }, timeout=10)
+    response.raise_for_status()
+    return [item['title'] for item in (response.json().get('data') or {}).get('list') or []]
+
+
+def fetch_juejin_titles(session) -> List[str]:
+    """通过掘金接口获取当前账号最近发布的文章标题"""
+    response = session.get('https://api.juejin.cn/user_api/v1/user/get', timeout=10)
+    response.raise_for_status()
+    user_id = (response.json().get('data') or {}).get('user_id')
+    if not user_id:
+        raise ValueError('未登录掘金')
+    response = session.post('https://api.juejin.cn/content_api/v1/article/query_list', json={
+        'user_id': user_id, 'sort_type': 2, 'cursor': '0',
+    }, timeout=10)
+    response.raise_for_status()
+    return [item['article_info']['title'] for item in response.json().get('data') or []]
+
+
+def fetch_zhihu_titles(session) -> List[str]:
+    """通过知乎接口获取当前账号最近发布的文章标题"""
+    response = session.get('https://www.zhihu.com/api/v4/me', timeout=10)
+    response.raise_for_status()
+    url_token = response.json().get('url_token')
+    if not url_token:
+        raise ValueError('未登录知乎')
+    response = session.get(f'https://www.zhihu.com/api/v4/members/{url_token}/articles',
+                           params={'limit': 50, 'offset': 0}, timeout=10)
+    response.raise_for_status()
+    return [item['title'] for item in response.json().get('data') or []]
+
+
+# 有文章列表接口的平台；其他平台只根据本地发布记录判断
+TITLE_FETCHERS: Dict[str, TitleFetcher] = {
+    'csdn': fetch_csdn_titles,
+    'juejin': fetch_juejin_titles,
+    'zhihu': fetch_zhihu_titles,
+}
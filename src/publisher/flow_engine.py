@@ -0,0 +1,275 @@
+"""
+声明式发布流程引擎
+用数据描述平台流程（步骤、候选定位器、成功条件），由统一引擎执行
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from src.core.logger import get_logger
+from src.publisher.form_filler import fill_element
+
+logger = get_logger(__name__)
+
+
+# 定位器：与 Selenium 相同的 (By, locator) 元组
+Locator = Tuple[str, str]
+
+# 在页面内一次性解析所有候选定位器，返回第一个满足条件的元素
+# 使用 execute_async_script 在页面内轮询，整个等待过程只消耗一次往返
+_RESOLVE_SCRIPT = """
+var candidates = arguments[0];
+var condition = arguments[1];
+var timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+
+function byXPath(expr) {
+    try {
+        return document.evaluate(expr, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } catch (e) { return null; }
+}
+function byCss(selector) {
+    try { return document.querySelector(selector); } catch (e) { return null; }
+}
+// 链接文字在脚本中比较，不拼接进 XPath（文字中的引号不会破坏表达式）
+function byLinkText(value, partial) {
+    var links = document.getElementsByTagName('a');
+    for (var i = 0; i < links.length; i++) {
+        var text = (links[i].textContent || '').replace(/\\s+/g, ' ').trim();
+        if (partial ? text.indexOf(value) >= 0 : text === value) { return links[i]; }
+    }
+    return null;
+}
+function lookup(by, value) {
+    switch (by) {
+        case 'id': return document.getElementById(value);
+        case 'xpath': return byXPath(value);
+        case 'css selector': return byCss(value);
+        case 'class name': return byCss('.' + value.trim().split(/\\s+/).join('.'));
+        case 'name': return byCss('[name="' + CSS.escape(value) + '"]');
+        case 'tag name': return byCss(value);
+        case 'link text': return byLinkText(value, false);
+        case 'partial link text': return byLinkText(value, true);
+    }
+    return null;
+}
+function visible(el) {
+    if (!el.getClientRects().length) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+function accept(el) {
+    if (!el) { return false; }
+    if (condition === 'present') { return true; }
+    if (!visible(el)) { return false; }
+    if (condition === 'clickable') { return !el.disabled; }
+    return true;
+}
+var deadline = Date.now() + timeoutMs;
+(function poll() {
+    for (var i = 0; i < candidates.length; i++) {
+        var el = lookup(candidates[i][0], candidates[i][1]);
+        if (accept(el)) { done([i, el]); return; }
+    }
+    if (Date.now() >= deadline) { done(null); return; }
+    setTimeout(poll, 100);
+})();
+"""
+
+
+class FlowStepError(Exception):
+    """流程步骤执行失败"""
+
+    def __init__(self, step_name: str, message: str):
+        super().__init__(f"{step_name}：{message}")
+        self.step_name = step_name
+
+
+class FlowStep:
+    """
+    流程中的单个步骤
+
+    Args:
+        name: 步骤名称（用于日志）
+        action: 动作类型，支持 click / js_click / input / upload / find
+        candidates: 候选定位器列表，按优先级排列
+        value: 输入的值，可以是字符串或接收上下文字典的函数
+        condition: 元素需要满足的条件：present / visible / clickable
+        timeout: 所有候选定位器共享的等待时间（秒）
+        wait_after: 动作完成后的等待时间（秒）
+        success: 成功条件，接收 (driver, context) 返回 bool 的函数
+        required: 是否为必需步骤，非必需步骤失败时只记录警告
+        scroll: 执行动作前是否滚动到元素可见
+    """
+
+    def __init__(self, name: str, action: str, candidates: Sequence[Locator],
+                 value: Union[str, Callable[[Dict[str, Any]], str], None] = None,
+                 condition: str = 'clickable', timeout: float = 10,
+                 wait_after: float = 0,
+                 success: Optional[Callable[[WebDriver, Dict[str, Any]], bool]] = None,
+                 required: bool = True, scroll: bool = True):
+        self.name = name
+        self.action = action
+        self.candidates = list(candidates)
+        self.value = value
+        self.condition = condition
+        self.timeout = timeout
+        self.wait_after = wait_after
+        self.success = success
+        self.required = required
+        self.scroll = scroll
+
+
+class PublishFlow:
+    """
+    一组按顺序执行的流程步骤
+
+    Args:
+        name: 流程名称
+        steps: 步骤列表
+    """
+
+    def __init__(self, name: str, steps: List[FlowStep]):
+        self.name = name
+        self.steps = steps
+
+
+class FlowEngine:
+    """
+    流程执行引擎
+
+    每个步骤的所有候选定位器在页面内通过一次脚本调用并行解析，
+    选择器失效只需要一次往返，而不是逐个等待超时。
+    """
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+
+    def find_first(self, candidates: Sequence[Locator], timeout: float = 10,
+                   condition: str = 'present') -> Tuple[int, Optional[WebElement]]:
+        """
+        在页面内解析所有候选定位器，返回第一个匹配的元素
+
+        Args:
+            candidates: 候选定位器列表
+            timeout: 等待时间（秒），为 0 时只检查一次当前页面
+            condition: 元素需要满足的条件：present / visible / clickable
+
+        Returns:
+            Tuple[int, WebElement]: 命中的候选序号和元素，未找到时返回 (-1, None)
+        """
+        payload = [[by, value] for by, value in candidates]
+        previous_timeout = self.driver.timeouts.script
+        self.driver.set_script_timeout(timeout + 5)
+        try:
+            result = self.driver.execute_async_script(
+                _RESOLVE_SCRIPT, payload, condition, int(timeout * 1000)
+            )
+        finally:
+            self.driver.set_script_timeout(previous_timeout)
+
+        if not result:
+            return -1, None
+        index, element = result
+        return index, element
+
+    def run_step(self, step: FlowStep, context: Optional[Dict[str, Any]] = None) -> Optional[WebElement]:
+        """
+        执行单个步骤
+
+        Args:
+            step: 流程步骤
+            context: 流程上下文（步骤间共享的数据）
+
+        Returns:
+            WebElement: 步骤操作的元素
+
+        Raises:
+            FlowStepError: 未找到元素或成功条件不满足
+        """
+        context = context if context is not None else {}
+
+        index, element = self.find_first(step.candidates, step.timeout, step.condition)
+        if element is None:
+            raise FlowStepError(step.name, f"所有候选定位器均未命中（{len(step.candidates)} 个）")
+
+        by, locator = step.candidates[index]
+        logger.info(f"✓ {step.name}：命中候选 {index + 1}/{len(step.candidates)}（{by}={locator}）")
+
+        if step.scroll and step.action != 'find':
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+
+        self._perform(step, element, context)
+
+        if step.wait_after:
+            time.sleep(step.wait_after)
+
+        if step.success and not step.success(self.driver, context):
+            raise FlowStepError(step.name, "成功条件未满足")
+
+        context[step.name] = element
+        return element
+
+    def run(self, flow: PublishFlow, context: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        按顺序执行整个流程
+
+        Args:
+            flow: 发布流程
+            context: 流程上下文
+
+        Returns:
+            bool: 所有必需步骤是否成功
+        """
+        context = context if context is not None else {}
+        logger.info(f"开始执行流程：{flow.name}（{len(flow.steps)} 个步骤）")
+
+        for step in flow.steps:
+            try:
+                self.run_step(step, context)
+            except Exception as e:
+                if step.required:
+                    logger.error(f"✗ 流程 {flow.name} 在步骤 [{step.name}] 失败：{e}")
+                    return False
+                logger.warning(f"⚠ 非必需步骤 [{step.name}] 失败，继续：{e}")
+
+        logger.info(f"✓ 流程 {flow.name} 执行完成")
+        return True
+
+    def _perform(self, step: FlowStep, element: WebElement, context: Dict[str, Any]):
+        """执行步骤动作"""
+        action = step.action
+
+        if action == 'find':
+            return
+
+        if action == 'click':
+            try:
+                element.click()
+            except Exception:
+                # 普通点击被遮挡时退回到 JavaScript 点击
+                logger.debug(f"{step.name}：普通点击失败，使用JavaScript点击")
+                self.driver.execute_script("arguments[0].click();", element)
+            return
+
+        if action == 'js_click':
+            self.driver.execute_script("arguments[0].click();", element)
+            return
+
+        value = step.value(context) if callable(step.value) else step.value
+
+        if action == 'input':
+            if not fill_element(self.driver, element, value or ''):
+                raise FlowStepError(step.name, "输入框的值与期望值不一致")
+            return
+
+        if action == 'upload':
+            element.send_keys(value)
+            return
+
+        raise FlowStepError(step.name, f"不支持的动作类型：{action}")
+
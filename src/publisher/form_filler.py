@@ -0,0 +1,171 @@
+"""
+表单快速填写模块
+在一次脚本调用中填写多个输入框（标题、摘要、标签搜索框等），
+通过原生 value setter 和 input/change 事件让 React/Vue 等框架感知到变化，
+回读校验后只对没有生效的字段退回到键盘输入
+"""
+
+import sys
+from typing import Any, List, Sequence, Tuple
+
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 批量设置字段值，等待框架处理完事件后回读实际的值
+#
+# 普通输入框使用原型链上的原生 value setter：React 会拦截元素自身的 value 属性，
+# 直接赋值不会触发 onChange；contenteditable 元素使用 insertText 命令，
+# 编辑器会像处理用户输入一样处理它。
+_FILL_SCRIPT = """
+var items = arguments[0];
+var done = arguments[arguments.length - 1];
+
+function setValue(el, value) {
+    el.focus();
+    if (el.isContentEditable) {
+        var range = document.createRange();
+        range.selectNodeContents(el);
+        var selection = window.getSelection();
+        selection.removeAllRanges();
+        selection.addRange(range);
+        if (!document.execCommand('insertText', false, value)) {
+            el.textContent = value;
+            el.dispatchEvent(new InputEvent('input', {bubbles: true, inputType: 'insertText', data: value}));
+        }
+        return;
+    }
+    var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+        : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+
+function readValue(el) {
+    return el.isContentEditable ? el.innerText : el.value;
+}
+
+var errors = items.map(function (item) {
+    try { setValue(item[0], item[1]); return ''; } catch (e) { return String(e); }
+});
+setTimeout(function () {
+    done(items.map(function (item, i) {
+        var value = null;
+        try { value = readValue(item[0]); } catch (e) {}
+        return {value: value, error: errors[i]};
+    }));
+}, 50);
+"""
+
+
+def _normalize(value: Any) -> str:
+    """比较时忽略首尾空白和换行差异"""
+    return ' '.join(str(value or '').split())
+
+
+def _type_value(element, value: str):
+    """键盘输入（回退方式）：先清空再逐字输入"""
+    if element.get_attribute('contenteditable') == 'true':
+        cmd_ctrl = Keys.COMMAND if sys.platform == 'darwin' else Keys.CONTROL
+        element.click()
+        element.send_keys(cmd_ctrl, 'a')
+        element.send_keys(Keys.DELETE)
+    else:
+        element.clear()
+    element.send_keys(value)
+
+
+def fill_elements(driver: WebDriver, fields: Sequence[Tuple[Any, str]]) -> List[bool]:
+    """
+    一次性填写多个元素，回读校验，只对没有生效的元素退回到键盘输入
+
+    Args:
+        driver: WebDriver实例
+        fields: (元素, 值) 列表
+
+    Returns:
+        List[bool]: 每个元素最终是否填写成功
+    """
+    fields = [(element, '' if value is None else str(value)) for element, value in fields]
+    if not fields:
+        return []
+
+    try:
+        readback = driver.execute_async_script(_FILL_SCRIPT, [[element, value] for element, value in fields])
+    except Exception as e:
+        logger.debug(f"脚本填写表单失败，全部使用键盘输入：{e}")
+        readback = [{'value': None, 'error': str(e)}] * len(fields)
+
+    results = []
+    for (element, value), state in zip(fields, readback):
+        if _normalize(state.get('value')) == _normalize(value):
+            results.append(True)
+            continue
+
+        logger.debug(f"字段未接受脚本赋值（{state.get('error') or '回读不一致'}），改为键盘输入")
+        try:
+            _type_value(element, value)
+            results.append(_normalize(_read_value(driver, element)) == _normalize(value))
+        except Exception as e:
+            logger.warning(f"⚠ 键盘输入失败：{e}")
+            results.append(False)
+    return results
+
+
+def fill_element(driver: WebDriver, element, value: str) -> bool:
+    """
+    填写单个元素
+
+    Args:
+        driver: WebDriver实例
+        element: 输入框元素
+        value: 要填写的值
+
+    Returns:
+        bool: 是否填写成功
+    """
+    return fill_elements(driver, [(element, value)])[0]
+
+
+def fill_fields(driver: WebDriver, fields: Sequence[Tuple[str, str, str]], timeout: float = 10) -> List[bool]:
+    """
+    按定位符查找元素后一次性填写
+
+    Args:
+        driver: WebDriver实例
+        fields: (定位方式, 定位符, 值) 列表
+        timeout: 等待每个元素出现的时间（秒）
+
+    Returns:
+        List[bool]: 每个字段是否填写成功（找不到元素时为 False）
+
+    Example:
+        fill_fields(driver, [
+            (By.XPATH, '//input[@placeholder="标题"]', title),
+            (By.CSS_SELECTOR, 'textarea.summary', summary),
+        ])
+    """
+    found = []
+    for by, locator, value in fields:
+        try:
+            element = WebDriverWait(driver, timeout).until(EC.presence_of_element_located((by, locator)))
+            found.append((element, value))
+        except Exception:
+            logger.warning(f"✗ 未找到输入框：{by}={locator}")
+            found.append(None)
+
+    filled = iter(fill_elements(driver, [item for item in found if item is not None]))
+    return [next(filled) if item is not None else False for item in found]
+
+
+def _read_value(driver: WebDriver, element) -> str:
+    return driver.execute_script(
+        "return arguments[0].isContentEditable ? arguments[0].innerText : arguments[0].value;", element
+    )
@@ -13,7 +13,12 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from src.publisher.base_publisher import BasePublisher
-from src.publisher.common_handler import wait_login, safe_click, safe_input, switch_to_new_tab
+from src.publisher.common_handler import (
+    wait_login, safe_click, safe_input, collect_texts, click_by_texts
+)
+from src.publisher.flow_engine import FlowEngine, FlowStep
+from src.publisher.content_verifier import wait_for_content
+from src.publisher.form_filler import fill_element
 from src.core.logger import get_logger
 from src.utils.file_utils import read_file_with_footer, parse_front_matter, download_image
 from src.utils.yaml_file_utils import read_juejin, read_common
@@ -26,6 +31,33 @@ class JuejinPublisher(BasePublisher):
     
     PLATFORM_NAME = "juejin"
     
+    # "写文章"按钮：class 与文本两种定位方式在页面内并行匹配
+    WRITE_BUTTON_STEP = FlowStep('点击写文章按钮', 'click', [
+        (By.CLASS_NAME, 'send-button'),
+        (By.XPATH, '//button[contains(text(), "写文章")]'),
+    ], timeout=10)
+    
+    # 重试时根据编辑器当前状态判断步骤是否已经完成
+    STEP_PROBES = {
+        'click_write_button': '_probe_editor_open',
+        'fill_article_content': '_probe_content_filled',
+        'fill_article_title': '_probe_title_filled',
+        'click_publish_button': '_probe_publish_dialog_open',
+    }
+    
+    # 标题输入框
+    TITLE_INPUT_XPATH = '//input[@placeholder="输入文章标题..."]'
+    # 正文编辑器（CodeMirror）
+    EDITOR_SELECTORS = ['.bytemd-editor .CodeMirror', '.CodeMirror']
+    # 发布设置弹窗的标题
+    PUBLISH_DIALOG_XPATH = '//div[contains(@class,"title") and contains(text(), "发布文章")]'
+    
+    # 编辑器会自动保存草稿，地址为 https://juejin.cn/editor/drafts/<草稿ID>
+    DRAFT_URL_PATTERN = r'/editor/drafts/(?P<id>\d+)'
+    DRAFT_READY_SELECTORS = ['.bytemd-editor .CodeMirror']
+    # 登录后才有的Cookie
+    LOGIN_COOKIE = 'sessionid'
+    
     def __init__(self, common_config: Dict[str, Any] = None, platform_config: Dict[str, Any] = None):
         """
         初始化掘金发布器
@@ -70,57 +102,58 @@ class JuejinPublisher(BasePublisher):
             if not self.driver:
                 self.setup_driver(use_existing=True)
             
-            # 2. 打开新标签页
-            switch_to_new_tab(self.driver, self.site_url)
-            
-            # 3. 尝试加载Cookie
-            cookie_loaded = self.load_cookies_if_exists(self.site_url)
-            if cookie_loaded:
-                logger.info("✓ 成功加载已保存的登录状态")
-                # 刷新页面以应用cookie
-                self.driver.refresh()
-                time.sleep(3)
-            else:
-                logger.info("⚠ 未找到保存的登录状态，需要手动登录")
-            
-            # 4. 等待登录（如果需要）
-            if not self._check_login_status():
-                logger.info("检测到未登录，等待用户登录...")
-                if not self._wait_for_login():
-                    logger.error("✗ 登录超时或失败")
-                    return False
+            # 重试时回到上次失败时的编辑器标签页，跳过打开页面和登录
+            if not self.resume_editor(article_path):
+                # 2. 打开新标签页
+                self.open_page(self.site_url, new_tab=True, wait_ready=False)
                 
-                # 登录成功后保存Cookie
-                logger.info("✓ 登录成功，保存登录状态...")
-                self.save_login_state(self.site_url)
-            else:
-                # 如果已经登录，更新cookies以保持同步
-                logger.debug("已登录状态，更新cookies...")
-                self.update_cookies(self.site_url)
+                # 3. 尝试加载Cookie（加载后已刷新页面）
+                cookie_loaded = self.load_cookies_if_exists(self.site_url)
+                if cookie_loaded:
+                    logger.info("✓ 成功加载已保存的登录状态")
+                    self.wait_page_ready()
+                else:
+                    logger.info("⚠ 未找到保存的登录状态，需要手动登录")
+                
+                # 4. 等待登录（如果需要）
+                if not self._check_login_status():
+                    logger.info("检测到未登录，等待用户登录...")
+                    if not self.wait_for_login_or_defer():
+                        logger.error("✗ 登录超时或失败")
+                        return False
+                    
+                    # 登录成功后保存Cookie
+                    logger.info("✓ 登录成功，保存登录状态...")
+                    self.save_login_state(self.site_url)
+                else:
+                    # 如果已经登录，更新cookies以保持同步
+                    logger.debug("已登录状态，更新cookies...")
+                    self.update_cookies(self.site_url)
             
             # 5. 解析文章元数据
             front_matter = self.parse_article_metadata(article_path)
             
             # 6. 点击"写文章"按钮
-            if not self._click_write_button():
+            if not self.run_step(self._click_write_button):
                 logger.error("✗ 无法点击写文章按钮")
                 return False
             
-            # 7. 等待新标签页打开并切换
-            time.sleep(3)  # 等待新标签页打开
-            logger.info(f"当前窗口句柄数：{len(self.driver.window_handles)}")
-            
-            # 切换到最新的标签页（编辑器页面）
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            logger.info("✓ 已切换到编辑器标签页")
-            time.sleep(2)
+            # 7. 等待新标签页打开并切换（从检查点继续时已经在编辑器标签页）
+            if not self.resuming:
+                time.sleep(3)  # 等待新标签页打开
+                logger.info(f"当前窗口句柄数：{len(self.driver.window_handles)}")
+                
+                # 切换到最新的标签页（编辑器页面）
+                self.driver.switch_to.window(self.driver.window_handles[-1])
+                logger.info("✓ 已切换到编辑器标签页")
+                time.sleep(2)
             
             # 8. 等待编辑器加载
             wait = WebDriverWait(self.driver, 20)  # 增加等待时间到20秒
             try:
                 # 等待标题输入框出现
                 title_input = wait.until(
-                    EC.presence_of_element_located((By.XPATH, '//input[@placeholder="输入文章标题..."]'))
+                    EC.presence_of_element_located((By.XPATH, self.TITLE_INPUT_XPATH))
                 )
                 logger.info("✓ 编辑器加载完成")
             except Exception as e:
@@ -130,28 +163,32 @@ class JuejinPublisher(BasePublisher):
                 return False
             
             # 9. 填充文章内容
-            if not self._fill_article_content(article_path):
+            if not self.run_step(self._fill_article_content, article_path):
                 logger.error("✗ 填充文章内容失败")
                 return False
             
             # 10. 填充文章标题
-            if not self._fill_article_title(front_matter):
+            if not self.run_step(self._fill_article_title, front_matter):
                 logger.error("✗ 填充文章标题失败")
                 return False
             
+            # 草稿模式：等待自动保存后结束，审阅后由 publish_draft 完成发布设置和最终发布
+            if self.draft_mode:
+                return self.run_step(self._save_draft)
+            
             # 11. 点击发布按钮
-            if not self._click_publish_button():
+            if not self.run_step(self._click_publish_button):
                 logger.error("✗ 无法点击发布按钮")
                 return False
             
             # 12. 填充发布设置
-            if not self._fill_publish_settings(front_matter):
+            if not self.run_step(self._fill_publish_settings, front_matter):
                 logger.error("✗ 填充发布设置失败")
                 return False
             
             # 13. 确认发布
             if self.auto_publish:
-                if not self._confirm_publish():
+                if not self.run_step(self._confirm_publish):
                     logger.error("✗ 确认发布失败")
                     return False
                 logger.info("✓ 文章发布成功！")
@@ -235,49 +272,20 @@ class JuejinPublisher(BasePublisher):
             windows_before = len(self.driver.window_handles)
             logger.info(f"点击前窗口数：{windows_before}")
             
-            wait = WebDriverWait(self.driver, 10)
+            self.run_flow_step(self.WRITE_BUTTON_STEP)
+            logger.info("✓ 已点击写文章按钮")
             
-            # 尝试多种方式定位按钮
-            write_btn = None
-            try:
-                # 方式1: 通过 class name
-                write_btn = wait.until(
-                    EC.element_to_be_clickable((By.CLASS_NAME, 'send-button'))
-                )
-                logger.info("✓ 通过 class name 找到写文章按钮")
-            except:
-                try:
-                    # 方式2: 通过 XPath 文本
-                    write_btn = wait.until(
-                        EC.element_to_be_clickable((By.XPATH, '//button[contains(text(), "写文章")]'))
-                    )
-                    logger.info("✓ 通过 XPath 找到写文章按钮")
-                except:
-                    logger.error("✗ 无法找到写文章按钮")
-                    return False
+            # 等待新窗口打开
+            time.sleep(2)
+            windows_after = len(self.driver.window_handles)
+            logger.info(f"点击后窗口数：{windows_after}")
             
-            if write_btn:
-                # 滚动到按钮可见
-                self.driver.execute_script("arguments[0].scrollIntoView(true);", write_btn)
-                time.sleep(0.5)
-                
-                # 点击按钮
-                write_btn.click()
-                logger.info("✓ 已点击写文章按钮")
-                
-                # 等待新窗口打开
-                time.sleep(2)
-                windows_after = len(self.driver.window_handles)
-                logger.info(f"点击后窗口数：{windows_after}")
-                
-                if windows_after > windows_before:
-                    logger.info("✓ 新标签页已打开")
-                else:
-                    logger.warning("⚠ 窗口数量未增加，可能在当前页打开")
-                
-                return True
+            if windows_after > windows_before:
+                logger.info("✓ 新标签页已打开")
+            else:
+                logger.warning("⚠ 窗口数量未增加，可能在当前页打开")
             
-            return False
+            return True
         except Exception as e:
             logger.error(f"✗ 点击写文章按钮失败：{e}")
             return False
@@ -294,31 +302,34 @@ class JuejinPublisher(BasePublisher):
         """
         try:
             # 读取文章内容
-            file_content = read_file_with_footer(article_path)
+            file_content = read_file_with_footer(article_path, self.PLATFORM_NAME)
             logger.info(f"✓ 读取文章内容，长度：{len(file_content)}")
             
-            # 掘金使用复制粘贴的方式填充内容
             cmd_ctrl = Keys.COMMAND if sys.platform == 'darwin' else Keys.CONTROL
             
-            # 将内容复制到剪贴板
-            pyperclip.copy(file_content)
-            
             # 定位到编辑器
             content_element = self.driver.find_element(
                 By.XPATH, 
                 '//div[@class="CodeMirror-code"]//span[@role="presentation"]'
             )
             content_element.click()
-            time.sleep(1)
             
-            # 执行粘贴操作
+            # 长文：清空编辑器后通过 CodeMirror 实例分块追加，每块写入后校验进度
+            if self.should_inject_in_chunks(file_content):
+                ActionChains(self.driver).key_down(cmd_ctrl).send_keys('a').key_up(cmd_ctrl) \
+                    .send_keys(Keys.DELETE).perform()
+                return self.inject_content(self.EDITOR_SELECTORS, file_content)
+            
+            # 掘金使用复制粘贴的方式填充内容
+            pyperclip.copy(file_content)
+            
+            # 全选后粘贴：重试时替换编辑器中不完整的正文，而不是追加一份
             action_chains = ActionChains(self.driver)
-            action_chains.key_down(cmd_ctrl).send_keys('v').key_up(cmd_ctrl).perform()
+            action_chains.key_down(cmd_ctrl).send_keys('a').send_keys('v').key_up(cmd_ctrl).perform()
             
+            # 等待编辑器接收正文并完成图片转存（文本不再变化），代替固定等待
             logger.info("✓ 已粘贴文章内容，等待图片解析...")
-            time.sleep(5)  # 等待图片解析
-            
-            return True
+            return self.verify_editor_content(self.EDITOR_SELECTORS, file_content)
         except Exception as e:
             logger.error(f"✗ 填充文章内容失败：{e}")
             return False
@@ -334,29 +345,68 @@ class JuejinPublisher(BasePublisher):
             bool: 是否成功
         """
         try:
-            title_input = self.driver.find_element(
-                By.XPATH, 
-                '//input[@placeholder="输入文章标题..."]'
-            )
-            title_input.clear()
-            
-            # 优先使用front matter中的标题
-            if 'title' in front_matter and front_matter['title']:
-                title = front_matter['title']
-            else:
-                title = self.common_config.get('title', '未命名文章')
-            
-            # 清理标题中的引号
-            title = self.clean_title(title)
+            title_input = self.driver.find_element(By.XPATH, self.TITLE_INPUT_XPATH)
+            # 优先使用front matter中的标题，并清理标题中的引号
+            title = self._article_title(front_matter)
             
-            title_input.send_keys(title)
+            if not fill_element(self.driver, title_input, title):
+                logger.error("✗ 标题输入框的值与标题不一致")
+                return False
             logger.info(f"✓ 已填充文章标题：{title}")
-            time.sleep(2)
             return True
         except Exception as e:
             logger.error(f"✗ 填充文章标题失败：{e}")
             return False
     
+    def _article_title(self, front_matter: Dict[str, Any]) -> str:
+        """要填写的标题：优先使用front matter中的标题"""
+        return self.clean_title(front_matter.get('title') or self.common_config.get('title', '未命名文章'))
+    
+    def _probe_editor_open(self) -> bool:
+        """当前标签页是否已经是编辑器"""
+        return bool(self.driver.find_elements(By.XPATH, self.TITLE_INPUT_XPATH))
+    
+    def _probe_content_filled(self, article_path: str) -> bool:
+        """编辑器中是否已经是完整的正文（被截断时重新粘贴）"""
+        result = wait_for_content(self.driver, self.EDITOR_SELECTORS,
+                                  read_file_with_footer(article_path, self.PLATFORM_NAME), timeout=1, settle=0.5)
+        return result['status'] == 'match'
+    
+    def _probe_title_filled(self, front_matter: Dict[str, Any]) -> bool:
+        """标题输入框中是否已经是本文标题"""
+        value = self.driver.find_element(By.XPATH, self.TITLE_INPUT_XPATH).get_attribute('value')
+        return value == self._article_title(front_matter)
+    
+    def _probe_publish_dialog_open(self) -> bool:
+        """发布设置弹窗是否已经打开"""
+        return bool(self.driver.find_elements(By.XPATH, self.PUBLISH_DIALOG_XPATH))
+    
+    def _save_draft(self) -> bool:
+        """
+        等待编辑器自动保存草稿
+        
+        Returns:
+            bool: 是否取得草稿ID
+        """
+        logger.info("等待草稿自动保存...")
+        try:
+            WebDriverWait(self.driver, 15).until(
+                EC.presence_of_element_located((By.XPATH, '//*[contains(text(), "保存成功")]'))
+            )
+        except Exception:
+            logger.warning("⚠ 没有看到自动保存成功的提示，继续读取草稿ID")
+        return self.capture_draft()
+    
+    def finish_draft(self, front_matter: Dict[str, Any]) -> bool:
+        """在已打开的草稿中执行发布设置和最终发布"""
+        if not self.run_step(self._click_publish_button):
+            logger.error("✗ 无法点击发布按钮")
+            return False
+        if not self.run_step(self._fill_publish_settings, front_matter):
+            logger.error("✗ 填充发布设置失败")
+            return False
+        return self.run_step(self._confirm_publish)
+    
     def _click_publish_button(self) -> bool:
         """
         点击发布按钮
@@ -391,9 +441,7 @@ class JuejinPublisher(BasePublisher):
             # 等待发布弹窗出现
             wait = WebDriverWait(self.driver, 10)
             title_label = wait.until(
-                EC.presence_of_element_located(
-                    (By.XPATH, '//div[contains(@class,"title") and contains(text(), "发布文章")]')
-                )
+                EC.presence_of_element_located((By.XPATH, self.PUBLISH_DIALOG_XPATH))
             )
             logger.info("✓ 发布设置弹窗已显示")
             
@@ -424,18 +472,19 @@ class JuejinPublisher(BasePublisher):
     def _select_category(self) -> bool:
         """选择文章分类"""
         try:
-            category = self.platform_config.get('category')
-            if not category:
+            categories = self.resolve_taxonomy('categories', [self.platform_config.get('category')])
+            if not categories:
                 logger.info("⚠ 未配置分类，跳过")
                 return True
             
-            category_btn = self.driver.find_element(
-                By.XPATH, 
-                f'//div[@class="form-item-content category-list"]//div[contains(text(), "{category}")]'
-            )
-            category_btn.click()
-            logger.info(f"✓ 已选择分类：{category}")
-            time.sleep(1)
+            # 分类按钮全部在弹窗中，读取写入缓存并在同一次往返中点击
+            category_xpath = '//div[@class="form-item-content category-list"]/div'
+            self.taxonomy.update('categories', collect_texts(self.driver, category_xpath), complete=True)
+            categories = self.resolve_taxonomy('categories', categories) or categories
+            if not click_by_texts(self.driver, category_xpath, categories[:1]):
+                logger.warning(f"⚠ 未找到分类：{categories[0]}")
+                return True
+            logger.info(f"✓ 已选择分类：{categories[0]}")
             return True
         except Exception as e:
             logger.warning(f"⚠ 选择分类失败：{e}")
@@ -444,40 +493,25 @@ class JuejinPublisher(BasePublisher):
     def _add_tags(self) -> bool:
         """添加文章标签"""
         try:
-            tags = self.platform_config.get('tags', [])
+            # 用缓存的平台标签校验映射，无效标签直接跳过，不再逐个搜索后失败
+            tags = self.resolve_taxonomy('tags', self.platform_config.get('tags', []))
             if not tags:
                 logger.info("⚠ 未配置标签，跳过")
                 return True
             
-            cmd_ctrl = Keys.COMMAND if sys.platform == 'darwin' else Keys.CONTROL
-            
             # 点击标签输入框
             tag_btn = self.driver.find_element(
                 By.XPATH, 
                 '//div[contains(@class,"byte-select__placeholder") and contains(text(), "请搜索添加标签")]'
             )
             tag_btn.click()
-            time.sleep(1)
             
             # 逐个添加标签
             for tag in tags:
-                try:
-                    # 使用复制粘贴的方式输入标签
-                    pyperclip.copy(tag)
-                    action_chains = ActionChains(self.driver)
-                    action_chains.key_down(cmd_ctrl).send_keys('v').key_up(cmd_ctrl).perform()
-                    time.sleep(1)
-                    
-                    # 从下拉框中选择对应的标签
-                    tag_element = self.driver.find_element(
-                        By.XPATH, 
-                        f'//li[contains(@class,"byte-select-option") and contains(text(), "{tag}")]'
-                    )
-                    tag_element.click()
+                if self._pick_select_option(tag, f'//li[contains(@class,"byte-select-option") and contains(text(), "{tag}")]'):
                     logger.info(f"✓ 已添加标签：{tag}")
-                    time.sleep(1)
-                except Exception as e:
-                    logger.warning(f"⚠ 添加标签 {tag} 失败：{e}")
+                else:
+                    logger.warning(f"⚠ 添加标签 {tag} 失败：下拉框中没有该标签")
             
             # 点击其他位置关闭下拉框
             title_label = self.driver.find_element(
@@ -491,6 +525,27 @@ class JuejinPublisher(BasePublisher):
             logger.warning(f"⚠ 添加标签失败：{e}")
             return True  # 非关键步骤
     
+    def _pick_select_option(self, text: str, option_xpath: str, timeout: float = 3) -> bool:
+        """
+        在 byte-select 下拉框的搜索框中填写文本，等待选项出现后立即点击
+        
+        Args:
+            text: 搜索文本
+            option_xpath: 目标选项的XPath
+            timeout: 等待选项出现的时间（秒）
+        
+        Returns:
+            bool: 是否选中
+        """
+        # 点击下拉框后焦点在搜索框上，直接设置值并触发 input 事件，不再经过剪贴板
+        fill_element(self.driver, self.driver.switch_to.active_element, text)
+        
+        _, option = FlowEngine(self.driver).find_first([(By.XPATH, option_xpath)], timeout=timeout, condition='visible')
+        if option is None:
+            return False
+        option.click()
+        return True
+    
     def _upload_cover_image(self, front_matter: Dict[str, Any]) -> bool:
         """上传封面图"""
         try:
@@ -514,40 +569,26 @@ class JuejinPublisher(BasePublisher):
     def _add_to_collections(self) -> bool:
         """收录至专栏"""
         try:
-            collections = self.platform_config.get('collections', [])
+            # 同一篇文章最多添加三个专栏
+            collections = self.resolve_taxonomy('columns', self.platform_config.get('collections', []), limit=3)
             if not collections:
                 logger.info("⚠ 未配置专栏，跳过")
                 return True
             
-            cmd_ctrl = Keys.COMMAND if sys.platform == 'darwin' else Keys.CONTROL
-            
             # 点击专栏输入框
             collection_button = self.driver.find_element(
                 By.XPATH, 
                 '//div[contains(@class,"byte-select__placeholder") and contains(text(), "请搜索添加专栏，同一篇文章最多添加三个专栏")]'
             )
             collection_button.click()
-            time.sleep(1)
             
             # 逐个添加专栏
             for coll in collections:
-                try:
-                    # 使用复制粘贴的方式输入专栏名
-                    pyperclip.copy(coll)
-                    action_chains = ActionChains(self.driver)
-                    action_chains.key_down(cmd_ctrl).send_keys('v').key_up(cmd_ctrl).perform()
-                    time.sleep(1)
-                    
-                    # 从下拉框中选择对应的专栏
-                    coll_element = self.driver.find_element(
-                        By.XPATH, 
-                        f'//li[contains(@class,"byte-select-option") and contains(text(), "{coll}")]'
-                    )
-                    coll_element.click()
+                if self._pick_select_option(coll, f'//li[contains(@class,"byte-select-option") and contains(text(), "{coll}")]'):
+                    self.taxonomy.update('columns', [coll])
                     logger.info(f"✓ 已添加到专栏：{coll}")
-                    time.sleep(1)
-                except Exception as e:
-                    logger.warning(f"⚠ 添加专栏 {coll} 失败：{e}")
+                else:
+                    logger.warning(f"⚠ 添加专栏 {coll} 失败：下拉框中没有该专栏")
             
             # 点击其他位置关闭下拉框
             title_label = self.driver.find_element(
@@ -564,12 +605,11 @@ class JuejinPublisher(BasePublisher):
     def _add_topic(self) -> bool:
         """添加创作话题"""
         try:
-            topic = self.platform_config.get('topic')
-            if not topic:
+            topics = self.resolve_taxonomy('topics', [self.platform_config.get('topic')], limit=1)
+            if not topics:
                 logger.info("⚠ 未配置创作话题，跳过")
                 return True
-            
-            cmd_ctrl = Keys.COMMAND if sys.platform == 'darwin' else Keys.CONTROL
+            topic = topics[0]
             
             # 点击话题输入框
             topic_btn = self.driver.find_element(
@@ -577,22 +617,13 @@ class JuejinPublisher(BasePublisher):
                 '//div[contains(@class,"byte-select__placeholder") and contains(text(), "请搜索添加话题，最多添加1个话题")]'
             )
             topic_btn.click()
-            time.sleep(1)
-            
-            # 使用复制粘贴的方式输入话题
-            pyperclip.copy(topic)
-            action_chains = ActionChains(self.driver)
-            action_chains.key_down(cmd_ctrl).send_keys('v').key_up(cmd_ctrl).perform()
-            time.sleep(1)
             
             # 从下拉框中选择对应的话题
-            topic_element = self.driver.find_element(
-                By.XPATH, 
-                f'//li[@class="byte-select-option"]//span[contains(text(), "{topic}")]'
-            )
-            topic_element.click()
+            if not self._pick_select_option(topic, f'//li[@class="byte-select-option"]//span[contains(text(), "{topic}")]'):
+                logger.warning(f"⚠ 添加创作话题失败：下拉框中没有 {topic}")
+                return True
+            self.taxonomy.update('topics', [topic])
             logger.info(f"✓ 已添加创作话题：{topic}")
-            time.sleep(1)
             
             # 点击其他位置关闭下拉框
             title_label = self.driver.find_element(
@@ -623,11 +654,10 @@ class JuejinPublisher(BasePublisher):
                 By.XPATH, 
                 '//textarea[@class="byte-input__textarea"]'
             )
-            summary_textarea.clear()
-            summary_textarea.send_keys(summary)
-            
-            logger.info(f"✓ 已填充摘要")
-            time.sleep(2)
+            if fill_element(self.driver, summary_textarea, summary):
+                logger.info(f"✓ 已填充摘要")
+            else:
+                logger.warning("⚠ 摘要输入框的值与摘要不一致")
             return True
         except Exception as e:
             logger.warning(f"⚠ 填充摘要失败：{e}")
@@ -640,10 +670,10 @@ class JuejinPublisher(BasePublisher):
                 By.XPATH, 
                 '//button[contains(text(), "确定并发布")]'
             )
+            watcher = self.watch_publish()
             publish_button.click()
             logger.info("✓ 已点击确定并发布")
-            time.sleep(3)
-            return True
+            return self.confirm_publish(watcher)
         except Exception as e:
             logger.error(f"✗ 确认发布失败：{e}")
             return False
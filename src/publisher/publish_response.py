@@ -0,0 +1,183 @@
+"""
+发布结果确认模块
+点击最终发布按钮后，从网络日志中等待平台发布接口的响应，
+根据响应体判断是否发布成功并取出文章ID和链接，代替点击后的固定等待和页面轮询
+"""
+
+import json
+import re
+import time
+from typing import Any, Dict, Optional, Sequence, Set
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.core.logger import get_logger
+from src.core.network_log import get_network_log
+
+logger = get_logger(__name__)
+
+
+class PublishEndpoint:
+    """
+    平台的发布接口描述
+
+    Args:
+        pattern: 发布接口URL的正则表达式
+        ok_key: 响应体中表示结果的字段（如 code、status）
+        ok_values: 表示成功的取值
+        id_keys: 文章ID字段，按顺序在响应体中查找
+        url_keys: 文章链接字段，按顺序在响应体中查找
+        url_template: 响应体中没有链接时，用文章ID拼出链接（如 ``https://example.com/{id}``）
+        body_pattern: 请求体的正则表达式。同一个接口也用于保存草稿、自动保存时，
+            用它区分真正的发布请求（如 ``"status":0``）
+    """
+
+    def __init__(self, pattern: str, ok_key: str = 'code', ok_values: Sequence[Any] = (0,),
+                 id_keys: Sequence[str] = ('id',), url_keys: Sequence[str] = ('url',), url_template: str = '',
+                 body_pattern: str = ''):
+        self.pattern = re.compile(pattern)
+        self.body_pattern = re.compile(body_pattern) if body_pattern else None
+        self.ok_key = ok_key
+        self.ok_values = {str(value) for value in ok_values}
+        self.id_keys = tuple(id_keys)
+        self.url_keys = tuple(url_keys)
+        self.url_template = url_template
+
+    def matches(self, entry: Dict[str, Any], post_data: Optional[str] = None) -> bool:
+        """
+        网络日志条目是否为发布接口请求（忽略跨域预检请求；声明了 body_pattern 时还要求请求体匹配）
+
+        Args:
+            entry: 请求条目
+            post_data: 请求体，为 None 时使用条目中的 post_data
+        """
+        if entry.get('method') == 'OPTIONS' or not self.pattern.search(entry.get('url') or ''):
+            return False
+        if self.body_pattern is None:
+            return True
+        body = entry.get('post_data') if post_data is None else post_data
+        return bool(body) and bool(self.body_pattern.search(body))
+
+
+def _find_value(data: Any, keys: Sequence[str]) -> Any:
+    """在响应体中（含嵌套的 data 等字段）按顺序查找第一个非空字段"""
+    if isinstance(data, dict):
+        for key in keys:
+            if data.get(key) not in (None, ''):
+                return data[key]
+        children = data.values()
+    elif isinstance(data, list):
+        children = data
+    else:
+        return None
+    for child in children:
+        value = _find_value(child, keys)
+        if value is not None:
+            return value
+    return None
+
+
+def parse_publish_response(endpoint: PublishEndpoint, body: Optional[str]) -> Dict[str, Any]:
+    """
+    解析发布接口的响应体
+
+    Args:
+        endpoint: 发布接口描述
+        body: 响应体文本
+
+    Returns:
+        Dict: ok / id / url / message
+    """
+    try:
+        data = json.loads(body or '')
+    except ValueError:
+        return {'ok': False, 'id': '', 'url': '', 'message': f"响应不是JSON：{(body or '')[:100]}"}
+    if not isinstance(data, dict):
+        return {'ok': False, 'id': '', 'url': '', 'message': f"响应格式未知：{str(data)[:100]}"}
+
+    ok = str(data.get(endpoint.ok_key)) in endpoint.ok_values
+    article_id = _find_value(data, endpoint.id_keys)
+    article_id = '' if article_id is None else str(article_id)
+    url = _find_value(data, endpoint.url_keys) or ''
+    if not url and article_id and endpoint.url_template:
+        url = endpoint.url_template.format(id=article_id)
+    message = data.get('msg') or data.get('message') or data.get('err_msg') or ''
+    return {'ok': ok, 'id': article_id, 'url': str(url), 'message': str(message)}
+
+
+class PublishResponseWatcher:
+    """
+    等待发布接口的响应
+
+    点击发布按钮之前调用 ``start()`` 记下已有的请求，点击之后调用 ``wait()``，
+    只看点击之后发出的发布接口请求。网络日志与录制器、故障归档共享，不会清空其中的条目。
+
+    Example:
+        watcher = PublishResponseWatcher(driver, endpoint).start()
+        button.click()
+        result = watcher.wait(timeout=20)
+    """
+
+    def __init__(self, driver: WebDriver, endpoint: PublishEndpoint):
+        self.network = get_network_log(driver)
+        self.endpoint = endpoint
+        self._seen: Set[str] = set()
+
+    def start(self) -> 'PublishResponseWatcher':
+        """记下点击前已有的请求"""
+        self._seen = {entry['request_id'] for entry in self.network.recent(limit=self.network.max_entries)}
+        return self
+
+    def _matches(self, entry: Dict[str, Any]) -> bool:
+        """是否为发布请求；需要匹配请求体而日志中没有带上时通过 CDP 获取"""
+        if self.endpoint.body_pattern is not None and self.endpoint.pattern.search(entry.get('url') or ''):
+            return self.endpoint.matches(entry, self.network.get_post_data(entry))
+        return self.endpoint.matches(entry)
+
+    def wait(self, timeout: float = 20, interval: float = 0.3, idle: float = 5) -> Dict[str, Any]:
+        """
+        等待发布接口的响应并解析结果
+
+        返回的 status：
+        - ok：接口返回成功
+        - error：接口返回失败或请求失败（message 为平台返回的原因）
+        - timeout：超时仍没有发布接口的响应
+        - unavailable：点击后 idle 秒内没有任何网络事件（未开启性能日志），无法确认
+
+        Args:
+            timeout: 最长等待时间（秒）
+            interval: 读取网络日志的间隔（秒）
+            idle: 没有任何网络事件多久视为无法确认（秒）
+
+        Returns:
+            Dict: status / id / url / message / elapsed
+        """
+        start = time.monotonic()
+        any_traffic = False
+        while True:
+            elapsed = time.monotonic() - start
+            new_entries = self.network.find(lambda entry: entry['request_id'] not in self._seen)
+            any_traffic = any_traffic or bool(new_entries)
+
+            for entry in new_entries:
+                if not (entry['finished'] or entry['failed']):
+                    continue
+                if not self._matches(entry):
+                    # 已完成的其他请求（包括同一接口的保存草稿、自动保存）不再重复检查
+                    self._seen.add(entry['request_id'])
+                    continue
+                if entry['failed']:
+                    return {'status': 'error', 'id': '', 'url': '', 'elapsed': elapsed,
+                            'message': f"请求失败：{entry.get('error', '')}"}
+                result = parse_publish_response(self.endpoint, self.network.get_body(entry['request_id']))
+                if entry.get('status') and entry['status'] >= 400:
+                    result['ok'] = False
+                    result['message'] = result['message'] or f"HTTP {entry['status']}"
+                return {'status': 'ok' if result['ok'] else 'error', 'id': result['id'], 'url': result['url'],
+                        'message': result['message'], 'elapsed': elapsed}
+
+            if not any_traffic and elapsed >= idle:
+                return {'status': 'unavailable', 'id': '', 'url': '', 'message': '', 'elapsed': elapsed}
+            if elapsed >= timeout:
+                return {'status': 'timeout', 'id': '', 'url': '', 'message': '', 'elapsed': elapsed}
+            time.sleep(interval)
@@ -0,0 +1,322 @@
+"""
+平台分类体系缓存
+缓存各平台的有效标签、分类、专栏和话题，发布前把文章标签映射为平台可用的值
+"""
+
+import json
+import pickle
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 缓存目录
+TAXONOMY_DIR = Path(__file__).parent.parent.parent / 'data' / 'taxonomy'
+# Cookie目录（与 SessionManager 保持一致）
+COOKIE_DIR = Path(__file__).parent.parent.parent / 'data' / 'cookies'
+
+# 支持的分类体系种类
+KINDS = ('tags', 'categories', 'columns', 'topics')
+
+# 默认缓存有效期：1天
+DEFAULT_TTL = 24 * 3600
+
+# 刷新失败（未登录、网络不通）后多久再试：1小时，避免每次创建发布器都发起请求
+RETRY_INTERVAL = 3600
+
+# 获取函数：接收已加载Cookie的 requests.Session，返回 {种类: {名称: ID}}
+Fetcher = Callable[[Any], Dict[str, Dict[str, Any]]]
+
+# 掘金标签接口最多读取的页数（每页 100 个）
+JUEJIN_TAG_PAGES = 10
+
+
+class PartialValues(dict):
+    """获取函数没有拿到全部值（如达到分页上限）时返回的 {名称: ID}：写入缓存但不标记为完整列表"""
+
+
+class TaxonomyCache:
+    """
+    单个平台的分类体系缓存
+
+    数据保存在 ``data/taxonomy/<platform>.json``，来源有两种：
+    1. 平台接口（后台线程定期刷新，见 ``TAXONOMY_FETCHERS``）
+    2. 发布过程中从页面下拉框读取到的选项（``update`` 合并写入）
+    """
+
+    def __init__(self, platform: str, ttl: float = DEFAULT_TTL, cache_dir: Optional[Path] = None):
+        """
+        初始化缓存
+
+        Args:
+            platform: 平台名称
+            ttl: 缓存有效期（秒）
+            cache_dir: 缓存目录，默认 data/taxonomy
+        """
+        self.platform = platform
+        self.ttl = ttl
+        self.cache_file = Path(cache_dir or TAXONOMY_DIR) / f"{platform}.json"
+        self._lock = threading.Lock()
+        self._refreshing: Optional[threading.Thread] = None
+        self._data = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        """从文件加载缓存"""
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"⚠ 读取分类体系缓存失败：{self.cache_file}，错误：{e}")
+        return {'updated_at': 0}
+
+    def _save(self):
+        """写入缓存文件（先写临时文件再替换，避免读到半个文件）"""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        tmp_file.replace(self.cache_file)
+
+    def get(self, kind: str) -> Dict[str, Any]:
+        """
+        获取某一种类的全部值
+
+        Args:
+            kind: tags / categories / columns / topics
+
+        Returns:
+            Dict[str, Any]: 名称 -> 平台ID（页面读取的值没有ID时为 None）
+        """
+        with self._lock:
+            return dict(self._data.get(kind, {}))
+
+    def update(self, kind: str, values: Union[Dict[str, Any], Iterable[str]], replace: bool = False,
+               complete: bool = False):
+        """
+        合并写入某一种类的值
+
+        Args:
+            kind: tags / categories / columns / topics
+            values: 名称 -> ID 字典，或名称列表
+            replace: 是否整体替换（接口刷新时使用），默认合并
+            complete: 是否为该种类的完整列表（如接口结果、弹窗中的全部分类），
+                只有完整列表才会用于剔除无效名称；整体替换为不完整的列表时取消完整标记
+        """
+        if kind not in KINDS:
+            raise ValueError(f"不支持的分类体系种类：{kind}")
+        if not isinstance(values, dict):
+            values = {name: None for name in values}
+        values = {str(name).strip(): value for name, value in values.items() if str(name).strip()}
+        if not values and not replace:
+            return
+
+        with self._lock:
+            current = {} if replace else dict(self._data.get(kind, {}))
+            for name, value in values.items():
+                # 页面读取的值没有ID，不覆盖接口拿到的ID
+                if value is not None or name not in current:
+                    current[name] = value
+            self._data[kind] = current
+            complete_kinds = self._data.setdefault('complete', [])
+            if complete and kind not in complete_kinds:
+                complete_kinds.append(kind)
+            elif replace and not complete and kind in complete_kinds:
+                complete_kinds.remove(kind)
+            self._save()
+
+    def is_stale(self) -> bool:
+        """缓存是否过期（过期后上次刷新尝试不到 RETRY_INTERVAL 时不算，等下次再试）"""
+        now = time.time()
+        if now - self._data.get('updated_at', 0) <= self.ttl:
+            return False
+        return now - self._data.get('attempted_at', 0) > RETRY_INTERVAL
+
+    def resolve(self, kind: str, names: Iterable[str], aliases: Optional[Dict[str, str]] = None,
+                limit: Optional[int] = None) -> List[str]:
+        """
+        把文章中的名称映射为平台可用的值
+
+        依次尝试：别名 -> 忽略大小写完全匹配 -> 有效值在单词边界处包含整个名称（取最短的候选，
+        如 Vue -> Vue.js；Go 不会匹配 Google，单个字符的名称只完全匹配）。
+        缓存中只有部分数据（如搜索时看到的标签）时，未匹配的名称原样保留；
+        只有完整列表才会剔除未匹配的名称。
+
+        Args:
+            kind: tags / categories / columns / topics
+            names: 文章中的名称（如 front matter 的 tags）
+            aliases: 别名映射，如 {'py': 'Python'}
+            limit: 最多返回的数量
+
+        Returns:
+            List[str]: 映射后的名称（去重，保持顺序）
+        """
+        names = [str(name).strip() for name in (names or []) if name and str(name).strip()]
+        aliases = {str(k).casefold(): v for k, v in (aliases or {}).items()}
+        valid = list(self.get(kind))
+        with self._lock:
+            complete = kind in self._data.get('complete', [])
+
+        resolved: List[str] = []
+        dropped: List[str] = []
+        for name in names:
+            name = aliases.get(name.casefold(), name)
+            match = self._match(name, valid)
+            if match is None and not complete:
+                match = name
+            if match is None:
+                dropped.append(name)
+            elif match not in resolved:
+                resolved.append(match)
+
+        if dropped:
+            logger.info(f"{self.platform} 的{kind}中没有匹配项，已忽略：{dropped}")
+        return resolved[:limit] if limit else resolved
+
+    @staticmethod
+    def _match(name: str, valid: List[str]) -> Optional[str]:
+        """在有效值中查找匹配项"""
+        folded = name.casefold()
+        for candidate in valid:
+            if candidate.casefold() == folded:
+                return candidate
+        if len(folded) < 2:
+            return None
+        # 前后不能紧接字母或数字：避免 Kubernetes -> R、Django -> Go 这类误匹配
+        pattern = re.compile(r'(?<![a-z0-9])' + re.escape(folded) + r'(?![a-z0-9])')
+        partial = [c for c in valid if pattern.search(c.casefold())]
+        if partial:
+            return min(partial, key=len)
+        return None
+
+    def refresh(self, fetcher: Fetcher) -> bool:
+        """
+        通过平台接口刷新缓存（同步执行）
+
+        Args:
+            fetcher: 获取函数
+
+        Returns:
+            bool: 是否刷新成功
+        """
+        with self._lock:
+            self._data['attempted_at'] = time.time()
+        try:
+            session = build_cookie_session(self.platform)
+            result = fetcher(session)
+        except Exception as e:
+            logger.warning(f"⚠ 刷新 {self.platform} 分类体系失败：{e}")
+            with self._lock:
+                self._save()
+            return False
+
+        for kind, values in result.items():
+            if values:
+                self.update(kind, values, replace=True, complete=not isinstance(values, PartialValues))
+        with self._lock:
+            self._data['updated_at'] = time.time()
+            self._save()
+
+        summary = '，'.join(f"{kind} {len(values)} 个{'（不完整）' if isinstance(values, PartialValues) else ''}"
+                           for kind, values in result.items())
+        logger.info(f"✓ 已刷新 {self.platform} 分类体系：{summary}")
+        return True
+
+    def refresh_async(self, fetcher: Optional[Fetcher] = None) -> Optional[threading.Thread]:
+        """
+        缓存过期时在后台线程中刷新，不阻塞发布流程
+
+        Args:
+            fetcher: 获取函数，默认使用 TAXONOMY_FETCHERS 中注册的函数
+
+        Returns:
+            Thread: 刷新线程；不需要刷新或没有获取函数时返回 None
+        """
+        fetcher = fetcher or TAXONOMY_FETCHERS.get(self.platform)
+        if not fetcher or not self.is_stale():
+            return None
+        if self._refreshing and self._refreshing.is_alive():
+            return self._refreshing
+
+        self._refreshing = threading.Thread(
+            target=self.refresh, args=(fetcher,), name=f"taxonomy-{self.platform}", daemon=True
+        )
+        self._refreshing.start()
+        return self._refreshing
+
+
+def build_cookie_session(platform: str):
+    """创建带有已保存Cookie的 requests 会话"""
+    import requests
+
+    session = requests.Session()
+    session.headers['User-Agent'] = (
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+    )
+    cookie_file = COOKIE_DIR / f"{platform}_cookies.pkl"
+    if cookie_file.exists():
+        with open(cookie_file, 'rb') as f:
+            for cookie in pickle.load(f):
+                session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'))
+    return session
+
+
+def fetch_juejin_taxonomy(session) -> Dict[str, Dict[str, Any]]:
+    """通过掘金公开接口获取分类和标签（标签超过 JUEJIN_TAG_PAGES 页时返回不完整的 PartialValues）"""
+    api = 'https://api.juejin.cn/tag_api/v1'
+
+    response = session.post(f"{api}/query_category_list", json={}, timeout=10)
+    response.raise_for_status()
+    categories = {
+        item['category']['category_name']: item['category_id']
+        for item in response.json().get('data') or []
+    }
+
+    tags: Dict[str, Any] = {}
+    cursor = '0'
+    for _ in range(JUEJIN_TAG_PAGES):
+        response = session.post(f"{api}/query_tag_list", json={
+            'cursor': cursor, 'key_word': '', 'limit': 100, 'sort_type': 1
+        }, timeout=10)
+        response.raise_for_status()
+        payload = response.json()
+        for item in payload.get('data') or []:
+            tags[item['tag']['tag_name']] = item['tag_id']
+        if not payload.get('has_more'):
+            return {'categories': categories, 'tags': tags}
+        cursor = payload.get('cursor', str(len(tags)))
+
+    # 最后一页仍有更多标签：缓存已读取的部分，但不能据此剔除文章中的标签
+    logger.warning(f"⚠ 掘金标签超过 {JUEJIN_TAG_PAGES} 页，只缓存了前 {len(tags)} 个")
+    return {'categories': categories, 'tags': PartialValues(tags)}
+
+
+# 有公开接口的平台；其他平台的数据来自发布过程中从页面读取的选项
+TAXONOMY_FETCHERS: Dict[str, Fetcher] = {
+    'juejin': fetch_juejin_taxonomy,
+}
+
+_caches: Dict[str, TaxonomyCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_taxonomy(platform: str) -> TaxonomyCache:
+    """
+    获取平台的分类体系缓存（同一平台共享一个实例）
+
+    Args:
+        platform: 平台名称
+
+    Returns:
+        TaxonomyCache: 缓存实例
+    """
+    with _caches_lock:
+        if platform not in _caches:
+            _caches[platform] = TaxonomyCache(platform)
+        return _caches[platform]
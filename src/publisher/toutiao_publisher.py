@@ -13,6 +13,9 @@ from selenium.webdriver.support import expected_conditions as EC
 
 from src.publisher.base_publisher import BasePublisher
 from src.publisher.common_handler import wait_login
+from src.publisher.flow_engine import FlowEngine
+from src.publisher.form_filler import fill_element
+from src.publisher.publish_response import PublishEndpoint
 from src.core.logger import get_logger
 from src.utils.file_utils import convert_md_to_html
 from src.utils.selenium_utils import get_html_web_content
@@ -26,6 +29,31 @@ class ToutiaoPublisher(BasePublisher):
     
     PLATFORM_NAME = "toutiao"
     
+    # 页面就绪探针：编辑器出现即可开始填写
+    READY_SELECTORS = ['.publish-editor .ProseMirror']
+    
+    # 编辑器会自动保存草稿，保存后地址带上 pgc_id
+    DRAFT_URL_PATTERN = r'[?&]pgc_id=(?P<id>\d+)'
+    # 登录后才有的Cookie
+    LOGIN_COOKIE = 'sessionid'
+    
+    # "预览并发布"按钮候选定位器
+    PREVIEW_PUBLISH_BUTTONS = [
+        (By.XPATH, '//button[contains(@class,"publish-btn-last") and .//span[text()="预览并发布"]]'),
+        (By.XPATH, '//button[contains(@class,"publish-btn-last")]'),
+    ]
+    
+    # "确认发布"按钮候选定位器
+    CONFIRM_PUBLISH_BUTTONS = [
+        (By.XPATH, '//button[contains(@class,"publish-btn-last") and .//span[text()="确认发布"]]'),
+        (By.XPATH, '//button[.//span[contains(text(),"确认发布")]]'),
+    ]
+    
+    # 发布接口：code 为 0 时成功，data 中的 pgc_id 即文章ID
+    PUBLISH_ENDPOINT = PublishEndpoint(r'mp\.toutiao\.com/mp/agw/article/publish', ok_key='code', ok_values=(0,),
+                                       id_keys=('pgc_id', 'article_id', 'id'), url_keys=('url', 'article_url'),
+                                       url_template='https://www.toutiao.com/item/{id}/')
+    
     def __init__(self, common_config: Dict[str, Any] = None, platform_config: Dict[str, Any] = None):
         """
         初始化今日头条发布器
@@ -70,64 +98,70 @@ class ToutiaoPublisher(BasePublisher):
             if not self.driver:
                 self.setup_driver(use_existing=True)
             
-            # 2. 打开新标签页（但不立即访问URL）
-            self.driver.switch_to.new_window('tab')
-            logger.info("✓ 已切换到新标签页")
-            
-            # 3. 尝试加载Cookie（这会访问URL）
-            cookie_loaded = self.load_cookies_if_exists(self.site_url)
-            if cookie_loaded:
-                logger.info("✓ 成功加载已保存的登录状态")
-                # load_cookies内部已经刷新过了，不需要再刷新
-            else:
-                logger.info("⚠ 未找到保存的登录状态，需要手动登录")
-                # 如果没有Cookie，手动访问URL
-                self.driver.get(self.site_url)
-                time.sleep(2)
-            
-            # 4. 等待登录（如果需要）
-            if not self._check_login_status():
-                logger.info("检测到未登录，等待用户登录...")
-                if not self._wait_for_login():
-                    logger.error("✗ 登录超时或失败")
-                    return False
+            # 重试时回到上次失败时的编辑器标签页，跳过打开页面和登录
+            if not self.resume_editor(article_path):
+                # 2. 打开新标签页（但不立即访问URL）
+                self.driver.switch_to.new_window('tab')
+                logger.info("✓ 已切换到新标签页")
                 
-                # 登录成功后保存Cookie
-                logger.info("✓ 登录成功，保存登录状态...")
-                self.save_login_state(self.site_url)
-            else:
-                # 如果已经登录，更新cookies以保持同步
-                logger.debug("已登录状态，更新cookies...")
-                self.update_cookies(self.site_url)
+                # 3. 尝试加载Cookie（这会访问URL）
+                cookie_loaded = self.load_cookies_if_exists(self.site_url)
+                if cookie_loaded:
+                    logger.info("✓ 成功加载已保存的登录状态")
+                    # load_cookies内部已经刷新过了，不需要再刷新
+                    self.wait_page_ready()
+                else:
+                    logger.info("⚠ 未找到保存的登录状态，需要手动登录")
+                    # 如果没有Cookie，手动访问URL
+                    self.open_page(self.site_url)
+                
+                # 4. 等待登录（如果需要）
+                if not self._check_login_status():
+                    logger.info("检测到未登录，等待用户登录...")
+                    if not self.wait_for_login_or_defer():
+                        logger.error("✗ 登录超时或失败")
+                        return False
+                    
+                    # 登录成功后保存Cookie
+                    logger.info("✓ 登录成功，保存登录状态...")
+                    self.save_login_state(self.site_url)
+                else:
+                    # 如果已经登录，更新cookies以保持同步
+                    logger.debug("已登录状态，更新cookies...")
+                    self.update_cookies(self.site_url)
             
             # 5. 解析文章元数据
             front_matter = self.parse_article_metadata(article_path)
             
             # 6. 填充文章标题
-            if not self._fill_title(front_matter):
+            if not self.run_step(self._fill_title, front_matter):
                 logger.error("✗ 填充标题失败")
                 return False
             
             # 7. 填充文章内容
-            if not self._fill_content(article_path):
+            if not self.run_step(self._fill_content, article_path):
                 logger.error("✗ 填充内容失败")
                 return False
             
+            # 草稿模式：等待自动保存后结束，审阅后由 publish_draft 完成封面设置和最终发布
+            if self.draft_mode:
+                return self.run_step(self._save_draft)
+            
             # 8. 点击编辑器空白位置获取焦点（重要！）
-            if not self._click_editor_blank_area():
+            if not self.run_step(self._click_editor_blank_area):
                 logger.warning("⚠ 点击编辑器空白位置失败，继续执行")
             
             # 9. 点击下方表单区域（触发页面更新）
-            if not self._click_form_area():
+            if not self.run_step(self._click_form_area):
                 logger.warning("⚠ 点击表单区域失败，继续执行")
             
             # 10. 选择无封面
-            if not self._select_no_cover():
+            if not self.run_step(self._select_no_cover):
                 logger.warning("⚠ 选择无封面失败，继续执行")
             
             # 13. 最终发布
             if self.auto_publish:
-                if not self._final_publish():
+                if not self.run_step(self._final_publish):
                     logger.error("✗ 最终发布失败")
                     return False
                 logger.info("✓ 文章发布成功！")
@@ -198,17 +232,15 @@ class ToutiaoPublisher(BasePublisher):
                 EC.presence_of_element_located((By.XPATH, '//div[@class="publish-editor-title-inner"]//textarea[contains(@placeholder,"请输入文章标题")]'))
             )
             
-            title_element.clear()
-            time.sleep(1)
-            
             # 优先使用front matter中的标题
             title = front_matter.get('title') or self.common_config.get('title', '未命名文章')
             # 清理标题中的引号
             title = self.clean_title(title)
-            title_element.send_keys(title)
+            if not fill_element(self.driver, title_element, title):
+                logger.error("✗ 标题输入框的值与标题不一致")
+                return False
             
             logger.info(f"✓ 标题填充完成：{title}")
-            time.sleep(2)
             return True
             
         except Exception as e:
@@ -229,16 +261,20 @@ class ToutiaoPublisher(BasePublisher):
             logger.info("正在填充文章内容...")
             
             # 转换为HTML格式
-            content_file_html = convert_md_to_html(article_path)
+            content_file_html = convert_md_to_html(article_path, platform=self.PLATFORM_NAME)
             logger.info(f"Markdown已转换为HTML：{content_file_html}")
-            
-            # 使用HTML内容填充（打开HTML文件并复制内容到剪贴板）
-            get_html_web_content(self.driver, content_file_html)
-            time.sleep(0.5)
-            
-            # 切换回编辑器标签页
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            time.sleep(1)
+            with open(content_file_html, 'r', encoding='utf-8') as f:
+                html = f.read()
+            chunked = self.should_inject_in_chunks(html)
+            
+            if not chunked:
+                # 使用HTML内容填充（打开HTML文件并复制内容到剪贴板）
+                get_html_web_content(self.driver, content_file_html)
+                time.sleep(0.5)
+                
+                # 切换回编辑器标签页
+                self.driver.switch_to.window(self.driver.window_handles[-1])
+                time.sleep(1)
             
             # 定位到内容编辑器
             content_element = WebDriverWait(self.driver, 10).until(
@@ -254,13 +290,21 @@ class ToutiaoPublisher(BasePublisher):
             content_element.click()
             time.sleep(1)
             
-            # 粘贴内容
-            cmd_ctrl = Keys.COMMAND if sys.platform == 'darwin' else Keys.CONTROL
-            action_chains = ActionChains(self.driver)
-            action_chains.key_down(cmd_ctrl).send_keys('v').key_up(cmd_ctrl).perform()
+            if chunked:
+                # 长文：按顶层元素分块写入，不经过辅助页面和剪贴板
+                if not self.inject_content(['.publish-editor .ProseMirror'], html, markup='html'):
+                    return False
+            else:
+                # 粘贴内容
+                cmd_ctrl = Keys.COMMAND if sys.platform == 'darwin' else Keys.CONTROL
+                action_chains = ActionChains(self.driver)
+                action_chains.key_down(cmd_ctrl).send_keys('v').key_up(cmd_ctrl).perform()
+                
+                # 等待编辑器处理完粘贴的HTML
+                if not self.verify_editor_content(['.publish-editor .ProseMirror'], html, markup='html'):
+                    return False
             
             logger.info("✓ 内容填充完成")
-            time.sleep(1)
             return True
             
         except Exception as e:
@@ -399,6 +443,22 @@ class ToutiaoPublisher(BasePublisher):
             logger.error(f"✗ 选择无封面失败：{e}", exc_info=True)
             return False
     
+    def _save_draft(self) -> bool:
+        """
+        等待编辑器自动保存草稿（保存后地址中出现 pgc_id）
+        
+        Returns:
+            bool: 是否取得草稿ID
+        """
+        logger.info("等待草稿自动保存...")
+        return self.capture_draft(timeout=30)
+    
+    def finish_draft(self, front_matter: Dict[str, Any]) -> bool:
+        """在已打开的草稿中选择无封面并最终发布"""
+        if not self.run_step(self._select_no_cover):
+            logger.warning("⚠ 选择无封面失败，继续执行")
+        return self.run_step(self._final_publish)
+    
     def _final_publish(self) -> bool:
         """
         最终发布文章
@@ -423,27 +483,14 @@ class ToutiaoPublisher(BasePublisher):
             # 第一步：点击"预览并发布"按钮
             logger.info("步骤1: 查找并点击'预览并发布'按钮...")
             
-            # 尝试多种定位方式
-            preview_publish_button = None
-            
-            # 方法1: 通过按钮文本定位
-            try:
-                preview_publish_button = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, '//button[contains(@class,"publish-btn-last") and .//span[text()="预览并发布"]]'))
-                )
-                logger.info("✓ 方法1: 通过文本定位到'预览并发布'按钮")
-            except:
-                logger.info("方法1失败，尝试方法2...")
-                
-                # 方法2: 通过class定位
-                try:
-                    preview_publish_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, '//button[contains(@class,"publish-btn-last")]'))
-                    )
-                    logger.info("✓ 方法2: 通过class定位到发布按钮")
-                except:
-                    logger.error("✗ 无法定位到'预览并发布'按钮")
-                    return False
+            # 文本与class两种定位方式在页面内并行匹配
+            index, preview_publish_button = FlowEngine(self.driver).find_first(
+                self.PREVIEW_PUBLISH_BUTTONS, timeout=15, condition='clickable'
+            )
+            if preview_publish_button is None:
+                logger.error("✗ 无法定位到'预览并发布'按钮")
+                return False
+            logger.info(f"✓ 定位到'预览并发布'按钮（候选 {index + 1}）")
             
             # 滚动到按钮位置并高亮显示（便于调试）
             self.driver.execute_script(
@@ -463,40 +510,24 @@ class ToutiaoPublisher(BasePublisher):
                 self.driver.execute_script("arguments[0].click();", preview_publish_button)
                 logger.info("✓ 已通过JavaScript点击'预览并发布'按钮")
             
-            time.sleep(5)  # 等待页面跳转或弹窗加载
-            
             # 第二步：等待并点击"确认发布"按钮
             logger.info("步骤2: 等待预览页面加载...")
             logger.info("步骤3: 查找并点击'确认发布'按钮...")
             
-            # 尝试多种定位方式
-            confirm_button = None
-            
-            # 方法1: 通过按钮文本定位
-            try:
-                confirm_button = WebDriverWait(self.driver, 20).until(
-                    EC.element_to_be_clickable((By.XPATH, '//button[contains(@class,"publish-btn-last") and .//span[text()="确认发布"]]'))
-                )
-                logger.info("✓ 方法1: 通过文本定位到'确认发布'按钮")
-            except:
-                logger.info("方法1失败，尝试方法2...")
-                
-                # 方法2: 更宽松的定位
+            index, confirm_button = FlowEngine(self.driver).find_first(
+                self.CONFIRM_PUBLISH_BUTTONS, timeout=25, condition='clickable'
+            )
+            if confirm_button is None:
+                logger.error("✗ 无法定位到'确认发布'按钮")
+                logger.info("尝试截图保存当前页面状态...")
                 try:
-                    confirm_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, '//button[.//span[contains(text(),"确认发布")]]'))
-                    )
-                    logger.info("✓ 方法2: 通过contains文本定位到'确认发布'按钮")
+                    screenshot_path = f"/tmp/toutiao_publish_error_{int(time.time())}.png"
+                    self.driver.save_screenshot(screenshot_path)
+                    logger.info(f"截图已保存到: {screenshot_path}")
                 except:
-                    logger.error("✗ 无法定位到'确认发布'按钮")
-                    logger.info("尝试截图保存当前页面状态...")
-                    try:
-                        screenshot_path = f"/tmp/toutiao_publish_error_{int(time.time())}.png"
-                        self.driver.save_screenshot(screenshot_path)
-                        logger.info(f"截图已保存到: {screenshot_path}")
-                    except:
-                        pass
-                    return False
+                    pass
+                return False
+            logger.info(f"✓ 定位到'确认发布'按钮（候选 {index + 1}）")
             
             # 滚动到按钮位置并高亮显示
             self.driver.execute_script(
@@ -507,6 +538,7 @@ class ToutiaoPublisher(BasePublisher):
             time.sleep(1)
             
             # 点击确认发布按钮
+            watcher = self.watch_publish()
             try:
                 confirm_button.click()
                 logger.info("✓ 已点击'确认发布'按钮")
@@ -516,7 +548,8 @@ class ToutiaoPublisher(BasePublisher):
                 self.driver.execute_script("arguments[0].click();", confirm_button)
                 logger.info("✓ 已通过JavaScript点击'确认发布'按钮")
             
-            time.sleep(5)  # 等待发布完成
+            if not self.confirm_publish(watcher, fallback_wait=5):
+                return False
             
             logger.info("=" * 50)
             logger.info("✓ 文章发布流程完成！")
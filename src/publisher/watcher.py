@@ -0,0 +1,298 @@
+"""
+文章目录监听
+监听文章目录和生成器的输出目录，新增或修改的文章在写入停止一段时间后（防抖）交给回调发布。
+
+- 安装了 watchdog 时使用系统的文件事件（inotify / FSEvents），否则定时扫描修改时间和大小；
+- 只有内容指纹变化才算修改（只改了修改时间、编辑器原样保存不会触发）；
+- 已处理的文章指纹保存在 data/watch_state.json，重启后停机期间新增、修改的文章也会被发现；
+  回调报告处理失败的文章不记录指纹，retry_interval 秒后重新处理。
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.core.logger import get_logger
+from src.publisher.duplicates import content_hash
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # 未安装 watchdog 时定时扫描目录
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = get_logger(__name__)
+
+# 已见过的文章指纹
+STATE_FILE = Path(__file__).parent.parent.parent / 'data' / 'watch_state.json'
+
+# 编辑器和生成器的临时文件
+_IGNORED_SUFFIXES = ('~', '.swp', '.swx', '.tmp', '.part')
+
+ADDED = 'added'
+CHANGED = 'changed'
+
+
+def _is_article(path: str, extensions: Tuple[str, ...]) -> bool:
+    name = os.path.basename(path)
+    return (name.endswith(extensions) and not name.startswith('.')
+            and not name.endswith(_IGNORED_SUFFIXES))
+
+
+def file_hash(path: str) -> Optional[str]:
+    """文章的内容指纹（忽略空白差异，含 front matter）；文件不存在或无法读取时返回 None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return content_hash(f.read())
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+class _EventHandler(FileSystemEventHandler):
+    """把 watchdog 的文件事件转为待检查的路径"""
+
+    def __init__(self, watcher: 'ContentWatcher'):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if getattr(event, 'is_directory', False):
+            return
+        for path in (getattr(event, 'src_path', None), getattr(event, 'dest_path', None)):
+            if path:
+                self.watcher.touch(os.fsdecode(path))
+
+
+class ContentWatcher:
+    """
+    文章目录监听器
+
+    Example:
+        watcher = ContentWatcher(['posts', 'kimi/data/articles'], debounce=5)
+        # 回调返回处理失败的路径，这些文章稍后重试
+        watcher.run(lambda changes: publish_batch([path for path, _ in changes], ...))
+    """
+
+    def __init__(self, dirs: Iterable[str], debounce: float = 5.0, poll_interval: float = 2.0,
+                 extensions: Iterable[str] = ('.md',), state_file: Optional[Path] = STATE_FILE,
+                 use_watchdog: bool = True, clock: Callable[[], float] = time.monotonic,
+                 retry_interval: float = 300.0):
+        """
+        初始化监听器
+
+        Args:
+            dirs: 监听的目录（递归），不存在的目录忽略
+            debounce: 文件停止写入多少秒后再处理
+            poll_interval: 扫描间隔（秒），使用 watchdog 时为处理待定文件的间隔
+            extensions: 文章文件扩展名
+            state_file: 保存已见过的文章指纹的文件，None 表示不保存
+            use_watchdog: 是否使用 watchdog（未安装时自动改为定时扫描）
+            clock: 时钟（测试时可替换）
+            retry_interval: 处理失败的文章多少秒后重试
+        """
+        self.dirs = [os.path.abspath(d) for d in dirs if d and os.path.isdir(d)]
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.extensions = tuple(extensions)
+        self.state_file = Path(state_file) if state_file else None
+        self.use_watchdog = use_watchdog and Observer is not None
+        self.clock = clock
+        self.retry_interval = retry_interval
+
+        self._lock = threading.Lock()
+        # 路径 -> 已处理的内容指纹
+        self._hashes: Dict[str, str] = {}
+        # 路径 -> poll() 返回、尚未确认处理结果的内容指纹
+        self._unconfirmed: Dict[str, str] = {}
+        # 路径 -> (修改时间, 大小)，定时扫描时用来发现变化
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        # 路径 -> 最近一次变化的时间
+        self._pending: Dict[str, float] = {}
+        self._observer = None
+
+    def _files(self) -> Iterable[str]:
+        for directory in self.dirs:
+            for root, dirnames, filenames in os.walk(directory):
+                dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+                for filename in filenames:
+                    path = os.path.join(root, filename)
+                    if _is_article(path, self.extensions):
+                        yield path
+
+    def _load_state(self) -> Optional[Dict[str, str]]:
+        if self.state_file is None or not self.state_file.exists():
+            return None
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠ 监听状态文件无法读取，重新记录：{self.state_file}，{e}")
+            return None
+
+    def _save_state(self):
+        if self.state_file is None:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_name(self.state_file.name + '.tmp')
+        with self._lock:
+            data = dict(self._hashes)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def start(self):
+        """
+        记录当前的文章并开始监听
+
+        有上次保存的状态时，与状态相比新增或修改的文章立即进入待处理（停机期间的变化）；
+        首次运行只记录，不处理已有的文章。
+        """
+        saved = self._load_state()
+        now = self.clock()
+        for path in self._files():
+            digest = file_hash(path)
+            if digest is None:
+                continue
+            try:
+                stat = os.stat(path)
+                self._stats[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+            if saved is not None and saved.get(path) != digest:
+                # 待处理的文章按变化处理，指纹在处理时记录
+                self._pending[path] = now - self.debounce
+                if path in saved:
+                    self._hashes[path] = saved[path]
+            else:
+                self._hashes[path] = digest
+        self._save_state()
+
+        if self.use_watchdog:
+            self._observer = Observer()
+            handler = _EventHandler(self)
+            for directory in self.dirs:
+                self._observer.schedule(handler, directory, recursive=True)
+            self._observer.start()
+        logger.info(f"✓ 开始监听文章目录（{'文件事件' if self.use_watchdog else '定时扫描'}，"
+                    f"防抖 {self.debounce:.0f} 秒）：{', '.join(self.dirs) or '（无）'}")
+        if self._pending:
+            logger.info(f"停机期间新增或修改的文章：{len(self._pending)} 篇")
+
+    def stop(self):
+        """停止监听"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+
+    def touch(self, path: str):
+        """标记文件有变化（watchdog 事件线程调用），防抖计时从现在重新开始"""
+        path = os.path.abspath(path)
+        if not _is_article(path, self.extensions):
+            return
+        with self._lock:
+            self._pending[path] = self.clock()
+
+    def _scan(self):
+        """定时扫描：修改时间或大小变化的文件标记为有变化"""
+        seen = {}
+        for path in self._files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            seen[path] = (stat.st_mtime_ns, stat.st_size)
+            if self._stats.get(path) != seen[path]:
+                self.touch(path)
+        self._stats = seen
+
+    def poll(self) -> List[Tuple[str, str]]:
+        """
+        检查一次：返回防抖时间已过、内容确实变化的文章
+
+        返回的文章处理完后调用 commit() 记录指纹，处理失败时调用 retry()。
+
+        Returns:
+            List: (路径, added / changed)，按路径排序
+        """
+        if not self.use_watchdog:
+            self._scan()
+
+        now = self.clock()
+        with self._lock:
+            ready = [path for path, changed_at in self._pending.items() if now - changed_at >= self.debounce]
+            for path in ready:
+                del self._pending[path]
+
+        changes = []
+        for path in sorted(ready):
+            digest = file_hash(path)
+            with self._lock:
+                previous = self._hashes.get(path)
+                if digest is None:
+                    # 文件被删除或移走
+                    self._hashes.pop(path, None)
+                    continue
+                if digest == previous:
+                    continue
+                self._unconfirmed[path] = digest
+            changes.append((path, ADDED if previous is None else CHANGED))
+        if ready:
+            self._save_state()
+        return changes
+
+    def commit(self, paths: Iterable[str]):
+        """记录已处理的文章的指纹，之后内容不变就不再处理"""
+        with self._lock:
+            for path in paths:
+                digest = self._unconfirmed.pop(path, None)
+                if digest is not None:
+                    self._hashes[path] = digest
+        self._save_state()
+
+    def retry(self, paths: Iterable[str]):
+        """处理失败的文章不记录指纹，retry_interval 秒后重新处理（期间文件有变化时按防抖时间处理）"""
+        retry_at = self.clock() + self.retry_interval - self.debounce
+        with self._lock:
+            for path in paths:
+                self._unconfirmed.pop(path, None)
+                self._pending.setdefault(path, retry_at)
+
+    def run(self, on_change: Callable[[List[Tuple[str, str]]], Optional[Iterable[str]]],
+            stop_event: Optional[threading.Event] = None):
+        """
+        持续监听，直到 stop_event 被设置或按下 Ctrl+C
+
+        Args:
+            on_change: 回调，参数为 poll() 的结果，返回处理失败的路径（None 表示全部成功），
+                失败的文章稍后重试，回调抛出异常时全部重试；回调执行期间的变化在返回后处理
+            stop_event: 停止信号
+        """
+        stop_event = stop_event or threading.Event()
+        self.start()
+        try:
+            while not stop_event.is_set():
+                changes = self.poll()
+                if changes:
+                    for path, kind in changes:
+                        logger.info(f"{'新文章' if kind == ADDED else '文章已修改'}：{path}")
+                    paths = [path for path, _ in changes]
+                    try:
+                        failed = set(on_change(changes) or ())
+                    except Exception as e:
+                        logger.error(f"✗ 处理文章变化失败：{e}", exc_info=True)
+                        failed = set(paths)
+                    self.commit(path for path in paths if path not in failed)
+                    if failed:
+                        self.retry(failed)
+                        logger.warning(f"⚠ {len(failed)} 篇文章处理失败，{self.retry_interval:.0f} 秒后重试")
+                stop_event.wait(self.poll_interval)
+        except KeyboardInterrupt:
+            logger.info("停止监听")
+        finally:
+            self.stop()
@@ -13,7 +13,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from src.publisher.base_publisher import BasePublisher
-from src.publisher.common_handler import wait_login, safe_click, safe_input, switch_to_new_tab
+from src.publisher.common_handler import wait_login, safe_click, safe_input
+from src.publisher.flow_engine import FlowEngine, FlowStep
+from src.publisher.form_filler import fill_fields
 from src.core.logger import get_logger
 from src.utils.file_utils import read_file_with_footer, parse_front_matter, convert_md_to_html
 from src.utils.selenium_utils import get_html_web_content
@@ -27,6 +29,28 @@ class WechatPublisher(BasePublisher):
     
     PLATFORM_NAME = "wechat"
     
+    # 已登录的页面标志（创作按钮、图文消息按钮、用户信息）
+    LOGIN_MARKERS = [
+        (By.CSS_SELECTOR, '.new-creation__menu-content'),
+        (By.XPATH, '//div[@class="new-creation__menu-item"]//div[@class="new-creation__menu-title" and contains(text(), "图文消息")]'),
+        (By.CLASS_NAME, 'weui-desktop-account__img'),
+        (By.CLASS_NAME, 'weui-desktop_name'),
+        (By.CLASS_NAME, 'weui-desktop-person_info'),
+    ]
+    
+    # 正文编辑器：新版 ProseMirror 与旧版 UEditor 并行探测
+    EDITOR_PROBE_STEP = FlowStep('定位正文编辑器', 'find', [
+        (By.CSS_SELECTOR, '.ProseMirror[contenteditable="true"]'),
+        (By.ID, 'edui1_contentplaceholder'),
+    ], condition='present', timeout=10)
+    
+    # 保存草稿按钮：新版、旧版与文本兜底三种定位方式
+    SAVE_DRAFT_STEP = FlowStep('保存为草稿', 'click', [
+        (By.CSS_SELECTOR, '#js_submit button'),
+        (By.XPATH, '//button[@type="button"]//span[@class="send_wording" and text()="保存为草稿"]'),
+        (By.XPATH, '//button[contains(., "保存") or contains(., "草稿")]'),
+    ], timeout=10, wait_after=2)
+    
     def __init__(self, common_config: Dict[str, Any] = None, platform_config: Dict[str, Any] = None):
         """
         初始化微信公众号发布器
@@ -71,63 +95,12 @@ class WechatPublisher(BasePublisher):
                 logger.info("⚠ 检测到登录页面，未登录")
                 return False
             
-            # 2. 检查是否存在文章按钮（已登录的标志）
-            try:
-                self.driver.find_element(
-                    By.CSS_SELECTOR, 
-                    '.new-creation__menu-content'
-                )
-                logger.info("✓ 检测到已登录状态（找到创作按钮）")
-                return True
-            except:
-                pass
-            
-            # 也检查旧版图文消息按钮（兼容性）
-            try:
-                self.driver.find_element(
-                    By.XPATH, 
-                    '//div[@class="new-creation__menu-item"]//div[@class="new-creation__menu-title" and contains(text(), "图文消息")]'
-                )
-                logger.info("✓ 检测到已登录状态（找到图文消息按钮）")
-                return True
-            except:
-                pass
-            
-            # 3. 检查是否有用户信息元素（多种方式）
-            try:
-                # 方式1: 检查用户头像图片
-                self.driver.find_element(By.CLASS_NAME, 'weui-desktop-account__img')
-                logger.info("✓ 检测到已登录状态（找到用户头像）")
-                return True
-            except:
-                pass
-            
-            # 4. 检查用户名元素
-            try:
-                self.driver.find_element(By.CLASS_NAME, 'weui-desktop_name')
-                logger.info("✓ 检测到已登录状态（找到用户名）")
-                return True
-            except:
-                pass
-            
-            # 5. 检查个人信息容器
-            try:
-                self.driver.find_element(By.CLASS_NAME, 'weui-desktop-person_info')
-                logger.info("✓ 检测到已登录状态（找到个人信息区域）")
-                return True
-            except:
-                pass
-            
-            # 6. 通过XPath检查用户信息区域
-            try:
-                self.driver.find_element(
-                    By.XPATH,
-                    '//div[@class="weui-desktop-person_info"]//div[@class="weui-desktop_name"]'
-                )
-                logger.info("✓ 检测到已登录状态（通过XPath找到用户信息）")
+            # 2. 创作按钮、图文消息按钮与用户信息元素在页面内并行探测，只检查当前页面不等待：
+            # 未登录时立即进入等待登录（其中会持续检测）
+            index, _ = FlowEngine(self.driver).find_first(self.LOGIN_MARKERS, timeout=0)
+            if index >= 0:
+                logger.info(f"✓ 检测到已登录状态（命中标志 {self.LOGIN_MARKERS[index][1]}）")
                 return True
-            except:
-                pass
             
             logger.warning("⚠ 未检测到明确的登录状态")
             logger.info("尝试获取页面源码片段进行调试...")
@@ -335,9 +308,9 @@ class WechatPublisher(BasePublisher):
                 pass
             return False
     
-    def _fill_title(self, front_matter: Dict[str, Any]) -> bool:
+    def _fill_title_and_author(self, front_matter: Dict[str, Any]) -> bool:
         """
-        填写文章标题
+        填写文章标题和作者（同一页面的两个输入框，一次脚本调用填写）
         
         Args:
             front_matter: 文章元数据
@@ -346,10 +319,7 @@ class WechatPublisher(BasePublisher):
             bool: 是否成功
         """
         try:
-            logger.info("正在填写标题...")
-            title_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, 'title'))
-            )
+            logger.info("正在填写标题和作者...")
             
             title = front_matter.get('title', self.common_config.get('title', ''))
             if not title:
@@ -359,43 +329,25 @@ class WechatPublisher(BasePublisher):
             # 清理标题中的引号
             title = self.clean_title(title)
             
-            title_element.clear()
-            title_element.send_keys(title)
-            logger.info(f"✓ 标题已填写：{title}")
-            time.sleep(2)
-            return True
-        except Exception as e:
-            logger.error(f"✗ 填写标题失败：{e}", exc_info=True)
-            return False
-    
-    def _fill_author(self, front_matter: Dict[str, Any]) -> bool:
-        """
-        填写文章作者
-        
-        Args:
-            front_matter: 文章元数据
-        
-        Returns:
-            bool: 是否成功
-        """
-        try:
-            logger.info("正在填写作者...")
-            author_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, 'author'))
-            )
-            
             # 优先使用front matter中的作者信息
             author = front_matter.get('authors', self.author)
             if not author:
                 author = self.author
             
-            author_element.clear()
-            author_element.send_keys(author)
-            logger.info(f"✓ 作者已填写：{author}")
-            time.sleep(1)
+            title_ok, author_ok = fill_fields(self.driver, [
+                (By.ID, 'title', title),
+                (By.ID, 'author', author),
+            ])
+            if not title_ok:
+                logger.error("✗ 标题输入框的值与标题不一致")
+                return False
+            if not author_ok:
+                logger.error("✗ 作者输入框的值与作者不一致")
+                return False
+            logger.info(f"✓ 标题已填写：{title}，作者已填写：{author}")
             return True
         except Exception as e:
-            logger.error(f"✗ 填写作者失败：{e}", exc_info=True)
+            logger.error(f"✗ 填写标题和作者失败：{e}", exc_info=True)
             return False
     
     def _fill_content(self, article_path: str) -> bool:
@@ -412,7 +364,7 @@ class WechatPublisher(BasePublisher):
             logger.info("正在填写文章内容...")
             
             # 转换 Markdown 到 HTML（不转换代码块格式）
-            content_file_html = convert_md_to_html(article_path, False)
+            content_file_html = convert_md_to_html(article_path, False, platform=self.PLATFORM_NAME)
             logger.info(f"已转换文章为HTML格式：{content_file_html}")
             
             # 通过辅助页面获取HTML内容到剪贴板
@@ -423,37 +375,22 @@ class WechatPublisher(BasePublisher):
             self.driver.switch_to.window(self.driver.window_handles[-1])
             time.sleep(1)
             
-            # 尝试新版编辑器：.ProseMirror[contenteditable='true']
-            try:
-                logger.info("尝试定位新版编辑器（ProseMirror）...")
-                content_element = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((
-                        By.CSS_SELECTOR, 
-                        '.ProseMirror[contenteditable="true"]'
-                    ))
-                )
-                logger.info("✓ 找到新版编辑器")
-            except:
-                # 尝试旧版编辑器
-                logger.info("新版编辑器未找到，尝试旧版编辑器...")
-                content_element = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.ID, 'edui1_contentplaceholder'))
-                )
-                logger.info("✓ 找到旧版编辑器")
+            # 新版（ProseMirror）与旧版编辑器在页面内并行探测
+            content_element = self.run_flow_step(self.EDITOR_PROBE_STEP)
             
             # 点击内容编辑区域
             ActionChains(self.driver).click(content_element).perform()
-            time.sleep(1)
             
             # 执行粘贴操作（使用 Command/Ctrl + V）
             cmd_ctrl = Keys.COMMAND if sys.platform == 'darwin' else Keys.CONTROL
             action_chains = ActionChains(self.driver)
             action_chains.key_down(cmd_ctrl).send_keys('v').key_up(cmd_ctrl).perform()
             
+            # 等待编辑器处理完粘贴的HTML（旧版 iframe 编辑器读取不到文本时只记录警告）
             logger.info("✓ 内容已粘贴，等待处理...")
-            time.sleep(3)
-            
-            return True
+            with open(content_file_html, 'r', encoding='utf-8') as f:
+                html = f.read()
+            return self.verify_editor_content(['.ProseMirror[contenteditable="true"]'], html, markup='html')
         except Exception as e:
             logger.error(f"✗ 填写内容失败：{e}", exc_info=True)
             return False
@@ -580,53 +517,11 @@ class WechatPublisher(BasePublisher):
         try:
             logger.info("正在保存为草稿...")
             
-            # 方式1：新版UI - 使用 #js_submit button
-            try:
-                draft_button = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((
-                        By.CSS_SELECTOR, 
-                        '#js_submit button'
-                    ))
-                )
-                draft_button.click()
-                time.sleep(2)
-                
-                logger.info("✓ 文章已保存为草稿（新版UI）")
-                logger.info("💡 您可以稍后在微信公众平台的草稿箱中找到该文章")
-                return True
-                
-            except Exception as e1:
-                logger.info(f"新版保存按钮未找到，尝试旧版...")
-                
-                # 方式2：旧版UI - 查找"保存为草稿"按钮
-                try:
-                    draft_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((
-                            By.XPATH, 
-                            '//button[@type="button"]//span[@class="send_wording" and text()="保存为草稿"]'
-                        ))
-                    )
-                    draft_button.click()
-                    time.sleep(2)
-                    
-                    logger.info("✓ 文章已保存为草稿（旧版UI）")
-                    logger.info("💡 您可以稍后在微信公众平台的草稿箱中找到该文章")
-                    return True
-                    
-                except Exception as e2:
-                    # 方式3：通过文本定位
-                    logger.info("尝试通过文本定位保存按钮...")
-                    draft_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((
-                            By.XPATH, 
-                            '//button[contains(., "保存") or contains(., "草稿")]'
-                        ))
-                    )
-                    draft_button.click()
-                    time.sleep(2)
-                    
-                    logger.info("✓ 文章已保存（使用备用方法）")
-                    return True
+            self.run_flow_step(self.SAVE_DRAFT_STEP)
+            
+            logger.info("✓ 文章已保存为草稿")
+            logger.info("💡 您可以稍后在微信公众平台的草稿箱中找到该文章")
+            return True
                     
         except Exception as e:
             logger.error(f"✗ 保存草稿失败：{e}", exc_info=True)
@@ -656,62 +551,57 @@ class WechatPublisher(BasePublisher):
             if not self.driver:
                 self.setup_driver(use_existing=True)
             
-            # 2. 打开新标签页
-            switch_to_new_tab(self.driver, self.site_url)
-            
-            # 3. 尝试加载Cookie
-            cookie_loaded = self.load_cookies_if_exists(self.site_url)
-            if cookie_loaded:
-                logger.info("✓ 成功加载已保存的登录状态")
-                # 刷新页面以应用cookie
-                self.driver.refresh()
-                time.sleep(3)
-            else:
-                logger.info("⚠ 未找到保存的登录状态，需要手动登录")
-            
-            # 4. 等待登录（如果需要）
-            if not self._check_login_status():
-                logger.info("检测到未登录，等待用户登录...")
-                if not self._wait_for_login():
-                    logger.error("✗ 登录超时或失败")
-                    return False
+            # 重试时回到上次失败时的编辑器标签页，跳过打开页面和登录
+            if not self.resume_editor(article_path):
+                # 2. 打开新标签页
+                self.open_page(self.site_url, new_tab=True, wait_ready=False)
                 
-                # 登录成功后保存Cookie
-                logger.info("✓ 登录成功，保存登录状态...")
-                self.save_login_state(self.site_url)
-            else:
-                # 如果已经登录，更新cookies以保持同步
-                logger.debug("已登录状态，更新cookies...")
-                self.update_cookies(self.site_url)
+                # 3. 尝试加载Cookie（加载后已刷新页面）
+                cookie_loaded = self.load_cookies_if_exists(self.site_url)
+                if cookie_loaded:
+                    logger.info("✓ 成功加载已保存的登录状态")
+                    self.wait_page_ready()
+                else:
+                    logger.info("⚠ 未找到保存的登录状态，需要手动登录")
+                
+                # 4. 等待登录（如果需要）
+                if not self._check_login_status():
+                    logger.info("检测到未登录，等待用户登录...")
+                    if not self.wait_for_login_or_defer():
+                        logger.error("✗ 登录超时或失败")
+                        return False
+                    
+                    # 登录成功后保存Cookie
+                    logger.info("✓ 登录成功，保存登录状态...")
+                    self.save_login_state(self.site_url)
+                else:
+                    # 如果已经登录，更新cookies以保持同步
+                    logger.debug("已登录状态，更新cookies...")
+                    self.update_cookies(self.site_url)
             
             # 5. 点击图文消息按钮
-            if not self._click_article_button():
+            if not self.run_step(self._click_article_button):
                 logger.error("✗ 无法进入编辑页面")
                 return False
             
             # 6. 解析文章元数据
             front_matter = self.parse_article_metadata(article_path)
             
-            # 7. 填充文章标题
-            if not self._fill_title(front_matter):
-                logger.error("✗ 填写标题失败")
-                return False
-            
-            # 8. 填充文章作者
-            if not self._fill_author(front_matter):
-                logger.error("✗ 填写作者失败")
+            # 7. 填充文章标题和作者
+            if not self.run_step(self._fill_title_and_author, front_matter):
+                logger.error("✗ 填写标题和作者失败")
                 return False
             
-            # 9. 填充文章内容
-            if not self._fill_content(article_path):
+            # 8. 填充文章内容
+            if not self.run_step(self._fill_content, article_path):
                 logger.error("✗ 填写内容失败")
                 return False
             
-            # 10. 设置原创声明
-            self._set_original_statement()
+            # 9. 设置原创声明
+            self.run_step(self._set_original_statement)
             
-            # 13. 保存为草稿
-            if not self._save_as_draft():
+            # 10. 保存为草稿
+            if not self.run_step(self._save_as_draft):
                 logger.error("✗ 保存草稿失败")
                 return False
             
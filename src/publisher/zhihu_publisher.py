@@ -13,7 +13,11 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from src.publisher.base_publisher import BasePublisher
-from src.publisher.common_handler import wait_login, safe_click, safe_input, switch_to_new_tab
+from src.publisher.common_handler import (
+    wait_login, safe_click, safe_input, collect_texts, click_by_texts
+)
+from src.publisher.flow_engine import FlowEngine
+from src.publisher.form_filler import fill_element
 from src.core.logger import get_logger
 from src.utils.file_utils import read_file_with_footer, parse_front_matter, download_image, convert_md_to_html
 from src.utils.selenium_utils import get_html_web_content
@@ -27,6 +31,14 @@ class ZhihuPublisher(BasePublisher):
     
     PLATFORM_NAME = "zhihu"
     
+    # 页面就绪探针：编辑器出现即可开始填写
+    READY_SELECTORS = ['.DraftEditor-editorContainer']
+    
+    # 编辑器会自动保存草稿，保存后地址为 https://zhuanlan.zhihu.com/p/<草稿ID>/edit
+    DRAFT_URL_PATTERN = r'zhuanlan\.zhihu\.com/p/(?P<id>\d+)/edit'
+    # 登录后才有的Cookie
+    LOGIN_COOKIE = 'z_c0'
+    
     def __init__(self, common_config: Dict[str, Any] = None, platform_config: Dict[str, Any] = None):
         """
         初始化知乎发布器
@@ -120,10 +132,10 @@ class ZhihuPublisher(BasePublisher):
             # 清理标题中的引号
             title = self.clean_title(title)
             
-            title_element.clear()
-            title_element.send_keys(title)
+            if not fill_element(self.driver, title_element, title):
+                logger.error("✗ 标题输入框的值与标题不一致")
+                return False
             logger.info(f"✓ 标题已填写：{title}")
-            time.sleep(2)
             return True
         except Exception as e:
             logger.error(f"✗ 填写标题失败：{e}", exc_info=True)
@@ -142,8 +154,8 @@ class ZhihuPublisher(BasePublisher):
         try:
             logger.info("正在填写文章内容...")
             
-            # 转换 Markdown 到 HTML（注意：知乎不能识别某些代码块格式）
-            content_file_html = convert_md_to_html(article_path)
+            # 转换 Markdown 到 HTML（知乎不能识别的代码块写法先按转换链规范化）
+            content_file_html = convert_md_to_html(article_path, platform=self.PLATFORM_NAME)
             logger.info(f"已转换文章为HTML格式：{content_file_html}")
             
             # 通过辅助页面获取HTML内容到剪贴板
@@ -162,17 +174,17 @@ class ZhihuPublisher(BasePublisher):
                 ))
             )
             content_element.click()
-            time.sleep(2)
             
             # 执行粘贴操作（使用 Command/Ctrl + V）
             cmd_ctrl = Keys.COMMAND if sys.platform == 'darwin' else Keys.CONTROL
             action_chains = ActionChains(self.driver)
             action_chains.key_down(cmd_ctrl).send_keys('v').key_up(cmd_ctrl).perform()
             
+            # 等待编辑器处理完粘贴的HTML（代替固定等待）
             logger.info("✓ 内容已粘贴，等待处理...")
-            time.sleep(3)
-            
-            return True
+            with open(content_file_html, 'r', encoding='utf-8') as f:
+                html = f.read()
+            return self.verify_editor_content(['.DraftEditor-editorContainer'], html, markup='html')
         except Exception as e:
             logger.error(f"✗ 填写内容失败：{e}", exc_info=True)
             return False
@@ -236,8 +248,20 @@ class ZhihuPublisher(BasePublisher):
                 EC.presence_of_element_located((By.XPATH, '//label[@for="PublishPanel-columnLabel-1"]'))
             )
             ActionChains(self.driver).click(publish_panel).perform()
-            
             logger.info("✓ 已选择专栏收录")
+            
+            # 指定了专栏时，从专栏列表中选择（列表写入缓存，选择在一次往返中完成）
+            columns = self.resolve_taxonomy('columns', [self.platform_config.get('column')], limit=1)
+            if columns:
+                option_xpath = '//div[contains(@class,"PublishPanel")]//*[@role="option"]'
+                FlowEngine(self.driver).find_first([(By.XPATH, option_xpath)], timeout=3, condition='visible')
+                self.taxonomy.update('columns', collect_texts(self.driver, option_xpath), complete=True)
+                columns = self.resolve_taxonomy('columns', columns, limit=1) or columns
+                if click_by_texts(self.driver, option_xpath, columns):
+                    logger.info(f"✓ 已选择专栏：{columns[0]}")
+                else:
+                    logger.warning(f"⚠ 专栏列表中没有 {columns[0]}，使用默认专栏")
+            
             time.sleep(1)
             return True
         except Exception as e:
@@ -258,17 +282,42 @@ class ZhihuPublisher(BasePublisher):
                 time.sleep(5)
                 return True
             
-            logger.info("正在发布文章...")
-            
-            # 点击发布按钮
-            publish_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, '//button[contains(text(), "发布")]'))
-            )
-            publish_button.click()
-            
-            logger.info("✓ 文章发布成功")
-            time.sleep(3)
-            return True
+            return self._submit_article()
+        except Exception as e:
+            logger.error(f"✗ 发布文章失败：{e}", exc_info=True)
+            return False
+    
+    def _submit_article(self) -> bool:
+        """
+        点击发布按钮
+        
+        Returns:
+            bool: 是否成功
+        """
+        logger.info("正在发布文章...")
+        publish_button = WebDriverWait(self.driver, 10).until(
+            EC.element_to_be_clickable((By.XPATH, '//button[contains(text(), "发布")]'))
+        )
+        watcher = self.watch_publish()
+        publish_button.click()
+        
+        logger.info("✓ 已点击发布按钮")
+        return self.confirm_publish(watcher)
+    
+    def _save_draft(self) -> bool:
+        """
+        等待编辑器自动保存草稿（保存后地址中出现草稿ID）
+        
+        Returns:
+            bool: 是否取得草稿ID
+        """
+        logger.info("等待草稿自动保存...")
+        return self.capture_draft(timeout=30)
+    
+    def finish_draft(self, front_matter: Dict[str, Any]) -> bool:
+        """在已打开的草稿中点击发布"""
+        try:
+            return self.run_step(self._submit_article)
         except Exception as e:
             logger.error(f"✗ 发布文章失败：{e}", exc_info=True)
             return False
@@ -292,57 +341,61 @@ class ZhihuPublisher(BasePublisher):
             if not self.driver:
                 self.setup_driver(use_existing=True)
             
-            # 2. 打开新标签页
-            switch_to_new_tab(self.driver, self.site_url)
-            
-            # 3. 尝试加载Cookie
-            cookie_loaded = self.load_cookies_if_exists(self.site_url)
-            if cookie_loaded:
-                logger.info("✓ 成功加载已保存的登录状态")
-                # 刷新页面以应用cookie
-                self.driver.refresh()
-                time.sleep(3)
-            else:
-                logger.info("⚠ 未找到保存的登录状态，需要手动登录")
-            
-            # 4. 等待登录（如果需要）
-            if not self._check_login_status():
-                logger.info("检测到未登录，等待用户登录...")
-                if not self._wait_for_login():
-                    logger.error("✗ 登录超时或失败")
-                    return False
+            # 重试时回到上次失败时的编辑器标签页，跳过打开页面和登录
+            if not self.resume_editor(article_path):
+                # 2. 打开新标签页
+                self.open_page(self.site_url, new_tab=True, wait_ready=False)
                 
-                # 登录成功后保存Cookie
-                logger.info("✓ 登录成功，保存登录状态...")
-                self.save_login_state(self.site_url)
-            else:
-                # 如果已经登录，更新cookies以保持同步
-                logger.debug("已登录状态，更新cookies...")
-                self.update_cookies(self.site_url)
+                # 3. 尝试加载Cookie（加载后已刷新页面）
+                cookie_loaded = self.load_cookies_if_exists(self.site_url)
+                if cookie_loaded:
+                    logger.info("✓ 成功加载已保存的登录状态")
+                    self.wait_page_ready()
+                else:
+                    logger.info("⚠ 未找到保存的登录状态，需要手动登录")
+                
+                # 4. 等待登录（如果需要）
+                if not self._check_login_status():
+                    logger.info("检测到未登录，等待用户登录...")
+                    if not self.wait_for_login_or_defer():
+                        logger.error("✗ 登录超时或失败")
+                        return False
+                    
+                    # 登录成功后保存Cookie
+                    logger.info("✓ 登录成功，保存登录状态...")
+                    self.save_login_state(self.site_url)
+                else:
+                    # 如果已经登录，更新cookies以保持同步
+                    logger.debug("已登录状态，更新cookies...")
+                    self.update_cookies(self.site_url)
             
             # 5. 解析文章元数据
             front_matter = self.parse_article_metadata(article_path)
             
             # 6. 填写标题
-            if not self._fill_title(front_matter):
+            if not self.run_step(self._fill_title, front_matter):
                 logger.error("✗ 填写标题失败")
                 return False
             
             # 7. 填写内容
-            if not self._fill_content(article_path):
+            if not self.run_step(self._fill_content, article_path):
                 logger.error("✗ 填写内容失败")
                 return False
             
+            # 草稿模式：等待自动保存后结束，审阅后由 publish_draft 发布
+            if self.draft_mode:
+                return self.run_step(self._save_draft)
+            
             # # 8. 添加封面图片
-            # if not self._add_cover_image(front_matter):
+            # if not self.run_step(self._add_cover_image, front_matter):
             #     logger.warning("⚠ 添加封面图片失败，继续...")
             
             # # 9. 设置专栏收录
-            # if not self._set_column():
+            # if not self.run_step(self._set_column):
             #     logger.warning("⚠ 设置专栏收录失败，继续...")
             
             # 10. 发布文章
-            if not self._publish_article():
+            if not self.run_step(self._publish_article):
                 logger.error("✗ 发布文章失败")
                 return False
             
@@ -0,0 +1,28 @@
+"""
+Replay modules: record publisher flows and replay them offline
+"""
+
+import importlib
+
+# 导出的名称 -> 所在模块；首次访问时才导入，导入包中的某个模块不会连带导入
+# Selenium 等依赖
+_EXPORTS = {
+    'FlowRecorder': '.recorder',
+    'ReplayServer': '.server',
+    'ReplayFixture': '.server',
+    'compare_timings': '.harness',
+    'load_baseline': '.harness',
+    'save_baseline': '.harness',
+    'run_replay': '.harness',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
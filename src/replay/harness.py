@@ -0,0 +1,139 @@
+"""
+回放执行器
+在本地回放服务器上运行发布器，并将步骤耗时与基线比较
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.core.logger import get_logger
+from src.core.session_manager import SessionManager
+from src.replay.server import ReplayServer
+
+logger = get_logger(__name__)
+
+# 回放用的 Chrome 启动参数：无头运行，并把除本机外的域名解析全部屏蔽，保证不会访问真实站点
+REPLAY_CHROME_ARGUMENTS = [
+    '--headless=new',
+    '--no-sandbox',
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--window-size=1920,1080',
+    '--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE 127.0.0.1',
+]
+
+
+def load_baseline(fixture_dir) -> Dict[str, float]:
+    """
+    读取步骤耗时基线
+
+    Args:
+        fixture_dir: 录制数据目录
+
+    Returns:
+        Dict[str, float]: 步骤名 -> 耗时（秒），没有基线时返回空字典
+    """
+    baseline_file = Path(fixture_dir) / 'baseline.json'
+    if not baseline_file.exists():
+        return {}
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        return json.load(f).get('steps', {})
+
+
+def save_baseline(fixture_dir, timings: List[Dict[str, Any]]) -> Path:
+    """
+    把本次回放的步骤耗时保存为基线
+
+    Args:
+        fixture_dir: 录制数据目录
+        timings: 发布器的 step_timings
+
+    Returns:
+        Path: baseline.json 路径
+    """
+    baseline_file = Path(fixture_dir) / 'baseline.json'
+    steps = {timing['step']: timing['seconds'] for timing in timings}
+    with open(baseline_file, 'w', encoding='utf-8') as f:
+        json.dump({'steps': steps}, f, ensure_ascii=False, indent=2)
+    logger.info(f"✓ 已更新耗时基线：{baseline_file}")
+    return baseline_file
+
+
+def compare_timings(timings: List[Dict[str, Any]], baseline: Dict[str, float],
+                    tolerance: float = 0.5, min_slack: float = 1.0) -> List[str]:
+    """
+    将步骤耗时与基线比较
+
+    允许的耗时为 ``基线 * (1 + tolerance)`` 与 ``基线 + min_slack`` 中较大者，
+    避免很短的步骤因为抖动误报。
+
+    Args:
+        timings: 发布器的 step_timings
+        baseline: 步骤耗时基线
+        tolerance: 相对容差
+        min_slack: 绝对容差（秒）
+
+    Returns:
+        List[str]: 问题描述列表，为空表示没有回归
+    """
+    problems = []
+    seen = set()
+
+    for timing in timings:
+        step = timing['step']
+        seen.add(step)
+        if not timing.get('ok', True):
+            problems.append(f"步骤 {step} 失败")
+            continue
+        if step not in baseline:
+            continue
+        allowed = max(baseline[step] * (1 + tolerance), baseline[step] + min_slack)
+        if timing['seconds'] > allowed:
+            problems.append(
+                f"步骤 {step} 耗时 {timing['seconds']:.2f}秒，超过基线 {baseline[step]:.2f}秒（允许 {allowed:.2f}秒）"
+            )
+
+    for step in baseline:
+        if step not in seen:
+            problems.append(f"步骤 {step} 未执行")
+
+    return problems
+
+
+def run_replay(publisher, fixture_dir, article_path: str,
+               common_config: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    在回放服务器上运行发布器
+
+    发布器的站点地址会被替换为回放服务器地址，浏览器使用新的无头实例。
+
+    Args:
+        publisher: 发布器实例
+        fixture_dir: 录制数据目录
+        article_path: 文章路径
+        common_config: 通用配置（用于 service_location 等）
+
+    Returns:
+        List[Dict]: 步骤耗时记录
+    """
+    config = dict(common_config or {})
+    config['chrome_arguments'] = list(config.get('chrome_arguments', [])) + REPLAY_CHROME_ARGUMENTS
+    # 回放时开启性能日志（发布结果确认依赖网络日志）
+    config['network_log'] = True
+
+    with ReplayServer(fixture_dir) as server:
+        session_manager = SessionManager(f"replay_{publisher.PLATFORM_NAME}", config)
+        session_manager.create_driver(use_existing=False)
+        try:
+            publisher.session_manager = session_manager
+            publisher.driver = session_manager.driver
+            publisher.site_url = server.local_url(server.fixture.site_url)
+            publisher.step_timings = []
+
+            success = publisher.publish(article_path)
+            logger.info(f"回放结束：{'成功' if success else '失败'}，{len(publisher.step_timings)} 个步骤")
+        finally:
+            session_manager.close()
+
+    return publisher.step_timings
@@ -0,0 +1,134 @@
+"""
+流程录制器
+在真实站点上执行发布流程时，录制页面和网络响应，生成离线回放数据
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+from src.core.logger import get_logger
+from src.core.network_log import get_network_log
+
+logger = get_logger(__name__)
+
+# 需要录制响应体的资源类型（图片、字体等二进制资源回放时不需要）
+RECORDED_TYPES = ('Document', 'Script', 'Stylesheet', 'XHR', 'Fetch')
+
+
+class FlowRecorder:
+    """
+    录制步骤钩子
+
+    挂到发布器的 ``step_hooks`` 上，在每个步骤前后读取性能日志，
+    保存页面、脚本、样式和接口响应，最后写出 manifest.json。
+
+    Example:
+        recorder = FlowRecorder(publisher.driver, 'tests/fixtures/replay/csdn')
+        publisher.step_hooks.append(recorder)
+        publisher.publish(article_path)
+        recorder.save(publisher.site_url)
+    """
+
+    def __init__(self, driver, fixture_dir, max_entries: int = 2000):
+        """
+        初始化录制器
+
+        Args:
+            driver: WebDriver实例
+            fixture_dir: 录制数据目录
+            max_entries: 网络日志保留的最大请求条数
+        """
+        self.driver = driver
+        self.fixture_dir = Path(fixture_dir)
+        self.bodies_dir = self.fixture_dir / 'bodies'
+        self.network = get_network_log(driver, max_entries=max_entries)
+
+        self.steps: List[Dict[str, Any]] = []
+        self.responses: List[Dict[str, Any]] = []
+        self._saved: Set[str] = set()
+
+    def before_step(self, publisher, name: str):
+        """步骤开始前：保存目前为止的响应（包括入口页面）"""
+        self._collect()
+        self.steps.append({'name': name, 'url': self._current_url(), 'responses': []})
+
+    def after_step(self, publisher, name: str, ok: bool, elapsed: float):
+        """步骤结束后：保存步骤期间产生的响应"""
+        saved = self._collect()
+        if self.steps and self.steps[-1]['name'] == name:
+            self.steps[-1].update({
+                'ok': ok,
+                'seconds': round(elapsed, 3),
+                'responses': [response['url'] for response in saved],
+            })
+        logger.info(f"录制步骤 {name}：{len(saved)} 个响应")
+
+    def _current_url(self) -> str:
+        try:
+            return self.driver.current_url
+        except Exception:
+            return ''
+
+    def _collect(self) -> List[Dict[str, Any]]:
+        """读取网络日志，保存尚未录制的响应体"""
+        self.bodies_dir.mkdir(parents=True, exist_ok=True)
+        saved = []
+
+        for entry in self.network.recent(limit=self.network.max_entries):
+            request_id = entry['request_id']
+            if request_id in self._saved or not entry.get('finished'):
+                continue
+            if entry.get('type') not in RECORDED_TYPES or not entry.get('url', '').startswith('http'):
+                continue
+
+            self._saved.add(request_id)
+            body = self.network.get_body(request_id)
+            if body is None:
+                continue
+
+            body_file = f"bodies/{len(self.responses):05d}"
+            (self.fixture_dir / body_file).write_text(body, encoding='utf-8')
+
+            response = {
+                'method': entry.get('method', 'GET'),
+                'url': entry['url'],
+                'type': entry.get('type'),
+                'status': entry.get('status') or 200,
+                'mime_type': entry.get('mime_type', ''),
+                'body': body_file,
+            }
+            self.responses.append(response)
+            saved.append(response)
+
+        return saved
+
+    def save(self, site_url: str, platform: str = '') -> Path:
+        """
+        写出录制清单
+
+        Args:
+            site_url: 发布器的入口地址
+            platform: 平台名称
+
+        Returns:
+            Path: manifest.json 路径
+        """
+        self._collect()
+
+        manifest = {
+            'platform': platform,
+            'site_url': site_url,
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'steps': self.steps,
+            'responses': self.responses,
+        }
+
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+        manifest_file = self.fixture_dir / 'manifest.json'
+        with open(manifest_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        logger.info(f"✓ 录制完成：{len(self.steps)} 个步骤，{len(self.responses)} 个响应 -> {manifest_file}")
+        return manifest_file
@@ -0,0 +1,303 @@
+"""
+回放服务器
+在本地回放录制的页面和网络响应，使发布流程可以离线运行
+"""
+
+import json
+import re
+import threading
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, urljoin, urlparse
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 回放服务器内部路径前缀
+REPLAY_PREFIX = '/__replay__'
+
+# 注入到回放页面的脚本：把页面内发出的请求改写到回放服务器
+# 页面脚本中的相对地址需要按原始页面地址解析，而不是回放服务器地址
+_SHIM_TEMPLATE = """<script>
+(function () {
+    var pageUrl = %(page_url)s;
+    function rewrite(url) {
+        if (url === undefined || url === null) { return url; }
+        var text = String(url);
+        if (text.indexOf('%(prefix)s') === 0 || /^(data|blob|javascript|about):/i.test(text)) { return url; }
+        try { var abs = new URL(text, pageUrl).href; } catch (e) { return url; }
+        if (!/^https?:/i.test(abs)) { return url; }
+        return '%(prefix)s/proxy?url=' + encodeURIComponent(abs);
+    }
+    var rawFetch = window.fetch;
+    if (rawFetch) {
+        window.fetch = function (input, init) {
+            if (typeof input === 'string' || input instanceof URL) {
+                return rawFetch.call(this, rewrite(input), init);
+            }
+            return rawFetch.call(this, new Request(rewrite(input.url), input), init);
+        };
+    }
+    var rawOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        var args = Array.prototype.slice.call(arguments);
+        args[1] = rewrite(url);
+        return rawOpen.apply(this, args);
+    };
+    function patchUrlProperty(proto, prop) {
+        var desc = Object.getOwnPropertyDescriptor(proto, prop);
+        if (!desc || !desc.set) { return; }
+        Object.defineProperty(proto, prop, {
+            get: desc.get,
+            set: function (value) { desc.set.call(this, rewrite(value)); },
+            configurable: true
+        });
+    }
+    patchUrlProperty(HTMLScriptElement.prototype, 'src');
+    patchUrlProperty(HTMLLinkElement.prototype, 'href');
+    var rawSetAttribute = Element.prototype.setAttribute;
+    Element.prototype.setAttribute = function (name, value) {
+        var lower = String(name).toLowerCase();
+        if ((this instanceof HTMLScriptElement && lower === 'src') ||
+            (this instanceof HTMLLinkElement && lower === 'href')) {
+            value = rewrite(value);
+        }
+        return rawSetAttribute.call(this, name, value);
+    };
+})();
+</script>"""
+
+# 需要改写到回放服务器的静态资源属性
+_RESOURCE_ATTR_PATTERN = re.compile(
+    r'(<(?:script|link|iframe)\b[^>]*?\s(?:src|href)\s*=\s*)(["\'])(.*?)\2',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+class ReplayFixture:
+    """
+    录制的回放数据
+
+    目录结构::
+
+        <fixture_dir>/
+            manifest.json   录制清单（入口地址、步骤、响应列表）
+            bodies/         响应体文件
+            baseline.json   步骤耗时基线（可选）
+    """
+
+    def __init__(self, fixture_dir):
+        self.fixture_dir = Path(fixture_dir)
+        manifest_file = self.fixture_dir / 'manifest.json'
+        if not manifest_file.exists():
+            raise FileNotFoundError(f"回放清单不存在：{manifest_file}")
+
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            self.manifest: Dict[str, Any] = json.load(f)
+
+        self.site_url: str = self.manifest.get('site_url', '')
+        self.steps = self.manifest.get('steps', [])
+
+        # 同一请求可能被录制多次，按录制顺序依次回放，用完后重复最后一个
+        self._responses: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._last: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        for response in self.manifest.get('responses', []):
+            key = (response.get('method', 'GET').upper(), response['url'])
+            self._responses[key].append(response)
+
+    def lookup(self, method: str, url: str) -> Optional[Dict[str, Any]]:
+        """
+        查找录制的响应
+
+        先按完整地址匹配，找不到时忽略查询参数再匹配一次
+        （时间戳、签名等参数每次请求都会变化）。
+
+        Args:
+            method: 请求方法
+            url: 原始请求地址
+
+        Returns:
+            Dict: 响应条目，未录制时返回 None
+        """
+        method = method.upper()
+        candidates = [(method, url)]
+        stripped = url.split('?', 1)[0]
+        candidates.extend(
+            key for key in self._responses
+            if key[0] == method and key[1].split('?', 1)[0] == stripped and key[1] != url
+        )
+
+        with self._lock:
+            for key in candidates:
+                queue = self._responses.get(key)
+                if queue:
+                    response = queue.popleft()
+                    self._last[key] = response
+                    return response
+                if key in self._last:
+                    return self._last[key]
+        return None
+
+    def read_body(self, response: Dict[str, Any]) -> bytes:
+        """读取响应体"""
+        body_file = response.get('body')
+        if not body_file:
+            return b''
+        return (self.fixture_dir / body_file).read_bytes()
+
+
+class ReplayServer:
+    """
+    本地回放服务器
+
+    - 入口页面以原始路径提供（把发布器的站点地址指向本服务器即可）
+    - 页面中的脚本、样式以及 fetch / XHR 请求被改写为 ``/__replay__/proxy?url=原始地址``
+    - 未录制的请求返回 404，便于在日志中发现流程新增的依赖
+    """
+
+    def __init__(self, fixture_dir, host: str = '127.0.0.1', port: int = 0):
+        """
+        初始化回放服务器
+
+        Args:
+            fixture_dir: 录制数据目录
+            host: 监听地址
+            port: 监听端口，0 表示自动分配
+        """
+        self.fixture = ReplayFixture(fixture_dir)
+        self.misses: list = []
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """服务器根地址"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def local_url(self, original_url: str) -> str:
+        """
+        把原始页面地址转换为回放服务器上的地址（保留路径和查询参数）
+
+        Args:
+            original_url: 原始页面地址
+
+        Returns:
+            str: 回放地址
+        """
+        parsed = urlparse(original_url)
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+        return self.base_url + path
+
+    def start(self) -> 'ReplayServer':
+        """在后台线程中启动服务器"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"回放服务器已启动：{self.base_url}（{self.fixture.fixture_dir}）")
+        return self
+
+    def stop(self):
+        """停止服务器"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self.misses:
+            logger.warning(f"⚠ 回放期间有 {len(self.misses)} 个请求未录制，例如：{self.misses[:3]}")
+        logger.info("回放服务器已停止")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def rewrite_document(self, html: str, page_url: str) -> str:
+        """
+        改写录制的页面：注入请求改写脚本，并把静态资源地址指向回放服务器
+
+        Args:
+            html: 原始页面内容
+            page_url: 原始页面地址
+
+        Returns:
+            str: 改写后的页面
+        """
+        def replace(match):
+            value = match.group(3)
+            if value.startswith(('data:', 'blob:', 'javascript:', '#', REPLAY_PREFIX)):
+                return match.group(0)
+            absolute = urljoin(page_url, value)
+            return f"{match.group(1)}{match.group(2)}{REPLAY_PREFIX}/proxy?url={quote(absolute, safe='')}{match.group(2)}"
+
+        html = _RESOURCE_ATTR_PATTERN.sub(replace, html)
+        shim = _SHIM_TEMPLATE % {'page_url': json.dumps(page_url), 'prefix': REPLAY_PREFIX}
+
+        head = re.search(r'<head\b[^>]*>', html, re.IGNORECASE)
+        if head:
+            return html[:head.end()] + shim + html[head.end():]
+        return shim + html
+
+    def _resolve(self, method: str, raw_path: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """把回放服务器上的请求路径还原为原始地址并查找响应"""
+        parsed = urlparse(raw_path)
+        if parsed.path == f"{REPLAY_PREFIX}/proxy":
+            original = parse_qs(parsed.query).get('url', [''])[0]
+        else:
+            original = urljoin(self.fixture.site_url, raw_path)
+        if not original:
+            return None, None
+        return original, self.fixture.lookup(method, original)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+
+                original, response = server._resolve(self.command, self.path)
+                if response is None:
+                    server.misses.append(f"{self.command} {original or self.path}")
+                    self.send_response(404)
+                    self.send_header('Content-Type', 'application/json')
+                    self.end_headers()
+                    self.wfile.write(b'{}')
+                    return
+
+                body = server.fixture.read_body(response)
+                mime_type = response.get('mime_type') or 'application/octet-stream'
+                if response.get('type') == 'Document':
+                    body = server.rewrite_document(body.decode('utf-8', errors='replace'), original).encode('utf-8')
+
+                self.send_response(response.get('status') or 200)
+                self.send_header('Content-Type', f"{mime_type}; charset=utf-8" if mime_type.startswith('text') else mime_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _serve
+            do_POST = _serve
+            do_PUT = _serve
+            do_DELETE = _serve
+
+            def do_OPTIONS(self):
+                self.send_response(204)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Allow-Headers', '*')
+                self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                logger.debug(f"回放请求：{format % args}")
+
+        return Handler
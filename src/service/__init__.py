@@ -0,0 +1,24 @@
+"""
+Service modules: long-running publish service and its HTTP client
+"""
+
+import importlib
+
+# 导出的名称 -> 所在模块；首次访问时才导入，导入包中的某个模块不会连带导入
+# Selenium 等依赖
+_EXPORTS = {
+    'ServiceClient': '.client',
+    'ServiceError': '.client',
+    'PublishService': '.server',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
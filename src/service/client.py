@@ -0,0 +1,190 @@
+"""
+发布服务客户端
+向常驻的发布服务（src/service/server.py）提交任务并跟踪进度，只依赖标准库，启动很快：
+
+    python -m src.service.client status
+    python -m src.service.client submit posts/a.md posts/b.md --platform csdn juejin
+    python -m src.service.client jobs
+    python -m src.service.client stop
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# 默认服务地址（与 server.DEFAULT_HOST / DEFAULT_PORT 一致）
+DEFAULT_URL = 'http://127.0.0.1:8765'
+
+_FINISHED = ('succeeded', 'failed', 'skipped', 'rejected')
+
+_STATUS_NAMES = {
+    'queued': '排队中',
+    'running': '执行中',
+    'parked': '已暂放',
+    'succeeded': '成功',
+    'failed': '失败',
+    'skipped': '跳过',
+    'rejected': '拒绝',
+}
+
+
+class ServiceError(Exception):
+    """发布服务不可用或返回错误"""
+
+
+class ServiceClient:
+    """
+    发布服务的 HTTP 客户端
+
+    Example:
+        client = ServiceClient()
+        if client.available():
+            jobs = client.submit(['posts/a.md'], ['csdn'])
+            client.follow([job['id'] for job in jobs], on_event=print)
+    """
+
+    def __init__(self, url: Optional[str] = None, timeout: float = 5.0):
+        self.url = (url or os.environ.get('POSTS_COPILOT_SERVICE') or DEFAULT_URL).rstrip('/')
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, data: Any = None, timeout: Optional[float] = None) -> Any:
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8') if data is not None else None
+        request = urllib.request.Request(f"{self.url}{path}", data=body, method=method,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode('utf-8')).get('error', '')
+            except ValueError:
+                message = ''
+            raise ServiceError(f"发布服务返回 {e.code}：{message or e.reason}")
+        except (urllib.error.URLError, OSError) as e:
+            raise ServiceError(f"无法连接发布服务 {self.url}：{e}")
+
+    def available(self) -> bool:
+        """服务是否在运行"""
+        try:
+            return bool(self._request('GET', '/health', timeout=1).get('ok'))
+        except ServiceError:
+            return False
+
+    def health(self) -> Dict[str, Any]:
+        return self._request('GET', '/health')
+
+    def submit(self, articles: Iterable[str], platforms: Optional[List[str]] = None,
+               force: bool = False) -> List[Dict[str, Any]]:
+        """提交任务，返回创建的任务"""
+        data = {'articles': [os.path.abspath(a) for a in articles], 'platforms': platforms, 'force': force}
+        return self._request('POST', '/jobs', data)['jobs']
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        return self._request('GET', '/jobs')['jobs']
+
+    def job(self, job_id: str) -> Dict[str, Any]:
+        return self._request('GET', f"/jobs/{job_id}")
+
+    def events(self, since: int = 0, timeout: float = 30) -> Dict[str, Any]:
+        return self._request('GET', f"/events?since={since}&timeout={timeout}", timeout=timeout + 5)
+
+    def shutdown(self):
+        self._request('POST', '/shutdown')
+
+    def follow(self, job_ids: Iterable[str], on_event: Callable[[Dict[str, Any]], None],
+               since: int = 0) -> List[Dict[str, Any]]:
+        """
+        跟踪任务进度直到全部结束
+
+        Args:
+            job_ids: 任务ID
+            on_event: 每个相关事件（状态变化、执行日志）的回调
+            since: 从哪个事件开始读取
+
+        Returns:
+            List[Dict]: 结束时的任务状态
+        """
+        pending = set(job_ids)
+        while pending:
+            result = self.events(since)
+            since = result['next']
+            for event in result['events']:
+                if event.get('job') not in pending:
+                    continue
+                on_event(event)
+                if event['type'] == 'status' and event.get('status') in _FINISHED:
+                    pending.discard(event['job'])
+        return [self.job(job_id) for job_id in job_ids]
+
+
+def print_event(event: Dict[str, Any]):
+    """按 ✓/⚠/✗ 格式输出进度事件"""
+    moment = time.strftime('%H:%M:%S', time.localtime(event['ts']))
+    if event['type'] == 'log':
+        print(f"{moment} [任务 {event['job']}] {event['message']}")
+        return
+    status = event.get('status', '')
+    mark = {'succeeded': '✓', 'failed': '✗', 'rejected': '✗', 'skipped': '⚠', 'parked': '⚠'}.get(status, '·')
+    detail = event.get('url') or event.get('message') or event.get('article') or ''
+    print(f"{moment} {mark} 任务 {event['job']} {_STATUS_NAMES.get(status, status)}"
+          + (f"：{detail}" if detail else ''))
+
+
+def print_jobs(jobs: List[Dict[str, Any]]):
+    if not jobs:
+        print("没有任务")
+        return
+    for job in jobs:
+        print(f"{job['id']:>4}  {_STATUS_NAMES.get(job['status'], job['status']):<4}  {job['platform']:<8}  "
+              f"{os.path.basename(job['article'])}  {job['url'] or job['message']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='发布服务客户端')
+    parser.add_argument('--url', help=f"服务地址，默认为环境变量 POSTS_COPILOT_SERVICE 或 {DEFAULT_URL}")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('status', help='服务状态')
+    submit = commands.add_parser('submit', help='提交任务并跟踪进度')
+    submit.add_argument('articles', nargs='+', help='文章路径')
+    submit.add_argument('--platform', nargs='+', help='平台，默认为服务端已启用的平台')
+    submit.add_argument('--force', action='store_true', help='跳过重复发布检测')
+    submit.add_argument('--no-follow', action='store_true', help='提交后立即返回，不跟踪进度')
+    commands.add_parser('jobs', help='所有任务')
+    commands.add_parser('stop', help='处理完当前批次后停止服务')
+    args = parser.parse_args(argv)
+
+    client = ServiceClient(args.url)
+    try:
+        if args.command == 'status':
+            if not client.available():
+                print(f"⚠ 发布服务未运行（{client.url}），启动：python publish.py --serve")
+                return 1
+            health = client.health()
+            counts = '，'.join(f"{_STATUS_NAMES.get(k, k)} {v}" for k, v in health['jobs'].items()) or '无任务'
+            print(f"✓ 发布服务运行中（PID {health['pid']}）：{counts}")
+        elif args.command == 'jobs':
+            print_jobs(client.jobs())
+        elif args.command == 'stop':
+            client.shutdown()
+            print("✓ 已通知发布服务停止")
+        else:
+            since = client.events(timeout=0)['next']
+            jobs = client.submit(args.articles, args.platform, args.force)
+            print(f"✓ 已提交 {len(jobs)} 个任务")
+            if not args.no_follow:
+                jobs = client.follow([job['id'] for job in jobs], print_event, since=since)
+                print_jobs(jobs)
+                return 0 if all(job['status'] == 'succeeded' for job in jobs) else 1
+    except ServiceError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
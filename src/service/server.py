@@ -0,0 +1,428 @@
+"""
+发布服务
+常驻进程持有已连接的浏览器会话和任务队列，通过本地 HTTP 接口接收任务、查询状态和进度。
+publish.py、定时任务等作为客户端提交任务，单个任务的耗时不再包含启动、连接 Chrome 和导入 Selenium。
+
+接口（JSON，默认只监听 127.0.0.1）：
+
+    GET  /health                     服务状态
+    POST /jobs                       提交任务 {"articles": [...], "platforms": [...], "force": false}
+                                     （platforms 只能是已启用的平台，省略时使用全部已启用的平台）
+    GET  /jobs                       所有任务
+    GET  /jobs/<id>                  单个任务
+    GET  /events?since=0&timeout=30  进度事件（长轮询：没有新事件时最多等待 timeout 秒）
+    POST /shutdown                   处理完当前批次后停止
+
+只接受本机客户端的请求：Host（以及浏览器带上的 Origin）必须是本机地址，POST 必须是 application/json，
+浏览器中的网页无法通过跨站请求（CSRF）或 DNS 重绑定提交任务、停止服务。
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from src.core.logger import current_context, get_logger, log_context
+from src.core.scheduler import PublishJob, PublishScheduler
+
+logger = get_logger(__name__)
+
+# 默认监听地址（与 config/common.yaml.example 的 service 段一致）
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# 保留的进度事件数和已结束的任务数
+MAX_EVENTS = 2000
+MAX_FINISHED_JOBS = 1000
+
+# 长轮询最长等待时间（秒）
+MAX_WAIT = 60
+
+QUEUED = 'queued'
+RUNNING = 'running'
+PARKED = 'parked'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+REJECTED = 'rejected'
+FINISHED = (SUCCEEDED, FAILED, SKIPPED, REJECTED)
+
+
+class ServiceJob:
+    """服务中的一个发布任务（文章 + 平台）及其状态"""
+
+    def __init__(self, job_id: str, platform: str, article_path: str, force: bool = False):
+        self.id = job_id
+        self.platform = platform
+        self.article_path = article_path
+        self.force = force
+        self.status = QUEUED
+        self.url = ''
+        self.message = ''
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'platform': self.platform,
+            'article': self.article_path,
+            'status': self.status,
+            'url': self.url,
+            'message': self.message,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class _LogRelay(logging.Handler):
+    """把任务执行期间的日志（带 job 上下文）转为进度事件"""
+
+    def __init__(self, service: 'PublishService'):
+        super().__init__(logging.INFO)
+        self.service = service
+
+    def emit(self, record: logging.LogRecord):
+        job_id = current_context().get('service_job')
+        if job_id:
+            self.service.emit('log', job=job_id, level=record.levelname, message=record.getMessage())
+
+
+class PublishService:
+    """
+    发布服务：任务队列和执行线程
+
+    执行线程每次取出队列中的全部任务，检查后交给一个调度器按平台限流执行；
+    执行期间提交的任务在当前批次结束后执行。浏览器只在执行线程中使用。
+
+    Example:
+        service = PublishService(execute=lambda job: publish_to_platform(...), check=..., scheduler_factory=new_scheduler)
+        server = service.serve(port=8765)
+        service.wait()
+    """
+
+    def __init__(self, execute: Callable[[PublishJob], bool],
+                 check: Optional[Callable[[str, str, bool], Optional[str]]] = None,
+                 scheduler_factory: Callable[[], PublishScheduler] = None,
+                 default_platforms: Optional[Callable[[], List[str]]] = None):
+        """
+        初始化发布服务
+
+        Args:
+            execute: 执行单个任务，返回是否成功（与 PublishScheduler.run 的参数相同）
+            check: 调度前检查任务 (平台, 文章, force)，返回拒绝原因（如已发布过、预检未通过），None 表示通过
+            scheduler_factory: 创建调度器（每个批次一个）
+            default_platforms: 已启用的平台：提交任务时未指定平台使用这些平台，指定的平台也必须在其中
+        """
+        self.execute = execute
+        self.check = check
+        self.scheduler_factory = scheduler_factory
+        self.default_platforms = default_platforms or (lambda: [])
+        self.started_at = time.time()
+
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._jobs: Dict[str, ServiceJob] = {}
+        self._queue: List[ServiceJob] = []
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=MAX_EVENTS)
+        self._next_event = 0
+        self._next_job = 1
+        self._stopping = False
+        self._worker: Optional[threading.Thread] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._relay = _LogRelay(self)
+
+    # ---------- 任务 ----------
+
+    def submit(self, articles: List[str], platforms: Optional[List[str]] = None,
+               force: bool = False) -> List[ServiceJob]:
+        """
+        提交任务
+
+        Args:
+            articles: 文章路径
+            platforms: 平台，为空时使用 default_platforms
+            force: 是否跳过重复发布检测
+
+        Returns:
+            List[ServiceJob]: 每个（文章, 平台）一个任务
+        """
+        platforms = list(platforms or self.default_platforms())
+        jobs = []
+        with self._lock:
+            for article in articles:
+                for platform in platforms:
+                    job = ServiceJob(str(self._next_job), platform, os.path.abspath(article), force)
+                    self._next_job += 1
+                    self._jobs[job.id] = job
+                    self._queue.append(job)
+                    jobs.append(job)
+            finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED]
+            for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+                del self._jobs[job_id]
+        for job in jobs:
+            self.emit('status', job=job.id, status=QUEUED, platform=job.platform, article=job.article_path)
+        with self._lock:
+            self._changed.notify_all()
+        return jobs
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def _set_status(self, job: ServiceJob, status: str, message: str = ''):
+        with self._lock:
+            job.status = status
+            job.message = message or job.message
+            if status == RUNNING and job.started_at is None:
+                job.started_at = time.time()
+            if status in FINISHED:
+                job.finished_at = time.time()
+        self.emit('status', job=job.id, status=status, message=message, url=job.url)
+
+    # ---------- 进度事件 ----------
+
+    def emit(self, kind: str, **fields):
+        """记录一个进度事件并唤醒等待中的客户端"""
+        with self._lock:
+            event = {'seq': self._next_event, 'ts': time.time(), 'type': kind, **fields}
+            self._next_event += 1
+            self._events.append(event)
+            self._changed.notify_all()
+
+    def events(self, since: int = 0, timeout: float = 0) -> Dict[str, Any]:
+        """
+        读取 since 之后的事件；没有新事件时最多等待 timeout 秒
+
+        Returns:
+            Dict: events（事件列表）和 next（下次读取时的 since）
+        """
+        deadline = time.monotonic() + min(max(timeout, 0), MAX_WAIT)
+        with self._lock:
+            while self._next_event <= since and not self._stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            events = [event for event in self._events if event['seq'] >= since]
+            return {'events': events, 'next': self._next_event}
+
+    # ---------- 执行 ----------
+
+    def _take_batch(self) -> List[ServiceJob]:
+        with self._lock:
+            while not self._queue and not self._stopping:
+                self._changed.wait()
+            batch, self._queue = self._queue, []
+            return batch
+
+    def _run_batch(self, batch: List[ServiceJob]):
+        scheduler = self.scheduler_factory()
+        by_job: Dict[int, ServiceJob] = {}
+        for job in batch:
+            reason = self.check(job.platform, job.article_path, job.force) if self.check else None
+            if reason:
+                self._set_status(job, REJECTED, reason)
+                continue
+            by_job[id(scheduler.add(job.platform, job.article_path))] = job
+        if not by_job:
+            return
+
+        def execute(publish_job: PublishJob) -> bool:
+            job = by_job[id(publish_job)]
+            self._set_status(job, RUNNING)
+            with log_context(service_job=job.id):
+                ok = self.execute(publish_job)
+            job.url = publish_job.url
+            if not ok and publish_job.wait_for is not None:
+                self._set_status(job, PARKED, '等待条件满足（如人工登录）后继续')
+            return ok
+
+        summary = scheduler.run(execute)
+        for status in (SUCCEEDED, FAILED, SKIPPED):
+            for publish_job in summary[status]:
+                job = by_job[id(publish_job)]
+                job.url = publish_job.url
+                self._set_status(job, status)
+
+    def _work(self):
+        logging.getLogger().addHandler(self._relay)
+        try:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                try:
+                    self._run_batch(batch)
+                except Exception as e:
+                    logger.error(f"✗ 执行任务批次出错：{e}", exc_info=True)
+                    for job in batch:
+                        if job.status not in FINISHED:
+                            self._set_status(job, FAILED, str(e))
+        finally:
+            logging.getLogger().removeHandler(self._relay)
+
+    def start(self):
+        """启动执行线程"""
+        self._worker = threading.Thread(target=self._work, name='publish-service', daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        """不再接收新批次；当前批次结束后执行线程退出，HTTP 服务停止"""
+        with self._lock:
+            self._stopping = True
+            self._changed.notify_all()
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def wait(self):
+        """阻塞到服务停止（Ctrl+C 也会停止服务）"""
+        try:
+            while self._worker is not None and self._worker.is_alive():
+                self._worker.join(timeout=1)
+        except KeyboardInterrupt:
+            logger.info("停止发布服务")
+            self.stop()
+        if self._server is not None:
+            self._server.server_close()
+
+    # ---------- HTTP 接口 ----------
+
+    def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+        """
+        启动执行线程和 HTTP 接口（后台线程）
+
+        Args:
+            host: 监听地址，默认只监听本机
+            port: 端口，0 表示随机端口（实际端口见返回值的 server_port）
+        """
+        handler = type('ServiceHandler', (_ServiceHandler,), {'service': self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='publish-service-http', daemon=True).start()
+        if self._worker is None:
+            self.start()
+        logger.info(f"✓ 发布服务已启动：http://{host}:{self._server.server_port}")
+        return self._server
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {'ok': not self._stopping, 'pid': os.getpid(), 'started_at': self.started_at, 'jobs': counts}
+
+
+# Host / Origin 中允许的主机名（另外允许服务实际监听的地址）
+LOCAL_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+
+def _string_list(value: Any, name: str) -> List[str]:
+    """请求中的字符串列表字段（单个字符串不会被当作字符列表）"""
+    if not isinstance(value, list) or not all(isinstance(item, str) and item for item in value):
+        raise ValueError(f"{name} 应为非空字符串的列表")
+    return value
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    service: PublishService
+
+    def _forbidden(self, post: bool = False) -> Optional[str]:
+        """请求不是来自本机客户端时返回拒绝原因"""
+        allowed = set(LOCAL_HOSTS) | {self.server.server_address[0]}
+        allowed.discard('0.0.0.0')
+        host = urlparse(f"//{self.headers.get('Host') or ''}").hostname
+        if host not in allowed:
+            return f"Host 不是本机地址：{self.headers.get('Host')}"
+        origin = self.headers.get('Origin')
+        if origin and urlparse(origin).hostname not in allowed:
+            return f"不接受来自 {origin} 的请求"
+        if post:
+            content_type = (self.headers.get('Content-Type') or '').split(';', 1)[0].strip().lower()
+            if content_type != 'application/json':
+                return 'Content-Type 应为 application/json'
+        return None
+
+    def _send(self, status: int, data: Any):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        reason = self._forbidden()
+        if reason:
+            self._send(403, {'error': reason})
+            return
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == '/health':
+            self._send(200, self.service.health())
+        elif url.path == '/jobs':
+            self._send(200, {'jobs': self.service.jobs()})
+        elif url.path.startswith('/jobs/'):
+            job = self.service.job(url.path[len('/jobs/'):])
+            self._send(200, job) if job else self._send(404, {'error': '任务不存在'})
+        elif url.path == '/events':
+            try:
+                since = int(query.get('since', ['0'])[0])
+                timeout = float(query.get('timeout', ['0'])[0])
+            except ValueError:
+                self._send(400, {'error': 'since / timeout 应为数字'})
+                return
+            self._send(200, self.service.events(since, timeout))
+        else:
+            self._send(404, {'error': '接口不存在'})
+
+    def do_POST(self):
+        reason = self._forbidden(post=True)
+        if reason:
+            self._send(403, {'error': reason})
+            return
+        url = urlparse(self.path)
+        if url.path == '/shutdown':
+            self._send(200, {'ok': True})
+            self.service.stop()
+            return
+        if url.path != '/jobs':
+            self._send(404, {'error': '接口不存在'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            data = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(data, dict):
+                raise ValueError('请求体应为 JSON 对象')
+            articles = _string_list(data.get('articles'), 'articles')
+            if not articles:
+                raise ValueError('articles 应为非空列表')
+            platforms = _string_list(data.get('platforms') or [], 'platforms')
+        except ValueError as e:
+            self._send(400, {'error': f"请求格式错误：{e}"})
+            return
+        unknown = [platform for platform in platforms if platform not in self.service.default_platforms()]
+        if unknown:
+            self._send(400, {'error': f"平台未启用或不存在：{', '.join(unknown)}"})
+            return
+        missing = [article for article in articles if not os.path.exists(article)]
+        if missing:
+            self._send(400, {'error': f"文章不存在：{', '.join(missing)}"})
+            return
+        jobs = self.service.submit(articles, platforms, bool(data.get('force')))
+        self._send(202, {'jobs': [job.to_dict() for job in jobs]})
+
+    def log_message(self, format, *args):
+        logger.debug(f"发布服务 {self.address_string()} {format % args}")
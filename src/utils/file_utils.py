@@ -1,12 +1,11 @@
 import os
-import re
 import subprocess
 from tempfile import gettempdir
 from urllib.parse import urlparse
 
-import requests
-import yaml
-
+from src.core.config import get_config
+from src.utils.front_matter import read_article, split_front_matter
+from src.utils.markdown_pipeline import transform_markdown
 from src.utils.yaml_file_utils import read_common
 
 # 获取当前脚本的绝对路径
@@ -71,12 +70,9 @@ def read_file_with_extra_enter(file):
 
 
 def read_file(file):
-    with open(file, 'r', encoding='UTF-8') as file:
-        # 读取文件内容
-        content = file.read()
-        cleaned_content = remove_front_matter(content)
-        cleaned_content = remove_truncate_content(cleaned_content)
-        return cleaned_content
+    # 读取正文（不含 front matter）
+    _, content = read_article(file)
+    return remove_truncate_content(content)
 
 
 def read_file_all_content(file):
@@ -87,30 +83,27 @@ def read_file_all_content(file):
         return cleaned_content
 
 
-def read_file_with_footer(file):
-    with open(file, 'r', encoding='UTF-8') as file:
-        # 读取文件内容
-        content = file.read()
-        cleaned_content = remove_front_matter(content)
-        cleaned_content = remove_truncate_content(cleaned_content)
-        common_config = read_common()
-        footer = ""
-        # 使用 .get() 方法提供默认值 False，避免 KeyError
-        if common_config.get('include_footer', False):
-            current_dir = os.getcwd()
-            footer_path = os.path.join(current_dir, 'config/footer.md')
-            # 检查 footer 文件是否存在
-            if os.path.exists(footer_path):
-                footer = read_file(footer_path)
+def read_file_with_footer(file, platform=None):
+    # 指定平台时按该平台的转换链规范化（代码块、公式、标题层级、链接，见 markdown_pipeline）
+    cleaned_content = read_file(file)
+    common_config = read_common()
+    footer = ""
+    # 使用 .get() 方法提供默认值 False，避免 KeyError
+    if common_config.get('include_footer', False):
+        footer_path = get_config().path('footer.md')
+        # 检查 footer 文件是否存在
+        if os.path.exists(footer_path):
+            footer = read_file(footer_path)
 
-        return cleaned_content + "\n" + footer
+    content = cleaned_content + "\n" + footer
+    if platform:
+        content = transform_markdown(content, platform)
+    return content
 
 
 def remove_front_matter(markdown_content):
-    # 正则表达式匹配front matter，假设它以'---'开始和结束
-    front_matter_pattern = r'^---[\s\S]*?---'
-    # 使用re.sub替换front matter为空字符串
-    cleaned_content = re.sub(front_matter_pattern, '', markdown_content, flags=re.MULTILINE)
+    # 只去掉文件开头的 front matter，正文中的分隔线保留（规则见 front_matter.split_front_matter）
+    _, cleaned_content = split_front_matter(markdown_content)
     return cleaned_content
 
 
@@ -120,33 +113,19 @@ def remove_truncate_content(content):
     return cleaned_content
 
 
-# 解析markdown中的front matter的内容
+# 解析markdown中的front matter的内容，没有 front matter 时返回空字典
 def parse_front_matter(content_file):
-    metadata = []
-    markdown_content = read_file_all_content(content_file)
-    # 使用正则表达式匹配Front matter部分
-    # front_matter_pattern = re.compile(r'^---\n(.+?)\n---', re.DOTALL | re.MULTILINE)
-    front_matter_pattern = re.compile(r'^---\n(.+?)\n---', re.DOTALL)
-    # 搜索并提取Front matter
-    front_matter_match = front_matter_pattern.search(markdown_content)
-    if front_matter_match:
-        # 提取Front matter的内容
-        front_matter_content = front_matter_match.group(1)
-        # print(front_matter_content)
-        # 使用yaml.safe_load解析YAML内容
-        metadata = yaml.safe_load(front_matter_content)
-        # print(metadata)
-    else:
-        print("没有找到Front matter部分。")
+    metadata, _ = read_article(content_file)
     return metadata
 
-def convert_md_to_html(md_filename, include_footer=True):
+def convert_md_to_html(md_filename, include_footer=True, platform=None):
     """
     将 Markdown 文件转换为 HTML
     
     Args:
         md_filename: Markdown 文件路径
         include_footer: 是否包含页脚
+        platform: 平台名称，转换前按该平台的转换链规范化正文
     
     Returns:
         HTML 文件路径
@@ -161,25 +140,18 @@ def convert_md_to_html(md_filename, include_footer=True):
 
     # 构建输出的HTML文件名（修复：不要将布尔值拼接到文件名中）
     footer_suffix = '_with_footer' if include_footer else ''
-    html_filename = os.path.join(directory, base_name + footer_suffix + '.html')
+    platform_suffix = f'_{platform}' if platform else ''
+    html_filename = os.path.join(directory, base_name + footer_suffix + platform_suffix + '.html')
 
-    # 如果HTML文件已经存在，直接返回
-    if os.path.exists(html_filename):
+    # 如果HTML文件已经存在且比文章新，直接返回
+    if os.path.exists(html_filename) and os.path.getmtime(html_filename) >= os.path.getmtime(md_filename):
         return html_filename
     
-    # 读取 Markdown 文件内容并移除 Front Matter
-    with open(md_filename, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # 移除 Front Matter（如果存在）
-    if content.startswith('---'):
-        parts = content.split('---', 2)
-        if len(parts) >= 3:
-            # Front Matter 存在，只保留正文部分
-            content = parts[2].strip()
-        else:
-            # 没有正确的 Front Matter 结构，保留原内容
-            pass
+    # 读取 Markdown 正文（不含 Front Matter）
+    _, content = read_article(md_filename)
+    if platform:
+        content = transform_markdown(content, platform)
+    content = content.strip()
     
     # 创建临时 Markdown 文件（不含 Front Matter）
     import tempfile
@@ -216,8 +188,7 @@ def convert_md_to_html(md_filename, include_footer=True):
     common_config = read_common()
     if include_footer:
         if common_config['include_footer']:
-            current_dir = os.getcwd()
-            footer = os.path.join(current_dir, 'config/footer.html')
+            footer = get_config().path('footer.html')
 
             # 把footer合并到html中
             # 打开两个文件：一个用于读取，另一个用于写入
@@ -248,7 +219,8 @@ def download_image(url):
         # 完整的文件路径
         file_path = os.path.join(temp_dir, filename)
 
-        # 发送GET请求
+        # 发送GET请求（requests 导入较慢，用到时才导入）
+        import requests
         response = requests.get(url, stream=True)
 
         # 检查请求是否成功
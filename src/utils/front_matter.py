@@ -0,0 +1,121 @@
+"""
+Front matter 解析
+一次读取文章，同时得到 front matter 元数据和正文，所有读取文章的地方统一使用：
+
+- 文件第一行（忽略 BOM 和行尾空白）为 ``---`` 时才有 front matter，到下一行 ``---`` 或 ``...`` 结束
+- 没有结束行、YAML 无法解析为映射时，视为没有 front matter，全文都是正文
+- 正文中的 ``---``（分隔线）不受影响
+- CRLF 换行统一为 LF
+"""
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Tuple
+
+import yaml
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 按（路径, 修改时间, 大小）缓存最近解析的文章，一次发布中多处读取同一篇文章时只解析一次
+CACHE_SIZE = 128
+
+# 有 libyaml 时使用 C 实现的解析器（front matter 解析的主要耗时在 YAML）
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+_OPEN = '---'
+_CLOSE = ('---', '...')
+
+_cache: "OrderedDict[Tuple[str, int, int], Tuple[Dict[str, Any], str]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _parse(lines: Iterable[str], rest) -> Tuple[Dict[str, Any], str]:
+    """
+    从行迭代器中解析 front matter
+
+    Args:
+        lines: 行迭代器（front matter 部分逐行读取）
+        rest: 返回剩余全部内容的函数
+
+    Returns:
+        Tuple: (元数据, 正文)
+    """
+    iterator = iter(lines)
+    first = next(iterator, '')
+    if first.lstrip('\ufeff').rstrip() != _OPEN:
+        return {}, first + rest()
+
+    header = []
+    for line in iterator:
+        if line.rstrip() in _CLOSE:
+            break
+        header.append(line)
+    else:
+        # 没有结束行：不是 front matter
+        return {}, first + ''.join(header) + rest()
+
+    body = rest()
+    try:
+        metadata = yaml.load(''.join(header), Loader=_Loader)
+    except yaml.YAMLError as e:
+        logger.warning(f"⚠ front matter 不是有效的 YAML，已忽略：{e}")
+        return {}, body
+    if metadata is None:
+        return {}, body
+    if not isinstance(metadata, dict):
+        # 如开头的分隔线，不是元数据
+        return {}, first + ''.join(header) + line + body
+    return metadata, body
+
+
+def split_front_matter(text: str) -> Tuple[Dict[str, Any], str]:
+    """
+    拆分文章文本的 front matter 和正文
+
+    Args:
+        text: 文章全文
+
+    Returns:
+        Tuple: (元数据, 正文)
+    """
+    text = text.replace('\r\n', '\n')
+    lines = text.splitlines(keepends=True)
+    consumed = [0]
+
+    def counted():
+        for line in lines:
+            consumed[0] += 1
+            yield line
+
+    return _parse(counted(), lambda: ''.join(lines[consumed[0]:]))
+
+
+def read_article(path: str) -> Tuple[Dict[str, Any], str]:
+    """
+    读取文章的 front matter 和正文（front matter 逐行读取，正文一次读取）
+
+    Args:
+        path: 文章路径
+
+    Returns:
+        Tuple: (元数据, 正文)，元数据是副本，可以修改
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+    if cached is None:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            cached = _parse(f, f.read)
+        with _cache_lock:
+            _cache[key] = cached
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    metadata, body = cached
+    return copy.deepcopy(metadata), body
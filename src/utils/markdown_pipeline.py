@@ -0,0 +1,548 @@
+"""
+按平台规范化 Markdown
+把正文解析为块级语法树（段落、标题、代码块、公式块），再按平台声明的转换链处理：
+去掉 <!-- truncate --> 等标记、统一代码块写法、转换公式、调整标题层级、把链接改为文末引用。
+
+- 转换链只编译一次（正则和参数在编译时确定），同一篇文章的所有平台版本共用一次解析；
+- 每个块只遍历一次，转换链中的各个转换依次作用于同一个块；
+- 结果按（转换链, 正文哈希）缓存，同一篇文章重复读取（预检、填写、校验）不会重复转换。
+
+Example:
+    content = transform_markdown(read_file(article_path), 'zhihu')
+    variants = transform_for_platforms(content, ['csdn', 'wechat'])
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 各平台默认的转换链：转换名，或 {转换名: 参数}。可在通用配置的 markdown_transforms 中按平台覆盖
+DEFAULT_TRANSFORMS: List[Any] = ['strip_markers', 'code_fences']
+
+PLATFORM_TRANSFORMS: Dict[str, List[Any]] = {
+    'csdn': DEFAULT_TRANSFORMS,
+    'juejin': DEFAULT_TRANSFORMS,
+    'cto51': DEFAULT_TRANSFORMS,
+    'alicloud': DEFAULT_TRANSFORMS,
+    # 知乎不能识别 ~~~ 围栏、带属性的语言标记（如 {.python}）
+    'zhihu': ['strip_markers', {'code_fences': {'strip_attributes': True}}],
+    # 头条和公众号不支持公式；标题单独填写，正文标题从二级开始
+    'toutiao': ['strip_markers', 'code_fences', {'math': {'style': 'code'}}, {'headings': {'top': 2}}],
+    # 公众号正文不能放外部链接，改为文末引用
+    'wechat': ['strip_markers', 'code_fences', {'math': {'style': 'code'}}, {'headings': {'top': 2}},
+               {'links': {'style': 'footnote'}}],
+}
+
+# 缓存的转换结果数
+CACHE_SIZE = 256
+
+_FENCE_OPEN = re.compile(r'^( {0,3})(`{3,}|~{3,})(.*)$')
+_HEADING = re.compile(r'^(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$|^(#{1,6})[ \t]*$')
+_MATH_SINGLE = re.compile(r'^\s*\$\$(.+)\$\$\s*$')
+_MATH_OPEN = re.compile(r'^\s*\$\$\s*(.*)$')
+_INLINE_CODE = re.compile(r'(`+)[\s\S]*?\1')
+
+
+class Block:
+    """
+    块级语法树的节点
+
+    Attributes:
+        kind: text（普通段落，含列表、引用、空行等）、heading、code、math
+        lines: text 块的原始行
+        level / text: heading 块的层级和文本
+        fence / info / body / closed / indent: code 块的围栏、语言标记、代码行、是否闭合、缩进
+        body: math 块的公式行
+    """
+
+    __slots__ = ('kind', 'lines', 'level', 'text', 'fence', 'info', 'body', 'closed', 'indent', 'raw')
+
+    def __init__(self, kind: str, lines: Sequence[str] = (), level: int = 0, text: str = '',
+                 fence: str = '', info: str = '', body: Sequence[str] = (), closed: bool = True,
+                 indent: str = '', raw: Optional[Sequence[str]] = None):
+        self.kind = kind
+        self.lines = tuple(lines)
+        self.level = level
+        self.text = text
+        self.fence = fence
+        self.info = info
+        self.body = tuple(body)
+        self.closed = closed
+        self.indent = indent
+        # 解析时的原始行：块没有被修改时原样输出
+        self.raw = tuple(raw) if raw is not None else None
+
+    def replace(self, **changes) -> 'Block':
+        """返回修改后的副本（转换不修改缓存中的语法树）"""
+        values = {name: getattr(self, name) for name in self.__slots__ if name != 'raw'}
+        values.update(changes)
+        return Block(**values)
+
+    def render(self) -> List[str]:
+        if self.raw is not None:
+            return list(self.raw)
+        if self.kind == 'heading':
+            return ['#' * self.level + (' ' + self.text if self.text else '')]
+        if self.kind == 'code':
+            lines = [f"{self.indent}{self.fence}{self.info}"]
+            lines.extend(self.body)
+            if self.closed:
+                lines.append(f"{self.indent}{self.fence}")
+            return lines
+        if self.kind == 'math':
+            return ['$$', *self.body, '$$']
+        return list(self.lines)
+
+    def __repr__(self):
+        return f"Block({self.kind}, {self.render()[:1]})"
+
+
+class Document:
+    """解析后的正文：块列表和标题层级统计"""
+
+    def __init__(self, blocks: List[Block]):
+        self.blocks = blocks
+        levels = [block.level for block in blocks if block.kind == 'heading']
+        self.min_heading = min(levels) if levels else 0
+
+
+def parse(content: str) -> Document:
+    """
+    解析正文为块级语法树；不做任何转换时 render(parse(content)) == content
+
+    Args:
+        content: Markdown 正文（不含 front matter）
+
+    Returns:
+        Document: 语法树
+    """
+    lines = content.split('\n')
+    blocks: List[Block] = []
+    text: List[str] = []
+
+    def flush_text():
+        if text:
+            blocks.append(Block('text', lines=text))
+            text.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        fence_match = _FENCE_OPEN.match(line)
+        if fence_match and not (fence_match.group(2)[0] == '`' and '`' in fence_match.group(3)):
+            flush_text()
+            indent, fence, info = fence_match.groups()
+            closing = re.compile(r'^ {0,3}' + re.escape(fence[0]) + '{' + str(len(fence)) + r',}\s*$')
+            end = next((j for j in range(i + 1, len(lines)) if closing.match(lines[j])), None)
+            body = lines[i + 1:end if end is not None else len(lines)]
+            last = end if end is not None else len(lines) - 1
+            blocks.append(Block('code', fence=fence, info=info, body=body, closed=end is not None,
+                                indent=indent, raw=lines[i:last + 1]))
+            i = last + 1
+            continue
+
+        heading_match = _HEADING.match(line)
+        if heading_match:
+            flush_text()
+            marks = heading_match.group(1) or heading_match.group(3)
+            blocks.append(Block('heading', level=len(marks), text=heading_match.group(2) or '', raw=[line]))
+            i += 1
+            continue
+
+        single = _MATH_SINGLE.match(line)
+        if single:
+            flush_text()
+            blocks.append(Block('math', body=[single.group(1).strip()], raw=[line]))
+            i += 1
+            continue
+        math_open = _MATH_OPEN.match(line)
+        if math_open:
+            end = None
+            for j in range(i + 1, len(lines)):
+                if lines[j].rstrip().endswith('$$'):
+                    end = j
+                    break
+                if _FENCE_OPEN.match(lines[j]):
+                    break
+            if end is not None:
+                flush_text()
+                body = ([math_open.group(1)] if math_open.group(1).strip() else []) + lines[i + 1:end]
+                tail = lines[end].rstrip()[:-2]
+                if tail.strip():
+                    body.append(tail)
+                blocks.append(Block('math', body=body, raw=lines[i:end + 1]))
+                i = end + 1
+                continue
+
+        text.append(line)
+        i += 1
+    flush_text()
+    return Document(blocks)
+
+
+def render(blocks: Iterable[Block]) -> str:
+    """把块列表输出为 Markdown"""
+    return '\n'.join(line for block in blocks for line in block.render())
+
+
+# ---------- 转换 ----------
+
+class Transform:
+    """
+    转换基类
+
+    prepare 在遍历前执行一次（可替换整个语法树或统计信息），block 作用于每个块，
+    finish 在遍历后执行一次（如在文末追加引用列表）。state 是本次转换独占的字典。
+    """
+
+    name = ''
+
+    def prepare(self, document: Document, state: Dict[str, Any]) -> Document:
+        return document
+
+    def block(self, block: Block, state: Dict[str, Any]) -> List[Block]:
+        return [block]
+
+    def finish(self, blocks: List[Block], state: Dict[str, Any]) -> List[Block]:
+        return blocks
+
+
+class StripMarkers(Transform):
+    """去掉正文中的标记（默认 <!-- truncate --> 和 <!-- more -->），代码块中的不处理"""
+
+    name = 'strip_markers'
+
+    def __init__(self, markers: Sequence[str] = ('<!-- truncate -->', '<!-- more -->')):
+        self.pattern = re.compile('|'.join(re.escape(marker) for marker in markers))
+
+    def block(self, block, state):
+        if block.kind != 'text' or not any(self.pattern.search(line) for line in block.lines):
+            return [block]
+        return [block.replace(lines=[self.pattern.sub('', line) for line in block.lines], raw=None)]
+
+
+class UnwrapMarkdownFence(Transform):
+    """整篇正文被 ```markdown 代码块包裹时（大模型生成的内容常见）去掉包裹"""
+
+    name = 'unwrap_markdown_fence'
+
+    def prepare(self, document, state):
+        blocks = [block for block in document.blocks
+                  if not (block.kind == 'text' and not ''.join(block.lines).strip())]
+        if len(blocks) == 1 and blocks[0].kind == 'code' and blocks[0].info.strip().lower() in ('markdown', 'md', ''):
+            return parse('\n'.join(blocks[0].body))
+        return document
+
+
+class CodeFences(Transform):
+    """
+    统一代码块写法：围栏改为反引号、去掉缩进、语言标记小写并使用常见名称
+
+    Args:
+        strip_attributes: 去掉语言标记后的属性（如 ``{.python}``、``python title="a.py"``）
+        aliases: 语言别名，合并到默认别名中
+        default_language: 没有语言标记的代码块使用的语言
+    """
+
+    name = 'code_fences'
+
+    ALIASES = {'py': 'python', 'py3': 'python', 'sh': 'bash', 'shell': 'bash', 'zsh': 'bash',
+               'js': 'javascript', 'ts': 'typescript', 'yml': 'yaml', 'golang': 'go', 'c++': 'cpp'}
+
+    def __init__(self, strip_attributes: bool = False, aliases: Optional[Dict[str, str]] = None,
+                 default_language: str = ''):
+        self.strip_attributes = strip_attributes
+        self.aliases = {**self.ALIASES, **(aliases or {})}
+        self.default_language = default_language
+
+    def block(self, block, state):
+        if block.kind != 'code':
+            return [block]
+        info = block.info.strip()
+        language, _, rest = info.partition(' ')
+        if language.startswith('{'):
+            # pandoc 写法 {.python .numberLines}
+            classes = re.findall(r'\.([\w+-]+)', info)
+            language, rest = (classes[0] if classes else ''), ''
+        language = self.aliases.get(language.lower(), language.lower()) or self.default_language
+        info = language if self.strip_attributes or not rest else f"{language} {rest.strip()}"
+
+        longest = max((len(run) for line in block.body for run in re.findall(r'`{3,}', line)), default=0)
+        fence = '`' * max(3, longest + 1)
+        indent = len(block.indent)
+        body = [line[indent:] if line[:indent].isspace() else line.lstrip() for line in block.body] if indent else block.body
+        if (fence, info, '', True) == (block.fence, block.info, block.indent, block.closed) and body == block.body:
+            return [block]
+        return [block.replace(fence=fence, info=info, indent='', body=body, closed=True, raw=None)]
+
+
+class Math(Transform):
+    """
+    转换公式块
+
+    Args:
+        style: dollar（$$ 独占一行）、brackets（\\[ \\]）、code（不支持公式的平台，改为 latex 代码块）
+    """
+
+    name = 'math'
+
+    def __init__(self, style: str = 'dollar'):
+        if style not in ('dollar', 'brackets', 'code'):
+            raise ValueError(f"未知的公式格式：{style}")
+        self.style = style
+
+    def block(self, block, state):
+        if block.kind != 'math':
+            return [block]
+        if self.style == 'code':
+            return [Block('code', fence='```', info='latex', body=block.body)]
+        if self.style == 'brackets':
+            return [Block('text', lines=['\\[', *block.body, '\\]'])]
+        return [block.replace(raw=None)]
+
+
+class Headings(Transform):
+    """
+    调整标题层级：正文最高一级标题调整为 top，超过 max_level 的改为加粗段落
+
+    Args:
+        top: 正文最高一级标题的层级
+        max_level: 平台支持的最深层级
+    """
+
+    name = 'headings'
+
+    def __init__(self, top: int = 1, max_level: int = 6):
+        self.top = top
+        self.max_level = max_level
+
+    def prepare(self, document, state):
+        state['shift'] = self.top - document.min_heading if document.min_heading else 0
+        return document
+
+    def block(self, block, state):
+        if block.kind != 'heading':
+            return [block]
+        level = min(max(block.level + state['shift'], 1), 6)
+        if level > self.max_level:
+            return [Block('text', lines=[f"**{block.text}**"])]
+        if level == block.level:
+            return [block]
+        return [block.replace(level=level, raw=None)]
+
+
+class Links(Transform):
+    """
+    转换链接（图片、行内代码中的不处理）
+
+    Args:
+        style: footnote（正文保留文字并加编号，文末列出链接地址）或 inline（不转换）
+        title: 文末引用列表的标题
+    """
+
+    name = 'links'
+
+    LINK = re.compile(r'(?<!!)\[([^\]\n]+)\]\(\s*<?(https?://[^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+
+    def __init__(self, style: str = 'footnote', title: str = '参考链接'):
+        if style not in ('footnote', 'inline'):
+            raise ValueError(f"未知的链接格式：{style}")
+        self.style = style
+        self.title = title
+
+    def prepare(self, document, state):
+        state['urls'] = []
+        return document
+
+    def block(self, block, state):
+        if self.style == 'inline' or block.kind not in ('text', 'heading'):
+            return [block]
+        if block.kind == 'heading':
+            text = self._convert(block.text, state['urls'])
+            return [block] if text == block.text else [block.replace(text=text, raw=None)]
+        lines = [self._convert(line, state['urls']) for line in block.lines]
+        return [block] if list(block.lines) == lines else [block.replace(lines=lines, raw=None)]
+
+    def _convert(self, line: str, urls: List[str]) -> str:
+        if '](' not in line:
+            return line
+
+        def replace(match):
+            url = match.group(2)
+            if url not in urls:
+                urls.append(url)
+            return f"{match.group(1)}[{urls.index(url) + 1}]"
+
+        # 行内代码中的内容保持原样
+        parts, last = [], 0
+        for code in _INLINE_CODE.finditer(line):
+            parts.append(self.LINK.sub(replace, line[last:code.start()]))
+            parts.append(code.group(0))
+            last = code.end()
+        parts.append(self.LINK.sub(replace, line[last:]))
+        return ''.join(parts)
+
+    def finish(self, blocks, state):
+        urls = state['urls']
+        if not urls:
+            return blocks
+        lines = ['', f"**{self.title}**", '']
+        lines.extend(f"[{i}] {url}  " for i, url in enumerate(urls, 1))
+        return blocks + [Block('text', lines=lines)]
+
+
+TRANSFORMS = {cls.name: cls for cls in (StripMarkers, UnwrapMarkdownFence, CodeFences, Math, Headings, Links)}
+
+
+class Pipeline:
+    """编译后的转换链"""
+
+    def __init__(self, transforms: Sequence[Transform], key: str = ''):
+        self.transforms = list(transforms)
+        # 缓存键：同样配置的转换链键相同
+        self.key = key or '|'.join(transform.name for transform in self.transforms)
+
+    def run(self, document: Document) -> str:
+        states: List[Dict[str, Any]] = [{} for _ in self.transforms]
+        for transform, state in zip(self.transforms, states):
+            document = transform.prepare(document, state)
+
+        output: List[Block] = []
+        for block in document.blocks:
+            current = [block]
+            for transform, state in zip(self.transforms, states):
+                current = [result for item in current for result in transform.block(item, state)]
+            output.extend(current)
+
+        for transform, state in zip(self.transforms, states):
+            output = transform.finish(output, state)
+        return render(output)
+
+
+def _normalize_spec(spec: Sequence[Any]) -> Tuple[Tuple[str, str], ...]:
+    """把转换链配置转为可哈希的形式：((转换名, 参数JSON), ...)"""
+    normalized = []
+    for item in spec:
+        if isinstance(item, str):
+            normalized.append((item, '{}'))
+        elif isinstance(item, dict) and len(item) == 1:
+            name, options = next(iter(item.items()))
+            normalized.append((name, json.dumps(options or {}, sort_keys=True, ensure_ascii=False)))
+        else:
+            raise ValueError(f"转换配置应为名称或 {{名称: 参数}}：{item!r}")
+    return tuple(normalized)
+
+
+@lru_cache(maxsize=64)
+def _compile(spec: Tuple[Tuple[str, str], ...]) -> Pipeline:
+    transforms = []
+    for name, options in spec:
+        cls = TRANSFORMS.get(name)
+        if cls is None:
+            raise ValueError(f"未知的转换：{name}，可用：{', '.join(TRANSFORMS)}")
+        transforms.append(cls(**json.loads(options)))
+    return Pipeline(transforms, key=json.dumps(spec, ensure_ascii=False))
+
+
+def compile_pipeline(spec: Sequence[Any]) -> Pipeline:
+    """
+    编译转换链（相同的配置只编译一次）
+
+    Args:
+        spec: 转换名或 {转换名: 参数} 的列表，如 ['strip_markers', {'headings': {'top': 2}}]
+
+    Raises:
+        ValueError: 转换名或参数无效
+    """
+    return _compile(_normalize_spec(spec))
+
+
+def platform_pipeline(platform: Optional[str]) -> Pipeline:
+    """
+    平台的转换链：通用配置 markdown_transforms 中的设置优先，其次为 PLATFORM_TRANSFORMS
+
+    配置无效时记录错误并使用默认转换链。
+    """
+    from src.core.config import ConfigError, get_config
+
+    try:
+        overrides = get_config().common().get('markdown_transforms') or {}
+    except ConfigError:
+        overrides = {}
+    default = PLATFORM_TRANSFORMS.get(platform, DEFAULT_TRANSFORMS)
+    spec = overrides.get(platform, default) if isinstance(overrides, dict) else default
+    try:
+        return compile_pipeline(spec)
+    except (ValueError, TypeError) as e:
+        logger.error(f"✗ {platform} 的 markdown_transforms 配置无效，使用默认转换：{e}")
+        return compile_pipeline(default)
+
+
+_lock = threading.Lock()
+# 正文哈希 -> 语法树；(转换链, 正文哈希) -> 结果
+_documents: 'OrderedDict[str, Document]' = OrderedDict()
+_outputs: 'OrderedDict[Tuple[str, str], str]' = OrderedDict()
+
+
+def _cache_get(cache: OrderedDict, key):
+    with _lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: OrderedDict, key, value):
+    with _lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def clear_cache():
+    """清空解析和转换结果的缓存"""
+    with _lock:
+        _documents.clear()
+        _outputs.clear()
+
+
+def transform_markdown(content: str, platform: Optional[str] = None,
+                       pipeline: Optional[Pipeline] = None) -> str:
+    """
+    按平台的转换链处理正文
+
+    Args:
+        content: Markdown 正文（不含 front matter）
+        platform: 平台名称，决定使用的转换链
+        pipeline: 直接指定转换链（优先于 platform）
+
+    Returns:
+        str: 转换后的正文
+    """
+    pipeline = pipeline or platform_pipeline(platform)
+    digest = hashlib.sha1(content.encode('utf-8')).hexdigest()
+    cached = _cache_get(_outputs, (pipeline.key, digest))
+    if cached is not None:
+        return cached
+
+    document = _cache_get(_documents, digest)
+    if document is None:
+        document = parse(content)
+        _cache_put(_documents, digest, document)
+    result = pipeline.run(document)
+    _cache_put(_outputs, (pipeline.key, digest), result)
+    return result
+
+
+def transform_for_platforms(content: str, platforms: Iterable[str]) -> Dict[str, str]:
+    """生成多个平台的版本（只解析一次）"""
+    return {platform: transform_markdown(content, platform) for platform in platforms}
@@ -1,7 +1,6 @@
-import shutil
-
 import yaml
-import os
+
+from src.core.config import get_config
 
 
 def read_yaml(file, encoding='UTF-8'):
@@ -29,42 +28,26 @@ def read_common():
     """
     读取通用配置文件。
 
-    该函数没有参数。
+    该函数没有参数。配置由 src.core.config 缓存，文件修改后自动重新加载，
+    config/common.yaml 不存在时从模板复制。
 
     返回:
-        返回从通用配置文件中读取的数据。
+        返回从通用配置文件中读取的数据（副本）。
     """
-    # 获取当前工作目录
-    current_dir = os.getcwd()
-
-    # 设置config目录和文件名
-    config_dir = 'config'
-    default_filename = 'common.default.yaml'
-    yaml_filename = 'common.yaml'
+    return get_config().common()
 
-    # 构建完整的文件路径
-    default_file_path = os.path.join(current_dir, config_dir, default_filename)
-    yaml_file_path = os.path.join(current_dir, config_dir, yaml_filename)
-
-    if not os.path.exists(yaml_file_path):
-        # 把config/common.default.yaml 拷贝为config/common.yaml
-        shutil.copy(default_file_path, yaml_file_path)
-        print(f"已复制 {default_file_path} 到 {yaml_file_path}")
-
-    return read_yaml(yaml_file_path)  # 读取并返回配置文件中的数据
 
 def read_common_video():
     """
-    读取通用配置文件。
+    读取视频通用配置文件。
 
     该函数没有参数。
 
     返回:
-        返回从通用配置文件中读取的数据。
+        返回从视频通用配置文件中读取的数据。
     """
-    # 获取当前工作目录
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/common_video.yaml'))  # 读取并返回配置文件中的数据
+    return get_config().load('common_video.yaml')
+
 
 def read_jianshu():
     """
@@ -75,25 +58,23 @@ def read_jianshu():
     返回:
         返回从简书配置文件中读取的数据。
     """
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/jianshu.yaml'))
+    return get_config().platform('jianshu')
+
 
 def read_xiaohongshu():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/xiaohongshu.yaml'))
+    return get_config().platform('xiaohongshu')
+
 
 def read_douyin():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/douyin.yaml'))
+    return get_config().platform('douyin')
 
 
 def read_kuaishou():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/kuaishou.yaml'))
+    return get_config().platform('kuaishou')
+
 
 def read_shipinhao():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/shipinhao.yaml'))
+    return get_config().platform('shipinhao')
 
 
 def read_zhihu():
@@ -105,8 +86,7 @@ def read_zhihu():
     返回:
         返回从知乎配置文件中读取的数据。
     """
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/zhihu.yaml'))
+    return get_config().platform('zhihu')
 
 
 def read_juejin():
@@ -118,18 +98,16 @@ def read_juejin():
     返回:
         返回从掘金配置文件中读取的数据。
     """
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/juejin.yaml'))
+    return get_config().platform('juejin')
 
 
 def read_segmentfault():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/segmentfault.yaml'))
+    return get_config().platform('segmentfault')
 
 
 def read_oschina():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/oschina.yaml'))
+    return get_config().platform('oschina')
+
 
 def read_mpweixin():
     """读取微信公众号配置文件（旧函数名，保持兼容性）"""
@@ -138,23 +116,15 @@ def read_mpweixin():
 
 def read_wechat():
     """读取微信公众号配置文件"""
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/wechat.yaml'))
+    return get_config().platform('wechat')
 
 
 def read_cnblogs():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/cnblogs.yaml'))
-
-
-def read_zhihu():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/zhihu.yaml'))
+    return get_config().platform('cnblogs')
 
 
 def read_51cto():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/51cto.yaml'))
+    return get_config().platform('cto51')
 
 
 def read_cto51():
@@ -168,23 +138,19 @@ def read_cto51():
 
 
 def read_infoq():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/infoq.yaml'))
+    return get_config().platform('infoq')
 
 
 def read_txcloud():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/txcloud.yaml'))
+    return get_config().platform('txcloud')
 
 
 def read_alcloud():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/alicloud.yaml'))
+    return get_config().platform('alicloud')
 
 
 def read_toutiao():
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/toutiao.yaml'))
+    return get_config().platform('toutiao')
 
 
 def read_csdn():
@@ -196,5 +162,4 @@ def read_csdn():
     返回:
         返回从 CSDN 配置文件中读取的数据。
     """
-    current_dir = os.getcwd()
-    return read_yaml(os.path.join(current_dir, 'config/csdn.yaml'))
+    return get_config().platform('csdn')
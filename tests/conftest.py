@@ -0,0 +1,24 @@
+"""
+测试的公共配置：日志写到临时目录，测试不在仓库的 data/logs 中留下日志文件
+"""
+
+import os
+import sys
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.logger import configure_logging, shutdown_logging
+
+_log_dir = tempfile.TemporaryDirectory(prefix='posts-copilot-logs-')
+
+
+def pytest_configure(config):
+    # 在收集测试模块之前配置，模块导入时的 get_logger 不会再按默认配置创建 data/logs
+    configure_logging({'file': os.path.join(_log_dir.name, 'publisher.log')})
+
+
+def pytest_unconfigure(config):
+    shutdown_logging()
+    _log_dir.cleanup()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+测试文章索引：增量更新和按标签、日期、发布状态筛选
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.publisher.article_index import ArticleIndex, parse_query
+from src.publisher.duplicates import PublishLedger, article_fingerprint
+
+
+def write(path, title, tags, day, body):
+    path.write_text(f"---\ntitle: {title}\ntags: [{', '.join(tags)}]\ndate: {day}\n---\n\n{body}\n",
+                    encoding='utf-8')
+    return str(path)
+
+
+def test_refresh_is_incremental(tmp_path):
+    """只重新读取修改过的文章；删除的文章从索引移除；重新加载后无需重新读取"""
+    posts = tmp_path / 'posts'
+    (posts / '2024').mkdir(parents=True)
+    a = write(posts / 'a.md', 'Python 入门', ['Python'], '2024-01-02', '正文 A')
+    b = write(posts / '2024' / 'b.md', 'Go 并发', ['Go'], '2024-03-04', '正文 B')
+    index_file = tmp_path / 'index.json'
+
+    index = ArticleIndex(str(posts), path=index_file)
+    assert index.refresh() == {'added': 2, 'updated': 0, 'removed': 0, 'unchanged': 0}
+
+    write(posts / 'a.md', 'Python 入门（修订）', ['Python'], '2024-01-02', '正文 A 修订')
+    os.remove(b)
+    reloaded = ArticleIndex(str(posts), path=index_file)
+    assert reloaded.refresh() == {'added': 0, 'updated': 1, 'removed': 1, 'unchanged': 0}
+    assert [entry['title'] for entry in reloaded.query()] == ['Python 入门（修订）']
+    assert reloaded.query()[0]['path'] == a
+
+
+def test_query_filters_by_tag_date_and_publish_state(tmp_path):
+    """按标签、日期和平台发布状态筛选，新的在前"""
+    posts = tmp_path / 'posts'
+    posts.mkdir()
+    a = write(posts / 'a.md', 'Python 入门', ['Python', '教程'], '2024-01-02', '正文 A')
+    write(posts / 'b.md', 'Python 进阶', ['python'], '2024-05-06', '正文 B')
+    write(posts / 'c.md', 'Go 并发', ['Go'], '2024-03-04', '正文 C')
+
+    ledger = PublishLedger(tmp_path / 'ledger.json')
+    ledger.record('csdn', a, article_fingerprint(a))
+    index = ArticleIndex(str(posts), path=tmp_path / 'index.json', ledger=ledger)
+    index.refresh()
+
+    assert [entry['name'] for entry in index.query(tags=['PYTHON'])] == ['b.md', 'a.md']
+    assert [entry['name'] for entry in index.query(**parse_query('tag:python unpublished platform:csdn'))] == ['b.md']
+    assert [entry['name'] for entry in index.query(**parse_query('since:2024-02-01 until:2024-04-01'))] == ['c.md']
+    assert [entry['published'] for entry in index.query(text='入门')] == [['csdn']]
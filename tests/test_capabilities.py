@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+测试发布前预检：按平台能力矩阵自动修正或拒绝任务
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.publisher.capabilities import check_article
+
+
+ARTICLE = """---
+title: 一篇标题足够长的测试文章
+tags: [Python, Selenium, 自动化, 一个超过二十个字的非常非常非常非常长的标签, 爬虫, 测试, 博客]
+description: 摘要
+image: https://example.com/cover.svg
+---
+
+# 第一节
+
+正文第一段，介绍这篇文章要解决的问题，以及为什么需要在打开浏览器之前先做一次预检，
+避免长标题、过多标签和缺少摘要的任务在发布流程进行到一半时失败。
+
+```mermaid
+graph TD; A-->B
+```
+"""
+
+
+def write_article(tmp_path, text=ARTICLE):
+    path = tmp_path / 'a.md'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_fixable_problems_are_fixed_per_platform(tmp_path):
+    """51CTO 截断标签；掘金从正文生成摘要；不支持的封面去掉；不支持的特性只提示"""
+    article = write_article(tmp_path)
+
+    cto51 = check_article('cto51', article)
+    assert cto51.ok
+    assert len(cto51.metadata['tags']) == 5 and all(len(tag) <= 20 for tag in cto51.metadata['tags'])
+    assert 'image' not in cto51.metadata
+    assert any('Mermaid' in warning for warning in cto51.warnings)
+
+    juejin = check_article('juejin', article)
+    assert juejin.ok and 50 <= len(juejin.metadata['description']) <= 100
+    assert juejin.metadata['image'].endswith('cover.svg')
+
+    assert not check_article('cto51', article, auto_fix=False).ok
+
+
+def test_doomed_jobs_are_rejected(tmp_path):
+    """标题过短、正文图片格式不受支持的任务拒绝；阿里云缺少摘要时从正文生成"""
+    article = write_article(tmp_path, "---\ntitle: 短\n---\n\n正文\n\n![图](https://example.com/a.heic)\n")
+
+    toutiao = check_article('toutiao', article)
+    assert not toutiao.ok and len(toutiao.errors) == 2
+
+    zhihu = check_article('zhihu', article, metadata={'title': '知乎文章'})
+    assert len(zhihu.errors) == 1
+
+    alicloud = check_article('alicloud', article, metadata={'title': '阿里云文章'})
+    assert alicloud.metadata['description'] == '正文'
+    assert any('heic' in error for error in alicloud.errors)
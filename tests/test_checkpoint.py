@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+测试发布步骤的检查点与从失败步骤继续
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.publisher.base_publisher import BasePublisher
+
+
+class FakeDriver:
+    """只实现检查点用到的标签页接口"""
+
+    def __init__(self):
+        self.window_handles = ['editor']
+        self.current_window_handle = 'editor'
+        self.switch_to = SimpleNamespace(window=lambda handle: None)
+
+
+class DemoPublisher(BasePublisher):
+    """标题有探针，打开设置弹窗没有探针，填写设置第一次失败"""
+
+    PLATFORM_NAME = 'demo'
+    STEP_PROBES = {'fill_title': '_probe_title_filled'}
+
+    def __init__(self):
+        super().__init__({'failure_artifacts': {'enabled': False}}, {})
+        self.driver = FakeDriver()
+        self.calls = []
+        self.opened = 0
+        self.title = ''
+        self.settings_failures = 1
+
+    def get_platform_name(self):
+        return 'demo'
+
+    def publish(self, article_path):
+        if not self.resume_editor(article_path):
+            self.opened += 1
+        return (self.run_step(self._fill_title, 'Hello')
+                and self.run_step(self._open_settings)
+                and self.run_step(self._fill_settings))
+
+    def _probe_title_filled(self, title):
+        return self.title == title
+
+    def _fill_title(self, title):
+        self.calls.append('fill_title')
+        self.title = title
+        return True
+
+    def _open_settings(self):
+        self.calls.append('open_settings')
+        return True
+
+    def _fill_settings(self):
+        self.calls.append('fill_settings')
+        if self.settings_failures:
+            self.settings_failures -= 1
+            return False
+        return True
+
+
+def test_retry_resumes_from_failed_step():
+    """重试时不重新打开页面，已完成的步骤被跳过，只重新执行失败的步骤"""
+    publisher = DemoPublisher()
+
+    assert publisher.publish_with_resume('post.md', attempts=2)
+
+    assert publisher.opened == 1
+    assert publisher.calls == ['fill_title', 'open_settings', 'fill_settings', 'fill_settings']
+    assert [t['step'] for t in publisher.step_timings if t.get('skipped')] == ['fill_title', 'open_settings']
+
+
+def test_probe_reruns_step_when_editor_lost_state():
+    """探针发现编辑器状态丢失时重新执行，之后没有探针的步骤也不再信任检查点"""
+    publisher = DemoPublisher()
+    publisher.publish('post.md')
+    publisher.title = ''
+
+    publisher._retry_pending = True
+    assert publisher.publish('post.md')
+
+    assert publisher.opened == 1
+    assert publisher.calls[3:] == ['fill_title', 'open_settings', 'fill_settings']
+
+
+def test_publish_without_retry_starts_fresh():
+    """不是重试发起的发布总是从头开始"""
+    publisher = DemoPublisher()
+    publisher.settings_failures = 0
+    assert publisher.publish('post.md')
+    assert publisher.publish('post.md')
+
+    assert publisher.opened == 2
+    assert publisher.calls.count('fill_title') == 2
+
+
+def test_platform_without_probes_retries_from_scratch():
+    """没有步骤探针的平台重试时重新打开编辑器，所有步骤重新执行"""
+    publisher = DemoPublisher()
+    publisher.STEP_PROBES = {}
+
+    assert publisher.publish_with_resume('post.md', attempts=2)
+
+    assert publisher.opened == 2
+    assert publisher.calls == ['fill_title', 'open_settings', 'fill_settings',
+                               'fill_title', 'open_settings', 'fill_settings']
+
+
+def test_each_publish_gets_its_own_run_id():
+    """每次发布生成新的运行ID，同一发布器的故障现场不会归到上一次发布下"""
+    publisher = DemoPublisher()
+    publisher.settings_failures = 0
+    run_ids = set()
+    for _ in range(3):
+        assert publisher.publish_with_resume('post.md')
+        run_ids.add(publisher.run_id)
+
+    assert len(run_ids) == 3 and all(run_id.endswith('-demo') for run_id in run_ids)
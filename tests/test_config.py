@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+测试配置缓存：结构校验、返回副本、按修改时间重新加载
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.core.config import ConfigError, ConfigStore
+
+
+def write(path, text, mtime):
+    path.write_text(text, encoding='utf-8')
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_common_config_is_copied_validated_and_cached(tmp_path):
+    """首次读取从模板复制；类型不符的键丢弃；返回副本，修改不影响缓存"""
+    (tmp_path / 'common.yaml.example').write_text(
+        "auto_publish: yes\npublish_attempts: true\nlogin_queue:\n  timeout: soon\n  poll: 10\n", encoding='utf-8')
+    store = ConfigStore(tmp_path)
+
+    config = store.common()
+    assert (tmp_path / 'common.yaml').exists()
+    assert config == {'auto_publish': True, 'login_queue': {'poll': 10}}
+
+    config['auto_publish'] = False
+    assert store.common()['auto_publish'] is True
+
+
+def test_reload_on_mtime_change_keeps_last_good_config(tmp_path):
+    """文件修改后重新加载；修改后的文件无法解析时继续使用上一次的配置"""
+    path = tmp_path / 'csdn.yaml'
+    write(path, "site: https://a.example/\n", 1_000_000_000)
+    store = ConfigStore(tmp_path)
+    assert store.platform('csdn')['site'] == 'https://a.example/'
+
+    write(path, "site: https://b.example/\n", 2_000_000_000)
+    assert store.platform('csdn')['site'] == 'https://b.example/'
+
+    write(path, "site: [unclosed\n", 3_000_000_000)
+    assert store.platform('csdn')['site'] == 'https://b.example/'
+
+    with pytest.raises(ConfigError):
+        store.platform('cto51')
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+测试长文分块注入：块边界切分和逐块校验
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.publisher.content_injector import inject_chunks, split_html, split_markdown
+
+
+def test_split_markdown_keeps_code_blocks():
+    """只在代码块之外的空行处切分，拼接后与原文相同"""
+    code = "```python\n" + "print('a')\n\n" * 3 + "```\n\n"
+    text = "# 标题\n\n" + "正文段落。\n\n" * 30 + code + "结尾\n"
+
+    chunks = split_markdown(text, max_chars=80)
+
+    assert ''.join(chunks) == text
+    assert len(chunks) > 1
+    assert any(chunk.count('```') == 2 for chunk in chunks)
+    assert all(chunk.count('```') in (0, 2) for chunk in chunks)
+
+
+def test_split_html_on_top_level_elements():
+    """HTML 只取 body，在顶层元素之间切分"""
+    html = ("<html><head><title>t</title></head><body>\n"
+            "<h1>标题</h1>\n<p>第一段<br>换行</p>\n<pre><code>a\n\nb</code></pre>\n<p>结尾</p>\n"
+            "</body></html>")
+
+    chunks = split_html(html, max_chars=20)
+
+    assert chunks[0].strip() == '<h1>标题</h1>'
+    assert '<pre><code>a\n\nb</code></pre>\n' in chunks
+    assert 'title' not in ''.join(chunks)
+
+
+class FakeEditor:
+    """追加脚本把分块写入编辑器；truncate_after 模拟编辑器在某一块后丢失内容"""
+
+    def __init__(self, truncate_after=None):
+        self.text = ''
+        self.appends = 0
+        self.truncate_after = truncate_after
+
+    def execute_async_script(self, script, selectors, chunk, mime):
+        self.appends += 1
+        self.text += chunk if self.appends != self.truncate_after else chunk[:len(chunk) // 3]
+        return 'codemirror'
+
+    def execute_script(self, script, selectors):
+        return self.text
+
+
+def test_inject_chunks_verifies_each_chunk():
+    """每块写入后校验，某一块被截断时立即停止"""
+    text = ''.join(f"第{i}段：分块写入的正文内容，编号{i}。\n\n" for i in range(60))
+
+    editor = FakeEditor()
+    assert inject_chunks(editor, ['.CodeMirror'], text, max_chars=300, chunk_timeout=5)
+    assert editor.text == text
+    assert editor.appends > 3
+
+    broken = FakeEditor(truncate_after=2)
+    assert not inject_chunks(broken, ['.CodeMirror'], text, max_chars=300, chunk_timeout=5)
+    assert broken.appends == 2
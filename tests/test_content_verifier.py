@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+测试粘贴后的正文校验：分片指纹比较和自适应等待
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.publisher.content_verifier import compare_text, html_to_text, normalize_text, wait_for_content
+
+ARTICLE = '\n\n'.join(
+    f"## 第{i}节\n\n这是第{i}段正文，介绍 **Python** 的用法。![图{i}](https://example.com/{i}.png)"
+    for i in range(40)
+)
+
+
+class FakeDriver:
+    """每次读取返回下一个编辑器快照，读完后保持最后一个"""
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+
+    def execute_script(self, script, selectors):
+        if len(self.snapshots) > 1:
+            return self.snapshots.pop(0)
+        return self.snapshots[0]
+
+
+def test_markdown_and_rendered_text_compare_equal():
+    """Markdown 源码与渲染后的文本、转存后的图片地址都视为一致"""
+    html = ''.join(
+        f"<h2>第{i}节</h2><p>这是第{i}段正文，介绍 <strong>Python</strong> 的用法。"
+        f"<img src=\"https://cdn.example.net/{i}.webp\" alt=\"图{i}\"></p>"
+        for i in range(40)
+    )
+    html = f"<html><head><style>p {{}}</style></head><body>{html}</body></html>"
+    rendered = html_to_text(html)
+
+    metrics = compare_text(normalize_text(ARTICLE), normalize_text(rendered))
+    assert metrics['similarity'] > 0.97
+
+    truncated = compare_text(normalize_text(ARTICLE), normalize_text(ARTICLE[:len(ARTICLE) // 2]))
+    assert truncated['similarity'] < 0.6 and truncated['length_ratio'] < 0.6
+
+
+def test_wait_for_content_waits_for_ingestion():
+    """编辑器还在接收内容时继续等待，内容完整且稳定后立即返回"""
+    driver = FakeDriver(['', ARTICLE[:300], ARTICLE[:2000], ARTICLE, ARTICLE])
+    result = wait_for_content(driver, ['.editor'], ARTICLE, interval=0.01, settle=0.5, timeout=5)
+    assert result['status'] == 'match'
+
+
+def test_wait_for_content_confirms_truncation():
+    """内容停止变化但仍不完整时判定为截断，不等到超时"""
+    driver = FakeDriver([ARTICLE[:500]])
+    result = wait_for_content(driver, ['.editor'], ARTICLE, interval=0.01, settle=0.1, timeout=5)
+    assert result['status'] == 'mismatch'
+    assert result['elapsed'] < 1
+
+    duplicated = FakeDriver([ARTICLE + ARTICLE])
+    assert wait_for_content(duplicated, ['.editor'], ARTICLE, interval=0.01, settle=0.1)['status'] == 'mismatch'
+
+    unreadable = FakeDriver([None])
+    assert wait_for_content(unreadable, ['.editor'], ARTICLE, interval=0.01, settle=0.1)['status'] == 'unreadable'
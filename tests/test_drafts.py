@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+测试两阶段发布的草稿记录和草稿ID读取
+"""
+
+import logging
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.publisher.drafts import DraftStore, STATUS_FAILED, STATUS_PUBLISHED
+from src.publisher.csdn_publisher import CSDNPublisher
+
+
+def test_draft_store_lifecycle(tmp_path):
+    """重新保存覆盖原记录；发布失败的草稿仍待发布，已发布的不再返回"""
+    store = DraftStore(tmp_path / 'drafts.json')
+    store.record('csdn', 'posts/a.md', '1', 'https://editor.csdn.net/md/?articleId=1', title='A')
+    store.record('juejin', 'posts/a.md', '2', 'https://juejin.cn/editor/drafts/2')
+    store.record('csdn', 'posts/a.md', '3', 'https://editor.csdn.net/md/?articleId=3', title='A')
+
+    reloaded = DraftStore(tmp_path / 'drafts.json')
+    assert [d['draft_id'] for d in reloaded.pending()] == ['3', '2']
+    assert [d['platform'] for d in reloaded.pending(platforms=['juejin'])] == ['juejin']
+
+    reloaded.mark('csdn', 'posts/a.md', STATUS_PUBLISHED, url='https://blog.csdn.net/u/article/details/3')
+    reloaded.mark('juejin', 'posts/a.md', STATUS_FAILED, error='编辑器没有打开')
+    assert [d['platform'] for d in reloaded.pending()] == ['juejin']
+
+
+class FakeDriver:
+    """保存草稿后地址才带上文章ID"""
+
+    def __init__(self, urls):
+        self.urls = list(urls)
+
+    @property
+    def current_url(self):
+        return self.urls.pop(0) if len(self.urls) > 1 else self.urls[0]
+
+
+def test_capture_draft_reads_id_from_url():
+    """地址中出现草稿ID后记录草稿ID和编辑地址"""
+    publisher = CSDNPublisher.__new__(CSDNPublisher)
+    publisher.logger = logging.getLogger('test')
+    publisher.driver = FakeDriver(['https://editor.csdn.net/md/', 'https://editor.csdn.net/md/?articleId=42'])
+
+    assert CSDNPublisher.supports_drafts()
+    assert publisher.capture_draft(timeout=5)
+    assert publisher.draft_result == {'id': '42', 'url': 'https://editor.csdn.net/md/?articleId=42'}
+
+
+def test_publish_drafts_without_article_filter(tmp_path, monkeypatch):
+    """不指定文章（--publish-drafts 不带 --article）时发布所有待发布的草稿"""
+    import publish
+    from src.core.scheduler import PublishScheduler, RateLimiter
+
+    store = DraftStore(tmp_path / 'drafts.json')
+    store.record('csdn', 'posts/a.md', '1', 'https://editor.csdn.net/md/?articleId=1')
+    store.record('juejin', 'posts/b.md', '2', 'https://juejin.cn/editor/drafts/2')
+    published = []
+
+    def publish_draft(draft, session_manager, job):
+        published.append((draft['platform'], draft['article']))
+        return draft['platform'] == 'csdn'
+
+    monkeypatch.setattr(publish, 'DraftStore', lambda: DraftStore(tmp_path / 'drafts.json'))
+    monkeypatch.setattr(publish, 'publish_draft_to_platform', publish_draft)
+    monkeypatch.setattr(publish, 'new_scheduler', lambda: PublishScheduler(
+        RateLimiter({'default': {'interval': 0}}, state_file=tmp_path / 'rate_limits.json')))
+
+    publish.publish_drafts(None)
+
+    assert sorted(published) == [('csdn', 'posts/a.md'), ('juejin', 'posts/b.md')]
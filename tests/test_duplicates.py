@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+测试重复发布检测：规范化标题、正文指纹和平台标题缓存
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.publisher.duplicates import DuplicateChecker, PublishLedger, normalize_title
+
+
+def write_article(path, title, body):
+    header = f"---\ntitle: {title}\n---\n" if title else ''
+    path.write_text(header + body, encoding='utf-8')
+    return str(path)
+
+
+def test_normalize_title():
+    """全角、大小写、空白和引号不影响比较"""
+    assert normalize_title('“Python 异步编程” 入门！') == normalize_title('python异步编程入门')
+    assert normalize_title('ＡＩ 技术') == normalize_title('ai技术')
+
+
+def test_ledger_matches_hash_and_title(tmp_path):
+    """发布后同一正文（即使改了标题）或同一标题都判定为重复，其他平台不受影响"""
+    checker = DuplicateChecker(PublishLedger(tmp_path / 'ledger.json'), cache_dir=tmp_path, fetchers={})
+    article = write_article(tmp_path / 'a.md', 'Python 异步编程', '正文内容\n\n第二段')
+    assert checker.check('csdn', article) is None
+
+    checker.record('csdn', article)
+
+    renamed = write_article(tmp_path / 'b.md', '另一个标题', '正文内容  \n\n第二段\n')
+    retitled = write_article(tmp_path / 'c.md', 'python 异步编程', '改写后的正文')
+    assert '正文' in checker.check('csdn', renamed)
+    assert '标题' in checker.check('csdn', retitled)
+    assert checker.check('juejin', article) is None
+
+    # 重新加载记录文件后仍然生效
+    reloaded = DuplicateChecker(PublishLedger(tmp_path / 'ledger.json'), cache_dir=tmp_path, fetchers={})
+    assert reloaded.check('csdn', article)
+
+
+def test_remote_titles_are_cached(tmp_path):
+    """平台标题在有效期内只获取一次；没有标题的文章只比较正文指纹"""
+    calls = []
+
+    def fetcher(session):
+        calls.append(session)
+        return ['Python 异步编程']
+
+    checker = DuplicateChecker(PublishLedger(tmp_path / 'ledger.json'), cache_dir=tmp_path,
+                               fetchers={'csdn': fetcher})
+    live = write_article(tmp_path / 'a.md', '“Python异步编程”', '正文')
+    fresh = write_article(tmp_path / 'b.md', '新文章', '正文2')
+    untitled = write_article(tmp_path / 'c.md', '', '正文3')
+
+    assert '同名' in checker.check('csdn', live)
+    assert checker.check('csdn', fresh) is None
+    assert checker.check('csdn', untitled) is None
+    assert len(calls) == 1
+
+
+def test_only_confirmed_publish_is_recorded(tmp_path, monkeypatch):
+    """停在编辑器等待人工发布时不写入发布记录，确认最终发布后才写入"""
+    import publish
+
+    checker = DuplicateChecker(PublishLedger(tmp_path / 'ledger.json'), cache_dir=tmp_path, fetchers={})
+    article = write_article(tmp_path / 'a.md', '人工审核的文章', '正文')
+
+    class Publisher:
+        common_config = {}
+        login_required = False
+
+        def __init__(self, result):
+            self.publish_result = result
+
+        def publish_with_resume(self, article_path, attempts=2):
+            return True
+
+    session = type('Session', (), {'driver': None})()
+    monkeypatch.setattr(publish, 'get_duplicate_checker', lambda: checker)
+    monkeypatch.setattr(publish, 'save_last_published_file', lambda name: None)
+
+    monkeypatch.setattr(publish, 'get_publisher', lambda platform: Publisher({}))
+    assert publish.publish_to_platform('csdn', article, session)
+    assert checker.check('csdn', article) is None
+
+    monkeypatch.setattr(publish, 'get_publisher', lambda platform: Publisher({'url': 'https://x/1', 'confirmed': True}))
+    assert publish.publish_to_platform('csdn', article, session)
+    assert checker.check('csdn', article)
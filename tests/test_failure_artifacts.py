@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+测试故障现场采集的环形缓冲区
+"""
+
+import json
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.artifacts import FailureArtifacts
+
+
+class FakeDriver:
+    """只实现采集用到的接口，截图失败模拟页面已崩溃"""
+
+    current_url = 'https://editor.example.com/md/'
+    title = '写文章'
+    page_source = '<html><body>' + 'x' * 2048 + '</body></html>'
+
+    def save_screenshot(self, path):
+        raise RuntimeError('tab crashed')
+
+    def get_log(self, log_type):
+        if log_type == 'browser':
+            return [{'level': 'SEVERE', 'message': 'Uncaught TypeError'}]
+        return []
+
+
+def test_capture_writes_artifacts(tmp_path):
+    """截图失败时其他现场仍然保存，并写入索引"""
+    store = FailureArtifacts(root=tmp_path)
+
+    target = store.capture(FakeDriver(), 'run-1', 'fill_title', error='TimeoutException: title')
+
+    assert (target / 'dom.html').exists()
+    assert not (target / 'screenshot.png').exists()
+    assert json.loads((target / 'console.json').read_text(encoding='utf-8'))[0]['level'] == 'SEVERE'
+    meta = json.loads((target / 'meta.json').read_text(encoding='utf-8'))
+    assert meta['step'] == 'fill_title' and meta['url'] == FakeDriver.current_url
+    assert [entry['step'] for entry in store.list('run-1')] == ['fill_title']
+
+
+def test_ring_buffer_evicts_oldest(tmp_path):
+    """超过条数上限时删除最旧的记录及其目录"""
+    store = FailureArtifacts(root=tmp_path, max_entries=2)
+    driver = FakeDriver()
+
+    first = store.capture(driver, 'run-1', 'fill_title')
+    store.capture(driver, 'run-1', 'fill_content')
+    store.capture(driver, 'run-2', 'final_publish')
+
+    assert [entry['step'] for entry in store.list()] == ['fill_content', 'final_publish']
+    assert not first.exists()
+
+
+def test_ring_buffer_size_cap(tmp_path):
+    """超过空间上限时同样淘汰，但至少保留最新一条"""
+    store = FailureArtifacts(root=tmp_path, max_mb=0.001)
+    driver = FakeDriver()
+
+    store.capture(driver, 'run-1', 'fill_title')
+    store.capture(driver, 'run-1', 'fill_content')
+
+    assert [entry['step'] for entry in store.list()] == ['fill_content']
+
+
+def test_sequence_not_reused_after_eviction(tmp_path):
+    """淘汰同一运行的旧记录后，新记录不会复用仍在保留的记录目录"""
+    store = FailureArtifacts(root=tmp_path, max_entries=2)
+    driver = FakeDriver()
+
+    store.capture(driver, 'run-1', 'fill_title')
+    second = store.capture(driver, 'run-1', 'fill_content')
+    third = store.capture(driver, 'run-1', 'fill_content')
+
+    assert second.exists() and third != second
+    assert [entry['path'] for entry in store.list()] == ['run-1/02_fill_content', 'run-1/03_fill_content']
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+测试流程引擎在页面内解析候选定位器：候选并行竞争、轮询等待、超时、元素条件与链接文字
+（页面脚本在 Node.js 中对模拟的 DOM 执行）
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.webdriver.common.by import By
+
+from src.publisher.flow_engine import FlowEngine
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='需要 Node.js 执行页面脚本')
+
+# 模拟的页面：元素在 after 毫秒后出现；返回命中的候选序号和元素 id
+_NODE_RUNNER = """
+const fs = require('fs');
+const page = JSON.parse(process.argv[1]);
+const args = JSON.parse(process.argv[2]);
+const start = Date.now();
+
+function present(e) { return Date.now() - start >= (e.after || 0); }
+function element(e) {
+    return {id: e.id, textContent: e.text || '', disabled: !!e.disabled, hidden: e.visible === false,
+            getClientRects() { return this.hidden ? [] : [{}]; }};
+}
+function find(by, value) {
+    const e = page.find(x => x.by === by && x.value === value && present(x));
+    return e ? element(e) : null;
+}
+global.document = {
+    getElementById: v => find('id', v),
+    querySelector: v => find('css selector', v),
+    evaluate: expr => ({singleNodeValue: find('xpath', expr)}),
+    getElementsByTagName: tag => page.filter(x => x.tag === tag && present(x)).map(element),
+};
+global.window = {getComputedStyle: el => ({visibility: el.hidden ? 'hidden' : 'visible', display: 'block'})};
+global.XPathResult = {FIRST_ORDERED_NODE_TYPE: 9};
+global.CSS = {escape: v => v.replace(/["\\\\]/g, '\\\\$&')};
+
+const script = fs.readFileSync(0, 'utf8');
+new Function(script).apply(null, args.concat([result => {
+    console.log(JSON.stringify(result === null ? null : [result[0], result[1].id]));
+}]));
+"""
+
+
+class FakeDriver:
+    """execute_async_script 在 Node.js 中执行页面脚本"""
+
+    def __init__(self, page):
+        self.page = page
+        self.timeouts = SimpleNamespace(script=30)
+        self.script_timeouts = []
+
+    def set_script_timeout(self, seconds):
+        self.script_timeouts.append(seconds)
+        self.timeouts.script = seconds
+
+    def execute_async_script(self, script, *args):
+        result = subprocess.run(['node', '-e', _NODE_RUNNER, json.dumps(self.page), json.dumps(args)],
+                                input=script, capture_output=True, text=True, timeout=30, check=True)
+        return json.loads(result.stdout)
+
+
+def resolve(page, candidates, timeout=1, condition='present'):
+    driver = FakeDriver(page)
+    start = time.perf_counter()
+    result = FlowEngine(driver).find_first(candidates, timeout=timeout, condition=condition)
+    return result, time.perf_counter() - start, driver
+
+
+def test_first_matching_candidate_wins_without_waiting_for_others():
+    """已出现的候选立即命中，不等待排在前面但尚未出现的候选；都出现时按优先级"""
+    candidates = [(By.ID, 'publish'), (By.CSS_SELECTOR, '.publish-btn')]
+
+    (index, element), elapsed, driver = resolve(
+        [{'by': 'id', 'value': 'publish', 'id': 'a', 'after': 5000},
+         {'by': 'css selector', 'value': '.publish-btn', 'id': 'b'}], candidates, timeout=10)
+    assert (index, element) == (1, 'b')
+    assert elapsed < 4
+    # 脚本超时临时放宽到等待时间之上，结束后恢复
+    assert driver.script_timeouts == [15, 30]
+
+    (index, element), _, _ = resolve(
+        [{'by': 'id', 'value': 'publish', 'id': 'a'},
+         {'by': 'css selector', 'value': '.publish-btn', 'id': 'b'}], candidates)
+    assert (index, element) == (0, 'a')
+
+
+def test_polls_until_element_appears_and_times_out():
+    """等待期间轮询到后出现的元素；超时后返回未命中，为 0 时只检查一次"""
+    candidates = [(By.XPATH, '//button[text()="发布"]')]
+    page = [{'by': 'xpath', 'value': '//button[text()="发布"]', 'id': 'late', 'after': 300}]
+
+    (index, element), _, _ = resolve(page, candidates, timeout=3)
+    assert (index, element) == (0, 'late')
+
+    (index, element), elapsed, _ = resolve(page, candidates, timeout=0)
+    assert (index, element) == (-1, None)
+
+    (index, element), elapsed, _ = resolve([], candidates, timeout=0.5)
+    assert (index, element) == (-1, None)
+    assert elapsed >= 0.5
+
+
+def test_condition_filters_hidden_and_disabled_elements():
+    """visible 跳过隐藏元素，clickable 还要求未禁用，present 只要存在"""
+    candidates = [(By.ID, 'hidden'), (By.ID, 'disabled'), (By.ID, 'ok')]
+    page = [{'by': 'id', 'value': 'hidden', 'id': 'hidden', 'visible': False},
+            {'by': 'id', 'value': 'disabled', 'id': 'disabled', 'disabled': True},
+            {'by': 'id', 'value': 'ok', 'id': 'ok'}]
+
+    assert resolve(page, candidates, condition='present')[0] == (0, 'hidden')
+    assert resolve(page, candidates, condition='visible')[0] == (1, 'disabled')
+    assert resolve(page, candidates, condition='clickable')[0] == (2, 'ok')
+
+
+def test_link_text_with_quotes():
+    """链接文字中的引号不会破坏定位"""
+    page = [{'tag': 'a', 'text': '  阅读 "原文"\n链接 ', 'id': 'link'}]
+
+    assert resolve(page, [(By.LINK_TEXT, '阅读 "原文" 链接')])[0] == (0, 'link')
+    assert resolve(page, [(By.PARTIAL_LINK_TEXT, '"原文"')])[0] == (0, 'link')
+    assert resolve(page, [(By.LINK_TEXT, '阅读')], timeout=0)[0] == (-1, None)
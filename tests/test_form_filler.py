@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+测试表单快速填写：一次脚本调用填写多个字段，只对回读不一致的字段退回键盘输入
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.publisher.form_filler import fill_elements
+
+
+class FakeElement:
+    """记录键盘输入的输入框；rejects_script 模拟不接受脚本赋值的框架组件"""
+
+    def __init__(self, rejects_script=False):
+        self.rejects_script = rejects_script
+        self.value = ''
+        self.typed = False
+
+    def get_attribute(self, name):
+        return None
+
+    def clear(self):
+        self.value = ''
+
+    def send_keys(self, *keys):
+        self.typed = True
+        self.value += ''.join(keys)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.async_calls = 0
+
+    def execute_async_script(self, script, items):
+        self.async_calls += 1
+        result = []
+        for element, value in items:
+            if not element.rejects_script:
+                element.value = value
+            result.append({'value': element.value, 'error': ''})
+        return result
+
+    def execute_script(self, script, element):
+        return element.value
+
+
+def test_fill_elements_batches_and_falls_back():
+    """所有字段在一次脚本调用中填写，只有不接受脚本赋值的字段改为键盘输入"""
+    driver = FakeDriver()
+    title, summary, tag = FakeElement(), FakeElement(), FakeElement(rejects_script=True)
+
+    results = fill_elements(driver, [(title, '标题'), (summary, '  摘要\n'), (tag, 'Python')])
+
+    assert results == [True, True, True]
+    assert driver.async_calls == 1
+    assert not title.typed and not summary.typed
+    assert tag.typed and tag.value == 'Python'
+
+
+def test_wechat_fills_title_and_author_in_one_call():
+    """公众号编辑页的标题和作者在一次脚本调用中填写"""
+    from src.publisher.wechat_publisher import WechatPublisher
+
+    class Page(FakeDriver):
+        def __init__(self):
+            super().__init__()
+            self.fields = {'title': FakeElement(), 'author': FakeElement()}
+
+        def find_element(self, by, locator):
+            return self.fields[locator]
+
+    publisher = WechatPublisher({'failure_artifacts': {'enabled': False}}, {'author': '默认作者'})
+    publisher.driver = Page()
+
+    assert publisher._fill_title_and_author({'title': '"示例" 标题'})
+    assert publisher.driver.async_calls == 1
+    assert publisher.driver.fields['title'].value == publisher.clean_title('"示例" 标题')
+    assert publisher.driver.fields['author'].value == '默认作者'
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+测试 front matter 解析的边界情况
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.utils.front_matter import read_article, split_front_matter
+
+
+@pytest.mark.parametrize('text, metadata, body', [
+    # 常规
+    ("---\ntitle: A\ntags: [x]\n---\n\n正文\n", {'title': 'A', 'tags': ['x']}, "\n正文\n"),
+    # 正文中的分隔线和第二对 --- 保留
+    ("---\ntitle: A\n---\n上\n\n---\n\n下\n---\n", {'title': 'A'}, "上\n\n---\n\n下\n---\n"),
+    # 没有 front matter 时正文中的 --- 不是 front matter
+    ("正文\n---\ntitle: A\n---\n", {}, "正文\n---\ntitle: A\n---\n"),
+    # BOM、CRLF、以 ... 结束
+    ("\ufeff---\r\ntitle: A\r\n...\r\n正文\r\n", {'title': 'A'}, "正文\n"),
+    # 没有结束行
+    ("---\ntitle: A\n正文\n", {}, "---\ntitle: A\n正文\n"),
+    # 空的 front matter
+    ("---\n---\n正文", {}, "正文"),
+    # 开头是分隔线而不是元数据
+    ("---\n一段文字\n---\n正文", {}, "---\n一段文字\n---\n正文"),
+    # 无效的 YAML：忽略元数据，仍去掉 front matter
+    ("---\ntitle: [A\n---\n正文", {}, "正文"),
+    ("", {}, ""),
+])
+def test_split_front_matter(text, metadata, body):
+    assert split_front_matter(text) == (metadata, body)
+
+
+def test_read_article_matches_split_and_returns_copies(tmp_path):
+    """读取文件与拆分文本结果一致；缓存的元数据不会被调用方修改"""
+    path = tmp_path / 'a.md'
+    path.write_bytes("\ufeff---\r\ntitle: A\r\ntags: [x]\r\n---\r\n正文\r\n---\r\n结尾\r\n".encode('utf-8'))
+
+    metadata, body = read_article(str(path))
+    assert (metadata, body) == ({'title': 'A', 'tags': ['x']}, "正文\n---\n结尾\n")
+
+    metadata['tags'].append('y')
+    assert read_article(str(path))[0]['tags'] == ['x']
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+测试各子命令的导入耗时：python -X importtime cli.py <子命令> 不导入重依赖，总耗时不超过上限
+
+除 --help 外，list 真正扫描一个临时文章目录，status 真正连接一个没有服务监听的端口。
+"""
+
+import os
+import re
+import socket
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 子命令 -> 导入耗时预算（毫秒，不含解释器启动时的导入）；list、status 应几乎立即返回
+BUDGETS_MS = {
+    'list': 200,
+    'status': 100,
+    'publish': 300,
+    'serve': 300,
+    'generate': 200,
+    'topics': 200,
+    'daily': 150,
+}
+
+# 断言的上限为预算的倍数：测试机繁忙时导入耗时波动很大，只拦截明显的退化（如重新在顶部导入重依赖）
+HEADROOM = 4
+
+# 只应在真正用到时导入的依赖
+HEAVY_MODULES = ('selenium', 'requests', 'openai', 'httpx', 'zhipuai', 'bs4', 'gradio', 'playwright')
+
+_LINE = re.compile(r'import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)')
+
+# 运行 list 子命令，文章索引写到临时目录（不写仓库中的 data/article_index.json）
+_LIST_RUNNER = (
+    "import runpy, sys\n"
+    "import src.publisher.article_index as article_index\n"
+    "article_index.INDEX_FILE = article_index.Path(sys.argv[1])\n"
+    "sys.argv = ['cli.py', 'list', '--dir', sys.argv[2]]\n"
+    "runpy.run_path('cli.py', run_name='__main__')\n"
+)
+
+
+def import_times(*args, returncode=0, env=None):
+    """运行 python -X importtime，返回 {模块: (累计微秒, 缩进)}"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, timeout=60, env=env)
+    assert result.returncode == returncode, result.stdout[-2000:] + result.stderr[-2000:]
+    times = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            times[match.group(3)] = (int(match.group(1)), len(match.group(2)))
+    return times
+
+
+def check(command, times, startup, over_budget):
+    """不导入重依赖；导入总耗时超过上限时记入 over_budget"""
+    heavy = sorted({name.split('.')[0] for name in times} & set(HEAVY_MODULES))
+    assert not heavy, f"{command} 导入了 {heavy}"
+    total_ms = sum(cumulative for name, (cumulative, indent) in times.items()
+                   if indent == 1 and name not in startup) / 1000
+    limit = BUDGETS_MS[command.split()[0]] * HEADROOM
+    if total_ms > limit:
+        over_budget[command] = f"{total_ms:.0f}ms > {limit}ms"
+
+
+def closed_port() -> int:
+    """一个当前没有服务监听的本机端口"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_subcommand_import_budget():
+    """每个子命令只导入自己的入口，不导入 Selenium、大模型 SDK 等，导入总耗时在上限内"""
+    startup = set(import_times('-c', 'pass'))
+    over_budget = {}
+    for command in BUDGETS_MS:
+        check(f"{command} --help", import_times('cli.py', command, '--help'), startup, over_budget)
+    assert not over_budget, over_budget
+
+
+def test_query_commands_stay_light(tmp_path):
+    """真正执行 list 和 status（服务未运行）时同样不导入重依赖"""
+    startup = set(import_times('-c', 'pass'))
+    over_budget = {}
+
+    content_dir = tmp_path / 'posts'
+    content_dir.mkdir()
+    (content_dir / 'a.md').write_text('---\ntitle: 示例\ntags: [python]\n---\n\n正文\n', encoding='utf-8')
+    times = import_times('-c', _LIST_RUNNER, str(tmp_path / 'article_index.json'), str(content_dir))
+    check('list --dir', times, startup, over_budget)
+
+    env = dict(os.environ, POSTS_COPILOT_SERVICE=f"http://127.0.0.1:{closed_port()}")
+    check('status', import_times('cli.py', 'status', returncode=1, env=env), startup, over_budget)
+
+    assert not over_budget, over_budget
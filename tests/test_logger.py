@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+测试日志系统：共用的队列处理器、JSON Lines 日志上下文和按大小轮转
+"""
+
+import io
+import json
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.logger import configure_logging, get_logger, log_context, logging_settings, shutdown_logging
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_loggers_share_one_queue_handler_and_write_context(tmp_path):
+    """所有 logger 共用一个处理器；文件为 JSON Lines，带日志上下文和异常堆栈"""
+    log_file = tmp_path / 'publisher.log'
+    previous = logging_settings()
+    try:
+        handler = configure_logging({'file': str(log_file), 'console': False, 'level': 'DEBUG'})
+        first, second = get_logger('test_logger.a'), get_logger('test_logger.b')
+        assert first.handlers == second.handlers == [handler]
+
+        with log_context(run_id='20251019-120000-csdn', platform='csdn'):
+            with log_context(job='csdn:a'):
+                first.info("步骤 %s 完成", 'title')
+            try:
+                raise ValueError('boom')
+            except ValueError:
+                second.error("✗ 发布失败", exc_info=True)
+        first.info("结束")
+        shutdown_logging()
+
+        lines = read_lines(log_file)
+        assert lines[0]['msg'] == '步骤 title 完成'
+        assert (lines[0]['run_id'], lines[0]['job'], lines[0]['platform']) == ('20251019-120000-csdn', 'csdn:a', 'csdn')
+        assert 'job' not in lines[1] and lines[1]['platform'] == 'csdn' and 'ValueError: boom' in lines[1]['exc']
+        assert 'run_id' not in lines[2]
+    finally:
+        configure_logging(previous)
+
+
+def test_size_rotation_from_config(tmp_path):
+    """超过 max_size 时轮转，最多保留 backup_count 个旧文件"""
+    log_file = tmp_path / 'publisher.log'
+    previous = logging_settings()
+    try:
+        configure_logging({'file': str(log_file), 'console': False, 'max_size': 0.001, 'backup_count': 2})
+        logger = get_logger('test_logger.rotation')
+        for i in range(100):
+            logger.info(f"第 {i} 条日志")
+        shutdown_logging()
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ['publisher.log', 'publisher.log.1', 'publisher.log.2']
+        assert read_lines(log_file)[-1]['msg'] == '第 99 条日志'
+    finally:
+        configure_logging(previous)
+
+
+def test_shutdown_stops_queueing(tmp_path, capsys):
+    """关闭后日志不再堆积在无人读取的队列中，警告直接写到标准错误；重新配置后恢复写文件"""
+    log_file = tmp_path / 'publisher.log'
+    previous = logging_settings()
+    try:
+        handler = configure_logging({'file': str(log_file), 'console': False})
+        logger = get_logger('test_logger.shutdown')
+        shutdown_logging()
+        assert handler.queue is None
+        logger.info("关闭后的普通日志")
+        logger.warning("关闭后的警告")
+        assert '关闭后的警告' in capsys.readouterr().err
+
+        configure_logging({'file': str(log_file), 'console': False})
+        logger.info("重新配置后")
+        shutdown_logging()
+        assert [line['msg'] for line in read_lines(log_file)] == ['重新配置后']
+    finally:
+        configure_logging(previous)
+
+
+def test_console_follows_current_stderr(tmp_path, monkeypatch):
+    """控制台日志写到输出时的 sys.stderr，而不是配置日志时的那一个（可能已被关闭）"""
+    previous = logging_settings()
+    try:
+        configure_logging({'file': str(tmp_path / 'publisher.log'), 'console': True})
+        stderr = io.StringIO()
+        monkeypatch.setattr(sys, 'stderr', stderr)
+        get_logger('test_logger.console').warning("写到新的标准错误")
+        shutdown_logging()
+        assert '写到新的标准错误' in stderr.getvalue()
+    finally:
+        monkeypatch.undo()
+        configure_logging(previous)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+测试按平台规范化 Markdown：语法树原样输出、各转换的效果和结果缓存
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import markdown_pipeline
+from src.utils.markdown_pipeline import compile_pipeline, parse, render, transform_markdown
+
+ARTICLE = """# 标题
+
+<!-- truncate -->
+正文 [链接](https://a.com) 和 `[代码](https://b.com)` ![图](https://c.com/a.png)
+
+~~~ {.python .numberLines}
+print('<!-- truncate -->')
+~~~
+
+  ```py title="a.py"
+  x = 1
+  ```
+
+$$
+E = mc^2
+$$
+
+## 小节 [再次](https://a.com)
+
+```
+未闭合的代码块"""
+
+
+def test_parse_round_trip():
+    """不做任何转换时输出与输入完全一致"""
+    for text in (ARTICLE, '', '\n\n', 'a\r\nb', '$$ 没有结束', '```js\n```\n# h #\n'):
+        assert render(parse(text).blocks) == text
+    kinds = [block.kind for block in parse(ARTICLE).blocks]
+    assert kinds == ['heading', 'text', 'code', 'text', 'code', 'text', 'math', 'text', 'heading', 'text', 'code']
+
+
+def test_platform_transforms():
+    """代码块统一写法，公众号的公式改为代码块、标题从二级开始、链接改为文末引用"""
+    pipeline = compile_pipeline(['strip_markers', {'code_fences': {'strip_attributes': True}}])
+    zhihu = transform_markdown(ARTICLE, pipeline=pipeline)
+    assert '<!-- truncate -->\n正文' not in zhihu
+    assert "```python\nprint('<!-- truncate -->')\n```" in zhihu
+    assert '```python\nx = 1\n```' in zhihu
+    assert zhihu.endswith('```\n未闭合的代码块\n```')
+
+    wechat = transform_markdown(ARTICLE, pipeline=compile_pipeline([
+        'code_fences', {'math': {'style': 'code'}}, {'headings': {'top': 2}}, {'links': {'style': 'footnote'}}]))
+    assert wechat.startswith('## 标题\n')
+    assert '### 小节 再次[1]' in wechat
+    assert '正文 链接[1] 和 `[代码](https://b.com)` ![图](https://c.com/a.png)' in wechat
+    assert '```latex\nE = mc^2\n```' in wechat
+    assert '```python title="a.py"\nx = 1\n```' in wechat
+    assert wechat.endswith('**参考链接**\n\n[1] https://a.com  ')
+
+    unwrapped = transform_markdown('```markdown\n# 标题\n\n正文\n```\n', pipeline=compile_pipeline(['unwrap_markdown_fence']))
+    assert unwrapped == '# 标题\n\n正文'
+
+
+def test_pipelines_compile_once_and_results_are_cached(monkeypatch):
+    """相同配置返回同一个转换链；同一正文只解析一次，重复转换直接返回缓存"""
+    spec = ['strip_markers', {'headings': {'top': 2}}]
+    assert compile_pipeline(spec) is compile_pipeline(list(spec))
+
+    markdown_pipeline.clear_cache()
+    parsed = []
+    original_parse = markdown_pipeline.parse
+    monkeypatch.setattr(markdown_pipeline, 'parse', lambda text: parsed.append(text) or original_parse(text))
+
+    first = transform_markdown(ARTICLE, pipeline=compile_pipeline(spec))
+    other = transform_markdown(ARTICLE, pipeline=compile_pipeline(['code_fences']))
+    assert transform_markdown(ARTICLE, pipeline=compile_pipeline(spec)) == first
+    assert first != other
+    assert len(parsed) == 1
+
+    try:
+        compile_pipeline(['no_such_transform'])
+    except ValueError as e:
+        assert 'no_such_transform' in str(e)
+    else:
+        raise AssertionError('未知的转换应抛出 ValueError')
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+测试运行指标：Prometheus 文本格式、多次运行之间的累计和大模型调用记录
+"""
+
+import os
+import sys
+import urllib.request
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.metrics import MetricsRegistry, export_metrics, instrument_llm_client, start_http_server
+
+
+def test_render_and_accumulate_across_runs(tmp_path):
+    """文本格式包含分桶、总和和次数；两次运行的计数器和直方图累加到状态文件"""
+    config = {'state': str(tmp_path / 'state.json'), 'textfile': str(tmp_path / 'metrics.prom')}
+
+    for _ in range(2):
+        registry = MetricsRegistry()
+        jobs = registry.counter('publish_jobs_total', '发布任务数', ('platform', 'result'))
+        latency = registry.histogram('publish_step_seconds', '发布步骤耗时', ('platform', 'step'), buckets=(1, 5))
+        jobs.inc(platform='csdn', result='succeeded')
+        latency.observe(0.5, platform='csdn', step='fill_title')
+        latency.observe(3, platform='csdn', step='fill_title')
+        total = export_metrics(registry, config)
+
+    text = (tmp_path / 'metrics.prom').read_text(encoding='utf-8')
+    assert '# TYPE posts_copilot_publish_jobs_total counter' in text
+    assert 'posts_copilot_publish_jobs_total{platform="csdn",result="succeeded"} 2' in text
+    assert 'posts_copilot_publish_step_seconds_bucket{platform="csdn",step="fill_title",le="1"} 2' in text
+    assert 'posts_copilot_publish_step_seconds_bucket{platform="csdn",step="fill_title",le="5"} 4' in text
+    assert 'posts_copilot_publish_step_seconds_bucket{platform="csdn",step="fill_title",le="+Inf"} 4' in text
+    assert 'posts_copilot_publish_step_seconds_sum{platform="csdn",step="fill_title"} 7' in text
+    assert 'posts_copilot_last_run_timestamp_seconds' in text
+    assert '4 次，平均 1.75，最大 3.00' in total.summary()
+
+    # 接口返回相同的文本格式
+    server = start_http_server(0, registry=total)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as response:
+            assert response.read().decode('utf-8') == total.render_prometheus()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_llm_client_records_latency_and_tokens(monkeypatch):
+    """包装后的客户端记录请求数和 token 用量，失败的请求计为 error 并继续抛出"""
+    import src.core.metrics as metrics
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, '_registry', registry)
+
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        if kwargs['messages'] == 'fail':
+            raise RuntimeError('rate limited')
+        return SimpleNamespace(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    instrument_llm_client(client, 'generator')
+
+    client.chat.completions.create(model='glm-4-flash', messages=[])
+    client.chat.completions.create(model='glm-4-flash', messages=[])
+    try:
+        client.chat.completions.create(model='glm-4-flash', messages='fail')
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError('异常应继续抛出')
+
+    assert len(calls) == 3
+    requests_total = registry.counter('llm_requests_total', '', ('caller', 'model', 'result'))
+    tokens = registry.counter('llm_tokens_total', '', ('caller', 'model', 'kind'))
+    assert requests_total.value(caller='generator', model='glm-4-flash', result='ok') == 2
+    assert requests_total.value(caller='generator', model='glm-4-flash', result='error') == 1
+    assert tokens.value(caller='generator', model='glm-4-flash', kind='prompt') == 240
+    assert tokens.value(caller='generator', model='glm-4-flash', kind='completion') == 60
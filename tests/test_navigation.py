@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+测试页面导航：按平台屏蔽资源和就绪探针
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.navigation import NavigationProfile, wait_for_page
+
+
+class FakeDriver:
+    """记录CDP命令；页面在第 ready_after 次检查时就绪"""
+
+    def __init__(self, ready_after=1):
+        self.current_window_handle = 'tab-1'
+        self.commands = []
+        self.checks = 0
+        self.ready_after = ready_after
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+        return {}
+
+    def execute_script(self, script, selectors):
+        self.checks += 1
+        return self.checks >= self.ready_after
+
+
+def test_profile_switches_blocked_urls_per_platform():
+    """共用浏览器时切换平台才重新下发屏蔽列表，配置中的模式追加在内置列表之后"""
+    driver = FakeDriver()
+    csdn = NavigationProfile('csdn', {'platforms': {'csdn': ['*recommend*']}})
+    zhihu = NavigationProfile('zhihu', {'block_resources': False})
+
+    csdn.apply(driver)
+    csdn.apply(driver)
+    blocked = [params for cmd, params in driver.commands if cmd == 'Network.setBlockedURLs']
+    assert len(blocked) == 1
+    assert '*event.csdn.net*' in blocked[0]['urls'] and blocked[0]['urls'][-1] == '*recommend*'
+
+    zhihu.apply(driver)
+    assert driver.commands[-1] == ('Network.setBlockedURLs', {'urls': []})
+
+
+def test_profile_is_applied_to_each_tab():
+    """屏蔽设置只对当前标签页生效：切换到新标签页时重新下发，回到已设置的标签页不重复下发"""
+    driver = FakeDriver()
+    csdn = NavigationProfile('csdn')
+
+    csdn.apply(driver)
+    driver.current_window_handle = 'tab-2'
+    csdn.apply(driver)
+    driver.current_window_handle = 'tab-1'
+    csdn.apply(driver)
+
+    blocked = [params for cmd, params in driver.commands if cmd == 'Network.setBlockedURLs']
+    assert len(blocked) == 2 and blocked[0] == blocked[1]
+
+
+def test_wait_for_page_polls_until_ready():
+    """探针出现即返回，超时返回 False"""
+    driver = FakeDriver(ready_after=3)
+    assert wait_for_page(driver, ['.editor'], timeout=5, interval=0.01)
+    assert driver.checks == 3
+
+    assert not wait_for_page(FakeDriver(ready_after=1000), ['.editor'], timeout=0.05, interval=0.01)
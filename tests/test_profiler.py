@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+测试性能剖析：采样墙钟时间，按类别汇总，写出折叠调用栈和耗时报告
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yaml
+
+from src.core.profiler import OTHER, WAITING, profiling
+
+
+def _parse_yaml(deadline):
+    while time.perf_counter() < deadline:
+        yaml.safe_load('a: [1, 2, 3]\nb: {c: d}\n' * 20)
+
+
+def _wait_for_child():
+    subprocess.run([sys.executable, '-c', 'import time; time.sleep(0.3)'], check=True)
+
+
+def _idle():
+    time.sleep(0.3)
+
+
+def test_profiling_writes_flame_graph_and_breakdown(tmp_path, monkeypatch):
+    """YAML 解析、等待子进程、sleep 分别计入对应类别；未开启时不采样"""
+    monkeypatch.delenv('POSTS_COPILOT_PROFILE', raising=False)
+    with profiling('off', directory=tmp_path) as profiler:
+        assert profiler is None
+    assert not list(tmp_path.iterdir())
+
+    with profiling('run', enabled=True, interval=0.002, directory=tmp_path) as profiler:
+        _parse_yaml(time.perf_counter() + 0.3)
+        _wait_for_child()
+        _idle()
+
+    breakdown = profiler.breakdown()['MainThread']
+    assert profiler.duration >= 0.9
+    assert 0.8 <= sum(breakdown.values()) <= profiler.duration + 0.05
+    for category in ('YAML 解析', '子进程（pandoc 等）', WAITING):
+        assert breakdown.get(category, 0) >= 0.15, breakdown
+    assert breakdown.get(OTHER, 0) < 0.2, breakdown
+
+    folded = next(tmp_path.glob('run-*.folded')).read_text(encoding='utf-8').splitlines()
+    assert folded and all(line.startswith('MainThread;') and line.rsplit(' ', 1)[1].isdigit() for line in folded)
+    assert any('_wait_for_child (tests/test_profiler.py:' in line for line in folded)
+    report = next(tmp_path.glob('run-*.txt')).read_text(encoding='utf-8')
+    assert 'YAML 解析' in report and '_parse_yaml' in report
+
+    # 环境变量也可开启
+    monkeypatch.setenv('POSTS_COPILOT_PROFILE', '1')
+    with profiling('env', directory=tmp_path) as profiler:
+        assert profiler is not None
+    assert list(tmp_path.glob('env-*.folded'))
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+测试发布结果确认：从网络日志中等待发布接口的响应并解析文章ID和链接
+"""
+
+import json
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.publisher.publish_response import PublishEndpoint, PublishResponseWatcher, parse_publish_response
+
+ENDPOINT = PublishEndpoint(r'mp\.toutiao\.com/mp/agw/article/publish', ok_key='code', ok_values=(0,),
+                           id_keys=('pgc_id',), url_template='https://www.toutiao.com/item/{id}/')
+
+
+def _event(method, request_id, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': dict(params, requestId=request_id)}})}
+
+
+def _request(request_id, url, method='POST', status=200):
+    return [
+        _event('Network.requestWillBeSent', request_id, request={'url': url, 'method': method}),
+        _event('Network.responseReceived', request_id, response={'url': url, 'status': status,
+                                                                 'mimeType': 'application/json'}),
+        _event('Network.loadingFinished', request_id),
+    ]
+
+
+class FakeDriver:
+    """每次读取性能日志返回下一批事件"""
+
+    def __init__(self, batches, bodies):
+        self.batches = list(batches)
+        self.bodies = bodies
+
+    def get_log(self, kind):
+        return self.batches.pop(0) if self.batches else []
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {'body': self.bodies[params['requestId']], 'base64Encoded': False}
+
+
+def test_parse_publish_response():
+    """按平台的成功字段判断结果，ID 从嵌套字段中查找，没有链接时用模板拼出"""
+    ok = parse_publish_response(ENDPOINT, '{"code": 0, "message": "success", "data": {"pgc_id": 7123}}')
+    assert ok == {'ok': True, 'id': '7123', 'url': 'https://www.toutiao.com/item/7123/', 'message': 'success'}
+
+    failed = parse_publish_response(ENDPOINT, '{"code": 7050, "message": "标题重复"}')
+    assert not failed['ok'] and failed['message'] == '标题重复'
+
+    assert not parse_publish_response(ENDPOINT, '<html>502</html>')['ok']
+
+
+def test_watcher_ignores_requests_before_click():
+    """只看点击之后的发布接口请求，忽略预检请求和其他接口"""
+    publish_url = 'https://mp.toutiao.com/mp/agw/article/publish?source=mp'
+    driver = FakeDriver(
+        batches=[
+            _request('old', publish_url),
+            _request('preflight', publish_url, method='OPTIONS') + _request('other', 'https://mp.toutiao.com/x'),
+            _request('new', publish_url),
+        ],
+        bodies={'old': '{"code": 1}', 'new': '{"code": 0, "data": {"pgc_id": "42"}}'},
+    )
+
+    watcher = PublishResponseWatcher(driver, ENDPOINT).start()
+    result = watcher.wait(timeout=5, interval=0.01)
+
+    assert result['status'] == 'ok'
+    assert result['url'] == 'https://www.toutiao.com/item/42/'
+
+
+def test_watcher_reports_failure_and_missing_log():
+    """接口返回HTTP错误时失败；点击后没有任何网络事件时返回 unavailable"""
+    url = 'https://mp.toutiao.com/mp/agw/article/publish'
+    driver = FakeDriver([[], _request('r1', url, status=500)], bodies={'r1': '{"code": 0}'})
+    watcher = PublishResponseWatcher(driver, ENDPOINT).start()
+    assert watcher.wait(timeout=5, interval=0.01)['status'] == 'error'
+
+    silent = PublishResponseWatcher(FakeDriver([], {}), ENDPOINT).start()
+    assert silent.wait(timeout=5, interval=0.01, idle=0.05)['status'] == 'unavailable'
+
+
+def test_body_pattern_skips_drafts_and_fetches_large_bodies():
+    """同一接口的保存草稿请求不算发布；日志中没带请求体时通过 CDP 获取"""
+    url = 'https://bizapi.csdn.net/blog-console-api/v3/mdeditor/saveArticle'
+    endpoint = PublishEndpoint(r'saveArticle', ok_key='code', ok_values=(200,), body_pattern=r'"status"\s*:\s*0\b')
+    draft = _request('draft', url)
+    draft[0] = _event('Network.requestWillBeSent', 'draft',
+                      request={'url': url, 'method': 'POST', 'postData': '{"title": "t", "status": 2}'})
+    publish = _request('pub', url)
+    publish[0] = _event('Network.requestWillBeSent', 'pub',
+                        request={'url': url, 'method': 'POST', 'hasPostData': True})
+
+    class Driver(FakeDriver):
+        def execute_cdp_cmd(self, cmd, params):
+            if cmd == 'Network.getRequestPostData':
+                return {'postData': '{"title": "t", "status": 0}'}
+            return super().execute_cdp_cmd(cmd, params)
+
+    driver = Driver([[], draft, publish], bodies={'draft': '{"code": 200, "data": {"id": 1}}',
+                                                  'pub': '{"code": 200, "data": {"id": 2}}'})
+    result = PublishResponseWatcher(driver, endpoint).start().wait(timeout=5, interval=0.01)
+    assert result['status'] == 'ok' and result['id'] == '2'
+
+    # 只有草稿请求时超时
+    driver = FakeDriver([[], draft], bodies={})
+    assert PublishResponseWatcher(driver, endpoint).start().wait(timeout=0.2, interval=0.01)['status'] == 'timeout'
+
+
+def test_confirm_publish_checks_success_page_on_timeout():
+    """等待接口超时时检查发布成功页，没有成功标志则失败"""
+    from src.publisher.base_publisher import BasePublisher
+
+    class Watcher:
+        def __init__(self, status):
+            self.status = status
+
+        def wait(self, timeout):
+            return {'status': self.status, 'id': '', 'url': '', 'message': '', 'elapsed': timeout}
+
+    class Page:
+        def __init__(self, url, text=''):
+            self.current_url = url
+            self.text = text
+
+        def execute_script(self, script):
+            return self.text
+
+    class Publisher(BasePublisher):
+        PLATFORM_NAME = 'demo'
+        PUBLISH_SUCCESS_URL = r'/creation/success/(?P<id>\d+)'
+
+        def get_platform_name(self):
+            return 'demo'
+
+        def publish(self, article_path):
+            return True
+
+        def check_publish_page(self, timeout=5):
+            return super().check_publish_page(timeout=0)
+
+    publisher = Publisher({'failure_artifacts': {'enabled': False}, 'publish_confirm': {'timeout': 0.1}}, {})
+
+    publisher.driver = Page('https://mp.csdn.net/mp_blog/creation/success/77')
+    assert publisher.confirm_publish(Watcher('timeout'))
+    assert publisher.publish_result['id'] == '77'
+
+    publisher.driver = Page('https://mp.csdn.net/mp_blog/creation/editor', text='文章已发布成功')
+    assert publisher.confirm_publish(Watcher('timeout'))
+
+    publisher.driver = Page('https://mp.csdn.net/mp_blog/creation/editor', text='编辑中')
+    assert not publisher.confirm_publish(Watcher('timeout'))
+
+
+def test_no_network_log_is_not_confirmed_without_success_page():
+    """点击后没有网络日志（或浏览器未开启性能日志）时不自动确认，只有发布成功页能确认"""
+    from src.publisher.base_publisher import BasePublisher
+
+    class Page:
+        current_url = 'https://mp.csdn.net/mp_blog/creation/editor'
+        text = '编辑中'
+
+        def execute_script(self, script):
+            return self.text
+
+    class Publisher(BasePublisher):
+        PLATFORM_NAME = 'demo'
+        PUBLISH_ENDPOINT = ENDPOINT
+
+        def get_platform_name(self):
+            return 'demo'
+
+        def publish(self, article_path):
+            return True
+
+        def check_publish_page(self, timeout=5):
+            return super().check_publish_page(timeout=0)
+
+    class NoTraffic(PublishResponseWatcher):
+        def wait(self, timeout=20, interval=0.3, idle=5):
+            self.result = super().wait(timeout, interval=0.01, idle=0.05)
+            return self.result
+
+    publisher = Publisher({'failure_artifacts': {'enabled': False}}, {})
+    publisher.driver = Page()
+    assert publisher.session_manager.performance_log_enabled()
+
+    no_traffic = NoTraffic(FakeDriver([], bodies={}), ENDPOINT).start()
+    assert not publisher.confirm_publish(no_traffic, fallback_wait=0)
+    assert no_traffic.result['status'] == 'unavailable'
+    assert 'confirmed' not in publisher.publish_result
+
+    # 浏览器没有开启性能日志：不创建监听，发布后同样只看发布成功页
+    publisher.session_manager.config = {'publish_confirm': {'enabled': False}}
+    assert publisher.watch_publish() is None
+    assert not publisher.confirm_publish(None, fallback_wait=0)
+
+    publisher.driver.text = '发布成功'
+    assert publisher.confirm_publish(None, fallback_wait=0)
+    assert publisher.publish_result['confirmed']
+
+
+def test_replayed_requests_match_by_original_url():
+    """回放时请求被改写到回放服务器，网络日志记录原始地址，发布接口照常匹配"""
+    from urllib.parse import quote
+
+    proxied = 'http://127.0.0.1:8000/__replay__/proxy?url=' + quote(
+        'https://mp.toutiao.com/mp/agw/article/publish?source=mp', safe='')
+    driver = FakeDriver([[], _request('r1', proxied)], bodies={'r1': '{"code": 0, "data": {"pgc_id": "7"}}'})
+    result = PublishResponseWatcher(driver, ENDPOINT).start().wait(timeout=5, interval=0.01)
+    assert result['status'] == 'ok' and result['id'] == '7'
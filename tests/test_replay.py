@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+测试离线回放：回放服务器和耗时基线比较
+"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from urllib.parse import quote
+from urllib.request import urlopen
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.replay import ReplayServer, compare_timings, load_baseline, run_replay
+
+# 提交在仓库中的录制数据
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'replay'
+
+# 离线回放需要本机的 Chrome 和 chromedriver（回放时不访问任何外部站点）
+HAS_CHROME = bool(shutil.which('chromedriver')) and any(
+    shutil.which(name) for name in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser'))
+
+
+def make_fixture(fixture_dir):
+    """创建一个最小的录制数据"""
+    bodies = fixture_dir / 'bodies'
+    bodies.mkdir(parents=True)
+    (bodies / '00000').write_text(
+        '<html><head><script src="/static/app.js"></script></head><body><input id="title"></body></html>',
+        encoding='utf-8'
+    )
+    (bodies / '00001').write_text('{"code": 0, "data": ["Python"]}', encoding='utf-8')
+
+    manifest = {
+        'platform': 'demo',
+        'site_url': 'https://editor.example.com/md/',
+        'steps': [{'name': 'fill_title'}],
+        'responses': [
+            {'method': 'GET', 'url': 'https://editor.example.com/md/', 'type': 'Document',
+             'status': 200, 'mime_type': 'text/html', 'body': 'bodies/00000'},
+            {'method': 'GET', 'url': 'https://api.example.com/tags?t=1', 'type': 'XHR',
+             'status': 200, 'mime_type': 'application/json', 'body': 'bodies/00001'},
+        ],
+    }
+    (fixture_dir / 'manifest.json').write_text(json.dumps(manifest), encoding='utf-8')
+
+
+def test_replay_server_serves_recorded_responses(tmp_path):
+    """回放服务器按原始路径提供页面，并通过 proxy 回放接口响应"""
+    make_fixture(tmp_path)
+
+    with ReplayServer(tmp_path) as server:
+        page = urlopen(server.local_url('https://editor.example.com/md/')).read().decode('utf-8')
+        assert 'id="title"' in page
+        # 静态资源被改写到回放服务器，并注入了请求改写脚本
+        assert '/__replay__/proxy?url=' + quote('https://editor.example.com/static/app.js', safe='') in page
+        assert 'XMLHttpRequest.prototype.open' in page
+
+        # 查询参数不同时仍能匹配录制的响应
+        api = urlopen(server.base_url + '/__replay__/proxy?url=' + quote('https://api.example.com/tags?t=2', safe=''))
+        assert json.loads(api.read()) == {'code': 0, 'data': ['Python']}
+
+        try:
+            urlopen(server.base_url + '/__replay__/proxy?url=' + quote('https://api.example.com/missing', safe=''))
+            assert False, '未录制的请求应返回 404'
+        except Exception as e:
+            assert getattr(e, 'code', None) == 404
+        assert server.misses
+
+
+def test_compare_timings():
+    """超过容差、失败和缺失的步骤都应报告"""
+    baseline = {'fill_title': 1.0, 'fill_content': 4.0, 'publish_article': 2.0}
+    timings = [
+        {'step': 'fill_title', 'seconds': 1.8, 'ok': True},
+        {'step': 'fill_content', 'seconds': 9.0, 'ok': True},
+        {'step': 'set_tags', 'seconds': 0.5, 'ok': False},
+    ]
+
+    problems = compare_timings(timings, baseline, tolerance=0.5, min_slack=1.0)
+
+    assert len(problems) == 3
+    assert any('fill_content' in p for p in problems)
+    assert any('set_tags' in p and '失败' in p for p in problems)
+    assert any('publish_article' in p and '未执行' in p for p in problems)
+    assert not any('fill_title' in p for p in problems)
+
+
+def test_recorded_csdn_session_is_served():
+    """录制的 CSDN 会话：入口页面和发布接口的响应都能回放"""
+    with ReplayServer(FIXTURES_DIR / 'csdn') as server:
+        page = urlopen(server.local_url('https://editor.csdn.net/md/')).read().decode('utf-8')
+        assert '请输入文章标题' in page and 'modal__button-bar' in page
+        api = urlopen(server.base_url + '/__replay__/proxy?url=' + quote(
+            'https://bizapi.csdn.net/blog-console-api/v3/mdeditor/saveArticle', safe=''), data=b'{"status": 0}')
+        assert json.loads(api.read())['code'] == 200
+    assert list(load_baseline(FIXTURES_DIR / 'csdn')) == [step['name'] for step in server.fixture.steps]
+
+
+@pytest.mark.skipif(not HAS_CHROME, reason='需要 Chrome 和 chromedriver')
+def test_csdn_publisher_replays_recorded_session(tmp_path, monkeypatch):
+    """CSDN 发布器在录制的编辑器页面上离线走完整个发布流程，由发布接口的响应确认发布成功"""
+    from src.publisher import base_publisher
+    from src.publisher.csdn_publisher import CSDNPublisher
+    from src.publisher.taxonomy import TaxonomyCache
+
+    # 不请求真实站点的分类体系，不保存回放站点的 Cookie
+    monkeypatch.setattr(TaxonomyCache, 'refresh_async', lambda self: None)
+    monkeypatch.setattr(base_publisher, 'get_taxonomy', lambda platform: TaxonomyCache(platform, cache_dir=tmp_path))
+    monkeypatch.setattr(CSDNPublisher, 'update_cookies', lambda self, site_url: None)
+
+    # 正文分块写入编辑器（不经过系统剪贴板）
+    config = {'auto_publish': True, 'failure_artifacts': {'enabled': False},
+              'chunked_injection': {'threshold': 0}, 'publish_confirm': {'timeout': 10}}
+    publisher = CSDNPublisher(config, {'tags': [], 'categories': []})
+    timings = run_replay(publisher, FIXTURES_DIR / 'csdn', str(FIXTURES_DIR / 'article.md'), config)
+
+    assert [timing['step'] for timing in timings] == list(load_baseline(FIXTURES_DIR / 'csdn'))
+    assert all(timing['ok'] for timing in timings), timings
+    assert publisher.publish_result == {'id': '140000001', 'confirmed': True,
+                                        'url': 'https://blog.csdn.net/demo_user/article/details/140000001'}
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+测试按平台限流的发布调度
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.scheduler import PublishScheduler, RateLimiter
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_scheduler(tmp_path, config):
+    clock = FakeClock()
+    limiter = RateLimiter(config, state_file=tmp_path / 'rate_limits.json', clock=clock)
+    return PublishScheduler(limiter, sleep=clock.sleep), clock
+
+
+def test_cooldown_runs_other_platforms_first(tmp_path):
+    """csdn 冷却时先执行 juejin 的任务，只在所有平台都冷却时才等待"""
+    scheduler, clock = make_scheduler(tmp_path, {'csdn': {'interval': 300}, 'juejin': {'interval': 100}})
+    for article in ('a.md', 'b.md'):
+        scheduler.add('csdn', article)
+        scheduler.add('juejin', article)
+
+    order = []
+    summary = scheduler.run(lambda job: order.append((job.platform, job.article_path, clock.now)) or True)
+
+    assert [(p, a) for p, a, _ in order] == [
+        ('csdn', 'a.md'), ('juejin', 'a.md'), ('juejin', 'b.md'), ('csdn', 'b.md')
+    ]
+    # 只等待了 csdn 的冷却时间，而不是两个平台的间隔之和
+    assert order[-1][2] - order[0][2] == 300
+    assert len(summary['succeeded']) == 4
+
+
+def test_daily_cap_skips_and_persists(tmp_path):
+    """达到每日上限的任务被跳过，计数保存到状态文件，重启后仍然生效"""
+    config = {'default': {'interval': 0}, 'zhihu': {'daily_cap': 1}}
+    scheduler, _ = make_scheduler(tmp_path, config)
+    scheduler.add('zhihu', 'a.md')
+    scheduler.add('zhihu', 'b.md')
+
+    summary = scheduler.run(lambda job: True)
+    assert [job.article_path for job in summary['skipped']] == ['b.md']
+
+    restarted = RateLimiter(config, state_file=tmp_path / 'rate_limits.json')
+    assert restarted.published_today('zhihu') == 1
+    assert restarted.cap_reached('zhihu')
+
+
+def test_burst_allows_back_to_back(tmp_path):
+    """burst 为 2 时前两次发布不需要等待"""
+    scheduler, clock = make_scheduler(tmp_path, {'csdn': {'interval': 60, 'burst': 2}})
+    for article in ('a.md', 'b.md', 'c.md'):
+        scheduler.add('csdn', article)
+
+    times = []
+    scheduler.run(lambda job: times.append(clock.now) or True)
+
+    assert times[1] - times[0] == 0
+    assert times[2] - times[1] == 60
+
+
+def test_parked_job_does_not_block_other_platforms(tmp_path):
+    """需要登录的任务被暂放，同平台任务随之暂停，其他平台继续；登录后暂放的任务重新执行"""
+    scheduler, clock = make_scheduler(tmp_path, {'default': {'interval': 0}})
+    scheduler.park_poll = 10
+    for article in ('a.md', 'b.md'):
+        scheduler.add('zhihu', article)
+        scheduler.add('csdn', article)
+
+    order = []
+
+    def execute(job):
+        order.append((job.platform, job.article_path))
+        if len(order) == 1:
+            # 执行完两个 csdn 任务时用户已经完成登录
+            job.wait_for = lambda: len(order) >= 3
+            return False
+        return True
+
+    summary = scheduler.run(execute)
+
+    assert order[:3] == [('zhihu', 'a.md'), ('csdn', 'a.md'), ('csdn', 'b.md')]
+    assert order[3:] == [('zhihu', 'a.md'), ('zhihu', 'b.md')]
+    assert len(summary['succeeded']) == 4 and not summary['failed']
+    # 暂放的尝试不计入当天的发布次数
+    assert scheduler.limiter.published_today('zhihu') == 2
+
+
+def test_parked_job_times_out(tmp_path):
+    """一直没有登录的任务在超时后计为失败"""
+    scheduler, clock = make_scheduler(tmp_path, {'default': {'interval': 0}})
+    scheduler.park_timeout = 60
+    scheduler.add('zhihu', 'a.md')
+
+    def execute(job):
+        job.wait_for = lambda: False
+        return False
+
+    summary = scheduler.run(execute)
+    assert [job.article_path for job in summary['failed']] == ['a.md']
+    assert clock.now - 1000.0 >= 60
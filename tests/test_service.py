@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+测试发布服务：通过 HTTP 接口提交任务、检查拒绝、跟踪进度事件
+"""
+
+import os
+import sys
+import threading
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.logger import get_logger
+from src.core.scheduler import PublishScheduler, RateLimiter
+from src.service import PublishService, ServiceClient, ServiceError
+
+
+def test_submit_and_follow_jobs_over_http(tmp_path):
+    """任务在同一个执行线程中按顺序执行，拒绝的任务不执行，执行日志作为进度事件返回"""
+    articles = []
+    for name in ('a.md', 'b.md'):
+        path = tmp_path / name
+        path.write_text(f"# {name}", encoding='utf-8')
+        articles.append(str(path))
+
+    threads = set()
+    job_logger = get_logger('test_service.publisher')
+
+    def execute(job):
+        threads.add(threading.current_thread().name)
+        job_logger.info(f"正在发布 {os.path.basename(job.article_path)}")
+        job.url = f"https://{job.platform}.example.com/{os.path.basename(job.article_path)}"
+        return job.platform != 'juejin'
+
+    def check(platform, article_path, force):
+        return None if force or not article_path.endswith('b.md') or platform != 'csdn' else '已发布过'
+
+    service = PublishService(
+        execute=execute, check=check,
+        scheduler_factory=lambda: PublishScheduler(RateLimiter({'default': {'interval': 0}},
+                                                               state_file=tmp_path / 'rate_limits.json')),
+        default_platforms=lambda: ['csdn', 'juejin'])
+    server = service.serve(port=0)
+    client = ServiceClient(f"http://127.0.0.1:{server.server_port}")
+    try:
+        assert client.available()
+        events = []
+        jobs = client.submit(articles, ['csdn', 'juejin'])
+        assert [job['status'] for job in jobs] == ['queued'] * 4
+
+        finished = client.follow([job['id'] for job in jobs], events.append)
+        by_key = {(job['platform'], os.path.basename(job['article'])): job for job in finished}
+        assert by_key[('csdn', 'a.md')]['status'] == 'succeeded'
+        assert by_key[('csdn', 'a.md')]['url'] == 'https://csdn.example.com/a.md'
+        assert by_key[('csdn', 'b.md')]['status'] == 'rejected'
+        assert by_key[('csdn', 'b.md')]['message'] == '已发布过'
+        assert by_key[('juejin', 'a.md')]['status'] == 'failed'
+        assert threads == {'publish-service'}
+
+        logs = [event['message'] for event in events if event['type'] == 'log']
+        assert '正在发布 a.md' in logs
+        statuses = [event['status'] for event in events
+                    if event['type'] == 'status' and event['job'] == by_key[('csdn', 'a.md')]['id']]
+        assert statuses == ['queued', 'running', 'succeeded']
+
+        # 未指定平台时使用已启用的平台；文章不存在时返回错误
+        assert [job['platform'] for job in client.submit(articles[:1], force=True)] == ['csdn', 'juejin']
+        try:
+            client.submit([str(tmp_path / 'missing.md')])
+        except ServiceError as e:
+            assert '文章不存在' in str(e)
+        else:
+            raise AssertionError('文章不存在时应返回错误')
+    finally:
+        client.shutdown()
+        service.wait()
+    assert not client.available()
+
+
+def test_rejects_requests_from_browser_pages(tmp_path):
+    """跨站的简单请求（text/plain）、其他 Origin 和 DNS 重绑定的 Host 都被拒绝，服务不会停止"""
+    import http.client
+
+    service = PublishService(execute=lambda job: True,
+                             scheduler_factory=lambda: PublishScheduler(RateLimiter(
+                                 {'default': {'interval': 0}}, state_file=tmp_path / 'rate_limits.json')))
+    server = service.serve(port=0)
+    port = server.server_port
+    client = ServiceClient(f"http://127.0.0.1:{port}")
+
+    def post(path, headers):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        connection.request('POST', path, body='{"articles": ["a.md"]}', headers=headers)
+        status = connection.getresponse().status
+        connection.close()
+        return status
+
+    try:
+        assert post('/shutdown', {'Content-Type': 'text/plain'}) == 403
+        assert post('/shutdown', {'Content-Type': 'application/json', 'Origin': 'https://evil.example.com'}) == 403
+        assert post('/shutdown', {'Content-Type': 'application/json', 'Host': f'evil.example.com:{port}'}) == 403
+        assert post('/jobs', {'Content-Type': 'application/json', 'Host': f'localhost:{port}',
+                              'Origin': f'http://localhost:{port}'}) == 400
+        assert client.available()
+    finally:
+        client.shutdown()
+        service.wait()
+
+
+def test_rejects_malformed_submissions(tmp_path):
+    """articles、platforms 必须是字符串列表，平台必须已启用；格式错误的请求不产生任务"""
+    import http.client
+    import json
+
+    article = tmp_path / 'a.md'
+    article.write_text('# a', encoding='utf-8')
+    service = PublishService(execute=lambda job: True,
+                             scheduler_factory=lambda: PublishScheduler(RateLimiter(
+                                 {'default': {'interval': 0}}, state_file=tmp_path / 'rate_limits.json')),
+                             default_platforms=lambda: ['csdn', 'juejin'])
+    server = service.serve(port=0)
+    port = server.server_port
+    client = ServiceClient(f"http://127.0.0.1:{port}")
+
+    def submit(body):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        connection.request('POST', '/jobs', body=json.dumps(body), headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        result = (response.status, json.loads(response.read()))
+        connection.close()
+        return result
+
+    try:
+        for body in ({'articles': [str(article)], 'platforms': 'csdn'},
+                     {'articles': [str(article)], 'platforms': ['csdn', 'medium']},
+                     {'articles': [str(article)], 'platforms': [1]},
+                     {'articles': str(article)},
+                     {'articles': [str(article), None]},
+                     [str(article)]):
+            status, result = submit(body)
+            assert status == 400, body
+        assert '平台未启用或不存在：medium' in submit({'articles': [str(article)], 'platforms': ['medium']})[1]['error']
+        assert client.jobs() == []
+
+        status, result = submit({'articles': [str(article)], 'platforms': ['juejin']})
+        assert status == 202 and [job['platform'] for job in result['jobs']] == ['juejin']
+    finally:
+        client.shutdown()
+        service.wait()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+测试平台分类体系缓存的名称映射
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.publisher.taxonomy import TaxonomyCache
+
+
+def test_resolve_with_complete_list(tmp_path):
+    """完整列表：大小写、别名、包含匹配，未匹配的名称被剔除"""
+    cache = TaxonomyCache('demo', cache_dir=tmp_path)
+    cache.update('tags', {'Python': 1, 'JavaScript': 2, '人工智能': 3}, replace=True, complete=True)
+
+    resolved = cache.resolve('tags', ['python', 'js', 'AI', '人工智能', 'Python'],
+                             aliases={'js': 'JavaScript'})
+
+    assert resolved == ['Python', 'JavaScript', '人工智能']
+    assert cache.resolve('tags', ['python', 'js'], aliases={'js': 'JavaScript'}, limit=1) == ['Python']
+
+
+def test_resolve_with_partial_list_keeps_unknown(tmp_path):
+    """部分列表（搜索时看到的选项）只规范写法，不剔除未知名称"""
+    cache = TaxonomyCache('demo', cache_dir=tmp_path)
+    cache.update('tags', ['Python'])
+
+    assert cache.resolve('tags', ['PYTHON', 'Rust', None, '']) == ['Python', 'Rust']
+
+
+def test_cache_persists_and_keeps_ids(tmp_path):
+    """页面读取的值不覆盖接口拿到的ID，缓存写入文件后可重新加载"""
+    cache = TaxonomyCache('demo', cache_dir=tmp_path)
+    cache.update('categories', {'后端': 6809637769959178254}, replace=True, complete=True)
+    cache.update('categories', ['后端', '前端'])
+
+    reloaded = TaxonomyCache('demo', cache_dir=tmp_path)
+    assert reloaded.get('categories') == {'后端': 6809637769959178254, '前端': None}
+    assert reloaded.is_stale()
+
+
+def test_short_tags_do_not_match_inside_other_names(tmp_path):
+    """R、Go、C 这类短标签不会匹配到 Kubernetes、Django、Rust 中；单词边界处的包含匹配仍然有效"""
+    cache = TaxonomyCache('demo', cache_dir=tmp_path)
+    cache.update('tags', ['C', 'R', 'Go', 'Python', 'Docker', '前端', 'Vue.js', 'Google'],
+                 replace=True, complete=True)
+
+    resolved = cache.resolve('tags', ['Kubernetes', 'Django', 'Rust', 'go', 'c', 'vue', '前', 'docker'])
+    assert resolved == ['Go', 'C', 'Vue.js', 'Docker']
+
+
+def test_failed_refresh_is_not_retried_immediately(tmp_path, monkeypatch):
+    """刷新失败后在 RETRY_INTERVAL 内不再发请求，每次创建发布器时不会重复刷新"""
+    from src.publisher import taxonomy
+
+    monkeypatch.setattr(taxonomy, 'build_cookie_session', lambda platform: None)
+    calls = []
+
+    def failing_fetcher(session):
+        calls.append(session)
+        raise ConnectionError('offline')
+
+    cache = TaxonomyCache('demo', cache_dir=tmp_path)
+    assert cache.is_stale()
+    cache.refresh_async(failing_fetcher).join()
+    assert cache.refresh_async(failing_fetcher) is None
+    assert TaxonomyCache('demo', cache_dir=tmp_path).refresh_async(failing_fetcher) is None
+    assert len(calls) == 1
+
+
+def test_truncated_tag_crawl_is_not_complete(tmp_path, monkeypatch):
+    """接口一直返回 has_more 时只读到分页上限，缓存的标签不标记为完整，不剔除文章中的其他标签"""
+    from src.publisher import taxonomy
+
+    class Response:
+        def __init__(self, data):
+            self.data = data
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.data
+
+    class Session:
+        def __init__(self):
+            self.pages = 0
+
+        def post(self, url, json, timeout):
+            if url.endswith('query_category_list'):
+                return Response({'data': [{'category_id': '1', 'category': {'category_name': '后端'}}]})
+            self.pages += 1
+            name = f"tag{self.pages}"
+            return Response({'data': [{'tag_id': str(self.pages), 'tag': {'tag_name': name}}],
+                             'has_more': True, 'cursor': str(self.pages)})
+
+    session = Session()
+    monkeypatch.setattr(taxonomy, 'build_cookie_session', lambda platform: session)
+    cache = TaxonomyCache('demo', cache_dir=tmp_path)
+    cache.update('tags', ['Python'], replace=True, complete=True)
+
+    assert cache.refresh(taxonomy.fetch_juejin_taxonomy)
+
+    assert session.pages == taxonomy.JUEJIN_TAG_PAGES
+    assert len(cache.get('tags')) == taxonomy.JUEJIN_TAG_PAGES
+    assert cache.resolve('tags', ['tag1', 'Rust']) == ['tag1', 'Rust']
+    assert cache.resolve('categories', ['后端', '前端']) == ['后端']
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+测试文章目录监听：防抖、按内容指纹判断修改，以及停机期间的变化
+"""
+
+import os
+import sys
+import threading
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.publisher.watcher import ADDED, CHANGED, ContentWatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def write(path, text, mtime):
+    path.write_text(text, encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def test_debounce_and_content_hash(tmp_path):
+    """写入后等防抖时间过去才处理；只改修改时间不算修改；临时文件忽略"""
+    posts = tmp_path / 'posts'
+    posts.mkdir()
+    write(posts / 'old.md', '# 已有文章', 100)
+    clock = FakeClock()
+    watcher = ContentWatcher([str(posts)], debounce=5, state_file=tmp_path / 'state.json',
+                             use_watchdog=False, clock=clock)
+    watcher.start()
+    assert watcher.poll() == []
+
+    write(posts / 'new.md', '# 新文章\n\n草稿', 200)
+    write(posts / '.new.md.swp', 'x', 200)
+    clock.now += 3
+    assert watcher.poll() == []
+    # 防抖期间继续写入，重新计时
+    write(posts / 'new.md', '# 新文章\n\n正文', 201)
+    clock.now += 3
+    assert watcher.poll() == []
+    clock.now += 5
+    assert watcher.poll() == [(str(posts / 'new.md'), ADDED)]
+    watcher.commit([str(posts / 'new.md')])
+
+    write(posts / 'old.md', '# 已有文章', 300)
+    write(posts / 'new.md', '# 新文章\n\n修改后的正文', 300)
+    clock.now += 10
+    watcher.poll()
+    clock.now += 10
+    assert watcher.poll() == [(str(posts / 'new.md'), CHANGED)]
+
+
+def test_changes_while_stopped_are_picked_up_on_restart(tmp_path):
+    """重启时与保存的指纹比较，停机期间新增和修改的文章立即可处理"""
+    posts = tmp_path / 'posts'
+    posts.mkdir()
+    write(posts / 'a.md', '# A', 100)
+    write(posts / 'b.md', '# B', 100)
+    state_file = tmp_path / 'state.json'
+    ContentWatcher([str(posts)], state_file=state_file, use_watchdog=False).start()
+
+    write(posts / 'a.md', '# A\n\n补充内容', 200)
+    write(posts / 'c.md', '# C', 200)
+    clock = FakeClock()
+    watcher = ContentWatcher([str(posts), str(tmp_path / 'missing')], debounce=5, state_file=state_file,
+                             use_watchdog=False, clock=clock)
+    watcher.start()
+    assert watcher.poll() == [(str(posts / 'a.md'), CHANGED), (str(posts / 'c.md'), ADDED)]
+    assert watcher.poll() == []
+
+
+def test_failed_articles_are_retried(tmp_path):
+    """回调报告失败的文章不记录指纹，重试间隔后再次处理；重启后仍会处理"""
+    posts = tmp_path / 'posts'
+    posts.mkdir()
+    state_file = tmp_path / 'state.json'
+    clock = FakeClock()
+    watcher = ContentWatcher([str(posts)], debounce=5, state_file=state_file, use_watchdog=False,
+                             clock=clock, retry_interval=60)
+    watcher.start()
+    write(posts / 'a.md', '# A', 100)
+    write(posts / 'b.md', '# B', 100)
+    watcher.poll()
+    clock.now += 10
+    changes = watcher.poll()
+    assert [path for path, _ in changes] == [str(posts / 'a.md'), str(posts / 'b.md')]
+
+    # a 发布成功，b 失败
+    watcher.commit([str(posts / 'a.md')])
+    watcher.retry([str(posts / 'b.md')])
+    restarted = ContentWatcher([str(posts)], debounce=5, state_file=state_file, use_watchdog=False, clock=FakeClock())
+    restarted.start()
+    assert restarted.poll() == [(str(posts / 'b.md'), ADDED)]
+
+    clock.now += 30
+    assert watcher.poll() == []
+    clock.now += 31
+    assert watcher.poll() == [(str(posts / 'b.md'), ADDED)]
+
+
+def test_run_retries_what_the_callback_reports_failed(tmp_path):
+    """run() 根据回调的返回值提交或重试"""
+    posts = tmp_path / 'posts'
+    posts.mkdir()
+    clock = FakeClock()
+    stop = threading.Event()
+    # 上次运行之后新增的文章
+    state_file = tmp_path / 'state.json'
+    state_file.write_text('{}', encoding='utf-8')
+    watcher = ContentWatcher([str(posts)], debounce=0, poll_interval=0, state_file=state_file, use_watchdog=False,
+                             clock=clock, retry_interval=0)
+    write(posts / 'a.md', '# A', 100)
+    calls = []
+
+    def on_change(changes):
+        calls.append([path for path, _ in changes])
+        if len(calls) == 1:
+            return [str(posts / 'a.md')]
+        stop.set()
+        return None
+
+    watcher.run(on_change, stop)
+    assert calls == [[str(posts / 'a.md')], [str(posts / 'a.md')]]
+    assert str(posts / 'a.md') in state_file.read_text(encoding='utf-8')